@@ -0,0 +1,431 @@
+"""Punto de entrada de los benchmarks.
+
+    python -m benchmarks run --posts 100000 --generate
+    python -m benchmarks compare results/base.json results/new.json
+    python -m benchmarks load --base-url http://127.0.0.1:8000 --mode open --rate 50
+
+`run` ejecuta cada escenario dentro de una transacción que se revierte al final,
+de modo que los escenarios de escritura no alteran el dataset entre ejecuciones.
+`load` genera carga con los flujos del frontend contra un servidor arrancado
+(ver `benchmarks/load.py`).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import subprocess
+import sys
+from collections.abc import Generator
+from datetime import UTC, datetime
+from pathlib import Path
+from time import perf_counter
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlmodel import Session, SQLModel
+
+from benchmarks.dataset import DatasetSpec, generate_dataset
+from benchmarks.load import LoadConfig, print_report, run_load
+from benchmarks.scenarios import SCENARIOS, BenchContext, Scenario
+from src.core.database.config import get_session
+from src.core.database.engine import create_db_engine
+from src.core.database.instrumentation import count_queries
+from src.core.database.settings import db_settings
+from src.domain.models.announcement import Announcement
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.category import Category
+from src.domain.models.section import Section
+from src.domain.models.tag import Tag
+from src.main import app, rate_limiter
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SAMPLE_SIZE = 1_000
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentile(cut_points: list[float], p: int) -> float:
+    return cut_points[p - 1] if cut_points else 0.0
+
+
+def _sample_ids(session: Session, model, size: int = SAMPLE_SIZE) -> list:
+    # Orden por id: al ser UUID aleatorios deterministas, la muestra es estable.
+    return list(session.exec(select(model.id).order_by(model.id).limit(size)).scalars())
+
+
+def _run_scenario(
+    scenario: Scenario,
+    engine,
+    ctx: BenchContext,
+    *,
+    iterations: int,
+    warmup: int,
+) -> dict:
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    def get_session_override() -> Generator[Session]:
+        yield ctx.session
+
+    app.dependency_overrides[get_session] = get_session_override
+    timings: list[float] = []
+    errors = 0
+    last_error = None
+    try:
+        with count_queries() as stats:
+            for i in range(warmup + iterations):
+                if i == warmup:
+                    stats.count, stats.duration = 0, 0.0
+                ctx.session = Session(
+                    bind=connection,
+                    join_transaction_mode="create_savepoint",
+                )
+                start = perf_counter()
+                try:
+                    scenario.run(ctx)
+                # Cualquier fallo del escenario se cuenta y se informa al final.
+                except Exception as exc:  # noqa: BLE001
+                    errors += 1
+                    last_error = repr(exc)
+                else:
+                    if i >= warmup:
+                        timings.append(perf_counter() - start)
+                finally:
+                    ctx.session.close()
+    finally:
+        app.dependency_overrides.clear()
+        transaction.rollback()
+        connection.close()
+
+    cut_points = (
+        statistics.quantiles(timings, n=100, method="inclusive")
+        if len(timings) > 1
+        else timings * 99
+    )
+    calls = max(iterations, 1)
+    result = {
+        "iterations": len(timings),
+        "errors": errors,
+        "mean_ms": statistics.fmean(timings) * 1000 if timings else 0.0,
+        "min_ms": min(timings, default=0.0) * 1000,
+        "max_ms": max(timings, default=0.0) * 1000,
+        "p50_ms": _percentile(cut_points, 50) * 1000,
+        "p95_ms": _percentile(cut_points, 95) * 1000,
+        "p99_ms": _percentile(cut_points, 99) * 1000,
+        "queries_per_call": stats.count / calls,
+        "db_ms_per_call": stats.duration * 1000 / calls,
+    }
+    if last_error:
+        result["last_error"] = last_error
+    return result
+
+
+def _selected(only: list[str] | None) -> list[Scenario]:
+    if not only:
+        return SCENARIOS
+    return [s for s in SCENARIOS if any(f in s.name or f in s.tags for f in only)]
+
+
+def run(args: argparse.Namespace) -> int:
+    # Los avisos de N+1 por petición ya se reflejan en `queries_per_call`.
+    logging.getLogger("src.core.middleware.query_accounting").setLevel(logging.ERROR)
+    # Se mide la aplicación, no el limitador: todas las peticiones salen del mismo
+    # cliente y agotarían enseguida los cubos de escritura.
+    rate_limiter.enabled = False
+    engine = create_db_engine(args.database_url)
+    spec = DatasetSpec(posts=args.posts, seed=args.seed)
+
+    if args.reset:
+        print("Recreando el esquema...")
+        SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        existing = session.exec(select(func.count()).select_from(BlogPost)).one()[0]
+    if args.generate:
+        if existing:
+            print(f"La base de datos ya contiene {existing:,} posts; no se genera.")
+        else:
+            print(f"Generando dataset ({spec.posts:,} posts, semilla {spec.seed})...")
+            start = perf_counter()
+            counts = generate_dataset(engine, spec)
+            print(f"Dataset cargado en {perf_counter() - start:.1f} s: {counts}")
+
+    with Session(engine) as session:
+        ctx = BenchContext(
+            client=TestClient(app),
+            rng=random.Random(args.seed),
+            post_ids=_sample_ids(session, BlogPost),
+            category_ids=_sample_ids(session, Category),
+            tag_ids=_sample_ids(session, Tag),
+            announcement_ids=_sample_ids(session, Announcement),
+            section_ids=_sample_ids(session, Section),
+        )
+    if not (ctx.post_ids and ctx.category_ids and ctx.tag_ids):
+        print("La base de datos está vacía; ejecute con --generate.", file=sys.stderr)
+        return 1
+
+    results = {}
+    print(
+        f"\n{'escenario':<52}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'consultas':>11}{'errores':>9}",
+    )
+    for scenario in _selected(args.only):
+        # Misma secuencia de IDs para cada escenario, independientemente del orden.
+        ctx.rng.seed(f"{args.seed}:{scenario.name}")
+        result = _run_scenario(
+            scenario,
+            engine,
+            ctx,
+            iterations=args.iterations,
+            warmup=args.warmup,
+        )
+        results[scenario.name] = result
+        print(
+            f"{scenario.name:<52}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+            f"{result['p99_ms']:>9.2f}{result['queries_per_call']:>11.1f}"
+            f"{result['errors']:>9}",
+        )
+
+    commit = _git_commit()
+    timestamp = datetime.now(UTC)
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": timestamp.isoformat(),
+            "dialect": engine.dialect.name,
+            "python": sys.version.split()[0],
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "dataset": spec.as_dict(),
+        },
+        "scenarios": results,
+    }
+    output = args.output or RESULTS_DIR / (
+        f"{timestamp:%Y%m%dT%H%M%S}-{commit or 'local'}.json"
+    )
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResultados guardados en {output}")
+    return 0
+
+
+def _weights(values: list[str]) -> dict[str, float]:
+    weights = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        try:
+            weights[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Peso inválido '{value}'; use flujo=peso.",
+            ) from None
+    return weights
+
+
+def load(args: argparse.Namespace) -> int:
+    config = LoadConfig(
+        base_url=args.base_url,
+        mode=args.mode,
+        duration=args.duration,
+        warmup=args.warmup,
+        users=args.users,
+        think_time=args.think_time,
+        rate=args.rate,
+        max_in_flight=args.max_in_flight,
+        weights=_weights(args.weight),
+        seed=args.seed,
+        keep_data=args.keep_data,
+    )
+    print(
+        f"Carga {config.mode} contra {config.base_url} durante {config.duration:.0f} s "
+        f"(+{config.warmup:.0f} s de calentamiento)...",
+    )
+    try:
+        report = asyncio.run(run_load(config))
+    except httpx.HTTPError as exc:
+        print(f"No se pudo conectar con {config.base_url}: {exc}", file=sys.stderr)
+        return 1
+    except (RuntimeError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print_report(report)
+
+    commit = _git_commit()
+    timestamp = datetime.now(UTC)
+    output = args.output or RESULTS_DIR / (
+        f"load-{timestamp:%Y%m%dT%H%M%S}-{commit or 'local'}.json"
+    )
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "commit": commit,
+        "timestamp": timestamp.isoformat(),
+        "python": sys.version.split()[0],
+        **{k: v for k, v in vars(config).items() if k != "weights"},
+    }
+    output.write_text(json.dumps({"meta": meta, **report}, indent=2))
+    print(f"\nResultados guardados en {output}")
+    total_errors = sum(stats["errors"] for stats in report["requests"].values())
+    return 1 if total_errors > args.max_errors else 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    base = json.loads(Path(args.base).read_text())
+    new = json.loads(Path(args.new).read_text())
+    print(f"base: {base['meta'].get('commit')}  nuevo: {new['meta'].get('commit')}")
+    if base["meta"].get("dataset") != new["meta"].get("dataset"):
+        print("Aviso: los datasets de ambas ejecuciones no coinciden.")
+
+    print(
+        f"\n{'escenario':<52}{'p50 base':>10}{'p50 nuevo':>11}{'Δ%':>8}"
+        f"{'p95 Δ%':>9}{'consultas':>12}",
+    )
+    regressions = []
+    for name, new_result in new["scenarios"].items():
+        old = base["scenarios"].get(name)
+        if old is None:
+            print(f"{name:<52}{'—':>10}{new_result['p50_ms']:>11.2f}   (nuevo)")
+            continue
+        p50_delta = _delta(old["p50_ms"], new_result["p50_ms"])
+        p95_delta = _delta(old["p95_ms"], new_result["p95_ms"])
+        queries = f"{old['queries_per_call']:.1f}→{new_result['queries_per_call']:.1f}"
+        flag = ""
+        if (
+            p50_delta > args.threshold
+            or new_result["queries_per_call"] > old["queries_per_call"]
+        ):
+            regressions.append(name)
+            flag = "  !"
+        print(
+            f"{name:<52}{old['p50_ms']:>10.2f}{new_result['p50_ms']:>11.2f}"
+            f"{p50_delta:>+8.1f}{p95_delta:>+9.1f}{queries:>12}{flag}",
+        )
+
+    if regressions:
+        print(
+            f"\n{len(regressions)} escenario(s) con regresión "
+            f"(umbral {args.threshold}%).",
+        )
+        return 1
+    return 0
+
+
+def _delta(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Ejecuta los escenarios.")
+    run_parser.add_argument("--database-url", default=db_settings.database_url)
+    run_parser.add_argument("--posts", type=int, default=DatasetSpec.posts)
+    run_parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    run_parser.add_argument(
+        "--generate",
+        action="store_true",
+        help="Genera el dataset si la base de datos está vacía.",
+    )
+    run_parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Elimina y recrea todas las tablas antes de empezar.",
+    )
+    run_parser.add_argument("--iterations", type=int, default=200)
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument(
+        "--only",
+        nargs="*",
+        help="Filtra por subcadena del nombre o por etiqueta (read, write, endpoint).",
+    )
+    run_parser.add_argument("--output", type=Path)
+    run_parser.set_defaults(handler=run)
+
+    load_parser = subparsers.add_parser(
+        "load",
+        help="Genera carga con los flujos del frontend contra un servidor.",
+    )
+    load_parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    load_parser.add_argument(
+        "--mode",
+        choices=("closed", "open"),
+        default="closed",
+        help="closed: usuarios concurrentes fijos; open: llegadas de Poisson.",
+    )
+    load_parser.add_argument("--duration", type=float, default=60.0)
+    load_parser.add_argument(
+        "--warmup",
+        type=float,
+        default=5.0,
+        help="Segundos iniciales que no se miden.",
+    )
+    load_parser.add_argument("--users", type=int, default=20)
+    load_parser.add_argument(
+        "--think-time",
+        type=float,
+        default=1.0,
+        help="Pausa media entre flujos de un usuario (modelo cerrado), en segundos.",
+    )
+    load_parser.add_argument(
+        "--rate",
+        type=float,
+        default=20.0,
+        help="Flujos que llegan por segundo (modelo abierto).",
+    )
+    load_parser.add_argument("--max-in-flight", type=int, default=500)
+    load_parser.add_argument(
+        "--weight",
+        action="append",
+        default=[],
+        metavar="FLUJO=PESO",
+        help="Peso de un flujo (browse, read, share); 0 lo desactiva.",
+    )
+    load_parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    load_parser.add_argument(
+        "--keep-data",
+        action="store_true",
+        help="No elimina los posts creados por el flujo share.",
+    )
+    load_parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=0,
+        help="Errores tolerados antes de salir con código 1.",
+    )
+    load_parser.add_argument("--output", type=Path)
+    load_parser.set_defaults(handler=load)
+
+    compare_parser = subparsers.add_parser("compare", help="Compara dos resultados.")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Regresión máxima tolerada en p50, en porcentaje.",
+    )
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""Generador reproducible de datos sintéticos para los benchmarks.
+
+Con la misma semilla y los mismos parámetros produce exactamente los mismos
+registros (incluidos los UUID), de modo que las ejecuciones en distintos
+commits miden lo mismo. Los datos se generan por lotes y se cargan con `COPY`
+en PostgreSQL (o con inserts multi-fila en otros motores), así que el consumo
+de memoria no depende del tamaño total del dataset.
+"""
+
+import csv
+import io
+import random
+import uuid
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session
+
+from src.domain.models.announcement import Announcement
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_announcement_link import BlogPostAnnouncementLink
+from src.domain.models.blog_post_body import BlogPostBody
+from src.domain.models.blog_post_tag_link import BlogPostTagLink
+from src.domain.models.category import Category
+from src.domain.models.section import Section
+from src.domain.models.tag import Tag
+from src.repository.related_posts import RelatedPostsRepository
+from src.repository.rendered_content import backfill_rendered_content
+
+WORDS = [
+    "entrenamiento",
+    "fuerza",
+    "cardio",
+    "nutrición",
+    "proteína",
+    "descanso",
+    "movilidad",
+    "rutina",
+    "hipertrofia",
+    "resistencia",
+    "flexibilidad",
+    "hidratación",
+    "sueño",
+    "recuperación",
+    "dieta",
+    "series",
+    "repeticiones",
+    "técnica",
+    "postura",
+    "calentamiento",
+    "estiramiento",
+    "progresión",
+    "objetivo",
+    "energía",
+    "salud",
+    "bienestar",
+    "constancia",
+    "disciplina",
+    "músculo",
+    "articulación",
+]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Parámetros del dataset. Los valores por defecto imitan la forma esperada
+    del blog: pocas categorías, cientos de tags con popularidad tipo Zipf,
+    varias secciones por post y anuncios enlazados a una fracción de los posts.
+    """
+
+    posts: int = 10_000
+    seed: int = 42
+    categories: int | None = None
+    tags: int | None = None
+    announcements: int = 50
+    sections_per_post: float = 4.0
+    tags_per_post: int = 3
+    announcement_link_ratio: float = 0.2
+    content_paragraphs: int = 6
+    batch_size: int = 10_000
+
+    @property
+    def category_count(self) -> int:
+        return self.categories or max(5, min(200, int(self.posts**0.5 / 5)))
+
+    @property
+    def tag_count(self) -> int:
+        return self.tags or max(20, min(2_000, int(self.posts**0.5 * 2)))
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["categories"] = self.category_count
+        data["tags"] = self.tag_count
+        return data
+
+
+class _Generator:
+    def __init__(self, spec: DatasetSpec):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.now = datetime(2025, 1, 1)
+        # Pesos tipo Zipf: unos pocos tags concentran la mayoría de los posts.
+        self.tag_cum_weights = list(
+            accumulate(1 / (rank + 1) for rank in range(spec.tag_count)),
+        )
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def timestamp(self) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randrange(3 * 365 * 86_400))
+
+    def sentence(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def paragraphs(self, count: int) -> str:
+        return "\n\n".join(
+            self.sentence(self.rng.randint(40, 90)) + "." for _ in range(count)
+        )
+
+    def base_row(self) -> dict:
+        created = self.timestamp()
+        return {"id": self.uuid(), "created_at": created, "updated_at": created}
+
+
+def _copy_rows(connection: Connection, table: Table, rows: list[dict]) -> None:
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+    buffer.seek(0)
+    raw = connection.connection.dbapi_connection
+    with raw.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def _load(connection: Connection, table: Table, rows: list[dict]) -> None:
+    if not rows:
+        return
+    if connection.dialect.name == "postgresql":
+        _copy_rows(connection, table, rows)
+    else:
+        connection.execute(insert(table), rows)
+
+
+def _batched(items: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_dataset(engine: Engine, spec: DatasetSpec, *, echo: bool = True) -> dict:
+    """Genera y carga el dataset descrito por `spec` en la base de datos de `engine`.
+    Las tablas deben existir y estar vacías. Devuelve el número de filas por tabla.
+    """
+    gen = _Generator(spec)
+    counts = dict.fromkeys(
+        (
+            "category",
+            "tag",
+            "announcement",
+            "blogpost",
+            "section",
+            "links",
+            "related",
+            "rendered",
+        ),
+        0,
+    )
+
+    categories = [
+        gen.base_row() | {"name": f"Categoría {i}", "description": gen.sentence(12)}
+        for i in range(spec.category_count)
+    ]
+    tags = [gen.base_row() | {"name": f"tag-{i}"} for i in range(spec.tag_count)]
+    announcements = [
+        gen.base_row()
+        | {
+            "name": f"Anuncio {i}",
+            "url": f"https://example.com/promo/{i}",
+            "image_url": f"https://example.com/promo/{i}.jpg",
+        }
+        for i in range(spec.announcements)
+    ]
+
+    with engine.begin() as connection:
+        _load(connection, Category.__table__, categories)
+        _load(connection, Tag.__table__, tags)
+        _load(connection, Announcement.__table__, announcements)
+    counts["category"] = len(categories)
+    counts["tag"] = len(tags)
+    counts["announcement"] = len(announcements)
+
+    category_ids = [row["id"] for row in categories]
+    tag_ids = [row["id"] for row in tags]
+    announcement_ids = [row["id"] for row in announcements]
+
+    def post_rows() -> Iterator[dict]:
+        for i in range(spec.posts):
+            row = gen.base_row()
+            row |= {
+                "title": f"{gen.sentence(6)} #{i}",
+                "date": (row["created_at"] + timedelta(days=1)).date()
+                if gen.rng.random() < 0.95
+                else None,
+                "category_id": gen.rng.choice(category_ids),
+            }
+            yield row
+
+    for batch in _batched(post_rows(), spec.batch_size):
+        bodies: list[dict] = []
+        sections: list[dict] = []
+        tag_links: list[dict] = []
+        announcement_links: list[dict] = []
+        for post in batch:
+            bodies.append(
+                {
+                    "blog_post_id": post["id"],
+                    "content": gen.paragraphs(spec.content_paragraphs),
+                },
+            )
+            section_count = int(gen.rng.expovariate(1 / spec.sections_per_post))
+            for position in range(section_count):
+                sections.append(
+                    gen.base_row()
+                    | {
+                        "title": gen.sentence(4),
+                        "image_url": None,
+                        "content": gen.paragraphs(2),
+                        "position_order": position,
+                        "blog_post_id": post["id"],
+                    },
+                )
+            chosen_tags = set(
+                gen.rng.choices(
+                    tag_ids,
+                    cum_weights=gen.tag_cum_weights,
+                    k=spec.tags_per_post,
+                ),
+            )
+            tag_links.extend(
+                gen.base_row() | {"blog_post_id": post["id"], "tag_id": tag_id}
+                for tag_id in chosen_tags
+            )
+            if announcement_ids and gen.rng.random() < spec.announcement_link_ratio:
+                announcement_links.append(
+                    gen.base_row()
+                    | {
+                        "blog_post_id": post["id"],
+                        "announcement_id": gen.rng.choice(announcement_ids),
+                    },
+                )
+
+        with engine.begin() as connection:
+            _load(connection, BlogPost.__table__, batch)
+            _load(connection, BlogPostBody.__table__, bodies)
+            _load(connection, Section.__table__, sections)
+            _load(connection, BlogPostTagLink.__table__, tag_links)
+            _load(connection, BlogPostAnnouncementLink.__table__, announcement_links)
+
+        counts["blogpost"] += len(batch)
+        counts["section"] += len(sections)
+        counts["links"] += len(tag_links) + len(announcement_links)
+        if echo:
+            print(f"  {counts['blogpost']:>10,} / {spec.posts:,} posts cargados")
+
+    with Session(engine) as session:
+        counts["related"] = RelatedPostsRepository(session).rebuild()
+        session.commit()
+        counts["rendered"] = sum(
+            backfill_rendered_content(session, model)
+            for model in (BlogPostBody, Section)
+        )
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT",
+        ) as connection:
+            connection.exec_driver_sql("ANALYZE")
+    return counts
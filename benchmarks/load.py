@@ -0,0 +1,462 @@
+"""Generador de carga asíncrono con los flujos de usuario del frontend.
+
+Cada flujo reproduce las peticiones de una de las vistas de `Front end Views/`:
+
+* `browse`: la portada con todos los blogs (`all blogs nav.html`): menú de
+  categorías, destacados (tendencia), últimos artículos y, a veces, los de una
+  categoría.
+* `read`: un blog completo (`full blog.html`): el post con su contenido en HTML,
+  la visita, el anuncio y los posts relacionados.
+* `share`: compartir una historia (`share u story.html`): el formulario carga
+  categorías y tags, crea el post y le añade tags.
+
+Las vistas de registro, inicio de sesión y ajustes de cuenta no tienen
+endpoints en esta API, así que no se modelan.
+
+Dos modelos de llegada:
+
+* cerrado (`closed`): `users` usuarios virtuales repiten flujos, con una pausa
+  aleatoria entre uno y otro (`think_time`). La carga se adapta a la velocidad
+  del servidor.
+* abierto (`open`): los flujos llegan como un proceso de Poisson a `rate` por
+  segundo, terminen o no los anteriores. La duración de un flujo se mide desde
+  su llegada prevista, así que incluye la espera si el cliente se satura (sin
+  omisión coordinada). Las llegadas que superan `max_in_flight` se descartan y
+  se cuentan.
+
+Se ejecuta contra un servidor ya arrancado (ver `python -m benchmarks load`).
+"""
+
+import asyncio
+import random
+import statistics
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+import httpx
+
+API = "/v1/api"
+SAMPLE_POSTS = 500
+
+
+class FlowError(Exception):
+    """Una petición del flujo falló; el resto del flujo no se ejecuta."""
+
+
+@dataclass
+class Stats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, seconds: float) -> dict[str, float]:
+        latencies = self.latencies
+        cut_points = (
+            statistics.quantiles(latencies, n=100, method="inclusive")
+            if len(latencies) > 1
+            else latencies * 99
+        )
+
+        def percentile(p: int) -> float:
+            return cut_points[p - 1] * 1000 if cut_points else 0.0
+
+        total = len(latencies) + self.errors
+        return {
+            "count": total,
+            "errors": self.errors,
+            "error_rate": self.errors / total if total else 0.0,
+            "throughput": total / seconds if seconds else 0.0,
+            "p50_ms": percentile(50),
+            "p90_ms": percentile(90),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": max(latencies, default=0.0) * 1000,
+        }
+
+
+class Recorder:
+    """Latencias y errores por petición (método y ruta) y por flujo. No registra
+    nada hasta `start()`, para descartar el calentamiento.
+    """
+
+    def __init__(self):
+        self.requests: dict[str, Stats] = defaultdict(Stats)
+        self.flows: dict[str, Stats] = defaultdict(Stats)
+        self.status_codes: dict[str, int] = defaultdict(int)
+        self.dropped = 0
+        self.recording = False
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+
+    def start(self) -> None:
+        self.recording = True
+        self.started_at = perf_counter()
+
+    def stop(self) -> None:
+        self.recording = False
+        self.stopped_at = perf_counter()
+
+    def request(self, name: str, seconds: float, status: str, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.status_codes[status] += 1
+        if ok:
+            self.requests[name].latencies.append(seconds)
+        else:
+            self.requests[name].errors += 1
+
+    def flow(self, name: str, seconds: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        if ok:
+            self.flows[name].latencies.append(seconds)
+        else:
+            self.flows[name].errors += 1
+
+    def drop(self) -> None:
+        if self.recording:
+            self.dropped += 1
+
+    def report(self) -> dict[str, Any]:
+        seconds = self.stopped_at - self.started_at
+        return {
+            "seconds": seconds,
+            "dropped_arrivals": self.dropped,
+            "status_codes": dict(sorted(self.status_codes.items())),
+            "flows": {n: s.summary(seconds) for n, s in sorted(self.flows.items())},
+            "requests": {
+                n: s.summary(seconds) for n, s in sorted(self.requests.items())
+            },
+        }
+
+
+@dataclass
+class LoadContext:
+    client: httpx.AsyncClient
+    recorder: Recorder
+    rng: random.Random
+    post_ids: list[str]
+    category_ids: list[str]
+    tag_ids: list[str]
+    created_post_ids: list[str] = field(default_factory=list)
+
+    async def call(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        *,
+        expected: tuple[int, ...] = (200,),
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Ejecuta y registra una petición; `name` agrupa las de la misma ruta."""
+        start = perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            elapsed = perf_counter() - start
+            self.recorder.request(name, elapsed, type(exc).__name__, False)
+            raise FlowError(f"{name}: {exc!r}") from exc
+        ok = response.status_code in expected
+        self.recorder.request(
+            name,
+            perf_counter() - start,
+            str(response.status_code),
+            ok,
+        )
+        if not ok:
+            raise FlowError(f"{name}: HTTP {response.status_code}")
+        return response
+
+
+@dataclass
+class Flow:
+    name: str
+    weight: float
+    run: Callable[[LoadContext], Awaitable[None]]
+
+
+FLOWS: list[Flow] = []
+
+
+def flow(name: str, weight: float):
+    def decorator(func: Callable[[LoadContext], Awaitable[None]]):
+        FLOWS.append(Flow(name=name, weight=weight, run=func))
+        return func
+
+    return decorator
+
+
+@flow("browse", 60)
+async def browse_all_blogs(ctx: LoadContext) -> None:
+    await ctx.call("GET /categories", "GET", f"{API}/categories")
+    await ctx.call(
+        "GET /blog_posts/trending",
+        "GET",
+        f"{API}/blog_posts/trending",
+        params={"limit": 3},
+    )
+    await ctx.call(
+        "GET /blog_posts",
+        "GET",
+        f"{API}/blog_posts",
+        params={"skip": ctx.rng.randrange(0, 100), "limit": 12},
+    )
+    if ctx.rng.random() < 0.5:
+        category_id = ctx.rng.choice(ctx.category_ids)
+        await ctx.call(
+            "GET /categories/{id}/blog_posts",
+            "GET",
+            f"{API}/categories/{category_id}/blog_posts",
+            params={"limit": 12},
+        )
+
+
+@flow("read", 35)
+async def read_full_blog(ctx: LoadContext) -> None:
+    blog_post_id = ctx.rng.choice(ctx.post_ids)
+    response = await ctx.call(
+        "GET /blog_posts/{id}",
+        "GET",
+        f"{API}/blog_posts/{blog_post_id}",
+        params={"content_format": "html"},
+    )
+    category_id = response.json()["category_id"]
+    await ctx.call(
+        "POST /blog_posts/{id}/views",
+        "POST",
+        f"{API}/blog_posts/{blog_post_id}/views",
+        expected=(202,),
+    )
+    await ctx.call(
+        "GET /announcements/serve",
+        "GET",
+        f"{API}/announcements/serve",
+        params={"blog_post_id": blog_post_id, "category_id": category_id},
+        expected=(200, 204),
+    )
+    await ctx.call(
+        "GET /blog_posts/{id}/related",
+        "GET",
+        f"{API}/blog_posts/{blog_post_id}/related",
+        params={"limit": 3},
+    )
+
+
+@flow("share", 5)
+async def share_story(ctx: LoadContext) -> None:
+    await ctx.call("GET /categories", "GET", f"{API}/categories")
+    await ctx.call("GET /tags", "GET", f"{API}/tags")
+    payload = {
+        "title": f"Mi historia {uuid.uuid4().hex[:8]}",
+        "content": "Mi experiencia entrenando en casa.\n\n" * ctx.rng.randint(5, 40),
+        "category_id": ctx.rng.choice(ctx.category_ids),
+    }
+    response = await ctx.call(
+        "POST /blog_posts",
+        "POST",
+        f"{API}/blog_posts",
+        json=payload,
+        expected=(201,),
+    )
+    blog_post_id = response.json()["id"]
+    ctx.created_post_ids.append(blog_post_id)
+    # Autoguardado del editor: solo el texto añadido desde el guardado anterior.
+    length, etag = len(payload["content"]), f'"{response.json()["version"]}"'
+    for _ in range(ctx.rng.randint(1, 5)):
+        addition = "Hoy he añadido otra serie. "
+        response = await ctx.call(
+            "PATCH /blog_posts/{id}",
+            "PATCH",
+            f"{API}/blog_posts/{blog_post_id}",
+            json={"content": {"delta": [{"retain": length}, {"insert": addition}]}},
+            headers={
+                "Content-Type": "application/merge-patch+json",
+                "If-Match": etag,
+                "Prefer": "return=minimal",
+            },
+            expected=(204,),
+        )
+        length, etag = length + len(addition), response.headers["etag"]
+    for tag_id in ctx.rng.sample(ctx.tag_ids, min(2, len(ctx.tag_ids))):
+        await ctx.call(
+            "POST /blog_posts/{id}/tags/{tag_id}",
+            "POST",
+            f"{API}/blog_posts/{blog_post_id}/tags/{tag_id}",
+        )
+
+
+@dataclass
+class LoadConfig:
+    base_url: str
+    mode: str = "closed"
+    duration: float = 60.0
+    warmup: float = 5.0
+    # Modelo cerrado
+    users: int = 20
+    think_time: float = 1.0
+    # Modelo abierto (flujos por segundo)
+    rate: float = 20.0
+    max_in_flight: int = 500
+    weights: dict[str, float] = field(default_factory=dict)
+    seed: int = 42
+    timeout: float = 30.0
+    keep_data: bool = False
+
+    def flows(self) -> list[Flow]:
+        flows = [Flow(f.name, self.weights.get(f.name, f.weight), f.run) for f in FLOWS]
+        unknown = set(self.weights) - {f.name for f in FLOWS}
+        if unknown:
+            raise ValueError(f"Flujos desconocidos: {', '.join(sorted(unknown))}.")
+        flows = [f for f in flows if f.weight > 0]
+        if not flows:
+            raise ValueError("Todos los flujos tienen peso 0.")
+        return flows
+
+
+async def _ids(client: httpx.AsyncClient, path: str, **params: Any) -> list[str]:
+    response = await client.get(f"{API}/{path}", params=params)
+    response.raise_for_status()
+    return [item["id"] for item in response.json()]
+
+
+async def discover(client: httpx.AsyncClient, sample_posts: int) -> dict[str, list]:
+    """IDs de muestra leídos de la propia API, sin acceso a la base de datos."""
+    post_ids: list[str] = []
+    for skip in range(0, sample_posts, 100):
+        page = await _ids(client, "blog_posts", skip=skip, limit=100)
+        post_ids.extend(page)
+        if len(page) < 100:
+            break
+    return {
+        "post_ids": post_ids,
+        "category_ids": await _ids(client, "categories", limit=100),
+        "tag_ids": await _ids(client, "tags", limit=200),
+    }
+
+
+async def _run_flow(
+    ctx: LoadContext,
+    flows: list[Flow],
+    weights: list[float],
+    started: float,
+) -> None:
+    chosen = ctx.rng.choices(flows, weights=weights)[0]
+    try:
+        await chosen.run(ctx)
+    except FlowError:
+        ctx.recorder.flow(chosen.name, perf_counter() - started, False)
+    else:
+        ctx.recorder.flow(chosen.name, perf_counter() - started, True)
+
+
+async def _closed_loop(
+    ctx: LoadContext,
+    config: LoadConfig,
+    flows: list[Flow],
+    deadline: float,
+) -> None:
+    weights = [f.weight for f in flows]
+
+    async def user() -> None:
+        while perf_counter() < deadline:
+            await _run_flow(ctx, flows, weights, perf_counter())
+            if config.think_time > 0:
+                await asyncio.sleep(ctx.rng.expovariate(1 / config.think_time))
+
+    await asyncio.gather(*(user() for _ in range(config.users)))
+
+
+async def _open_loop(
+    ctx: LoadContext,
+    config: LoadConfig,
+    flows: list[Flow],
+    deadline: float,
+) -> None:
+    weights = [f.weight for f in flows]
+    in_flight: set[asyncio.Task] = set()
+    arrival = perf_counter()
+    while arrival < deadline:
+        delay = arrival - perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= config.max_in_flight:
+            ctx.recorder.drop()
+        else:
+            task = asyncio.create_task(_run_flow(ctx, flows, weights, arrival))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        arrival += ctx.rng.expovariate(config.rate)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+async def run_load(config: LoadConfig) -> dict[str, Any]:
+    """Ejecuta la prueba de carga y devuelve el informe."""
+    flows = config.flows()
+    if config.mode not in ("closed", "open"):
+        raise ValueError(f"Modelo de llegada desconocido: {config.mode}.")
+    concurrency = config.users if config.mode == "closed" else config.max_in_flight
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+    )
+    async with httpx.AsyncClient(
+        base_url=config.base_url,
+        limits=limits,
+        timeout=config.timeout,
+    ) as client:
+        sample = await discover(client, SAMPLE_POSTS)
+        if not (sample["post_ids"] and sample["category_ids"] and sample["tag_ids"]):
+            raise RuntimeError(
+                "El servidor no tiene posts, categorías o tags; genere el dataset "
+                "con `python -m benchmarks run --generate`.",
+            )
+        recorder = Recorder()
+        ctx = LoadContext(
+            client=client,
+            recorder=recorder,
+            rng=random.Random(config.seed),
+            **sample,
+        )
+        loop = _closed_loop if config.mode == "closed" else _open_loop
+        start = perf_counter()
+        deadline = start + config.warmup + config.duration
+        warmup = asyncio.get_running_loop().call_later(config.warmup, recorder.start)
+        try:
+            await loop(ctx, config, flows, deadline)
+        finally:
+            warmup.cancel()
+            recorder.stop()
+        report = recorder.report()
+        if not config.keep_data:
+            # Los posts creados por `share` se eliminan: no cuentan en el informe.
+            for blog_post_id in ctx.created_post_ids:
+                await client.delete(f"{API}/blog_posts/{blog_post_id}")
+    report["created_posts"] = len(ctx.created_post_ids)
+    report["weights"] = {f.name: f.weight for f in flows}
+    return report
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"\n{report['seconds']:.1f} s medidos, "
+        f"{report['dropped_arrivals']} llegadas descartadas, "
+        f"códigos: {report['status_codes']}",
+    )
+    columns = (
+        f"{'total':>8}{'/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'max ms':>9}{'error %':>9}"
+    )
+    for key, title in (("flows", "flujo"), ("requests", "petición")):
+        print(f"\n{title:<40}{columns}")
+        for name, stats in report[key].items():
+            print(
+                f"{name:<40}{stats['count']:>8}{stats['throughput']:>9.1f}"
+                f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+                f"{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}"
+                f"{stats['error_rate'] * 100:>9.2f}",
+            )
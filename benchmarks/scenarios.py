@@ -0,0 +1,431 @@
+"""Escenarios de benchmark: un escenario por método de repositorio y por endpoint
+caliente. Cada escenario recibe un `BenchContext` con una sesión nueva por
+iteración y los IDs de muestra del dataset.
+"""
+
+import random
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.domain.models.announcement import Announcement
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_body import BlogPostBody
+from src.domain.models.category import Category
+from src.domain.models.section import Section
+from src.domain.models.tag import Tag
+from src.domain.schemas.blog_post import BlogPostCreateSchema, BlogPostUpdateSchema
+from src.domain.schemas.section import SectionCreateSchema
+from src.repository.announcement import AnnouncementRepository
+from src.repository.blog_post import BlogPostRepository
+from src.repository.buffered_counter import BufferedCounter
+from src.repository.category import CategoryRepository
+from src.repository.feeds import build_feed, build_sitemap
+from src.repository.section import SectionRepository
+from src.repository.tag import TagRepository
+from src.repository.taxonomy import load_snapshot
+from src.repository.view_stats import write_views
+
+
+@dataclass
+class BenchContext:
+    client: TestClient
+    rng: random.Random
+    post_ids: list[uuid.UUID]
+    category_ids: list[uuid.UUID]
+    tag_ids: list[uuid.UUID]
+    announcement_ids: list[uuid.UUID]
+    section_ids: list[uuid.UUID]
+    session: Session | None = None
+
+    def pick(self, ids: list[uuid.UUID]) -> uuid.UUID:
+        return self.rng.choice(ids)
+
+    @property
+    def blog_posts(self) -> BlogPostRepository:
+        return BlogPostRepository(model=BlogPost, db_session=self.session)
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[BenchContext], object]
+    tags: tuple[str, ...] = field(default_factory=tuple)
+
+
+SCENARIOS: list[Scenario] = []
+
+
+def scenario(name: str, *tags: str):
+    def decorator(func: Callable[[BenchContext], object]):
+        SCENARIOS.append(Scenario(name=name, run=func, tags=tags))
+        return func
+
+    return decorator
+
+
+def _check(response, expected: int = 200):
+    if response.status_code != expected:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+    return response
+
+
+# Repositorios
+
+
+@scenario("repo.blog_post.get_by_id", "read")
+def repo_blog_post_get_by_id(ctx: BenchContext):
+    return ctx.blog_posts.get_by_id(id=ctx.pick(ctx.post_ids))
+
+
+@scenario("repo.blog_post.get_all", "read")
+def repo_blog_post_get_all(ctx: BenchContext):
+    return ctx.blog_posts.get_all(skip=ctx.rng.randrange(1_000), limit=100)
+
+
+@scenario("repo.blog_post.get_many", "read")
+def repo_blog_post_get_many(ctx: BenchContext):
+    return ctx.blog_posts.get_many(ctx.rng.sample(ctx.post_ids, 20))
+
+
+@scenario("repo.blog_post.get_blog_posts_by_category", "read")
+def repo_blog_post_by_category(ctx: BenchContext):
+    return ctx.blog_posts.get_blog_posts_by_category(
+        category_id=ctx.pick(ctx.category_ids),
+        limit=100,
+    )
+
+
+@scenario("repo.blog_post.get_tags_for_blog_post", "read")
+def repo_blog_post_tags(ctx: BenchContext):
+    return list(ctx.blog_posts.get_tags_for_blog_post(ctx.pick(ctx.post_ids)))
+
+
+@scenario("repo.blog_post.get_category_for_blog_post", "read")
+def repo_blog_post_category(ctx: BenchContext):
+    return ctx.blog_posts.get_category_for_blog_post(ctx.pick(ctx.post_ids))
+
+
+@scenario("repo.blog_post.add_remove_tag", "write")
+def repo_blog_post_add_remove_tag(ctx: BenchContext):
+    post_id, tag_id = ctx.pick(ctx.post_ids), ctx.pick(ctx.tag_ids)
+    ctx.blog_posts.add_tag_to_blog_post(post_id, tag_id)
+    ctx.session.flush()
+    ctx.blog_posts.remove_tag_from_blog_post(post_id, tag_id)
+    ctx.session.flush()
+
+
+@scenario("repo.blog_post.assign_category", "write")
+def repo_blog_post_assign_category(ctx: BenchContext):
+    ctx.blog_posts.assign_category_to_blog_post(
+        ctx.pick(ctx.post_ids),
+        ctx.pick(ctx.category_ids),
+    )
+    ctx.session.flush()
+
+
+@scenario("repo.blog_post.create", "write")
+def repo_blog_post_create(ctx: BenchContext):
+    return ctx.blog_posts.create(
+        obj_in=BlogPostCreateSchema(
+            title="Benchmark",
+            content="Contenido " * 50,
+            category_id=ctx.pick(ctx.category_ids),
+        ),
+    )
+
+
+@scenario("repo.blog_post.update", "write")
+def repo_blog_post_update(ctx: BenchContext):
+    db_obj = ctx.blog_posts.get_by_id(id=ctx.pick(ctx.post_ids))
+    return ctx.blog_posts.update(
+        db_obj=db_obj,
+        obj_in=BlogPostUpdateSchema(title="Actualizado"),
+    )
+
+
+@scenario("repo.blog_post.delete", "write")
+def repo_blog_post_delete(ctx: BenchContext):
+    ctx.blog_posts.delete_by_id(id=ctx.pick(ctx.post_ids))
+
+
+@scenario("repo.category.get_all", "read")
+def repo_category_get_all(ctx: BenchContext):
+    return CategoryRepository(model=Category, db_session=ctx.session).get_all()
+
+
+@scenario("repo.taxonomy.load_snapshot", "read")
+def repo_taxonomy_load_snapshot(ctx: BenchContext):
+    # Coste de cada reconstrucción del snapshot (arranque, NOTIFY, caducidad).
+    return load_snapshot(ctx.session, version=1)
+
+
+@scenario("repo.tag.get_all", "read")
+def repo_tag_get_all(ctx: BenchContext):
+    return TagRepository(model=Tag, db_session=ctx.session).get_all()
+
+
+@scenario("repo.section.get_sections_by_blog_post", "read")
+def repo_sections_by_blog_post(ctx: BenchContext):
+    repo = SectionRepository(model=Section, db_session=ctx.session)
+    return repo.get_sections_by_blog_post(ctx.pick(ctx.post_ids))
+
+
+@scenario("repo.section.create", "write")
+def repo_section_create(ctx: BenchContext):
+    repo = SectionRepository(model=Section, db_session=ctx.session)
+    return repo.create(
+        obj_in=SectionCreateSchema(
+            title="Sección",
+            content="Texto " * 40,
+            blog_post_id=ctx.pick(ctx.post_ids),
+        ),
+    )
+
+
+@scenario("repo.section.delete", "write")
+def repo_section_delete(ctx: BenchContext):
+    repo = SectionRepository(model=Section, db_session=ctx.session)
+    repo.delete_by_id(id=ctx.pick(ctx.section_ids))
+
+
+@scenario("repo.announcement.get_announcements_by_blog_post", "read")
+def repo_announcements_by_blog_post(ctx: BenchContext):
+    repo = AnnouncementRepository(model=Announcement, db_session=ctx.session)
+    return repo.get_announcements_by_blog_post(ctx.pick(ctx.post_ids))
+
+
+@scenario("repo.announcement.add_remove_blog_post", "write")
+def repo_announcement_add_remove(ctx: BenchContext):
+    repo = AnnouncementRepository(model=Announcement, db_session=ctx.session)
+    post_id, announcement_id = ctx.pick(ctx.post_ids), ctx.pick(ctx.announcement_ids)
+    repo.add_announcement_to_blog_post(post_id, announcement_id)
+    ctx.session.flush()
+    repo.remove_announcement_from_blog_post(post_id, announcement_id)
+    ctx.session.flush()
+
+
+@scenario("repo.view_stats.flush", "write")
+def repo_view_stats_flush(ctx: BenchContext):
+    # Un vaciado típico: 1000 visitas repartidas entre 200 posts.
+    counter = BufferedCounter("bench_views", write_views)
+    for post_id in ctx.rng.sample(ctx.post_ids, 200):
+        counter.record(post_id, 5)
+    return counter.flush(ctx.session)
+
+
+@scenario("repo.feeds.build_sitemap", "read")
+def repo_feeds_build_sitemap(ctx: BenchContext):
+    # Generación completa (sin caché) de un sitemap con todos los posts.
+    return build_sitemap(ctx.session, 0, 1)
+
+
+@scenario("repo.feeds.build_category_feed", "read")
+def repo_feeds_build_category_feed(ctx: BenchContext):
+    return build_feed(ctx.session, ctx.pick(ctx.category_ids), "rss")
+
+
+# Endpoints
+
+
+@scenario("api.blog_posts.list", "read", "endpoint")
+def api_blog_posts_list(ctx: BenchContext):
+    return _check(ctx.client.get("/v1/api/blog_posts", params={"limit": 20}))
+
+
+@scenario("api.blog_posts.list_total", "read", "endpoint")
+def api_blog_posts_list_total(ctx: BenchContext):
+    return _check(
+        ctx.client.get(
+            "/v1/api/blog_posts",
+            params={"limit": 20, "include_total": True},
+        ),
+    )
+
+
+@scenario("api.blog_posts.list_recent", "read", "endpoint")
+def api_blog_posts_list_recent(ctx: BenchContext):
+    # Último trimestre del dataset (sus fechas acaban el 2025-01-01): con
+    # `blogpost` particionada solo se recorre una partición.
+    return _check(
+        ctx.client.get(
+            "/v1/api/blog_posts",
+            params={
+                "limit": 20,
+                "include_total": True,
+                "created_from": "2024-10-01T00:00:00",
+            },
+        ),
+    )
+
+
+@scenario("api.blog_posts.batch", "read", "endpoint")
+def api_blog_posts_batch(ctx: BenchContext):
+    ids = [str(id) for id in ctx.rng.sample(ctx.post_ids, 20)]
+    return _check(ctx.client.get("/v1/api/blog_posts", params={"ids": ids}))
+
+
+@scenario("api.blog_posts.detail", "read", "endpoint")
+def api_blog_posts_detail(ctx: BenchContext):
+    return _check(ctx.client.get(f"/v1/api/blog_posts/{ctx.pick(ctx.post_ids)}"))
+
+
+@scenario("api.blog_posts.detail_html", "read", "endpoint")
+def api_blog_posts_detail_html(ctx: BenchContext):
+    return _check(
+        ctx.client.get(
+            f"/v1/api/blog_posts/{ctx.pick(ctx.post_ids)}",
+            params={"content_format": "html"},
+        ),
+    )
+
+
+@scenario("api.blog_posts.related", "read", "endpoint")
+def api_blog_posts_related(ctx: BenchContext):
+    return _check(
+        ctx.client.get(f"/v1/api/blog_posts/{ctx.pick(ctx.post_ids)}/related"),
+    )
+
+
+@scenario("api.blog_posts.trending", "read", "endpoint")
+def api_blog_posts_trending(ctx: BenchContext):
+    return _check(ctx.client.get("/v1/api/blog_posts/trending"))
+
+
+@scenario("api.blog_posts.view", "write", "endpoint")
+def api_blog_posts_view(ctx: BenchContext):
+    url = f"/v1/api/blog_posts/{ctx.pick(ctx.post_ids)}/views"
+    return _check(ctx.client.post(url), expected=202)
+
+
+@scenario("api.categories.blog_posts", "read", "endpoint")
+def api_blog_posts_by_category(ctx: BenchContext):
+    category_id = ctx.pick(ctx.category_ids)
+    return _check(
+        ctx.client.get(
+            f"/v1/api/categories/{category_id}/blog_posts",
+            params={"limit": 20},
+        ),
+    )
+
+
+@scenario("api.tags.by_name", "read", "endpoint")
+def api_tags_by_name(ctx: BenchContext):
+    return _check(ctx.client.get("/v1/api/tags", params={"name": "tag-1"}))
+
+
+@scenario("api.blog_posts.tags", "read", "endpoint")
+def api_blog_post_tags(ctx: BenchContext):
+    return _check(ctx.client.get(f"/v1/api/blog_posts/{ctx.pick(ctx.post_ids)}/tags"))
+
+
+@scenario("api.blog_posts.add_remove_tag", "write", "endpoint")
+def api_blog_post_add_remove_tag(ctx: BenchContext):
+    url = f"/v1/api/blog_posts/{ctx.pick(ctx.post_ids)}/tags/{ctx.pick(ctx.tag_ids)}"
+    _check(ctx.client.post(url))
+    return _check(ctx.client.delete(url))
+
+
+@scenario("api.sections.by_blog_post", "read", "endpoint")
+def api_sections_by_blog_post(ctx: BenchContext):
+    return _check(
+        ctx.client.get(f"/v1/api/sections/blog_post/{ctx.pick(ctx.post_ids)}"),
+    )
+
+
+@scenario("api.announcements.by_blog_post", "read", "endpoint")
+def api_announcements_by_blog_post(ctx: BenchContext):
+    return _check(
+        ctx.client.get(f"/v1/api/announcements/blog_post/{ctx.pick(ctx.post_ids)}"),
+    )
+
+
+@scenario("api.announcements.serve", "read", "endpoint")
+def api_announcements_serve(ctx: BenchContext):
+    params = {
+        "blog_post_id": str(ctx.pick(ctx.post_ids)),
+        "category_id": str(ctx.pick(ctx.category_ids)),
+    }
+    response = ctx.client.get("/v1/api/announcements/serve", params=params)
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+    return response
+
+
+@scenario("api.feeds.category", "read", "endpoint")
+def api_feeds_category(ctx: BenchContext):
+    category_id = ctx.pick(ctx.category_ids)
+    return _check(ctx.client.get(f"/feeds/categories/{category_id}/rss.xml"))
+
+
+@scenario("api.sitemap", "read", "endpoint")
+def api_sitemap(ctx: BenchContext):
+    return _check(ctx.client.get("/sitemap.xml"))
+
+
+@scenario("api.blog_posts.create", "write", "endpoint")
+def api_blog_posts_create(ctx: BenchContext):
+    payload = {
+        "title": "Benchmark",
+        "content": "Contenido " * 50,
+        "category_id": str(ctx.pick(ctx.category_ids)),
+    }
+    return _check(ctx.client.post("/v1/api/blog_posts", json=payload), 201)
+
+
+@scenario("api.blog_posts.update", "write", "endpoint")
+def api_blog_posts_update(ctx: BenchContext):
+    url = f"/v1/api/blog_posts/{ctx.pick(ctx.post_ids)}"
+    return _check(ctx.client.put(url, json={"title": "Actualizado"}))
+
+
+def _draft(ctx: BenchContext) -> tuple[str, int, str]:
+    # Versión y texto que el editor ya tiene en el cliente. Los dos escenarios
+    # de autoguardado los leen igual, así que la diferencia es la escritura.
+    blog_post_id = ctx.post_ids[0]
+    version, content = ctx.session.exec(
+        select(BlogPost.version, BlogPostBody.content)
+        .join(BlogPostBody)
+        .where(BlogPost.id == blog_post_id),
+    ).one()
+    return f"/v1/api/blog_posts/{blog_post_id}", version, content
+
+
+@scenario("api.blog_posts.autosave_put", "write", "endpoint")
+def api_blog_posts_autosave_put(ctx: BenchContext):
+    url, version, content = _draft(ctx)
+    return _check(
+        ctx.client.put(
+            url,
+            json={"content": f"{content} Más."},
+            headers={"If-Match": f'"{version}"'},
+        ),
+    )
+
+
+@scenario("api.blog_posts.autosave_patch", "write", "endpoint")
+def api_blog_posts_autosave_patch(ctx: BenchContext):
+    url, version, content = _draft(ctx)
+    delta = [{"retain": len(content)}, {"insert": " Más."}]
+    return _check(
+        ctx.client.patch(
+            url,
+            json={"content": {"delta": delta}},
+            headers={"If-Match": f'"{version}"', "Prefer": "return=minimal"},
+        ),
+        204,
+    )
+
+
+@scenario("api.batch.add_remove_tag", "write", "endpoint")
+def api_batch_add_remove_tag(ctx: BenchContext):
+    # Mismas operaciones que api.blog_posts.add_remove_tag en una sola petición.
+    ids = {"id": str(ctx.pick(ctx.post_ids)), "related_id": str(ctx.pick(ctx.tag_ids))}
+    operations = [
+        {"op": "blog_post.add_tag", **ids},
+        {"op": "blog_post.remove_tag", **ids},
+    ]
+    return _check(ctx.client.post("/v1/api/batch", json={"operations": operations}))
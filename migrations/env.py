@@ -0,0 +1,88 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from src.core.database.engine import create_db_engine
+from src.core.database.metadata import metadata
+from src.core.database.partitioning import PARENT, is_partition, is_partitioned
+from src.core.database.settings import db_settings
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = metadata
+
+
+def _database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or db_settings.database_url
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    # Las particiones de blogpost no son modelos (ver partitioning.py).
+    return not (type_ == "table" and is_partition(name))
+
+
+def _include_object(connection):
+    # Se consulta solo al comparar con los modelos: una consulta antes de
+    # `begin_transaction` abriría la transacción fuera del control de Alembic.
+    partitioned = None
+
+    def include(object, name, type_, reflected, compare_to) -> bool:
+        nonlocal partitioned
+        if type_ != "foreign_key_constraint" or object.referred_table.name != PARENT:
+            return True
+        if partitioned is None:
+            partitioned = is_partitioned(connection)
+        # Con blogpost particionada, las claves foráneas hacia ella son triggers.
+        return not partitioned
+
+    return include
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL de las migraciones sin conectarse a la base de datos."""
+    url = _database_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Aplica las migraciones sobre la base de datos configurada. Se puede pasar
+    una conexión ya abierta en `config.attributes["connection"]` (p. ej. en tests).
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = create_db_engine(_database_url())
+    with engine.connect() as connection:
+        _run(connection)
+    engine.dispose()
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_name=_include_name,
+        include_object=_include_object(connection),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
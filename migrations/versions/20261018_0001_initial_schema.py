@@ -0,0 +1,185 @@
+"""Esquema inicial
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 22:50:33.218700
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "announcement",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("url", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("image_url", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_announcement_id"), "announcement", ["id"], unique=False)
+    op.create_table(
+        "category",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_category_id"), "category", ["id"], unique=False)
+    op.create_index(op.f("ix_category_name"), "category", ["name"], unique=False)
+    op.create_table(
+        "tag",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_tag_id"), "tag", ["id"], unique=False)
+    op.create_index(op.f("ix_tag_name"), "tag", ["name"], unique=True)
+    op.create_table(
+        "blogpost",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("content", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("category_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["category.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_blogpost_id"), "blogpost", ["id"], unique=False)
+    op.create_table(
+        "blogpostannouncementlink",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("blog_post_id", sa.Uuid(), nullable=False),
+        sa.Column("announcement_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["announcement_id"],
+            ["announcement.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["blog_post_id"],
+            ["blogpost.id"],
+        ),
+        sa.PrimaryKeyConstraint("id", "blog_post_id", "announcement_id"),
+        sa.UniqueConstraint(
+            "blog_post_id", "announcement_id", name="uq_blog_post_announcement"
+        ),
+    )
+    op.create_index(
+        op.f("ix_blogpostannouncementlink_announcement_id"),
+        "blogpostannouncementlink",
+        ["announcement_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_blogpostannouncementlink_blog_post_id"),
+        "blogpostannouncementlink",
+        ["blog_post_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_blogpostannouncementlink_id"),
+        "blogpostannouncementlink",
+        ["id"],
+        unique=False,
+    )
+    op.create_table(
+        "blogposttaglink",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("blog_post_id", sa.Uuid(), nullable=False),
+        sa.Column("tag_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["blog_post_id"],
+            ["blogpost.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["tag_id"],
+            ["tag.id"],
+        ),
+        sa.PrimaryKeyConstraint("id", "blog_post_id", "tag_id"),
+        sa.UniqueConstraint("blog_post_id", "tag_id", name="uq_blog_post_tag"),
+    )
+    op.create_index(
+        op.f("ix_blogposttaglink_blog_post_id"),
+        "blogposttaglink",
+        ["blog_post_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_blogposttaglink_id"), "blogposttaglink", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_blogposttaglink_tag_id"), "blogposttaglink", ["tag_id"], unique=False
+    )
+    op.create_table(
+        "section",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("image_url", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("content", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("position_order", sa.Integer(), nullable=False),
+        sa.Column("blog_post_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["blog_post_id"],
+            ["blogpost.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_section_id"), "section", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_section_id"), table_name="section")
+    op.drop_table("section")
+    op.drop_index(op.f("ix_blogposttaglink_tag_id"), table_name="blogposttaglink")
+    op.drop_index(op.f("ix_blogposttaglink_id"), table_name="blogposttaglink")
+    op.drop_index(op.f("ix_blogposttaglink_blog_post_id"), table_name="blogposttaglink")
+    op.drop_table("blogposttaglink")
+    op.drop_index(
+        op.f("ix_blogpostannouncementlink_id"), table_name="blogpostannouncementlink"
+    )
+    op.drop_index(
+        op.f("ix_blogpostannouncementlink_blog_post_id"),
+        table_name="blogpostannouncementlink",
+    )
+    op.drop_index(
+        op.f("ix_blogpostannouncementlink_announcement_id"),
+        table_name="blogpostannouncementlink",
+    )
+    op.drop_table("blogpostannouncementlink")
+    op.drop_index(op.f("ix_blogpost_id"), table_name="blogpost")
+    op.drop_table("blogpost")
+    op.drop_index(op.f("ix_tag_name"), table_name="tag")
+    op.drop_index(op.f("ix_tag_id"), table_name="tag")
+    op.drop_table("tag")
+    op.drop_index(op.f("ix_category_name"), table_name="category")
+    op.drop_index(op.f("ix_category_id"), table_name="category")
+    op.drop_table("category")
+    op.drop_index(op.f("ix_announcement_id"), table_name="announcement")
+    op.drop_table("announcement")
@@ -0,0 +1,57 @@
+"""Columna version para concurrencia optimista
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 23:01:04.991618
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "announcement",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "blogpost",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "blogpostannouncementlink",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "blogposttaglink",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "category",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "section",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "tag", sa.Column("version", sa.Integer(), server_default="1", nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tag", "version")
+    op.drop_column("section", "version")
+    op.drop_column("category", "version")
+    op.drop_column("blogposttaglink", "version")
+    op.drop_column("blogpostannouncementlink", "version")
+    op.drop_column("blogpost", "version")
+    op.drop_column("announcement", "version")
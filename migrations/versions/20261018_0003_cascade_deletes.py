@@ -0,0 +1,60 @@
+"""Borrados en cascada en la base de datos
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 23:02:53.348239
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Nombres por defecto de PostgreSQL; en SQLite las claves foráneas no tienen
+# nombre y la convención permite localizarlas al recrear la tabla.
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+# tabla -> [(columna, tabla referida, ON DELETE)]
+FOREIGN_KEYS = {
+    "blogpost": [("category_id", "category", "RESTRICT")],
+    "section": [("blog_post_id", "blogpost", "CASCADE")],
+    "blogposttaglink": [
+        ("blog_post_id", "blogpost", "CASCADE"),
+        ("tag_id", "tag", "CASCADE"),
+    ],
+    "blogpostannouncementlink": [
+        ("blog_post_id", "blogpost", "CASCADE"),
+        ("announcement_id", "announcement", "CASCADE"),
+    ],
+}
+
+
+def _replace_foreign_keys(*, with_ondelete: bool) -> None:
+    for table, foreign_keys in FOREIGN_KEYS.items():
+        with op.batch_alter_table(
+            table,
+            naming_convention=NAMING_CONVENTION,
+        ) as batch_op:
+            for column, referred_table, ondelete in foreign_keys:
+                name = f"{table}_{column}_fkey"
+                batch_op.drop_constraint(name, type_="foreignkey")
+                batch_op.create_foreign_key(
+                    name,
+                    referred_table,
+                    [column],
+                    ["id"],
+                    ondelete=ondelete if with_ondelete else None,
+                )
+
+
+def upgrade() -> None:
+    _replace_foreign_keys(with_ondelete=True)
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(with_ondelete=False)
@@ -0,0 +1,41 @@
+"""Índice precalculado de posts relacionados
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 23:20:40.339312
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "relatedblogpost",
+        sa.Column("blog_post_id", sa.Uuid(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("related_id", sa.Uuid(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["blog_post_id"], ["blogpost.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["related_id"], ["blogpost.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("blog_post_id", "rank"),
+    )
+    op.create_index(
+        op.f("ix_relatedblogpost_related_id"),
+        "relatedblogpost",
+        ["related_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_relatedblogpost_related_id"), table_name="relatedblogpost")
+    op.drop_table("relatedblogpost")
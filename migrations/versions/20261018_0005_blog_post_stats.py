@@ -0,0 +1,39 @@
+"""Contadores de visitas y tendencia de los blog posts
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 23:28:09.279656
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blogpoststats",
+        sa.Column("blog_post_id", sa.Uuid(), nullable=False),
+        sa.Column("views", sa.Integer(), nullable=False),
+        sa.Column("trending_log", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["blog_post_id"], ["blogpost.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("blog_post_id"),
+    )
+    op.create_index(
+        op.f("ix_blogpoststats_trending_log"),
+        "blogpoststats",
+        ["trending_log"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_blogpoststats_trending_log"), table_name="blogpoststats")
+    op.drop_table("blogpoststats")
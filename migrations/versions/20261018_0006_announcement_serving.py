@@ -0,0 +1,85 @@
+"""Peso de los anuncios, anuncios por categoría e impresiones
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 23:33:54.644977
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "announcementstats",
+        sa.Column("announcement_id", sa.Uuid(), nullable=False),
+        sa.Column("impressions", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["announcement_id"], ["announcement.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("announcement_id"),
+    )
+    op.create_table(
+        "categoryannouncementlink",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("category_id", sa.Uuid(), nullable=False),
+        sa.Column("announcement_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["announcement_id"], ["announcement.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["category_id"], ["category.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "category_id", "announcement_id"),
+        sa.UniqueConstraint(
+            "category_id", "announcement_id", name="uq_category_announcement"
+        ),
+    )
+    op.create_index(
+        op.f("ix_categoryannouncementlink_announcement_id"),
+        "categoryannouncementlink",
+        ["announcement_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_categoryannouncementlink_category_id"),
+        "categoryannouncementlink",
+        ["category_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_categoryannouncementlink_id"),
+        "categoryannouncementlink",
+        ["id"],
+        unique=False,
+    )
+    op.add_column(
+        "announcement",
+        sa.Column("weight", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("announcement", "weight")
+    op.drop_index(
+        op.f("ix_categoryannouncementlink_id"), table_name="categoryannouncementlink"
+    )
+    op.drop_index(
+        op.f("ix_categoryannouncementlink_category_id"),
+        table_name="categoryannouncementlink",
+    )
+    op.drop_index(
+        op.f("ix_categoryannouncementlink_announcement_id"),
+        table_name="categoryannouncementlink",
+    )
+    op.drop_table("categoryannouncementlink")
+    op.drop_table("announcementstats")
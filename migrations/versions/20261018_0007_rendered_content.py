@@ -0,0 +1,48 @@
+"""HTML renderizado del contenido de blog posts y secciones
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 23:39:21.168590
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "blogpost",
+        sa.Column("content_html", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "blogpost",
+        sa.Column(
+            "content_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True
+        ),
+    )
+    op.add_column(
+        "section",
+        sa.Column("content_html", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "section",
+        sa.Column(
+            "content_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("section", "content_hash")
+    op.drop_column("section", "content_html")
+    op.drop_column("blogpost", "content_hash")
+    op.drop_column("blogpost", "content_html")
@@ -0,0 +1,57 @@
+"""Contenido de los blog posts en su propia tabla
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:02:59.489381
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blogpostbody",
+        sa.Column("blog_post_id", sa.Uuid(), nullable=False),
+        sa.Column("content", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("content_html", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "content_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True
+        ),
+        sa.ForeignKeyConstraint(["blog_post_id"], ["blogpost.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("blog_post_id"),
+    )
+    op.execute(
+        "INSERT INTO blogpostbody (blog_post_id, content, content_html, content_hash) "
+        "SELECT id, content, content_html, content_hash FROM blogpost"
+    )
+    with op.batch_alter_table("blogpost") as batch_op:
+        batch_op.drop_column("content")
+        batch_op.drop_column("content_html")
+        batch_op.drop_column("content_hash")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "blogpost",
+        sa.Column("content_hash", sa.VARCHAR(length=64), nullable=True),
+    )
+    op.add_column("blogpost", sa.Column("content_html", sa.VARCHAR(), nullable=True))
+    op.add_column("blogpost", sa.Column("content", sa.VARCHAR(), nullable=True))
+    for column in ("content", "content_html", "content_hash"):
+        op.execute(
+            f"UPDATE blogpost SET {column} = (SELECT {column} FROM blogpostbody "
+            "WHERE blogpostbody.blog_post_id = blogpost.id)"
+        )
+    with op.batch_alter_table("blogpost") as batch_op:
+        batch_op.alter_column("content", existing_type=sa.VARCHAR(), nullable=False)
+    op.drop_table("blogpostbody")
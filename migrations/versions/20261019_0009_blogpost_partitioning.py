@@ -0,0 +1,36 @@
+"""Índice por fecha de alta de los blog posts y particionado opcional
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:10:13.678949
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+from src.core.database.partitioning import (
+    partition_blog_posts,
+    unpartition_blog_posts,
+)
+from src.core.database.settings import db_settings
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_blogpost_created_at", "blogpost", ["created_at"], unique=False)
+    bind = op.get_bind()
+    if db_settings.DB_PARTITION_BLOG_POSTS and bind.dialect.name == "postgresql":
+        partition_blog_posts(bind)
+
+
+def downgrade() -> None:
+    # Sin efecto si la tabla no está particionada.
+    if op.get_bind().dialect.name == "postgresql":
+        unpartition_blog_posts(op.get_bind())
+    op.drop_index("ix_blogpost_created_at", table_name="blogpost")
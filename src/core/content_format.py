@@ -0,0 +1,17 @@
+from enum import StrEnum
+from typing import Annotated
+
+from fastapi import Query
+
+
+class ContentFormat(StrEnum):
+    RAW = "raw"
+    HTML = "html"
+
+
+# Formato de `content` en las lecturas de posts y secciones: `?content_format=html`
+# devuelve el HTML renderizado al escribir (ver src/repository/rendered_content.py).
+ContentFormatQuery = Annotated[
+    ContentFormat,
+    Query(description="`raw` (contenido original) o `html` (HTML seguro)."),
+]
@@ -1,39 +1,174 @@
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from threading import Lock
+from typing import Annotated
 
-from sqlmodel import Session, SQLModel, create_engine
+from fastapi import Depends, Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
 
+from src.core.database.engine import create_db_engine
+from src.core.database.metadata import metadata
 from src.core.database.settings import db_settings
-from src.domain.models.announcement import Announcement  # noqa: F401
-from src.domain.models.blog_post import BlogPost  # noqa: F401
-from src.domain.models.blog_post_announcement_link import (
-    BlogPostAnnouncementLink,  # noqa: F401
-)
-from src.domain.models.blog_post_tag_link import BlogPostTagLink  # noqa: F401
-from src.domain.models.category import Category  # noqa: F401
-from src.domain.models.section import Section  # noqa: F401
-from src.domain.models.tag import Tag  # noqa: F401
-
-username = db_settings.DB_USERNAME
-password = db_settings.DB_PASSWORD
-dbname = db_settings.DB_NAME
-db_port = db_settings.DB_PORT
-db_host = db_settings.DB_HOST
-
-DATABASE_URL = (
-    f"postgresql+psycopg2://{username}:{password}@{db_host}:{db_port}/{dbname}"
-)
-engine = create_engine(DATABASE_URL, echo=True)
-
-
-def init_db():
-    SQLModel.metadata.create_all(engine)
-
-
-def get_session() -> Generator[Session]:
-    with Session(engine) as session:
+from src.core.database.sql_logging import SQLLogger, start_log_listener
+from src.core.metrics import observe_threadpool_wait
+
+# Identificador del advisory lock que serializa `init_db` entre workers.
+SCHEMA_LOCK_ID = 0x66697476
+# Métodos cuyas rutas solo leen: su sesión abre una transacción de solo lectura.
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+_engine: Engine | None = None
+_read_only_engine: Engine | None = None
+_sql_logger: SQLLogger | None = None
+_engine_lock = Lock()
+
+
+def get_engine() -> Engine:
+    """Devuelve el engine de la aplicación, creándolo en el primer uso (normalmente
+    desde el lifespan), de modo que importar la aplicación no abre nada.
+    """
+    global _engine, _sql_logger
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_db_engine(
+                    db_settings.database_url,
+                    pool_size=db_settings.DB_POOL_SIZE,
+                    max_overflow=db_settings.DB_MAX_OVERFLOW,
+                )
+                _sql_logger = SQLLogger(
+                    engine,
+                    sample_rate=db_settings.SQL_LOG_SAMPLE_RATE,
+                    slow_query_ms=db_settings.SQL_SLOW_QUERY_MS,
+                    explain_slow=db_settings.SQL_EXPLAIN_SLOW,
+                    explain_interval=db_settings.SQL_EXPLAIN_INTERVAL,
+                )
+                _sql_logger.install()
+                start_log_listener()
+                _engine = engine
+    return _engine
+
+
+def set_engine(engine: Engine) -> None:
+    """Sustituye el engine de la aplicación (tests, benchmarks). El llamador sigue
+    siendo responsable de cerrarlo; `dispose_engine` no lo toca.
+    """
+    global _engine, _read_only_engine, _sql_logger
+    with _engine_lock:
+        _engine = engine
+        _read_only_engine = None
+        _sql_logger = None
+
+
+def dispose_engine() -> None:
+    """Cierra las conexiones del engine creado por `get_engine`."""
+    global _engine, _read_only_engine, _sql_logger
+    with _engine_lock:
+        if _sql_logger is None:
+            return
+        _sql_logger.remove()
+        _engine.dispose()
+        _engine = None
+        _read_only_engine = None
+        _sql_logger = None
+
+
+def get_read_only_engine() -> Engine:
+    """Variante del engine de la aplicación cuyas transacciones se abren como
+    `READ ONLY` (y opcionalmente `DEFERRABLE`) en PostgreSQL. Comparte el pool
+    con `get_engine()`; las opciones se restablecen al devolver la conexión.
+    En otros dialectos es el mismo engine.
+    """
+    global _read_only_engine
+    engine = get_engine()
+    if _read_only_engine is None:
+        if engine.dialect.name == "postgresql":
+            _read_only_engine = engine.execution_options(
+                postgresql_readonly=True,
+                postgresql_deferrable=db_settings.DB_READ_ONLY_DEFERRABLE,
+            )
+        else:
+            _read_only_engine = engine
+    return _read_only_engine
+
+
+def init_db(engine: Engine | None = None) -> None:
+    """Crea las tablas que falten. En PostgreSQL se serializa con un advisory lock
+    para que varios workers arrancando a la vez no compitan por crear el esquema.
+    """
+    engine = engine or get_engine()
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                {"lock_id": SCHEMA_LOCK_ID},
+            )
+        metadata.create_all(connection)
+
+
+class ReadOnlySessionError(RuntimeError):
+    """Se intentó escribir desde una sesión de solo lectura."""
+
+
+class ReadOnlySession(Session):
+    """Sesión para rutas de solo lectura: cualquier flush con cambios pendientes
+    falla, también en dialectos sin transacciones `READ ONLY`.
+    """
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_read_only_flush(session: Session, flush_context, instances) -> None:
+    if (
+        session.new
+        or session.deleted
+        or any(session.is_modified(instance) for instance in session.dirty)
+    ):
+        raise ReadOnlySessionError(
+            "La sesión es de solo lectura: la ruta no puede modificar datos.",
+        )
+
+
+def writes_on_read[F: Callable](endpoint: F) -> F:
+    """Marca un endpoint `GET`/`HEAD` que necesita escribir: recibe una sesión
+    normal, que se confirma al terminar. Se aplica debajo del decorador de la
+    ruta.
+    """
+    endpoint.writes_on_read = True
+    return endpoint
+
+
+def is_read_only_request(request: Request) -> bool:
+    """Si la ruta de la petición solo lee: su método está en `READ_ONLY_METHODS`
+    y su endpoint no está marcado con `writes_on_read`.
+    """
+    if request.method not in READ_ONLY_METHODS:
+        return False
+    endpoint = getattr(request.scope.get("route"), "endpoint", None)
+    return not getattr(endpoint, "writes_on_read", False)
+
+
+def get_session(request: Request) -> Generator[Session]:
+    """Sesión por petición. Las rutas de lectura (`is_read_only_request`) usan
+    una transacción de solo lectura que no se confirma: al cerrar la sesión la
+    conexión vuelve al pool con un rollback implícito. Las demás confirman al
+    terminar o revierten si hay un error.
+    """
+    observe_threadpool_wait()
+    if db_settings.DB_READ_ONLY_SESSIONS and is_read_only_request(request):
+        with ReadOnlySession(get_read_only_engine()) as session:
+            yield session
+        return
+
+    # Sin expire_on_commit: las entidades devueltas ya reflejan lo escrito (ver
+    # `BaseRepository`) y no deben recargarse si se leen tras el commit.
+    with Session(get_engine(), expire_on_commit=False) as session:
         try:
             yield session
             session.commit()
         except Exception:
             session.rollback()
             raise
+
+
+CurrentSession = Annotated[Session, Depends(get_session)]
@@ -0,0 +1,55 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+from sqlmodel import create_engine
+
+
+def is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    database = parsed.database or ""
+    return parsed.get_backend_name() == "sqlite" and (
+        database in ("", ":memory:") or parsed.query.get("mode") == "memory"
+    )
+
+
+def _configure_sqlite(engine: Engine) -> None:
+    """Ajusta pysqlite para que se comporte como el resto de motores:
+
+    * Activa las claves foráneas (SQLite las ignora por defecto).
+    * Desactiva el BEGIN implícito del driver y lo emite en el evento "begin",
+      sin lo cual los SAVEPOINT (y por tanto el aislamiento de los tests) no
+      funcionan correctamente.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def create_db_engine(url: str, **kwargs: Any) -> Engine:
+    """Crea el engine para `url`. Además de PostgreSQL admite SQLite en fichero
+    (`sqlite:///ruta.db`) o en memoria (`sqlite://`); en memoria se comparte una
+    única conexión para que todas las sesiones vean la misma base de datos.
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_engine(url, **kwargs)
+
+    kwargs.setdefault("connect_args", {}).setdefault("check_same_thread", False)
+    if is_memory_sqlite(url):
+        kwargs.setdefault("poolclass", StaticPool)
+        kwargs.pop("pool_size", None)
+        kwargs.pop("max_overflow", None)
+    engine = create_engine(url, **kwargs)
+    _configure_sqlite(engine)
+    return engine
@@ -0,0 +1,118 @@
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Sentencias de control de transacción: no cuentan como consultas. PostgreSQL
+# abre la transacción de forma implícita en el driver, pero SQLite y los
+# SAVEPOINT (p. ej. el aislamiento de los tests) las emiten explícitamente.
+TRANSACTION_CONTROL = (
+    "BEGIN",
+    "SAVEPOINT",
+    "RELEASE SAVEPOINT",
+    "ROLLBACK TO SAVEPOINT",
+)
+
+
+class QueryStats:
+    """Acumula las sentencias SQL ejecutadas durante una petición (o un bloque).
+    Las sentencias se agrupan por su texto parametrizado ("forma"), que es el
+    mismo para todas las ejecuciones de una consulta con distintos parámetros.
+    """
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Devuelve las formas de sentencia ejecutadas al menos `threshold` veces,
+        típicamente síntoma de un patrón N+1 por relaciones perezosas.
+        """
+        return sorted(
+            (
+                (statement, count)
+                for statement, count in self.statements.items()
+                if count >= threshold
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def summary(self) -> str:
+        lines = [f"{self.count} consultas en {self.duration * 1000:.1f} ms"]
+        for statement, count in sorted(
+            self.statements.items(),
+            key=lambda item: item[1],
+            reverse=True,
+        ):
+            lines.append(f"  {count}x {' '.join(statement.split())}")
+        return "\n".join(lines)
+
+
+# Estadísticas de la petición en curso; el middleware las crea por petición y,
+# al ser un objeto mutable, los hilos del threadpool (que reciben una copia del
+# contexto) acumulan sobre la misma instancia.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats",
+    default=None,
+)
+_collectors: list[QueryStats] = []
+
+# Scope ASGI de la petición en curso, para atribuir las sentencias a su ruta. Es
+# el mismo diccionario que el router completa con "route" al resolver la ruta.
+current_request_scope: ContextVar[dict | None] = ContextVar(
+    "current_request_scope",
+    default=None,
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = perf_counter() - conn.info["query_start_time"].pop()
+    if statement.startswith(TRANSACTION_CONTROL):
+        return
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    for collector in _collectors:
+        collector.record(statement, duration)
+
+
+def install_query_instrumentation() -> None:
+    """Engancha los contadores a los eventos de todos los engines de SQLAlchemy.
+    Es idempotente.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Cuenta todas las sentencias ejecutadas dentro del bloque, en cualquier hilo.
+    Pensado para tests y benchmarks, donde las peticiones se ejecutan de una en una.
+    """
+    install_query_instrumentation()
+    stats = QueryStats()
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
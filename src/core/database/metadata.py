@@ -0,0 +1,24 @@
+"""Importa todos los modelos para que `SQLModel.metadata` describa el esquema
+completo. Lo usan `init_db` y las migraciones de Alembic.
+"""
+
+from sqlmodel import SQLModel
+
+from src.domain.models.announcement import Announcement  # noqa: F401
+from src.domain.models.announcement_stats import AnnouncementStats  # noqa: F401
+from src.domain.models.blog_post import BlogPost  # noqa: F401
+from src.domain.models.blog_post_announcement_link import (
+    BlogPostAnnouncementLink,  # noqa: F401
+)
+from src.domain.models.blog_post_body import BlogPostBody  # noqa: F401
+from src.domain.models.blog_post_stats import BlogPostStats  # noqa: F401
+from src.domain.models.blog_post_tag_link import BlogPostTagLink  # noqa: F401
+from src.domain.models.category import Category  # noqa: F401
+from src.domain.models.category_announcement_link import (
+    CategoryAnnouncementLink,  # noqa: F401
+)
+from src.domain.models.related_blog_post import RelatedBlogPost  # noqa: F401
+from src.domain.models.section import Section  # noqa: F401
+from src.domain.models.tag import Tag  # noqa: F401
+
+metadata = SQLModel.metadata
@@ -0,0 +1,468 @@
+"""Particionado opcional de `blogpost` por rango de `created_at` (PostgreSQL).
+
+Con archivos de decenas de millones de posts casi todo el tráfico va a los más
+recientes. Particionada, `blogpost` es una tabla por periodo de
+`DB_PARTITION_MONTHS` meses y las consultas con filtro de fecha (listados con
+`created_from`/`created_to`, feeds ordenados por `created_at`) solo recorren las
+particiones del rango. Se usa `created_at` y no `date` porque no admite nulos y
+no cambia al editar un post.
+
+PostgreSQL exige que la clave primaria de una tabla particionada incluya la
+columna de partición, así que pasa a ser `(id, created_at)` y las claves
+foráneas hacia `blogpost.id` no pueden existir. Se sustituyen por triggers con
+el mismo efecto: los de las tablas hijas comprueban que el post existe (y lo
+bloquean con `FOR KEY SHARE`, como una clave foránea) y el de `blogpost` aplica
+el `ON DELETE` de cada una al borrar un post.
+
+Por lo mismo, ningún índice único garantiza por sí solo que `id` no se repita
+(`ix_blogpost_id` no puede ser único sin incluir `created_at`). Lo garantiza otro
+trigger de `blogpost`: al insertar un post o cambiar su `id` toma un advisory
+lock de transacción por ese `id`, para serializar las altas concurrentes del
+mismo post, y rechaza la fila con `unique_violation` si el `id` ya existe en
+alguna partición. Cuesta una búsqueda en `ix_blogpost_id` de cada partición por
+alta.
+
+Las particiones se crean por adelantado (`DB_PARTITIONS_AHEAD` periodos) al
+arrancar la aplicación y con:
+
+    python -m src.core.database.partitioning ensure
+
+Las filas fuera de todo periodo van a la partición por defecto y se mueven a la
+suya cuando esta se crea. La migración 0009 particiona la tabla si
+`DB_PARTITION_BLOG_POSTS=true`; una base de datos ya migrada se convierte en
+uno u otro sentido con los comandos `partition` y `unpartition`.
+"""
+
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.database.settings import db_settings
+
+logger = logging.getLogger(__name__)
+
+PARENT = "blogpost"
+PARTITION_KEY = "created_at"
+PARTITION_PREFIX = f"{PARENT}_p"
+DEFAULT_PARTITION = f"{PARENT}_default"
+CHECK_FUNCTION = f"{PARENT}_check_reference"
+DELETE_FUNCTION = f"{PARENT}_delete_references"
+DELETE_TRIGGER = f"{PARENT}_delete_references"
+UNIQUE_ID_FUNCTION = f"{PARENT}_check_unique_id"
+UNIQUE_ID_TRIGGER = f"{PARENT}_check_unique_id"
+
+# `pg_constraint.confdeltype` -> cláusula `ON DELETE`.
+ON_DELETE = {
+    "a": "NO ACTION",
+    "r": "RESTRICT",
+    "c": "CASCADE",
+    "n": "SET NULL",
+    "d": "SET DEFAULT",
+}
+
+
+@dataclass(frozen=True)
+class Reference:
+    """Columna de otra tabla que apunta a `blogpost.id`."""
+
+    table: str
+    column: str
+    on_delete: str  # Código de `confdeltype`
+
+    @property
+    def trigger(self) -> str:
+        return f"{PARENT}_ref_{self.column}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.exec_driver_sql(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = to_regclass(%(table)s))",
+        {"table": PARENT},
+    ).scalar()
+
+
+def is_partition(table_name: str) -> bool:
+    return table_name == DEFAULT_PARTITION or table_name.startswith(PARTITION_PREFIX)
+
+
+def period_start(moment: datetime, months: int) -> datetime:
+    """Inicio del periodo de `months` meses que contiene `moment`; los periodos
+    se alinean con el año (con `months=3`, trimestres naturales).
+    """
+    index = (moment.year * 12 + moment.month - 1) // months * months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def add_months(start: datetime, months: int) -> datetime:
+    index = start.year * 12 + start.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(start: datetime) -> str:
+    return f"{PARTITION_PREFIX}{start:%Y_%m}"
+
+
+def _require_postgresql(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        raise ValueError(
+            "El particionado de blogpost solo está disponible en PostgreSQL.",
+        )
+
+
+def _foreign_key_references(connection: Connection) -> list[tuple[str, Reference]]:
+    rows = connection.exec_driver_sql(
+        "SELECT con.conname, con.conrelid::regclass::text, att.attname, "
+        "con.confdeltype FROM pg_constraint con JOIN pg_attribute att "
+        "ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1] "
+        "WHERE con.contype = 'f' AND con.confrelid = to_regclass(%(table)s) "
+        "ORDER BY 2, 3",
+        {"table": PARENT},
+    )
+    return [
+        (name, Reference(table, column, action)) for name, table, column, action in rows
+    ]
+
+
+def _trigger_references(connection: Connection) -> list[Reference]:
+    rows = connection.exec_driver_sql(
+        "SELECT tgrelid::regclass::text, tgargs FROM pg_trigger "
+        "WHERE tgfoid = to_regproc(%(function)s) ORDER BY 1, 2",
+        {"function": CHECK_FUNCTION},
+    )
+    references = []
+    for table, args in rows:
+        column, action = bytes(args).decode().split("\x00")[:2]
+        references.append(Reference(table, column, action))
+    return references
+
+
+def _rebuild(connection: Connection, *, partitioned: bool, ranges=()) -> None:
+    """Vuelve a crear `blogpost` (particionada o no) con sus columnas, índices y
+    claves foráneas, y copia las filas. `ranges` son las particiones a crear.
+    """
+    inspector = inspect(connection)
+    indexes = inspector.get_indexes(PARENT)
+    foreign_keys = inspector.get_foreign_keys(PARENT)
+    old = f"{PARENT}_old"
+    connection.exec_driver_sql(f"ALTER TABLE {PARENT} RENAME TO {old}")
+    partition_by = f" PARTITION BY RANGE ({PARTITION_KEY})" if partitioned else ""
+    connection.exec_driver_sql(
+        f"CREATE TABLE {PARENT} (LIKE {old} INCLUDING DEFAULTS "
+        f"INCLUDING CONSTRAINTS INCLUDING STORAGE){partition_by}",
+    )
+    if partitioned:
+        for start, end in ranges:
+            _create_partition(connection, start, end)
+        connection.exec_driver_sql(
+            f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT",
+        )
+    connection.exec_driver_sql(f"INSERT INTO {PARENT} SELECT * FROM {old}")
+    connection.exec_driver_sql(f"DROP TABLE {old}")
+
+    key = f"id, {PARTITION_KEY}" if partitioned else "id"
+    connection.exec_driver_sql(
+        f"ALTER TABLE {PARENT} ADD CONSTRAINT {PARENT}_pkey PRIMARY KEY ({key})",
+    )
+    for index in indexes:
+        unique = "UNIQUE " if index["unique"] else ""
+        columns = ", ".join(index["column_names"])
+        connection.exec_driver_sql(
+            f"CREATE {unique}INDEX {index['name']} ON {PARENT} ({columns})",
+        )
+    for fk in foreign_keys:
+        on_delete = fk["options"].get("ondelete")
+        connection.exec_driver_sql(
+            f"ALTER TABLE {PARENT} ADD CONSTRAINT {fk['name']} "
+            f"FOREIGN KEY ({', '.join(fk['constrained_columns'])}) "
+            f"REFERENCES {fk['referred_table']} ({', '.join(fk['referred_columns'])})"
+            + (f" ON DELETE {on_delete}" if on_delete else ""),
+        )
+
+
+def _create_reference_triggers(
+    connection: Connection,
+    references: list[Reference],
+) -> None:
+    # `%%`: el driver interpreta `%` como marcador de parámetro.
+    connection.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION {CHECK_FUNCTION}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            ref uuid;
+        BEGIN
+            EXECUTE format('SELECT ($1).%%I', TG_ARGV[0]) INTO ref USING NEW;
+            IF ref IS NULL THEN
+                RETURN NEW;
+            END IF;
+            PERFORM 1 FROM {PARENT} WHERE id = ref FOR KEY SHARE;
+            IF NOT FOUND THEN
+                RAISE foreign_key_violation USING MESSAGE = format(
+                    'insert or update on table "%%s" violates foreign key: '
+                    'key (%%s)=(%%s) is not present in table "{PARENT}"',
+                    TG_TABLE_NAME, TG_ARGV[0], ref
+                );
+            END IF;
+            RETURN NEW;
+        END
+        $$
+        """,
+    )
+    statements = []
+    for ref in references:
+        if ref.on_delete == "c":
+            statements.append(f"DELETE FROM {ref.table} WHERE {ref.column} = OLD.id;")
+        elif ref.on_delete == "n":
+            statements.append(
+                f"UPDATE {ref.table} SET {ref.column} = NULL "
+                f"WHERE {ref.column} = OLD.id;",
+            )
+        else:
+            statements.append(
+                f"IF EXISTS (SELECT 1 FROM {ref.table} WHERE {ref.column} = OLD.id) "
+                "THEN RAISE foreign_key_violation USING MESSAGE = format("
+                f'\'update or delete on table "{PARENT}" violates foreign key '
+                f'on table "{ref.table}"\'); END IF;',
+            )
+    # Un UPDATE que cambia `created_at` de periodo mueve la fila de partición
+    # (DELETE + INSERT): si el post sigue existiendo no se toca nada.
+    body = "\n            ".join(statements)
+    connection.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION {DELETE_FUNCTION}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM {PARENT} WHERE id = OLD.id) THEN
+                RETURN NULL;
+            END IF;
+            {body}
+            RETURN NULL;
+        END
+        $$
+        """,
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER {DELETE_TRIGGER} AFTER DELETE ON {PARENT} "
+        f"FOR EACH ROW EXECUTE FUNCTION {DELETE_FUNCTION}()",
+    )
+    for ref in references:
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER {ref.trigger} BEFORE INSERT OR UPDATE OF {ref.column} "
+            f"ON {ref.table} FOR EACH ROW "
+            f"EXECUTE FUNCTION {CHECK_FUNCTION}('{ref.column}', '{ref.on_delete}')",
+        )
+
+
+def _create_unique_id_trigger(connection: Connection) -> None:
+    # El `UPDATE` que mueve una fila de partición la inserta en la nueva después
+    # de borrarla de la anterior: el post ya no se ve y no cuenta como repetido.
+    connection.exec_driver_sql(
+        f"""
+        CREATE OR REPLACE FUNCTION {UNIQUE_ID_FUNCTION}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND NEW.id = OLD.id THEN
+                RETURN NEW;
+            END IF;
+            PERFORM pg_advisory_xact_lock(
+                '{PARENT}'::regclass::oid::integer, hashtext(NEW.id::text)
+            );
+            IF EXISTS (SELECT 1 FROM {PARENT} WHERE id = NEW.id) THEN
+                RAISE unique_violation USING MESSAGE = format(
+                    'duplicate key value violates unique constraint on "%%s": '
+                    'key (id)=(%%s) already exists',
+                    '{PARENT}', NEW.id
+                );
+            END IF;
+            RETURN NEW;
+        END
+        $$
+        """,
+    )
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER {UNIQUE_ID_TRIGGER} BEFORE INSERT OR UPDATE OF id "
+        f"ON {PARENT} FOR EACH ROW EXECUTE FUNCTION {UNIQUE_ID_FUNCTION}()",
+    )
+
+
+def partition_blog_posts(
+    connection: Connection,
+    *,
+    months: int | None = None,
+    ahead: int | None = None,
+    now: datetime | None = None,
+) -> None:
+    """Convierte `blogpost` en una tabla particionada por `created_at`, con una
+    partición por periodo desde el post más antiguo hasta `ahead` periodos
+    después del actual. Reescribe la tabla: bloquea los posts mientras dura.
+    """
+    _require_postgresql(connection)
+    if is_partitioned(connection):
+        return
+    months = months or db_settings.DB_PARTITION_MONTHS
+    ahead = db_settings.DB_PARTITIONS_AHEAD if ahead is None else ahead
+    current = period_start(now or datetime.now(), months)
+    oldest = connection.exec_driver_sql(
+        f"SELECT min({PARTITION_KEY}) FROM {PARENT}",
+    ).scalar()
+    start = period_start(oldest, months) if oldest is not None else current
+    last = add_months(current, ahead * months)
+    ranges = []
+    while start <= last:
+        ranges.append((start, add_months(start, months)))
+        start = ranges[-1][1]
+
+    references = []
+    for name, reference in _foreign_key_references(connection):
+        connection.exec_driver_sql(
+            f"ALTER TABLE {reference.table} DROP CONSTRAINT {name}",
+        )
+        references.append(reference)
+    _rebuild(connection, partitioned=True, ranges=ranges)
+    _create_unique_id_trigger(connection)
+    _create_reference_triggers(connection, references)
+
+
+def unpartition_blog_posts(connection: Connection) -> None:
+    """Vuelve a una tabla `blogpost` sin particionar y restaura las claves
+    foráneas que la apuntan.
+    """
+    _require_postgresql(connection)
+    if not is_partitioned(connection):
+        return
+    references = _trigger_references(connection)
+    for ref in references:
+        connection.exec_driver_sql(f"DROP TRIGGER {ref.trigger} ON {ref.table}")
+    connection.exec_driver_sql(f"DROP TRIGGER {DELETE_TRIGGER} ON {PARENT}")
+    connection.exec_driver_sql(f"DROP FUNCTION {DELETE_FUNCTION}()")
+    connection.exec_driver_sql(f"DROP FUNCTION {CHECK_FUNCTION}()")
+    connection.exec_driver_sql(f"DROP TRIGGER {UNIQUE_ID_TRIGGER} ON {PARENT}")
+    connection.exec_driver_sql(f"DROP FUNCTION {UNIQUE_ID_FUNCTION}()")
+    _rebuild(connection, partitioned=False)
+    for ref in references:
+        connection.exec_driver_sql(
+            f"ALTER TABLE {ref.table} ADD FOREIGN KEY ({ref.column}) "
+            f"REFERENCES {PARENT} (id) ON DELETE {ON_DELETE[ref.on_delete]}",
+        )
+
+
+def _create_partition(connection: Connection, start: datetime, end: datetime) -> None:
+    connection.exec_driver_sql(
+        f"CREATE TABLE {partition_name(start)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')",
+    )
+
+
+def _partitions(connection: Connection) -> set[str]:
+    return set(
+        connection.exec_driver_sql(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = to_regclass(%(table)s)",
+            {"table": PARENT},
+        ).scalars(),
+    )
+
+
+def ensure_partitions(
+    connection: Connection,
+    *,
+    months: int | None = None,
+    ahead: int | None = None,
+    now: datetime | None = None,
+) -> list[str]:
+    """Crea las particiones que falten del periodo actual y los `ahead`
+    siguientes. Las filas de esos periodos que estén en la partición por defecto
+    se mueven a la nueva. Devuelve los nombres de las particiones creadas.
+    """
+    if not is_partitioned(connection):
+        return []
+    months = months or db_settings.DB_PARTITION_MONTHS
+    ahead = db_settings.DB_PARTITIONS_AHEAD if ahead is None else ahead
+    existing = _partitions(connection)
+    created = []
+    start = period_start(now or datetime.now(), months)
+    for _ in range(ahead + 1):
+        end = add_months(start, months)
+        name = partition_name(start)
+        if name not in existing:
+            _create_partition_with_default_rows(connection, start, end)
+            created.append(name)
+        start = end
+    return created
+
+
+def _create_partition_with_default_rows(
+    connection: Connection,
+    start: datetime,
+    end: datetime,
+) -> None:
+    bounds = {"start": start, "end": end}
+    in_range = f"{PARTITION_KEY} >= %(start)s AND {PARTITION_KEY} < %(end)s"
+    has_rows = connection.exec_driver_sql(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})",
+        bounds,
+    ).scalar()
+    if not has_rows:
+        _create_partition(connection, start, end)
+        return
+    # PostgreSQL no crea una partición cuyo rango tiene filas en la de por
+    # defecto. Se separa (sin ella no hereda el trigger de borrado, así que
+    # sacar las filas no borra nada en cascada), se crea la nueva y las filas
+    # vuelven a entrar por la tabla padre.
+    connection.exec_driver_sql(
+        f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}",
+    )
+    _create_partition(connection, start, end)
+    connection.exec_driver_sql(
+        f"INSERT INTO {PARENT} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}",
+        bounds,
+    )
+    connection.exec_driver_sql(
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}",
+        bounds,
+    )
+    connection.exec_driver_sql(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    )
+
+
+def ensure_blog_post_partitions(engine: Engine) -> list[str]:
+    """`ensure_partitions` en su propia transacción; lo llama el arranque. Un
+    error no impide arrancar: mientras falten particiones, las filas nuevas van
+    a la partición por defecto.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    try:
+        with engine.begin() as connection:
+            created = ensure_partitions(connection)
+    except SQLAlchemyError:
+        logger.exception("No se pudieron crear las particiones de blogpost")
+        return []
+    if created:
+        logger.info("Particiones de blogpost creadas: %s", ", ".join(created))
+    return created
+
+
+if __name__ == "__main__":
+    from src.core.database.config import get_engine
+
+    commands = {
+        "partition": partition_blog_posts,
+        "unpartition": unpartition_blog_posts,
+        "ensure": ensure_partitions,
+    }
+    if len(sys.argv) != 2 or sys.argv[1] not in commands:
+        sys.exit(f"Uso: python -m {__spec__.name} {{{','.join(commands)}}}")
+    with get_engine().begin() as connection:
+        result = commands[sys.argv[1]](connection)
+    if result:
+        print(f"Particiones creadas: {', '.join(result)}")
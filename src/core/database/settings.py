@@ -2,13 +2,55 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    DB_NAME: str
-    DB_PASSWORD: str
-    DB_USERNAME: str
-    DB_HOST: str
-    DB_PORT: str
+    # URL completa de SQLAlchemy; si se define, tiene prioridad sobre DB_*.
+    # Ejemplos: "sqlite:///./fitvana.db", "sqlite://" (en memoria). Sin ninguna
+    # de las dos configuraciones no se arranca: SQLite se usa solo si se pide.
+    DATABASE_URL: str | None = None
+
+    DB_NAME: str | None = None
+    DB_PASSWORD: str | None = None
+    DB_USERNAME: str | None = None
+    DB_HOST: str | None = None
+    DB_PORT: str | None = None
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # El esquema se gestiona con Alembic (`alembic upgrade head`). Activar solo en
+    # desarrollo para crear al arrancar las tablas que falten.
+    DB_CREATE_ALL: bool = False
+    # Las peticiones GET/HEAD usan transacciones de solo lectura sin commit.
+    # DEFERRABLE solo tiene efecto con aislamiento SERIALIZABLE en PostgreSQL.
+    DB_READ_ONLY_SESSIONS: bool = True
+    DB_READ_ONLY_DEFERRABLE: bool = False
+
+    # Particionado de blogpost por created_at, solo PostgreSQL (ver
+    # src/core/database/partitioning.py). Lo aplica la migración 0009.
+    DB_PARTITION_BLOG_POSTS: bool = False
+    DB_PARTITION_MONTHS: int = 3
+    DB_PARTITIONS_AHEAD: int = 2
+
+    # Registro de SQL (ver src/core/database/sql_logging.py)
+    SQL_LOG_SAMPLE_RATE: float = 0.0
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_EXPLAIN_SLOW: bool = False
+    SQL_EXPLAIN_INTERVAL: float = 60.0
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @property
+    def database_url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
+        parts = ("DB_NAME", "DB_PASSWORD", "DB_USERNAME", "DB_HOST", "DB_PORT")
+        missing = [name for name in parts if getattr(self, name) is None]
+        if missing:
+            raise ValueError(
+                f"Configure DATABASE_URL o las variables {', '.join(missing)}.",
+            )
+        return (
+            f"postgresql+psycopg2://{self.DB_USERNAME}:{self.DB_PASSWORD}"
+            f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        )
+
 
 db_settings = Settings()
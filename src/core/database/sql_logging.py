@@ -0,0 +1,198 @@
+"""Registro de SQL muestreado y log de consultas lentas.
+
+Sustituye a `echo=True`: en lugar de formatear y escribir cada sentencia de forma
+síncrona, solo se registra una muestra configurable (nivel DEBUG) y las
+sentencias que superan el umbral de lentitud (nivel WARNING, con parámetros,
+duración y ruta). Los registros pasan por un `QueueHandler`, así que el hilo que
+ejecuta la consulta nunca espera a la escritura; un `QueueListener` los vuelca
+en segundo plano.
+
+Opcionalmente, para las sentencias lentas se captura su plan con `EXPLAIN`
+(solo PostgreSQL) en un hilo aparte y con una conexión propia, de modo que ni
+la petición espera ni su transacción se ve afectada.
+"""
+
+import atexit
+import logging
+import queue
+import random
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from time import monotonic, perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.database.instrumentation import (
+    TRANSACTION_CONTROL,
+    current_request_scope,
+)
+
+logger = logging.getLogger(__name__)
+
+# Opción de ejecución que excluye una sentencia del registro (p. ej. el EXPLAIN).
+SKIP_OPTION = "sql_logging_skip"
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def _current_route() -> str:
+    scope = current_request_scope.get()
+    if scope is None:
+        return "-"
+    route = getattr(scope.get("route"), "path_format", scope.get("path", "-"))
+    return f"{scope.get('method', '')} {route}".strip()
+
+
+def _shorten(value: object, max_length: int) -> str:
+    text = repr(value)
+    if len(text) > max_length:
+        return text[:max_length] + "…"
+    return text
+
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+class SQLLogger:
+    """Engancha el registro de SQL a un engine concreto."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        sample_rate: float = 0.0,
+        slow_query_ms: float = 200.0,
+        explain_slow: bool = False,
+        explain_interval: float = 60.0,
+        max_params_length: int = 500,
+    ):
+        self.engine = engine
+        self.sample_rate = sample_rate
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.explain_slow = explain_slow and engine.dialect.name == "postgresql"
+        self.explain_interval = explain_interval
+        self.max_params_length = max_params_length
+        self._explained: dict[str, float] = {}
+        self._explain_lock = Lock()
+        self._explain_executor: ThreadPoolExecutor | None = None
+
+    def install(self) -> None:
+        if self.sample_rate:
+            logger.setLevel(logging.DEBUG)
+        if not event.contains(self.engine, "before_cursor_execute", self._before):
+            event.listen(self.engine, "before_cursor_execute", self._before)
+            event.listen(self.engine, "after_cursor_execute", self._after)
+
+    def remove(self) -> None:
+        """Desengancha los eventos y espera a los EXPLAIN pendientes."""
+        if event.contains(self.engine, "before_cursor_execute", self._before):
+            event.remove(self.engine, "before_cursor_execute", self._before)
+            event.remove(self.engine, "after_cursor_execute", self._after)
+        if self._explain_executor is not None:
+            self._explain_executor.shutdown(wait=True)
+            self._explain_executor = None
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_logging_start", []).append(perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration = perf_counter() - conn.info["sql_logging_start"].pop()
+        if context is not None and context.execution_options.get(SKIP_OPTION):
+            return
+        if statement.startswith(TRANSACTION_CONTROL):
+            return
+
+        if duration >= self.slow_query_seconds:
+            logger.warning(
+                "Consulta lenta (%.1f ms) en %s: %s | parámetros: %s",
+                duration * 1000,
+                _current_route(),
+                _one_line(statement),
+                _shorten(parameters, self.max_params_length),
+            )
+            if self.explain_slow and not executemany:
+                self._schedule_explain(statement, parameters)
+        elif self.sample_rate and random.random() < self.sample_rate:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "%.2f ms en %s: %s | parámetros: %s",
+                    duration * 1000,
+                    _current_route(),
+                    _one_line(statement),
+                    _shorten(parameters, self.max_params_length),
+                )
+
+    def _schedule_explain(self, statement: str, parameters) -> None:
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        # Como mucho un EXPLAIN por forma de sentencia cada `explain_interval` s.
+        now = monotonic()
+        with self._explain_lock:
+            last = self._explained.get(statement)
+            if last is not None and now - last < self.explain_interval:
+                return
+            self._explained[statement] = now
+            if self._explain_executor is None:
+                self._explain_executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="sql-explain",
+                )
+        self._explain_executor.submit(self._explain, statement, parameters)
+
+    def _explain(self, statement: str, parameters) -> None:
+        try:
+            with self.engine.connect() as connection:
+                connection = connection.execution_options(**{SKIP_OPTION: True})
+                rows = connection.exec_driver_sql(
+                    f"EXPLAIN {statement}",
+                    parameters or None,
+                ).all()
+                connection.rollback()
+        except SQLAlchemyError as exc:
+            logger.info(
+                "No se pudo obtener el plan de %s: %s",
+                _one_line(statement),
+                exc,
+            )
+            return
+        plan = "\n".join(row[0] for row in rows)
+        logger.warning("Plan de la consulta lenta %s:\n%s", _one_line(statement), plan)
+
+
+_listener: QueueListener | None = None
+
+
+def start_log_listener(handler: logging.Handler | None = None) -> None:
+    """Hace que los registros de SQL se escriban desde un hilo de fondo.
+    Es idempotente.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"),
+        )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_log_listener)
+
+
+def stop_log_listener() -> None:
+    """Vacía la cola pendiente y detiene el hilo de escritura."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
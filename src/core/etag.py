@@ -0,0 +1,68 @@
+"""Precondiciones HTTP basadas en la columna `version` de las entidades.
+
+La ETag de una entidad es su versión entre comillas (`"3"`). Las rutas de
+actualización aceptan `If-Match` con ese valor para aplicar el cambio solo si
+nadie ha modificado la entidad desde que el cliente la leyó.
+
+Los documentos generados (sitemap, feeds) usan GET condicional: `If-None-Match`
+e `If-Modified-Since` (ver `is_not_modified`).
+"""
+
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Annotated
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from sqlmodel import SQLModel
+
+
+def etag_for(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, entity: SQLModel) -> None:
+    response.headers["ETag"] = etag_for(entity.version)
+
+
+def get_if_match_version(if_match: str | None = Header(None)) -> int | None:
+    """Versión esperada según `If-Match`, o None si no se envía o es `*`.
+    Se acepta la forma débil `W/"N"`: la compresión de respuestas marca como
+    débil la ETag de la representación comprimida, pero la versión es la misma.
+    Una ETag múltiple o mal formada nunca coincide con una versión, por lo que
+    la precondición falla directamente con `412`.
+    """
+    if if_match is None:
+        return None
+    value = if_match.strip()
+    if value == "*":
+        return None
+    value = value.removeprefix("W/")
+    if len(value) > 2 and value[0] == value[-1] == '"' and value[1:-1].isdigit():
+        return int(value[1:-1])
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="La cabecera If-Match no corresponde a ninguna versión.",
+    )
+
+
+IfMatchVersion = Annotated[int | None, Depends(get_if_match_version)]
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """Indica si el cliente ya tiene la representación actual (respuesta `304`).
+    Si envía `If-None-Match` se ignora `If-Modified-Since` (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified <= since
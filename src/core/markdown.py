@@ -0,0 +1,156 @@
+"""Conversión del contenido (Markdown) de posts y secciones a HTML seguro.
+
+Solo se admite un subconjunto de Markdown: títulos (`#`), párrafos, listas
+(`-`, `*`, `+`, `1.`), citas (`>`), bloques de código (```), separadores
+(`---`), código en línea, negrita, cursiva, enlaces e imágenes.
+
+El HTML es seguro por construcción: todo el texto se escapa antes de aplicar el
+formato, así que el HTML que venga en el contenido se muestra como texto y las
+únicas etiquetas de la salida son las que genera este módulo. Los enlaces e
+imágenes solo aceptan URLs relativas o con esquema `http`, `https` o `mailto`.
+"""
+
+import hashlib
+import re
+from html import escape, unescape
+
+# Versión del formato de salida. Cambiarla invalida los hashes guardados y hace
+# que el backfill vuelva a renderizar todo el contenido.
+RENDERER_VERSION = 1
+
+_ALLOWED_SCHEMES = {"http", "https", "mailto"}
+_SCHEME = re.compile(r"^([a-z][a-z0-9+.-]*):")
+# Caracteres de control y espacios que los navegadores ignoran dentro de una URL
+# (`java\tscript:`).
+_URL_IGNORED = re.compile(r"[\x00-\x20\x7f]+")
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^```")
+_RULE = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})\s*$")
+_QUOTE = re.compile(r"^>\s?(.*)$")
+_UNORDERED_ITEM = re.compile(r"^[-*+]\s+(.*)$")
+_ORDERED_ITEM = re.compile(r"^\d{1,9}[.)]\s+(.*)$")
+
+# El marcador de posición delimita fragmentos ya renderizados (código, enlaces)
+# para que el formato posterior no los toque.
+_PLACEHOLDER = re.compile("\x00(\\d+)\x00")
+_CODE_SPAN = re.compile(r"(`+)(.+?)\1", re.DOTALL)
+_IMAGE = re.compile(r"!\[([^\]]*)\]\(([^)\s]+)\)")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_STRONG = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*|__(?=\S)(.+?)(?<=\S)__")
+_EMPHASIS = re.compile(r"\*(?=\S)(.+?)(?<=\S)\*|(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)")
+
+
+def content_hash(content: str) -> str:
+    """Hash del contenido junto con la versión del renderizador."""
+    return hashlib.sha256(f"{RENDERER_VERSION}\n{content}".encode()).hexdigest()
+
+
+def safe_url(url: str) -> str | None:
+    """URL lista para un atributo `href`/`src`, o None si su esquema no se admite."""
+    url = _URL_IGNORED.sub("", unescape(url))
+    scheme = _SCHEME.match(url.lower())
+    if scheme is not None and scheme.group(1) not in _ALLOWED_SCHEMES:
+        return None
+    return escape(url, quote=True)
+
+
+def _render_inline(text: str) -> str:
+    fragments: list[str] = []
+
+    def keep(html: str) -> str:
+        fragments.append(html)
+        return f"\x00{len(fragments) - 1}\x00"
+
+    def code(match: re.Match) -> str:
+        return keep(f"<code>{escape(match.group(2).strip())}</code>")
+
+    def image(match: re.Match) -> str:
+        url = safe_url(match.group(2))
+        if url is None:
+            return match.group(1)
+        alt = _PLACEHOLDER.sub("", match.group(1))
+        return keep(f'<img src="{url}" alt="{alt}">')
+
+    def link(match: re.Match) -> str:
+        label = _format(match.group(1))
+        url = safe_url(match.group(2))
+        if url is None:
+            return label
+        return keep(f'<a href="{url}" rel="nofollow noopener">{label}</a>')
+
+    text = _CODE_SPAN.sub(code, text.replace("\x00", ""))
+    text = escape(text, quote=True)
+    text = _IMAGE.sub(image, text)
+    text = _LINK.sub(link, text)
+    text = _format(text)
+    return _PLACEHOLDER.sub(lambda match: fragments[int(match.group(1))], text)
+
+
+def _format(text: str) -> str:
+    text = _STRONG.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", text)
+    return _EMPHASIS.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", text)
+
+
+def render_markdown(content: str) -> str:
+    """Convierte `content` a HTML. Nunca devuelve etiquetas ni atributos que no
+    genere el propio renderizador.
+    """
+    lines = content.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    blocks: list[str] = []
+    paragraph: list[str] = []
+
+    def close_paragraph() -> None:
+        if paragraph:
+            blocks.append(f"<p>{_render_inline('\n'.join(paragraph))}</p>")
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped:
+            close_paragraph()
+            i += 1
+        elif _FENCE.match(stripped):
+            close_paragraph()
+            code: list[str] = []
+            i += 1
+            while i < len(lines) and not _FENCE.match(lines[i].strip()):
+                code.append(lines[i])
+                i += 1
+            i += 1
+            blocks.append(f"<pre><code>{escape('\n'.join(code))}</code></pre>")
+        elif heading := _HEADING.match(stripped):
+            close_paragraph()
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{_render_inline(heading.group(2))}</h{level}>")
+            i += 1
+        elif _RULE.match(stripped):
+            close_paragraph()
+            blocks.append("<hr>")
+            i += 1
+        elif _QUOTE.match(stripped):
+            close_paragraph()
+            quoted: list[str] = []
+            while i < len(lines) and (quote := _QUOTE.match(lines[i].strip())):
+                quoted.append(quote.group(1))
+                i += 1
+            inner = render_markdown("\n".join(quoted))
+            blocks.append(f"<blockquote>{inner}</blockquote>")
+        elif _UNORDERED_ITEM.match(stripped) or _ORDERED_ITEM.match(stripped):
+            close_paragraph()
+            item_pattern = (
+                _UNORDERED_ITEM if _UNORDERED_ITEM.match(stripped) else _ORDERED_ITEM
+            )
+            tag = "ul" if item_pattern is _UNORDERED_ITEM else "ol"
+            items: list[str] = []
+            while i < len(lines) and (item := item_pattern.match(lines[i].strip())):
+                items.append(f"<li>{_render_inline(item.group(1))}</li>")
+                i += 1
+            blocks.append(f"<{tag}>{''.join(items)}</{tag}>")
+        else:
+            paragraph.append(stripped)
+            i += 1
+    close_paragraph()
+    return "\n".join(blocks)
@@ -0,0 +1,317 @@
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from time import perf_counter
+
+import anyio.to_thread
+from starlette.routing import BaseRoute
+
+# Instante (perf_counter) en que el middleware de métricas admitió la petición.
+# Se propaga a los hilos del threadpool porque anyio copia el contexto.
+request_started_at: ContextVar[float | None] = ContextVar(
+    "request_started_at",
+    default=None,
+)
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PREREGISTERED_STATUSES = (200, 201, 204, 400, 404, 409, 412, 422, 429, 500)
+UNMATCHED_ROUTE = "<unmatched>"
+# El método lo elige el cliente: fuera de estos se agrupa en `OTHER_METHOD` para
+# que no pueda crear series sin límite.
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+OTHER_METHOD = "OTHER"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Serie monótona. Solo debe modificarse desde el bucle de eventos."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        yield f"{name}{labels} {_format_value(self.value)}"
+
+
+class Gauge(Counter):
+    """Serie que puede subir y bajar."""
+
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Histogram:
+    """Histograma con cubetas fijas. `observe` es seguro entre hilos."""
+
+    __slots__ = ("_lock", "bounds", "count", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        prefix = labels[:-1] + "," if labels else "{"
+        cumulative = 0
+        for bound, count in zip((*self.bounds, math.inf), self.counts, strict=True):
+            cumulative += count
+            yield f'{name}_bucket{prefix}le="{_format_value(bound)}"}} {cumulative}'
+        yield f"{name}_sum{labels} {_format_value(self.sum)}"
+        yield f"{name}_count{labels} {self.count}"
+
+
+class MetricFamily:
+    """Conjunto de series de una métrica con los mismos nombres de etiqueta.
+    Cada combinación de etiquetas se crea una única vez y se reutiliza.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        label_names: tuple[str, ...],
+        factory: Callable[[], Counter | Histogram],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.label_names = label_names
+        self._factory = factory
+        self._children: dict[tuple[str, ...], tuple[str, Counter | Histogram]] = {}
+
+    def labels(self, *values: str):
+        """Devuelve (creándola si no existe) la serie para esos valores de etiqueta."""
+        child = self._children.get(values)
+        if child is None:
+            rendered = ",".join(
+                f'{key}="{_escape(value)}"'
+                for key, value in zip(self.label_names, values, strict=True)
+            )
+            child = (f"{{{rendered}}}" if rendered else "", self._factory())
+            self._children[values] = child
+        return child[1]
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        for labels, series in list(self._children.values()):
+            yield from series.samples(self.name, labels)
+
+
+class MetricsRegistry:
+    """Registro de métricas del proceso con salida en formato de texto Prometheus."""
+
+    def __init__(self):
+        self._families: dict[str, MetricFamily] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self._families:
+            raise ValueError(f"Métrica duplicada: '{family.name}'.")
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        return self._register(
+            MetricFamily(name, documentation, "counter", labels, Counter),
+        )
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        return self._register(
+            MetricFamily(name, documentation, "gauge", labels, Gauge),
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        return self._register(
+            MetricFamily(
+                name,
+                documentation,
+                "histogram",
+                labels,
+                lambda: Histogram(buckets),
+            ),
+        )
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Registra una función que actualiza gauges justo antes de cada scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines: list[str] = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        lines.append("")
+        return "\n".join(lines)
+
+
+class _RouteSeries:
+    """Series precreadas de una combinación (método, plantilla de ruta)."""
+
+    __slots__ = ("_requests", "latency", "method", "route", "statuses")
+
+    def __init__(self, metrics: "HttpMetrics", method: str, route: str):
+        self.method = method
+        self.route = route
+        self._requests = metrics.requests
+        self.latency = metrics.latency.labels(method, route)
+        self.statuses = {
+            status: metrics.requests.labels(method, route, str(status))
+            for status in PREREGISTERED_STATUSES
+        }
+
+    def observe(self, status: int, duration: float) -> None:
+        counter = self.statuses.get(status)
+        if counter is None:
+            counter = self._requests.labels(self.method, self.route, str(status))
+            self.statuses[status] = counter
+        counter.inc()
+        self.latency.observe(duration)
+
+
+class HttpMetrics:
+    """Métricas HTTP por plantilla de ruta (no por ruta cruda).
+    Las series de cada ruta se registran al arrancar con `register_routes`,
+    de forma que el camino caliente solo hace búsquedas en diccionarios.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.requests = registry.counter(
+            "http_requests_total",
+            "Peticiones HTTP por método, plantilla de ruta y código de estado.",
+            ("method", "route", "status"),
+        )
+        self.latency = registry.histogram(
+            "http_request_duration_seconds",
+            "Latencia de las peticiones HTTP por método y plantilla de ruta.",
+            ("method", "route"),
+        )
+        self.in_progress = registry.gauge(
+            "http_requests_in_progress",
+            "Peticiones HTTP en curso.",
+        ).labels()
+        self.threadpool_wait = registry.histogram(
+            "http_threadpool_queue_seconds",
+            "Tiempo desde la admisión de la petición hasta que un hilo del "
+            "threadpool empieza a ejecutar su dependencia de sesión.",
+        ).labels()
+        self._by_route: dict[str, dict[str, _RouteSeries]] = {}
+        self._unmatched: dict[str, _RouteSeries] = {}
+
+    def register_routes(self, routes: Iterable[BaseRoute]) -> None:
+        """Precrea las series de todas las rutas de la aplicación."""
+        for route in routes:
+            path = getattr(route, "path_format", None)
+            methods = getattr(route, "methods", None)
+            if path is None or not methods:
+                continue
+            by_method = self._by_route.setdefault(path, {})
+            for method in methods:
+                by_method[method] = _RouteSeries(self, method, path)
+
+    def series_for(self, route: BaseRoute | None, method: str) -> _RouteSeries:
+        # `path_format` es el mismo objeto str en cada petición: la búsqueda
+        # usa su hash cacheado y no crea objetos nuevos.
+        path = getattr(route, "path_format", None)
+        by_method = self._by_route.get(path) if path is not None else None
+        series = by_method.get(method) if by_method else None
+        if series is None:
+            if method not in KNOWN_METHODS:
+                method = OTHER_METHOD
+            series = self._unmatched.get(method)
+            if series is None:
+                series = _RouteSeries(self, method, UNMATCHED_ROUTE)
+                self._unmatched[method] = series
+        return series
+
+
+def observe_threadpool_wait() -> None:
+    """Registra cuánto esperó la petición actual hasta ejecutarse en el threadpool.
+    Debe llamarse desde código síncrono que FastAPI ejecuta en el threadpool.
+    """
+    started = request_started_at.get()
+    if started is not None:
+        http_metrics.threadpool_wait.observe(perf_counter() - started)
+
+
+def _collect_threadpool_stats() -> None:
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        return
+    statistics = limiter.statistics()
+    _threadpool_capacity.set(limiter.total_tokens)
+    _threadpool_in_use.set(statistics.borrowed_tokens)
+    _threadpool_waiting.set(statistics.tasks_waiting)
+
+
+registry = MetricsRegistry()
+http_metrics = HttpMetrics(registry)
+
+_threadpool_capacity = registry.gauge(
+    "threadpool_capacity",
+    "Hilos máximos del threadpool por defecto de anyio.",
+).labels()
+_threadpool_in_use = registry.gauge(
+    "threadpool_in_use",
+    "Hilos del threadpool ocupados en este momento.",
+).labels()
+_threadpool_waiting = registry.gauge(
+    "threadpool_tasks_waiting",
+    "Tareas esperando un hilo libre del threadpool.",
+).labels()
+registry.add_collector(_collect_threadpool_stats)
@@ -0,0 +1,349 @@
+import gzip
+import zlib
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Protocol
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+# Tipos de contenido que no se comprimen: ya están comprimidos o deben
+# entregarse sin retardo (server-sent events).
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "image/",
+    "audio/",
+    "video/",
+    "application/zip",
+    "application/gzip",
+    "application/zstd",
+    "application/octet-stream",
+)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class Codec(Protocol):
+    name: str
+    default_level: int
+
+    def compress(self, data: bytes, level: int) -> bytes: ...
+
+    def stream(self, level: int) -> StreamCompressor: ...
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH,
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class GzipCodec:
+    name = "gzip"
+    default_level = 6
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def stream(self, level: int) -> StreamCompressor:
+        return _GzipStream(level)
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class BrotliCodec:
+    name = "br"
+    default_level = 4
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        return brotli.compress(data, quality=level)
+
+    def stream(self, level: int) -> StreamCompressor:
+        return _BrotliStream(level)
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK,
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdCodec:
+    name = "zstd"
+    default_level = 3
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+
+    def stream(self, level: int) -> StreamCompressor:
+        return _ZstdStream(level)
+
+
+def available_codecs() -> dict[str, Codec]:
+    """Devuelve los códecs disponibles en orden de preferencia del servidor.
+    zstd y brotli solo se ofrecen si sus paquetes están instalados.
+    """
+    codecs: dict[str, Codec] = {}
+    if zstandard is not None:
+        codecs["zstd"] = ZstdCodec()
+    if brotli is not None:
+        codecs["br"] = BrotliCodec()
+    codecs["gzip"] = GzipCodec()
+    return codecs
+
+
+def negotiate_encoding(accept_encoding: str, supported: tuple[str, ...]) -> str | None:
+    """Elige la codificación a partir de la cabecera `Accept-Encoding`.
+
+    Respeta los valores `q` del cliente (incluido `*` y `q=0`). En caso de empate
+    gana el orden de preferencia de `supported`. Devuelve None si el cliente no
+    acepta ninguna de las codificaciones soportadas.
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token] = quality
+
+    wildcard = weights.get("*", 0.0)
+    best: str | None = None
+    best_quality = 0.0
+    for encoding in supported:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Middleware ASGI que comprime las respuestas con zstd, brotli o gzip
+    según la negociación de `Accept-Encoding`.
+
+    **Parámetros**
+
+    * `minimum_size`: Tamaño mínimo (bytes) del cuerpo para comprimirlo.
+    * `levels`: Nivel por defecto de cada codificación, p. ej. `{"gzip": 6}`.
+    * `route_levels`: Niveles por prefijo de ruta; gana el prefijo más largo.
+    * `compress_in_thread`: Si es True, los cuerpos de al menos
+      `thread_min_size` bytes se comprimen en un hilo de trabajo para no
+      bloquear el bucle de eventos.
+
+    Las respuestas en streaming se comprimen trozo a trozo (con un flush por
+    trozo) una vez superado el umbral; las que ya traen `Content-Encoding` o
+    tienen un tipo de contenido excluido se dejan pasar sin cambios.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        levels: Mapping[str, int] | None = None,
+        route_levels: Mapping[str, Mapping[str, int]] | None = None,
+        compress_in_thread: bool = True,
+        thread_min_size: int = 64 * 1024,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codecs = available_codecs()
+        self.levels = {name: codec.default_level for name, codec in self.codecs.items()}
+        self.levels.update(levels or {})
+        self.route_levels = sorted(
+            (route_levels or {}).items(),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.compress_in_thread = compress_in_thread
+        self.thread_min_size = thread_min_size
+        self._negotiate = lru_cache(maxsize=256)(self._negotiate_uncached)
+
+    def _negotiate_uncached(self, accept_encoding: str) -> str | None:
+        return negotiate_encoding(accept_encoding, tuple(self.codecs))
+
+    def level_for(self, path: str, encoding: str) -> int:
+        """Devuelve el nivel de compresión configurado para una ruta y codificación."""
+        for prefix, levels in self.route_levels:
+            if path.startswith(prefix) and encoding in levels:
+                return levels[encoding]
+        return self.levels[encoding]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = self._negotiate(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            middleware=self,
+            codec=self.codecs[encoding],
+            level=self.level_for(scope["path"], encoding),
+            send=send,
+        )
+        await self.app(scope, receive, responder.send)
+
+    async def run(self, func: Callable[[bytes], bytes], data: bytes) -> bytes:
+        """Ejecuta la compresión en línea o en un hilo según el tamaño del cuerpo."""
+        if self.compress_in_thread and len(data) >= self.thread_min_size:
+            return await anyio.to_thread.run_sync(func, data)
+        return func(data)
+
+
+class _CompressionResponder:
+    """Estado de compresión de una única respuesta.
+    Retiene `http.response.start` hasta saber si el cuerpo supera el umbral.
+    """
+
+    def __init__(
+        self,
+        *,
+        middleware: CompressionMiddleware,
+        codec: Codec,
+        level: int,
+        send: Send,
+    ):
+        self.middleware = middleware
+        self.codec = codec
+        self.level = level
+        self._send = send
+        self.initial_message: Message | None = None
+        self.passthrough = False
+        self.pending: list[bytes] = []
+        self.pending_size = 0
+        self.stream: StreamCompressor | None = None
+
+    async def _flush_start(self) -> None:
+        if self.initial_message is not None:
+            message, self.initial_message = self.initial_message, None
+            await self._send(message)
+
+    def _compressed_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        headers["Content-Encoding"] = self.codec.name
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # La representación comprimida no es idéntica byte a byte.
+            headers["ETag"] = f"W/{etag}"
+        return headers
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.initial_message = message
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is not None:
+            data = b""
+            if body:
+                data = await self.middleware.run(self.stream.compress, body)
+            if not more_body:
+                data += self.stream.finish()
+            await self._send(
+                {"type": "http.response.body", "body": data, "more_body": more_body},
+            )
+            return
+
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if more_body and self.pending_size < self.middleware.minimum_size:
+            return
+
+        payload = b"".join(self.pending)
+        self.pending.clear()
+
+        if self.pending_size < self.middleware.minimum_size:
+            # Respuesta pequeña: no compensa comprimirla.
+            await self._flush_start()
+            await self._send(
+                {"type": "http.response.body", "body": payload, "more_body": False},
+            )
+            return
+
+        headers = self._compressed_headers()
+        if not more_body:
+            compressed = await self.middleware.run(self._compress, payload)
+            headers["Content-Length"] = str(len(compressed))
+            await self._flush_start()
+            await self._send(
+                {"type": "http.response.body", "body": compressed, "more_body": False},
+            )
+            return
+
+        # Respuesta en streaming que ya superó el umbral.
+        del headers["Content-Length"]
+        self.stream = self.codec.stream(self.level)
+        data = await self.middleware.run(self.stream.compress, payload)
+        await self._flush_start()
+        await self._send(
+            {"type": "http.response.body", "body": data, "more_body": True},
+        )
+
+    def _compress(self, data: bytes) -> bytes:
+        return self.codec.compress(data, self.level)
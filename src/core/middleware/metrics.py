@@ -0,0 +1,43 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import HttpMetrics, http_metrics, request_started_at
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que registra número de peticiones, códigos de estado,
+    latencia y peticiones en curso por plantilla de ruta.
+
+    La plantilla se obtiene de `scope["route"]`, que FastAPI rellena al
+    resolver la ruta, por lo que `/v1/api/tags/{tag_id}` es una única serie
+    independientemente del ID solicitado.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HttpMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        token = request_started_at.set(start)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_progress.dec()
+            request_started_at.reset(token)
+            series = self.metrics.series_for(scope.get("route"), scope["method"])
+            series.observe(status_code, perf_counter() - start)
@@ -0,0 +1,80 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.database.instrumentation import (
+    QueryStats,
+    current_query_stats,
+    current_request_scope,
+    install_query_instrumentation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryAccountingMiddleware:
+    """Middleware ASGI que cuenta las consultas SQL y el tiempo de base de datos
+    de cada petición.
+
+    * Añade las cabeceras `X-DB-Query-Count` y `X-DB-Time-Ms` si `expose_headers`.
+    * Registra en el log (nivel DEBUG) los totales de cada petición.
+    * Emite un WARNING cuando una misma forma de sentencia se ejecuta al menos
+      `n_plus_one_threshold` veces en la misma petición (posible N+1).
+    * Publica el scope de la petición para que el log de SQL indique la ruta.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        expose_headers: bool = True,
+        n_plus_one_threshold: int = 5,
+    ):
+        self.app = app
+        self.expose_headers = expose_headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+        install_query_instrumentation()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        scope_token = current_request_scope.set(scope)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.duration * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_query_stats.reset(token)
+            current_request_scope.reset(scope_token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        if not stats.count:
+            return
+        route = getattr(scope.get("route"), "path_format", scope["path"])
+        logger.debug(
+            "%s %s: %d consultas, %.2f ms en BD",
+            scope["method"],
+            route,
+            stats.count,
+            stats.duration * 1000,
+        )
+        for statement, count in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(
+                "Posible N+1 en %s %s: %d ejecuciones de %s",
+                scope["method"],
+                route,
+                count,
+                " ".join(statement.split()),
+            )
@@ -0,0 +1,50 @@
+import json
+import math
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.rate_limit import RateLimiter
+
+
+class RateLimitMiddleware:
+    """Middleware ASGI que aplica el `RateLimiter` antes de resolver la ruta, de
+    modo que una petición rechazada no llega a ocupar un hilo ni una conexión.
+    Responde `429` con `Retry-After` en segundos.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.limiter.check(scope)
+        if result is None or result[1].allowed:
+            await self.app(scope, receive, send)
+            return
+
+        group, decision = result
+        retry_after = max(1, math.ceil(decision.retry_after))
+        body = json.dumps(
+            {
+                "detail": "Demasiadas peticiones. Inténtelo de nuevo en "
+                f"{retry_after} segundos.",
+            },
+            ensure_ascii=False,
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                    (b"x-ratelimit-group", group.encode()),
+                ],
+            },
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,28 @@
+import uuid
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import Query, Response
+
+from src.core.settings import app_settings
+
+if TYPE_CHECKING:
+    from src.repository.counting import TotalCount
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+# Presente ("true") cuando el total es una estimación o un mínimo ("más de N").
+TOTAL_COUNT_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+# Lectura por lotes en los listados: `?ids=a&ids=b`.
+BatchIds = Annotated[
+    list[uuid.UUID] | None,
+    Query(
+        max_length=app_settings.BATCH_MAX_IDS,
+        description="IDs a obtener en una sola consulta; ignora skip y limit.",
+    ),
+]
+
+
+def set_total_count(response: Response, total: "TotalCount") -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total.value)
+    if not total.exact:
+        response.headers[TOTAL_COUNT_ESTIMATED_HEADER] = "true"
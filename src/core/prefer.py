@@ -0,0 +1,34 @@
+"""Preferencia `return` de la cabecera `Prefer` (RFC 7240).
+
+Con `Prefer: return=minimal` las rutas PATCH responden `204` sin cuerpo, solo
+con la nueva `ETag`: el autoguardado del editor no necesita el post completo
+después de cada cambio.
+"""
+
+from typing import Annotated
+
+from fastapi import Depends, Header, Response, status
+
+from src.core.etag import etag_for
+
+PREFERENCE_APPLIED_HEADER = "Preference-Applied"
+
+
+def get_return_minimal(prefer: str | None = Header(None)) -> bool:
+    if prefer is None:
+        return False
+    preferences = {item.strip().lower() for item in prefer.split(",")}
+    return "return=minimal" in preferences
+
+
+ReturnMinimal = Annotated[bool, Depends(get_return_minimal)]
+
+
+def minimal_response(version: int) -> Response:
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={
+            "ETag": etag_for(version),
+            PREFERENCE_APPLIED_HEADER: "return=minimal",
+        },
+    )
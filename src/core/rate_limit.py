@@ -0,0 +1,293 @@
+"""Limitación de peticiones por grupo de rutas y cliente mediante token buckets.
+
+Cada grupo (p. ej. "write", "list", "read") tiene un cubo por cliente con
+capacidad `burst` que se rellena a `rate` tokens por segundo. Una petición
+consume `cost` tokens; las consultas de listado cuestan más cuanto mayor es su
+`limit`, de modo que pedir `limit=100000` agota el cubo en lugar de ocupar el
+pool de conexiones.
+
+El estado vive en un backend intercambiable: `InMemoryBackend` (por proceso) o
+`RedisBackend` (compartido entre procesos; requiere el paquete `redis`).
+"""
+
+import logging
+import math
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Protocol
+from urllib.parse import parse_qsl
+
+from fastapi.routing import APIRoute
+from starlette.routing import BaseRoute, Match
+from starlette.types import Scope
+
+from src.core.metrics import registry
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - dependencia opcional
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+# Filas de `limit` incluidas en el coste base de una petición de listado.
+LIST_COST_PAGE = 100
+
+_decisions = registry.counter(
+    "rate_limit_decisions_total",
+    "Decisiones del limitador de peticiones por grupo de rutas.",
+    ("group", "decision"),
+)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    rate: float
+    burst: float
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class RateLimitBackend(Protocol):
+    async def consume(
+        self,
+        key: str,
+        cost: float,
+        rule: RateLimitRule,
+    ) -> RateLimitDecision:
+        """Consume `cost` tokens del cubo `key` si hay suficientes."""
+        ...
+
+
+class InMemoryBackend:
+    """Cubos en memoria del proceso. Solo se usa desde el bucle de eventos, por lo
+    que no necesita bloqueos. Conserva como mucho `max_keys` cubos, descartando
+    los menos usados recientemente.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def consume(
+        self,
+        key: str,
+        cost: float,
+        rule: RateLimitRule,
+    ) -> RateLimitDecision:
+        now = monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = rule.burst
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            tokens, updated = bucket
+            tokens = min(rule.burst, tokens + (now - updated) * rule.rate)
+            self._buckets.move_to_end(key)
+
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            return RateLimitDecision(allowed=True)
+        self._buckets[key] = (tokens, now)
+        return RateLimitDecision(allowed=False, retry_after=(cost - tokens) / rule.rate)
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+
+# Token bucket atómico en Redis. Usa el reloj del servidor para que todos los
+# procesos compartan la misma referencia temporal.
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBackend:
+    """Cubos compartidos en Redis, para limitar de forma global con varios workers."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        if redis_asyncio is None:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requiere el paquete 'redis' instalado.",
+            )
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def consume(
+        self,
+        key: str,
+        cost: float,
+        rule: RateLimitRule,
+    ) -> RateLimitDecision:
+        allowed, tokens = await self._script(
+            keys=[self.prefix + key],
+            args=[rule.rate, rule.burst, cost],
+        )
+        if allowed:
+            return RateLimitDecision(allowed=True)
+        return RateLimitDecision(
+            allowed=False,
+            retry_after=(cost - float(tokens)) / rule.rate,
+        )
+
+
+class _LimitedRoute:
+    __slots__ = ("group", "route", "weighted")
+
+    def __init__(self, route: BaseRoute, group: str, weighted: bool):
+        self.route = route
+        self.group = group
+        self.weighted = weighted
+
+
+def classify_route(route: APIRoute, method: str) -> tuple[str, bool]:
+    """Grupo por defecto de una ruta: escrituras, listados (rutas con parámetro
+    `limit`, cuyo coste se pondera) o lecturas individuales.
+    """
+    if method in WRITE_METHODS:
+        return "write", False
+    query_params = {param.name for param in route.dependant.query_params}
+    if "limit" in query_params:
+        return "list", True
+    return "read", False
+
+
+class RateLimiter:
+    """Decide si una petición se admite. Las rutas limitadas se registran al
+    arrancar con `register_routes`; las demás (p. ej. `/health`, `/metrics`) no
+    se limitan nunca.
+    """
+
+    def __init__(
+        self,
+        rules: dict[str, RateLimitRule],
+        backend: RateLimitBackend,
+        *,
+        trust_forwarded_for: bool = False,
+        route_groups: dict[str, str] | None = None,
+        path_prefix: str = "/v1/api",
+    ):
+        self.enabled = True
+        self.rules = rules
+        self.backend = backend
+        self.trust_forwarded_for = trust_forwarded_for
+        self.route_groups = route_groups or {}
+        self.path_prefix = path_prefix
+        self._routes_by_method: dict[str, list[_LimitedRoute]] = {}
+        self._counters = {
+            (group, decision): _decisions.labels(group, decision)
+            for group in rules
+            for decision in ("allowed", "limited")
+        }
+
+    def register_routes(self, routes: Iterable[BaseRoute]) -> None:
+        for route in routes:
+            if not isinstance(route, APIRoute):
+                continue
+            if not route.path_format.startswith(self.path_prefix):
+                continue
+            for method in route.methods:
+                group, weighted = classify_route(route, method)
+                group = self.route_groups.get(route.path_format, group)
+                if group not in self.rules:
+                    continue
+                self._routes_by_method.setdefault(method, []).append(
+                    _LimitedRoute(route, group, weighted),
+                )
+
+    def match(self, scope: Scope) -> _LimitedRoute | None:
+        for limited in self._routes_by_method.get(scope["method"], ()):
+            match, _ = limited.route.matches(scope)
+            if match is Match.FULL:
+                return limited
+        return None
+
+    def client_key(self, scope: Scope) -> str:
+        # Solo la dirección del cliente: una cabecera sin validar (p. ej. una API
+        # key) permitiría estrenar un cubo en cada petición.
+        if self.trust_forwarded_for:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return "ip:" + value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    def cost(self, scope: Scope, limited: _LimitedRoute, rule: RateLimitRule) -> float:
+        if not limited.weighted:
+            return 1.0
+        for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1")):
+            if name == "limit":
+                try:
+                    limit = int(value)
+                except ValueError:
+                    break
+                # Una petición nunca cuesta más que el cubo lleno, para que sea
+                # posible (aunque caro) pedir páginas grandes.
+                return float(min(max(1, math.ceil(limit / LIST_COST_PAGE)), rule.burst))
+        return 1.0
+
+    async def check(self, scope: Scope) -> tuple[str, RateLimitDecision] | None:
+        """Devuelve el grupo y la decisión, o None si la ruta no está limitada."""
+        if not self.enabled:
+            return None
+        limited = self.match(scope)
+        if limited is None:
+            return None
+        rule = self.rules[limited.group]
+        key = f"{limited.group}:{self.client_key(scope)}"
+        try:
+            decision = await self.backend.consume(
+                key,
+                self.cost(scope, limited, rule),
+                rule,
+            )
+        except Exception:
+            # Si el backend compartido falla se admite la petición: es preferible
+            # perder temporalmente el límite que rechazar todo el tráfico.
+            logger.exception("Error del backend de rate limiting")
+            decision = RateLimitDecision(allowed=True)
+        outcome = "allowed" if decision.allowed else "limited"
+        self._counters[(limited.group, outcome)].inc()
+        return limited.group, decision
+
+
+def create_rate_limiter(settings) -> RateLimiter:
+    """Construye el limitador a partir de `AppSettings`."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        backend: RateLimitBackend = RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    else:
+        backend = InMemoryBackend()
+    return RateLimiter(
+        {
+            group: RateLimitRule(rate=rule["rate"], burst=rule["burst"])
+            for group, rule in settings.RATE_LIMIT_RULES.items()
+        },
+        backend,
+        trust_forwarded_for=settings.RATE_LIMIT_TRUST_FORWARDED_FOR,
+        route_groups=settings.RATE_LIMIT_ROUTE_GROUPS,
+    )
@@ -0,0 +1,103 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AppSettings(BaseSettings):
+    """Configuración general de la aplicación (middlewares, rendimiento, etc.).
+    Todos los valores tienen un valor por defecto y pueden sobrescribirse
+    mediante variables de entorno o el fichero `.env`.
+    """
+
+    # Compresión de respuestas
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    # Niveles por ruta: {"/v1/api/blog_posts": {"gzip": 9, "br": 6, "zstd": 10}}
+    COMPRESSION_ROUTE_LEVELS: dict[str, dict[str, int]] = {}
+    COMPRESSION_IN_THREAD: bool = True
+    COMPRESSION_THREAD_MIN_SIZE: int = 64 * 1024
+
+    # Métricas Prometheus
+    METRICS_ENABLED: bool = True
+
+    # Contabilidad de consultas SQL por petición
+    QUERY_ACCOUNTING_ENABLED: bool = True
+    QUERY_ACCOUNTING_HEADERS: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Calentamiento al arrancar (ver src/core/startup.py)
+    STARTUP_WARMUP: bool = True
+    STARTUP_WARMUP_CONNECTIONS: int = 5
+
+    # Rate limiting por grupo de rutas y cliente (ver src/core/rate_limit.py)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" o "redis"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    # Tokens por segundo y capacidad del cubo de cada grupo
+    RATE_LIMIT_RULES: dict[str, dict[str, float]] = {
+        "write": {"rate": 5, "burst": 30},
+        "list": {"rate": 20, "burst": 100},
+        "read": {"rate": 100, "burst": 300},
+    }
+    # Grupo por plantilla de ruta, p. ej. {"/v1/api/tags": "read"}
+    RATE_LIMIT_ROUTE_GROUPS: dict[str, str] = {}
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+
+    # Totales de los listados con include_total (ver src/repository/counting.py)
+    TOTAL_COUNT_CAP: int = 10_000
+    TOTAL_COUNT_CACHE_SECONDS: float = 30.0
+    # Máximo de IDs por lectura por lotes (?ids=)
+    BATCH_MAX_IDS: int = 100
+    # Máximo de operaciones por petición a /v1/api/batch
+    BATCH_MAX_OPERATIONS: int = 50
+
+    # Posts relacionados (ver src/repository/related_posts.py)
+    RELATED_POSTS_K: int = 10
+    # Recalcular los vecinos afectados tras confirmar cambios de tags
+    RELATED_POSTS_INCREMENTAL: bool = True
+
+    # Contadores de visitas y tendencia (ver src/repository/view_stats.py). El
+    # vaciado periódico se aplica también a las impresiones de anuncios.
+    VIEW_FLUSH_ENABLED: bool = True
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5.0
+    # Máximo de posts distintos con visitas pendientes por proceso
+    VIEW_BUFFER_MAX_POSTS: int = 50_000
+    TRENDING_HALF_LIFE_HOURS: float = 24.0
+
+    # Snapshot de anuncios por post (ver src/repository/announcement_snapshot.py).
+    # Máximo retraso con el que un proceso ve los cambios hechos en otro.
+    ANNOUNCEMENT_SNAPSHOT_TTL_SECONDS: float = 60.0
+
+    # HTML del contenido de posts y secciones (ver src/repository/rendered_content.py).
+    # Procesos del pool de renderizado; 0 renderiza en el proceso de la API.
+    CONTENT_RENDER_WORKERS: int = 2
+    # Tamaño total (caracteres) a partir del cual se renderiza en el pool
+    CONTENT_RENDER_POOL_MIN_CHARS: int = 20_000
+
+    # Sitemap y feeds RSS/Atom (ver src/repository/feeds.py)
+    PUBLIC_SITE_URL: str = "http://localhost:3000"
+    # Ruta pública de un post en el sitio; admite {blog_post_id}
+    PUBLIC_BLOG_POST_PATH: str = "/blog/{blog_post_id}"
+    # URL pública de esta API, para enlazar los sitemaps desde el índice
+    PUBLIC_API_URL: str = "http://localhost:8000"
+    FEED_TITLE: str = "Fitvana"
+    FEED_ITEMS: int = 50
+    # URLs por sitemap (de media); el protocolo admite hasta 50000
+    SITEMAP_URLS_PER_FILE: int = 10_000
+    # Máximo retraso con el que un proceso ve los cambios hechos en otro
+    FEED_CACHE_TTL_SECONDS: float = 300.0
+
+    # Snapshot de categorías y tags (ver src/repository/taxonomy.py)
+    # Canal de NOTIFY por el que se avisan los cambios entre procesos
+    TAXONOMY_NOTIFY_CHANNEL: str = "taxonomy_changed"
+    # Escuchar el canal (solo PostgreSQL); sin escucha solo caduca por tiempo
+    TAXONOMY_LISTEN_ENABLED: bool = True
+    # Máximo retraso con el que un proceso ve los cambios hechos en otro si la
+    # notificación se pierde
+    TAXONOMY_SNAPSHOT_TTL_SECONDS: float = 300.0
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+
+app_settings = AppSettings()
@@ -0,0 +1,133 @@
+"""Arranque de la aplicación: medición de tiempos y fase de calentamiento.
+
+El calentamiento se ejecuta en el lifespan, antes de aceptar tráfico, para que
+las primeras peticiones tras un escalado no paguen el coste de abrir conexiones,
+configurar los mappers del ORM ni compilar las sentencias más frecuentes. Los
+módulos que mantienen cachés pueden registrar su propio paso con
+`warmup.register`.
+"""
+
+import logging
+import os
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session
+
+from src.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+WarmupHook = Callable[[Session], None]
+
+_startup_seconds = registry.gauge(
+    "app_startup_seconds",
+    "Duración de cada fase del arranque del proceso.",
+    ("phase",),
+)
+
+
+def process_uptime() -> float | None:
+    """Segundos desde que arrancó el proceso (solo Linux), que incluyen el
+    arranque del intérprete y la importación de la aplicación.
+    """
+    try:
+        with open("/proc/self/stat") as stat_file:
+            # El nombre del proceso puede contener espacios: se parte tras ")".
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    return max(uptime - started, 0.0)
+
+
+class StartupTimer:
+    """Mide las fases del lifespan y las publica en `app_startup_seconds`."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.phases: dict[str, float] = {}
+        imported = process_uptime()
+        if imported is not None:
+            self.phases["import"] = imported
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = perf_counter() - start
+
+    def finish(self) -> dict[str, float]:
+        self.phases["lifespan"] = perf_counter() - self.started
+        self.phases["total"] = self.phases["lifespan"] + self.phases.get("import", 0.0)
+        for name, seconds in self.phases.items():
+            _startup_seconds.labels(name).set(seconds)
+        logger.info(
+            "Arranque completado en %.3f s (%s)",
+            self.phases["total"],
+            ", ".join(f"{name}={value:.3f}s" for name, value in self.phases.items()),
+        )
+        return self.phases
+
+
+def pre_open_connections(engine: Engine, count: int) -> int:
+    """Abre `count` conexiones a la vez y las devuelve al pool, de modo que queden
+    establecidas (TCP, TLS, autenticación) antes de la primera petición.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        count = min(count, 1)
+    count = min(count, getattr(engine.pool, "size", lambda: count)())
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+class WarmupRegistry:
+    """Pasos de calentamiento. Cada paso recibe una sesión de solo lectura que se
+    revierte al terminar; un paso que falla se registra y no impide el arranque.
+    """
+
+    def __init__(self):
+        self._hooks: list[tuple[str, WarmupHook]] = []
+
+    def register(self, name: str, hook: WarmupHook) -> None:
+        self._hooks.append((name, hook))
+
+    def run(self, engine: Engine, *, connections: int = 0) -> dict[str, float]:
+        timings: dict[str, float] = {}
+
+        start = perf_counter()
+        configure_mappers()
+        timings["mappers"] = perf_counter() - start
+
+        if connections:
+            start = perf_counter()
+            pre_open_connections(engine, connections)
+            timings["connections"] = perf_counter() - start
+
+        for name, hook in self._hooks:
+            start = perf_counter()
+            try:
+                with Session(engine) as session:
+                    hook(session)
+                    session.rollback()
+            except Exception:
+                logger.exception("Falló el paso de calentamiento %s", name)
+            timings[name] = perf_counter() - start
+        return timings
+
+
+warmup = WarmupRegistry()
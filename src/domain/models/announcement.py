@@ -1,19 +1,34 @@
 from typing import TYPE_CHECKING
 
-from sqlmodel import Relationship
+from sqlmodel import Field, Relationship
 
 from .base import Base
 from .blog_post_announcement_link import BlogPostAnnouncementLink
+from .category_announcement_link import CategoryAnnouncementLink
 
 if TYPE_CHECKING:
     from .blog_post import BlogPost
+    from .category import Category
 
 
 class Announcement(Base, table=True):
     name: str
     url: str | None = None
     image_url: str | None = None
+    # Peso relativo en la rotación de anuncios de un mismo post o categoría.
+    weight: int = Field(
+        default=1,
+        nullable=False,
+        sa_column_kwargs={"server_default": "1"},
+    )
 
     blog_posts: list["BlogPost"] = Relationship(
-        back_populates="announcements", link_model=BlogPostAnnouncementLink,
+        back_populates="announcements",
+        link_model=BlogPostAnnouncementLink,
+        passive_deletes=True,
+    )
+    categories: list["Category"] = Relationship(
+        back_populates="announcements",
+        link_model=CategoryAnnouncementLink,
+        passive_deletes=True,
     )
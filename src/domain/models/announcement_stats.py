@@ -0,0 +1,16 @@
+import uuid
+
+from sqlmodel import Field, SQLModel
+
+
+class AnnouncementStats(SQLModel, table=True):
+    """Impresiones de un anuncio (ver `src/repository/announcement_snapshot.py`).
+    Se escriben con upserts aditivos por lotes, fuera de la fila del anuncio.
+    """
+
+    announcement_id: uuid.UUID = Field(
+        foreign_key="announcement.id",
+        ondelete="CASCADE",
+        primary_key=True,
+    )
+    impressions: int = Field(default=0, nullable=False)
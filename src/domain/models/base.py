@@ -12,3 +12,9 @@ class Base(SQLModel):
         nullable=False,
         sa_column_kwargs={"onupdate": datetime.now},
     )
+    # Se incrementa en cada actualización; es la precondición de `If-Match`.
+    version: int = Field(
+        default=1,
+        nullable=False,
+        sa_column_kwargs={"server_default": "1"},
+    )
@@ -1,11 +1,14 @@
+import logging
 import uuid
 from datetime import date as date_type
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from .base import Base
 from .blog_post_announcement_link import BlogPostAnnouncementLink
+from .blog_post_body import BlogPostBody
 from .blog_post_tag_link import BlogPostTagLink
 
 if TYPE_CHECKING:
@@ -14,19 +17,73 @@ if TYPE_CHECKING:
     from .section import Section
     from .tag import Tag
 
+logger = logging.getLogger(__name__)
+
+
+class MissingBlogPostBodyError(LookupError):
+    """El blog post no tiene fila en `blogpostbody`: los datos están dañados."""
+
+
+def missing_body_error(blog_post_id: uuid.UUID) -> MissingBlogPostBodyError:
+    """Registra que el post `blog_post_id` no tiene contenido y devuelve el error
+    que hay que lanzar.
+    """
+    logger.error("El blog post %s no tiene fila en blogpostbody", blog_post_id)
+    return MissingBlogPostBodyError(
+        f"El blog post {blog_post_id} no tiene contenido en blogpostbody.",
+    )
+
 
 class BlogPost(Base, table=True):
+    # Los listados y feeds filtran y ordenan por fecha de alta; es también la
+    # columna de partición (ver src/core/database/partitioning.py).
+    __table_args__ = (Index("ix_blogpost_created_at", "created_at"),)
+
     title: str
-    content: str
     date: date_type | None = None
 
-    category_id: uuid.UUID = Field(foreign_key="category.id")
+    # Sin cascada: borrar una categoría con posts exige una política explícita
+    # (ver CategoryRepository.delete_with_policy).
+    category_id: uuid.UUID = Field(foreign_key="category.id", ondelete="RESTRICT")
 
     category: "Category" = Relationship(back_populates="blog_posts")
+    # El contenido está en su propia tabla: se carga solo cuando se lee `content`
+    # o cuando un listado lo pide (ver BlogPostRepository.eager_relations).
+    body: BlogPostBody = Relationship(passive_deletes=True)
+    # Secciones y enlaces se borran en la base de datos (ON DELETE CASCADE): el
+    # ORM no necesita cargarlos para eliminar un post.
     tags: list["Tag"] = Relationship(
-        back_populates="blog_posts", link_model=BlogPostTagLink,
+        back_populates="blog_posts",
+        link_model=BlogPostTagLink,
+        passive_deletes=True,
+    )
+    # Solo lectura: los IDs de los tags sin cargar sus filas; el esquema de
+    # lectura los resuelve con el snapshot de taxonomía (src/repository/taxonomy.py).
+    tag_links: list[BlogPostTagLink] = Relationship(
+        sa_relationship_kwargs={
+            "viewonly": True,
+            "order_by": "BlogPostTagLink.created_at",
+        },
+    )
+    sections: list["Section"] = Relationship(
+        back_populates="blog_post",
+        passive_deletes=True,
     )
-    sections: list["Section"] = Relationship(back_populates="blog_post")
     announcements: list["Announcement"] = Relationship(
-        back_populates="blog_posts", link_model=BlogPostAnnouncementLink,
+        back_populates="blog_posts",
+        link_model=BlogPostAnnouncementLink,
+        passive_deletes=True,
     )
+
+    @property
+    def stored_body(self) -> BlogPostBody:
+        """Fila de `blogpostbody` del post. El alta y la migración 0008 crean una
+        para cada post; si falta, lanza `MissingBlogPostBodyError`.
+        """
+        if self.body is None:
+            raise missing_body_error(self.id)
+        return self.body
+
+    @property
+    def content(self) -> str:
+        return self.stored_body.content
@@ -0,0 +1,22 @@
+import uuid
+
+from sqlmodel import Field, SQLModel
+
+
+class BlogPostBody(SQLModel, table=True):
+    """Contenido de un blog post, uno a uno con `BlogPost`. Vive fuera de
+    `blogpost` para que los listados, los conteos y las comprobaciones de
+    existencia recorran filas estrechas, sin el texto ni su HTML (TOAST); solo
+    se lee cuando una respuesta incluye el contenido.
+    """
+
+    blog_post_id: uuid.UUID = Field(
+        foreign_key="blogpost.id",
+        ondelete="CASCADE",
+        primary_key=True,
+    )
+    content: str
+    # HTML de `content` y hash con el que se generó; los rellena el repositorio
+    # al escribir (ver src/repository/rendered_content.py).
+    content_html: str | None = None
+    content_hash: str | None = Field(default=None, max_length=64)
@@ -0,0 +1,21 @@
+import uuid
+
+from sqlmodel import Field, SQLModel
+
+
+class BlogPostStats(SQLModel, table=True):
+    """Contadores de visitas de un blog post (ver `src/repository/view_stats.py`).
+    Viven fuera de `BlogPost` para que las visitas no bloqueen ni reescriban
+    las filas de los posts: solo se actualizan con upserts aditivos por lotes.
+    """
+
+    blog_post_id: uuid.UUID = Field(
+        foreign_key="blogpost.id",
+        ondelete="CASCADE",
+        primary_key=True,
+    )
+    views: int = Field(default=0, nullable=False)
+    # Logaritmo de la puntuación de tendencia referida al instante 0: cada
+    # visita en `t` suma 2^(t / vida media). Ordenar por esta columna equivale a
+    # ordenar por la puntuación con decaimiento en cualquier instante.
+    trending_log: float = Field(nullable=False, index=True)
@@ -8,10 +8,18 @@ from .base import Base
 
 class BlogPostTagLink(Base, table=True):
     blog_post_id: uuid.UUID = Field(
-        foreign_key="blogpost.id", primary_key=True, index=True, nullable=False,
+        foreign_key="blogpost.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        index=True,
+        nullable=False,
     )
     tag_id: uuid.UUID = Field(
-        foreign_key="tag.id", primary_key=True, index=True, nullable=False,
+        foreign_key="tag.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        index=True,
+        nullable=False,
     )
 
     __table_args__ = (
@@ -3,8 +3,10 @@ from typing import TYPE_CHECKING
 from sqlmodel import Field, Relationship
 
 from .base import Base
+from .category_announcement_link import CategoryAnnouncementLink
 
 if TYPE_CHECKING:
+    from .announcement import Announcement
     from .blog_post import BlogPost
 
 
@@ -12,4 +14,13 @@ class Category(Base, table=True):
     name: str = Field(index=True)
     description: str | None = None
 
-    blog_posts: list["BlogPost"] = Relationship(back_populates="category")
+    blog_posts: list["BlogPost"] = Relationship(
+        back_populates="category",
+        passive_deletes="all",
+    )
+    # Anuncios por defecto de los posts de la categoría sin anuncios propios.
+    announcements: list["Announcement"] = Relationship(
+        back_populates="categories",
+        link_model=CategoryAnnouncementLink,
+        passive_deletes=True,
+    )
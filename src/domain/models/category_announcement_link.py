@@ -0,0 +1,35 @@
+import uuid
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field
+
+from .base import Base
+
+
+class CategoryAnnouncementLink(Base, table=True):
+    """Anuncios por defecto de una categoría: se sirven en los blog posts de la
+    categoría que no tienen anuncios propios.
+    """
+
+    category_id: uuid.UUID = Field(
+        foreign_key="category.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        index=True,
+        nullable=False,
+    )
+    announcement_id: uuid.UUID = Field(
+        foreign_key="announcement.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        index=True,
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "category_id",
+            "announcement_id",
+            name="uq_category_announcement",
+        ),
+    )
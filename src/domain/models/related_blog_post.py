@@ -0,0 +1,26 @@
+import uuid
+
+from sqlmodel import Field, SQLModel
+
+
+class RelatedBlogPost(SQLModel, table=True):
+    """Vecinos precalculados de un blog post por similitud de tags (ver
+    `src/repository/related_posts.py`). Es un índice derivado de
+    `BlogPostTagLink`: no hereda de `Base` porque no se edita por la API.
+    """
+
+    blog_post_id: uuid.UUID = Field(
+        foreign_key="blogpost.id",
+        ondelete="CASCADE",
+        primary_key=True,
+    )
+    # Posición en la lista (0 = el más parecido); la clave primaria sirve la
+    # lista ordenada con un único recorrido del índice.
+    rank: int = Field(primary_key=True)
+    related_id: uuid.UUID = Field(
+        foreign_key="blogpost.id",
+        ondelete="CASCADE",
+        index=True,
+        nullable=False,
+    )
+    score: float = Field(nullable=False)
@@ -13,9 +13,14 @@ class Section(Base, table=True):
     title: str
     image_url: str | None = None
     content: str
+    # HTML de `content` y hash con el que se generó; los rellena el repositorio
+    # al escribir (ver src/repository/rendered_content.py).
+    content_html: str | None = None
+    content_hash: str | None = Field(default=None, max_length=64)
     position_order: int = Field(
-        default=0, description="Orden de la sección dentro del blog post",
+        default=0,
+        description="Orden de la sección dentro del blog post",
     )
 
-    blog_post_id: uuid.UUID = Field(foreign_key="blogpost.id")
+    blog_post_id: uuid.UUID = Field(foreign_key="blogpost.id", ondelete="CASCADE")
     blog_post: "BlogPost" = Relationship(back_populates="sections")
@@ -13,5 +13,7 @@ class Tag(Base, table=True):
     name: str = Field(index=True, unique=True)
 
     blog_posts: list["BlogPost"] = Relationship(
-        back_populates="tags", link_model=BlogPostTagLink,
+        back_populates="tags",
+        link_model=BlogPostTagLink,
+        passive_deletes=True,
     )
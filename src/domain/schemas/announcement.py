@@ -1,34 +1,33 @@
 import uuid
 
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
 
 class AnnouncementBaseSchema(SQLModel):
-    """Esquema base para anuncios.
-    """
+    """Esquema base para anuncios."""
 
     name: str
     url: str | None = None
     image_url: str | None = None
+    # Peso relativo en la rotación de anuncios.
+    weight: int = Field(default=1, ge=1)
 
 
 class AnnouncementCreateSchema(AnnouncementBaseSchema):
-    """Esquema para crear un nuevo anuncio.
-    """
-
+    """Esquema para crear un nuevo anuncio."""
 
 
 class AnnouncementUpdateSchema(SQLModel):
-    """Esquema para actualizar un anuncio. Todos los campos son opcionales.
-    """
+    """Esquema para actualizar un anuncio. Todos los campos son opcionales."""
 
     name: str | None = None
     url: str | None = None
     image_url: str | None = None
+    weight: int | None = Field(default=None, ge=1)
 
 
 class AnnouncementReadSchema(AnnouncementBaseSchema):
-    """Esquema para leer/devolver datos de un anuncio desde la API.
-    """
+    """Esquema para leer/devolver datos de un anuncio desde la API."""
 
     id: uuid.UUID
+    version: int
@@ -0,0 +1,69 @@
+from enum import StrEnum
+from typing import Any
+
+from sqlmodel import Field, SQLModel
+
+from src.core.settings import app_settings
+
+
+class BatchOperationType(StrEnum):
+    """Operaciones admitidas por `/v1/api/batch`. Cada una corresponde a una ruta
+    existente y usa el mismo método de repositorio.
+    """
+
+    TAG_CREATE = "tag.create"
+    TAG_UPDATE = "tag.update"
+    TAG_DELETE = "tag.delete"
+    CATEGORY_CREATE = "category.create"
+    CATEGORY_UPDATE = "category.update"
+    CATEGORY_DELETE = "category.delete"
+    SECTION_CREATE = "section.create"
+    SECTION_UPDATE = "section.update"
+    SECTION_DELETE = "section.delete"
+    ANNOUNCEMENT_CREATE = "announcement.create"
+    ANNOUNCEMENT_UPDATE = "announcement.update"
+    ANNOUNCEMENT_DELETE = "announcement.delete"
+    BLOG_POST_CREATE = "blog_post.create"
+    BLOG_POST_UPDATE = "blog_post.update"
+    BLOG_POST_DELETE = "blog_post.delete"
+    BLOG_POST_ADD_TAG = "blog_post.add_tag"
+    BLOG_POST_REMOVE_TAG = "blog_post.remove_tag"
+    BLOG_POST_ASSIGN_CATEGORY = "blog_post.assign_category"
+    BLOG_POST_ADD_ANNOUNCEMENT = "blog_post.add_announcement"
+    BLOG_POST_REMOVE_ANNOUNCEMENT = "blog_post.remove_announcement"
+
+
+class BatchOperation(SQLModel):
+    """Una operación del lote.
+
+    Cualquier valor de `id`, `related_id` o `body` puede ser una referencia
+    `{"$ref": "<ref>"}` al ID devuelto por una operación anterior del mismo lote.
+    """
+
+    op: BatchOperationType
+    # Nombre con el que las operaciones siguientes pueden referenciar el resultado.
+    ref: str | None = None
+    # Entidad sobre la que se opera (update, delete y operaciones de relación).
+    id: Any = None
+    # Entidad relacionada (tag, categoría o anuncio en las operaciones de relación).
+    related_id: Any = None
+    body: dict[str, Any] | None = None
+    # Equivale a `If-Match` en las actualizaciones.
+    version: int | None = None
+
+
+class BatchRequestSchema(SQLModel):
+    operations: list[BatchOperation] = Field(
+        min_length=1,
+        max_length=app_settings.BATCH_MAX_OPERATIONS,
+    )
+
+
+class BatchOperationResult(SQLModel):
+    ref: str | None = None
+    status: int
+    data: dict[str, Any] | None = None
+
+
+class BatchResponseSchema(SQLModel):
+    results: list[BatchOperationResult]
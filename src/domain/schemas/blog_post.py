@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING, Optional
 
 from sqlmodel import SQLModel
 
+from src.domain.schemas.patch import MergePatchSchema, TextDelta
+
 if TYPE_CHECKING:
     from src.domain.schemas.category import CategoryReadSchema
     from src.domain.schemas.section import SectionReadWithoutBlogPost
@@ -12,8 +14,7 @@ if TYPE_CHECKING:
 
 
 class BlogPostBaseSchema(SQLModel):
-    """Esquema base con campos comunes para Crear y Actualizar.
-    """
+    """Esquema base con campos comunes para Crear y Actualizar."""
 
     title: str | None = None
     content: str | None = None
@@ -22,8 +23,7 @@ class BlogPostBaseSchema(SQLModel):
 
 
 class BlogPostCreateSchema(BlogPostBaseSchema):
-    """Esquema para crear un nuevo blog_post. Requiere título, contenido y category_id.
-    """
+    """Esquema para crear un nuevo blog_post. Requiere título, contenido y category_id."""
 
     title: str
     content: str
@@ -36,6 +36,19 @@ class BlogPostUpdateSchema(BlogPostBaseSchema):
     """
 
 
+class BlogPostPatchSchema(MergePatchSchema):
+    """Esquema para modificar parcialmente un blog_post (PATCH). `content` puede
+    ser el texto completo o un delta sobre el de la versión de `If-Match`.
+    """
+
+    update_schema = BlogPostUpdateSchema
+    nullable_fields = frozenset({"date"})
+
+    title: str | None = None
+    content: str | TextDelta | None = None
+    date: date_type | None = None
+    category_id: uuid.UUID | None = None
+
 
 class BlogPostReadSchema(BlogPostBaseSchema):
     """Esquema para leer/devolver datos de un blog_post desde la API.
@@ -48,6 +61,7 @@ class BlogPostReadSchema(BlogPostBaseSchema):
     category_id: uuid.UUID
     created_at: datetime | None = None
     updated_at: datetime | None = None
+    version: int
 
     category: Optional["CategoryReadSchema"] = None
     tags: list["TagReadSchema"] = []
@@ -0,0 +1,13 @@
+import uuid
+
+from sqlmodel import SQLModel
+
+
+class BlogPostStatsReadSchema(SQLModel):
+    """Esquema para leer las visitas y la tendencia de un blog post. No incluye
+    las visitas que aún no se han escrito (hasta `VIEW_FLUSH_INTERVAL_SECONDS`).
+    """
+
+    blog_post_id: uuid.UUID
+    views: int
+    trending_score: float
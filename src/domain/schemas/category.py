@@ -1,32 +1,37 @@
 import uuid
+from enum import StrEnum
 
 from sqlmodel import SQLModel
 
 
+class CategoryDeletePolicy(StrEnum):
+    """Qué hacer con los blog posts de una categoría al eliminarla."""
+
+    RESTRICT = "restrict"  # No eliminarla si tiene blog posts (409).
+    REASSIGN = "reassign"  # Mover sus blog posts a otra categoría.
+    CASCADE = "cascade"  # Eliminar también sus blog posts y sus secciones.
+
+
 class CategoryBaseSchema(SQLModel):
-    """Esquema base para categorías.
-    """
+    """Esquema base para categorías."""
 
     name: str
     description: str | None = None
 
 
 class CategoryCreateSchema(CategoryBaseSchema):
-    """Esquema para crear una nueva categoría.
-    """
-
+    """Esquema para crear una nueva categoría."""
 
 
 class CategoryUpdateSchema(CategoryBaseSchema):
-    """Esquema para actualizar una categoría. Todos los campos son opcionales.
-    """
+    """Esquema para actualizar una categoría. Todos los campos son opcionales."""
 
     name: str | None = None
     description: str | None = None
 
 
 class CategoryReadSchema(CategoryBaseSchema):
-    """Esquema para leer/devolver datos de una categoría desde la API.
-    """
+    """Esquema para leer/devolver datos de una categoría desde la API."""
 
     id: uuid.UUID
+    version: int
@@ -0,0 +1,51 @@
+from typing import ClassVar
+
+from pydantic import model_validator
+from sqlmodel import Field, SQLModel
+
+
+class DeltaOp(SQLModel):
+    """Una operación de un delta de texto, con una sola clave: `retain` conserva
+    los n caracteres siguientes del texto base, `delete` los elimina e `insert`
+    inserta el texto indicado. Las longitudes cuentan caracteres Unicode.
+    """
+
+    retain: int | None = Field(default=None, gt=0)
+    delete: int | None = Field(default=None, gt=0)
+    insert: str | None = Field(default=None, min_length=1)
+
+    @model_validator(mode="after")
+    def _single_operation(self) -> "DeltaOp":
+        values = [getattr(self, name) for name in self.model_fields_set]
+        if len(values) != 1 or values[0] is None:
+            raise ValueError(
+                "Cada operación del delta debe tener una sola clave: "
+                "retain, delete o insert.",
+            )
+        return self
+
+
+class TextDelta(SQLModel):
+    """Cambio de un campo de texto respecto a la versión que indica `If-Match`.
+    El texto que queda después de la última operación se conserva.
+    """
+
+    delta: list[DeltaOp] = Field(min_length=1)
+
+
+class MergePatchSchema(SQLModel):
+    """Base de los esquemas de PATCH (JSON Merge Patch, RFC 7396): solo se
+    modifican los campos presentes y `null` borra el valor, así que solo se
+    admite en los campos de `nullable_fields`.
+    """
+
+    # Esquema de actualización con el que el repositorio aplica el parche.
+    update_schema: ClassVar[type[SQLModel]]
+    nullable_fields: ClassVar[frozenset[str]] = frozenset()
+
+    @model_validator(mode="after")
+    def _null_only_on_nullable(self) -> "MergePatchSchema":
+        for name in self.model_fields_set:
+            if getattr(self, name) is None and name not in self.nullable_fields:
+                raise ValueError(f"El campo '{name}' no admite null.")
+        return self
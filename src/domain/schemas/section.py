@@ -2,10 +2,11 @@ import uuid
 
 from sqlmodel import SQLModel
 
+from src.domain.schemas.patch import MergePatchSchema, TextDelta
+
 
 class SectionBaseSchema(SQLModel):
-    """Esquema base para secciones.
-    """
+    """Esquema base para secciones."""
 
     title: str
     image_url: str | None = None
@@ -15,14 +16,11 @@ class SectionBaseSchema(SQLModel):
 
 
 class SectionCreateSchema(SectionBaseSchema):
-    """Esquema para crear una nueva sección.
-    """
-
+    """Esquema para crear una nueva sección."""
 
 
 class SectionUpdateSchema(SQLModel):
-    """Esquema para actualizar una sección. Todos los campos son opcionales.
-    """
+    """Esquema para actualizar una sección. Todos los campos son opcionales."""
 
     title: str | None = None
     image_url: str | None = None
@@ -31,16 +29,30 @@ class SectionUpdateSchema(SQLModel):
     blog_post_id: uuid.UUID | None = None
 
 
-class SectionReadSchema(SectionBaseSchema):
-    """Esquema para leer/devolver datos de una sección desde la API.
+class SectionPatchSchema(MergePatchSchema):
+    """Esquema para modificar parcialmente una sección (PATCH). `content` puede
+    ser el texto completo o un delta sobre el de la versión de `If-Match`.
     """
 
+    update_schema = SectionUpdateSchema
+    nullable_fields = frozenset({"image_url"})
+
+    title: str | None = None
+    image_url: str | None = None
+    content: str | TextDelta | None = None
+    position_order: int | None = None
+    blog_post_id: uuid.UUID | None = None
+
+
+class SectionReadSchema(SectionBaseSchema):
+    """Esquema para leer/devolver datos de una sección desde la API."""
+
     id: uuid.UUID
+    version: int
 
 
 class SectionReadWithoutBlogPost(SQLModel):
-    """Esquema para leer secciones sin incluir el blog_post completo (evita referencias circulares).
-    """
+    """Esquema para leer secciones sin incluir el blog_post completo (evita referencias circulares)."""
 
     id: uuid.UUID
     title: str
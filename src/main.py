@@ -1,38 +1,151 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from functools import partial
 
+import anyio.to_thread
 from fastapi import FastAPI
 
-from src.core.database.config import init_db
+from src.core.database.config import dispose_engine, get_engine, init_db
+from src.core.database.partitioning import ensure_blog_post_partitions
+from src.core.database.settings import db_settings
+from src.core.metrics import http_metrics
+from src.core.middleware.compression import CompressionMiddleware
+from src.core.middleware.metrics import MetricsMiddleware
+from src.core.middleware.query_accounting import QueryAccountingMiddleware
+from src.core.middleware.rate_limit import RateLimitMiddleware
+from src.core.rate_limit import create_rate_limiter
+from src.core.settings import app_settings
+from src.core.startup import StartupTimer, warmup
+from src.repository.announcement_snapshot import (
+    announcement_snapshot,
+    impression_counter,
+)
+from src.repository.buffered_counter import flush_all, flush_periodically
+from src.repository.rendered_content import shutdown_render_pool
+from src.repository.taxonomy import TaxonomyListener, taxonomy_snapshot
+from src.repository.view_stats import view_counter
+from src.repository.warmup import warm_repositories
 from src.routers.announcement import router as announcement_router
+from src.routers.batch import router as batch_router
 from src.routers.blog_post import router as blog_post_router
 from src.routers.category import router as category_router
+from src.routers.feeds import router as feeds_router
+from src.routers.metrics import router as metrics_router
 from src.routers.section import router as section_router
 from src.routers.tag import router as tag_router
 
+logger = logging.getLogger(__name__)
+
+warmup.register("repositories", warm_repositories)
+warmup.register("announcement_snapshot", announcement_snapshot.rebuild)
+warmup.register("taxonomy_snapshot", taxonomy_snapshot.rebuild)
+
+# Contadores con escritura diferida que se vacían periódicamente y al apagar.
+BUFFERED_COUNTERS = (view_counter, impression_counter)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Iniciando aplicación...")
-    init_db()
-    print("Inicialización de base de datos completada.")
+    timer = StartupTimer()
+    with timer.phase("engine"):
+        engine = get_engine()
+    if db_settings.DB_CREATE_ALL:
+        with timer.phase("create_all"):
+            await anyio.to_thread.run_sync(init_db, engine)
+    if engine.dialect.name == "postgresql":
+        # Sin efecto si blogpost no está particionada.
+        with timer.phase("partitions"):
+            await anyio.to_thread.run_sync(ensure_blog_post_partitions, engine)
+    if app_settings.STARTUP_WARMUP:
+        with timer.phase("warmup"):
+            steps = await anyio.to_thread.run_sync(
+                partial(
+                    warmup.run,
+                    engine,
+                    connections=app_settings.STARTUP_WARMUP_CONNECTIONS,
+                ),
+            )
+        timer.phases.update({f"warmup_{name}": t for name, t in steps.items()})
+    timer.finish()
+    taxonomy_listener = None
+    if app_settings.TAXONOMY_LISTEN_ENABLED:
+        taxonomy_listener = TaxonomyListener(
+            engine,
+            taxonomy_snapshot,
+            channel=app_settings.TAXONOMY_NOTIFY_CHANNEL,
+        )
+        taxonomy_listener.start()
+    flush_task = None
+    if app_settings.VIEW_FLUSH_ENABLED:
+        flush_task = asyncio.create_task(
+            flush_periodically(
+                BUFFERED_COUNTERS,
+                app_settings.VIEW_FLUSH_INTERVAL_SECONDS,
+            ),
+        )
     yield
-    print("Cerrando aplicación...")
+    logger.info("Cerrando aplicación...")
+    if flush_task is not None:
+        flush_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await flush_task
+        # Último vaciado antes de cerrar el engine para no perder incrementos.
+        await anyio.to_thread.run_sync(flush_all, BUFFERED_COUNTERS)
+    await anyio.to_thread.run_sync(shutdown_render_pool)
+    if taxonomy_listener is not None:
+        await anyio.to_thread.run_sync(taxonomy_listener.stop)
+    dispose_engine()
 
 
 app = FastAPI(
     title="FastAPI Example",
     description="A simple FastAPI example",
     version="1.0",
-    # lifespan=lifespan,
+    lifespan=lifespan,
 )
 
+if app_settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=app_settings.COMPRESSION_MINIMUM_SIZE,
+        levels={
+            "gzip": app_settings.COMPRESSION_GZIP_LEVEL,
+            "br": app_settings.COMPRESSION_BROTLI_LEVEL,
+            "zstd": app_settings.COMPRESSION_ZSTD_LEVEL,
+        },
+        route_levels=app_settings.COMPRESSION_ROUTE_LEVELS,
+        compress_in_thread=app_settings.COMPRESSION_IN_THREAD,
+        thread_min_size=app_settings.COMPRESSION_THREAD_MIN_SIZE,
+    )
+
+if app_settings.QUERY_ACCOUNTING_ENABLED:
+    app.add_middleware(
+        QueryAccountingMiddleware,
+        expose_headers=app_settings.QUERY_ACCOUNTING_HEADERS,
+        n_plus_one_threshold=app_settings.N_PLUS_ONE_THRESHOLD,
+    )
+
 app.include_router(blog_post_router)
 app.include_router(category_router)
 app.include_router(tag_router)
 app.include_router(section_router)
 app.include_router(announcement_router)
+app.include_router(batch_router)
+app.include_router(feeds_router)
 
 
 @app.get("/health")
 async def health():
     return {"message": "OK"}
+
+
+rate_limiter = create_rate_limiter(app_settings)
+if app_settings.RATE_LIMIT_ENABLED:
+    rate_limiter.register_routes(app.routes)
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+if app_settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+    app.add_middleware(MetricsMiddleware)
+    http_metrics.register_routes(app.routes)
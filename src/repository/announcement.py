@@ -4,62 +4,215 @@ from typing import Annotated
 from fastapi import Depends
 from sqlmodel import Session, select
 
-from src.core.database.config import get_session
+from src.core.database.config import CurrentSession
 from src.domain.models.announcement import Announcement
 from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_announcement_link import BlogPostAnnouncementLink
+from src.domain.models.category import Category
 from src.domain.schemas.announcement import (
     AnnouncementCreateSchema,
     AnnouncementUpdateSchema,
 )
+from src.repository.announcement_snapshot import (
+    ServedAnnouncement,
+    announcement_snapshot,
+    impression_counter,
+    record_announcement_change,
+)
 from src.repository.base_many_to_many import BaseManyToManyRepository
+from src.repository.blog_post import BlogPostRepository
+from src.repository.counting import TotalCount, total_counter
+from src.repository.loader import CurrentEntityLoader, EntityLoader
 
 
 class AnnouncementRepository(
     BaseManyToManyRepository[
-        Announcement, AnnouncementCreateSchema, AnnouncementUpdateSchema,
+        Announcement,
+        AnnouncementCreateSchema,
+        AnnouncementUpdateSchema,
     ],
 ):
-    def __init__(self, model: type, db_session: Session):
-        super().__init__(model, db_session)
+    def __init__(
+        self,
+        model: type,
+        db_session: Session,
+        loader: EntityLoader | None = None,
+    ):
+        super().__init__(model, db_session, loader)
+
+    # Los cambios se anotan en la sesión y se aplican al snapshot de anuncios
+    # servidos cuando se confirman (ver src/repository/announcement_snapshot.py).
+
+    def _record_announcement(self, announcement: Announcement) -> Announcement:
+        record_announcement_change(
+            self.session,
+            "announcement",
+            ServedAnnouncement.from_entity(announcement),
+        )
+        return announcement
+
+    def create(self, *, obj_in: AnnouncementCreateSchema) -> Announcement:
+        return self._record_announcement(super().create(obj_in=obj_in))
+
+    def update(
+        self,
+        *,
+        db_obj: Announcement,
+        obj_in: AnnouncementUpdateSchema,
+    ) -> Announcement:
+        return self._record_announcement(super().update(db_obj=db_obj, obj_in=obj_in))
+
+    def update_by_id(
+        self,
+        *,
+        id: uuid.UUID,
+        obj_in: AnnouncementUpdateSchema,
+        expected_version: int | None = None,
+    ) -> Announcement:
+        return self._record_announcement(
+            super().update_by_id(
+                id=id,
+                obj_in=obj_in,
+                expected_version=expected_version,
+            ),
+        )
+
+    def delete_by_id(self, *, id: uuid.UUID) -> None:
+        super().delete_by_id(id=id)
+        record_announcement_change(self.session, "deleted", id)
 
     def add_announcement_to_blog_post(
-        self, blog_post_id: uuid.UUID, announcement_id: uuid.UUID,
+        self,
+        blog_post_id: uuid.UUID,
+        announcement_id: uuid.UUID,
     ):
-        """Agrega un anuncio a un blog post.
-        """
-        return self.add_related_entity(
+        """Agrega un anuncio a un blog post."""
+        announcement = self.add_related_entity(
             entity_id=announcement_id,
             related_entity_id=blog_post_id,
             related_model=BlogPost,
             relation_attr="blog_posts",
         )
+        record_announcement_change(
+            self.session,
+            "blog_post",
+            blog_post_id,
+            announcement_id,
+            True,
+        )
+        return announcement
 
     def remove_announcement_from_blog_post(
-        self, blog_post_id: uuid.UUID, announcement_id: uuid.UUID,
+        self,
+        blog_post_id: uuid.UUID,
+        announcement_id: uuid.UUID,
     ):
-        """Elimina un anuncio de un blog post.
-        """
-        return self.remove_related_entity(
+        """Elimina un anuncio de un blog post."""
+        announcement = self.remove_related_entity(
             entity_id=announcement_id,
             related_entity_id=blog_post_id,
             related_model=BlogPost,
             relation_attr="blog_posts",
         )
+        record_announcement_change(
+            self.session,
+            "blog_post",
+            blog_post_id,
+            announcement_id,
+            False,
+        )
+        return announcement
+
+    def add_announcement_to_category(
+        self,
+        category_id: uuid.UUID,
+        announcement_id: uuid.UUID,
+    ):
+        """Agrega un anuncio por defecto a una categoría."""
+        announcement = self.add_related_entity(
+            entity_id=announcement_id,
+            related_entity_id=category_id,
+            related_model=Category,
+            relation_attr="categories",
+        )
+        record_announcement_change(
+            self.session,
+            "category",
+            category_id,
+            announcement_id,
+            True,
+        )
+        return announcement
+
+    def remove_announcement_from_category(
+        self,
+        category_id: uuid.UUID,
+        announcement_id: uuid.UUID,
+    ):
+        """Elimina un anuncio por defecto de una categoría."""
+        announcement = self.remove_related_entity(
+            entity_id=announcement_id,
+            related_entity_id=category_id,
+            related_model=Category,
+            relation_attr="categories",
+        )
+        record_announcement_change(
+            self.session,
+            "category",
+            category_id,
+            announcement_id,
+            False,
+        )
+        return announcement
+
+    def get_announcements_by_category(
+        self,
+        category_id: uuid.UUID,
+    ) -> list[Announcement]:
+        """Obtiene los anuncios por defecto de una categoría."""
+        stmt = (
+            select(Announcement)
+            .join(Announcement.categories)
+            .where(Category.id == category_id)
+        )
+        return list(self.session.exec(stmt).all())
+
+    def serve_announcement(
+        self,
+        blog_post_id: uuid.UUID,
+        category_id: uuid.UUID | None = None,
+    ) -> tuple[ServedAnnouncement | None, int]:
+        """Elige un anuncio para mostrar en un blog post (o, si no tiene, uno de
+        los de `category_id`) desde el snapshot en memoria y anota la impresión.
+        Solo consulta la base de datos si el snapshot no existe o caducó.
+
+        Devuelve el anuncio elegido (o None) y la versión del snapshot.
+        """
+        snapshot = announcement_snapshot.current(self.session)
+        announcement = snapshot.pick(blog_post_id, category_id)
+        if announcement is not None:
+            impression_counter.record(announcement.id)
+        return announcement, snapshot.version
 
     def get_blog_posts_for_announcement(
-        self, announcement_id: uuid.UUID,
+        self,
+        announcement_id: uuid.UUID,
     ) -> list[BlogPost]:
-        """Obtiene todos los blog posts asociados a un anuncio.
-        """
-        return self.get_related_entities(
-            entity_id=announcement_id, relation_attr="blog_posts",
+        """Obtiene todos los blog posts asociados a un anuncio."""
+        blog_posts = self.get_related_entities(
+            entity_id=announcement_id,
+            relation_attr="blog_posts",
         )
+        self.loader.load_relations(blog_posts, *BlogPostRepository.eager_relations)
+        return blog_posts
 
     def get_announcements_by_blog_post(
-        self, blog_post_id: uuid.UUID, skip: int = 0, limit: int = 100,
+        self,
+        blog_post_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
     ) -> list[Announcement]:
-        """Obtiene todos los anuncios asociados a un blog post específico.
-        """
+        """Obtiene todos los anuncios asociados a un blog post específico."""
         stmt = (
             select(Announcement)
             .join(Announcement.blog_posts)
@@ -70,13 +223,22 @@ class AnnouncementRepository(
         result = self.session.exec(stmt)
         return list(result.all())
 
+    def count_announcements_by_blog_post(self, blog_post_id: uuid.UUID) -> TotalCount:
+        """Total de anuncios de un blog post, para la paginación."""
+        stmt = select(BlogPostAnnouncementLink.announcement_id).where(
+            BlogPostAnnouncementLink.blog_post_id == blog_post_id,
+        )
+        return total_counter.count(self.session, stmt)
+
 
 def get_announcement_repository(
-    session: Session = Depends(get_session),
+    session: CurrentSession,
+    loader: CurrentEntityLoader,
 ) -> AnnouncementRepository:
-    return AnnouncementRepository(model=Announcement, db_session=session)
+    return AnnouncementRepository(model=Announcement, db_session=session, loader=loader)
 
 
 CurrentAnnouncementRepo = Annotated[
-    AnnouncementRepository, Depends(get_announcement_repository),
+    AnnouncementRepository,
+    Depends(get_announcement_repository),
 ]
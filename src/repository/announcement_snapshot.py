@@ -0,0 +1,295 @@
+"""Snapshot en memoria de los anuncios que se sirven en cada blog post.
+
+Los anuncios se muestran en cada visita a un artículo pero cambian poco, así que
+`/v1/api/announcements/serve` no consulta la base de datos: elige uno del
+snapshot del proceso, una copia inmutable y versionada de:
+
+* los datos de cada anuncio (incluido su peso en la rotación),
+* los anuncios de cada blog post,
+* los anuncios por defecto de cada categoría, para los posts sin anuncios propios.
+
+Los métodos de `AnnouncementRepository` que cambian anuncios o enlaces anotan el
+cambio en la sesión y, al confirmarse, se aplica sobre una copia del snapshot
+(copy-on-write), sin reconstruirlo. Los cambios hechos en otros procesos se
+recogen al reconstruirlo, como mucho `ANNOUNCEMENT_SNAPSHOT_TTL_SECONDS` después.
+
+Las impresiones se acumulan en memoria (`impression_counter`) y se escriben por
+lotes en `announcementstats` (ver `src/repository/buffered_counter.py`).
+"""
+
+import random
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+from src.core.settings import app_settings
+from src.domain.models.announcement import Announcement
+from src.domain.models.announcement_stats import AnnouncementStats
+from src.domain.models.blog_post_announcement_link import BlogPostAnnouncementLink
+from src.domain.models.category_announcement_link import CategoryAnnouncementLink
+from src.repository.buffered_counter import BufferedCounter, dialect_insert
+from src.repository.loader import id_in
+
+_CHANGES_KEY = "announcement_changes"
+
+
+@dataclass(frozen=True)
+class ServedAnnouncement:
+    id: uuid.UUID
+    name: str
+    url: str | None
+    image_url: str | None
+    weight: int
+    version: int
+
+    @classmethod
+    def from_entity(cls, announcement: Announcement) -> "ServedAnnouncement":
+        return cls(
+            id=announcement.id,
+            name=announcement.name,
+            url=announcement.url,
+            image_url=announcement.image_url,
+            weight=announcement.weight,
+            version=announcement.version,
+        )
+
+
+# Cambios que se aplican al snapshot tras el commit:
+#   ("announcement", ServedAnnouncement)   alta o modificación de un anuncio
+#   ("deleted", announcement_id)
+#   ("blog_post", blog_post_id, announcement_id, añadido)
+#   ("category", category_id, announcement_id, añadido)
+Change = tuple[Any, ...]
+
+
+def _toggle(
+    index: dict[uuid.UUID, tuple[uuid.UUID, ...]],
+    key: uuid.UUID,
+    announcement_id: uuid.UUID,
+    added: bool,
+) -> None:
+    current = index.get(key, ())
+    if added and announcement_id not in current:
+        index[key] = (*current, announcement_id)
+    elif not added and announcement_id in current:
+        remaining = tuple(id for id in current if id != announcement_id)
+        if remaining:
+            index[key] = remaining
+        else:
+            del index[key]
+
+
+@dataclass(frozen=True)
+class AnnouncementSnapshot:
+    version: int
+    # Instante (monotonic) de la última reconstrucción desde la base de datos.
+    built_at: float
+    announcements: dict[uuid.UUID, ServedAnnouncement] = field(default_factory=dict)
+    by_blog_post: dict[uuid.UUID, tuple[uuid.UUID, ...]] = field(default_factory=dict)
+    by_category: dict[uuid.UUID, tuple[uuid.UUID, ...]] = field(default_factory=dict)
+
+    def candidates(
+        self,
+        blog_post_id: uuid.UUID,
+        category_id: uuid.UUID | None = None,
+    ) -> list[ServedAnnouncement]:
+        """Anuncios del blog post o, si no tiene, los de su categoría."""
+        candidates = self._existing(self.by_blog_post.get(blog_post_id, ()))
+        if not candidates and category_id is not None:
+            candidates = self._existing(self.by_category.get(category_id, ()))
+        return candidates
+
+    def _existing(self, ids: tuple[uuid.UUID, ...]) -> list[ServedAnnouncement]:
+        return [self.announcements[id] for id in ids if id in self.announcements]
+
+    def pick(
+        self,
+        blog_post_id: uuid.UUID,
+        category_id: uuid.UUID | None = None,
+        rng: random.Random | None = None,
+    ) -> ServedAnnouncement | None:
+        """Elige un anuncio al azar con probabilidad proporcional a su peso."""
+        candidates = self.candidates(blog_post_id, category_id)
+        if not candidates:
+            return None
+        weights = [announcement.weight for announcement in candidates]
+        return (rng or random).choices(candidates, weights=weights)[0]
+
+    def patched(self, changes: list[Change]) -> "AnnouncementSnapshot":
+        """Nueva versión del snapshot con `changes` aplicados. Solo se copian los
+        índices que cambian; el snapshot actual no se modifica.
+        """
+        indexes: dict[str, dict] = {}
+
+        def copy(name: str) -> dict:
+            # Cada índice se copia una sola vez, la primera vez que cambia.
+            if name not in indexes:
+                indexes[name] = dict(getattr(self, name))
+            return indexes[name]
+
+        for change in changes:
+            kind = change[0]
+            if kind == "announcement":
+                copy("announcements")[change[1].id] = change[1]
+            elif kind == "deleted":
+                # Los enlaces huérfanos se ignoran al elegir y desaparecen en la
+                # siguiente reconstrucción.
+                copy("announcements").pop(change[1], None)
+            elif kind == "blog_post":
+                _toggle(copy("by_blog_post"), *change[1:])
+            elif kind == "category":
+                _toggle(copy("by_category"), *change[1:])
+        return replace(self, version=self.version + 1, **indexes)
+
+
+def load_snapshot(session: Session, version: int) -> AnnouncementSnapshot:
+    """Construye el snapshot desde la base de datos con tres consultas."""
+    announcements = {
+        announcement.id: ServedAnnouncement.from_entity(announcement)
+        for announcement in session.exec(select(Announcement)).scalars()
+    }
+    return AnnouncementSnapshot(
+        version=version,
+        built_at=monotonic(),
+        announcements=announcements,
+        by_blog_post=_load_links(session, BlogPostAnnouncementLink.blog_post_id),
+        by_category=_load_links(session, CategoryAnnouncementLink.category_id),
+    )
+
+
+def _load_links(session: Session, key_column) -> dict[uuid.UUID, tuple[uuid.UUID, ...]]:
+    link_model = key_column.class_
+    grouped: dict[uuid.UUID, list[uuid.UUID]] = defaultdict(list)
+    for key, announcement_id in session.exec(
+        select(key_column, link_model.announcement_id).order_by(link_model.created_at),
+    ):
+        grouped[key].append(announcement_id)
+    return {key: tuple(ids) for key, ids in grouped.items()}
+
+
+class AnnouncementSnapshotStore:
+    """Snapshot vigente del proceso. Las lecturas no toman ningún lock: solo
+    leen la referencia al snapshot, que se sustituye entera en cada cambio.
+    """
+
+    def __init__(self, *, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: AnnouncementSnapshot | None = None
+        self._version = 0
+        # Cambios aplicados; permite detectar los que llegan durante una
+        # reconstrucción.
+        self._generation = 0
+        self._lock = Lock()
+        self._rebuild_lock = Lock()
+
+    def _is_fresh(self, snapshot: AnnouncementSnapshot | None) -> bool:
+        return (
+            snapshot is not None and monotonic() - snapshot.built_at < self.ttl_seconds
+        )
+
+    def current(self, session: Session) -> AnnouncementSnapshot:
+        """Snapshot vigente; lo reconstruye con `session` si no existe o caducó."""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+        # Si otro hilo ya está reconstruyendo, se sirve el snapshot caducado en
+        # lugar de lanzar otra reconstrucción.
+        if not self._rebuild_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+            return self._load(session)
+        finally:
+            self._rebuild_lock.release()
+
+    def rebuild(self, session: Session) -> AnnouncementSnapshot:
+        """Reconstruye el snapshot desde la base de datos."""
+        with self._rebuild_lock:
+            return self._load(session)
+
+    def _load(self, session: Session) -> AnnouncementSnapshot:
+        generation = self._generation
+        snapshot = load_snapshot(session, self._version + 1)
+        with self._lock:
+            self._version = snapshot.version
+            if self._generation != generation:
+                # Un cambio confirmado durante la carga podría no estar en ella:
+                # el snapshot nace caducado y se recarga en la siguiente petición.
+                snapshot = replace(snapshot, built_at=float("-inf"))
+            self._snapshot = snapshot
+        return snapshot
+
+    def apply(self, changes: list[Change]) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.patched(changes)
+                self._version = self._snapshot.version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+
+def record_announcement_change(session: Session, *change: Any) -> None:
+    """Anota un cambio que se aplicará al snapshot cuando la sesión confirme."""
+    session.info.setdefault(_CHANGES_KEY, []).append(change)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_announcement_changes(session: OrmSession) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        announcement_snapshot.apply(changes)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_announcement_changes(session: OrmSession) -> None:
+    session.info.pop(_CHANGES_KEY, None)
+
+
+def write_impressions(
+    session: Session,
+    impressions: dict[uuid.UUID, int],
+    at: float,
+) -> int:
+    """Suma las impresiones por anuncio con un único upsert aditivo."""
+    dialect_name = session.get_bind().dialect.name
+    ids = sorted(impressions)
+    existing = set(
+        session.exec(
+            select(Announcement.id).where(id_in(Announcement.id, ids, dialect_name)),
+        ).scalars(),
+    )
+    rows = [
+        {"announcement_id": id, "impressions": impressions[id]}
+        for id in ids
+        if id in existing
+    ]
+    if rows:
+        statement = dialect_insert(AnnouncementStats, dialect_name)
+        statement = statement.on_conflict_do_update(
+            index_elements=[AnnouncementStats.announcement_id],
+            set_={
+                "impressions": AnnouncementStats.impressions
+                + statement.excluded.impressions,
+            },
+        )
+        session.exec(statement, params=rows)
+    return sum(row["impressions"] for row in rows)
+
+
+announcement_snapshot = AnnouncementSnapshotStore(
+    ttl_seconds=app_settings.ANNOUNCEMENT_SNAPSHOT_TTL_SECONDS,
+)
+impression_counter = BufferedCounter("announcement_impressions", write_impressions)
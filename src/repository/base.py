@@ -1,14 +1,38 @@
+from collections.abc import Iterable
 from typing import Any, Generic, TypeVar
 
+from sqlalchemy import delete, insert, inspect, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import Session, SQLModel, select
 
+from src.domain.schemas.patch import MergePatchSchema, TextDelta
+from src.repository.counting import TotalCount, total_counter
+from src.repository.exceptions import (
+    EntityInUseError,
+    EntityNotFoundError,
+    VersionConflictError,
+    VersionRequiredError,
+)
+from src.repository.loader import EntityLoader
+from src.repository.patching import apply_delta
+
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=SQLModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=SQLModel)
 
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: type[ModelType], db_session: Session):
+    # Relaciones que el esquema de lectura serializa; los listados las cargan
+    # con una consulta por relación en lugar de una por fila.
+    eager_relations: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        model: type[ModelType],
+        db_session: Session,
+        loader: EntityLoader | None = None,
+    ):
         """Repositorio base con operaciones fundamentales de acceso a datos.
         Este repositorio espera que la gestión de transacciones (commit, rollback)
         sea manejada por la capa que lo utiliza.
@@ -17,17 +41,44 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         * `model`: Una clase de modelo SQLModel.
         * `db_session`: La sesión de base de datos SQLModel/SQLAlchemy.
+        * `loader`: El cargador de entidades de la petición, compartido entre
+          repositorios. Si no se indica se crea uno propio.
         """
         self.model = model
         self.session = db_session
+        self.loader = loader or EntityLoader(db_session)
 
-    def _save(self, entity: ModelType) -> None:
-        """Persiste el estado actual de la entidad en la base de datos y la refresca.
-        Llama a flush para enviar los cambios a la BD y refresh para actualizar la entidad.
-        Si ocurre un error, la excepción se propaga para ser manejada por el método llamador.
+    def _column_values(self, entity: ModelType) -> dict[str, Any]:
+        """Valores de las columnas de una entidad aún no persistida, incluidos los
+        generados por los `default_factory` del modelo (id, fechas).
         """
-        self.session.flush()
-        self.session.refresh(entity)
+        return {
+            attr.key: getattr(entity, attr.key)
+            for attr in inspect(self.model).column_attrs
+        }
+
+    def _with_derived_values(self, values: dict[str, Any]) -> dict[str, Any]:
+        """Completa los valores de un `INSERT` o `UPDATE` con las columnas que se
+        calculan a partir de ellos. Los repositorios que las tienen lo extienden.
+        """
+        return values
+
+    def _insert(self, values: dict[str, Any]) -> ModelType:
+        """Inserta una fila con `INSERT ... RETURNING` y devuelve la entidad ya
+        persistente en la sesión: una sola sentencia, sin flush ni refresh.
+        """
+        statement = (
+            insert(self.model)
+            .values(**self._with_derived_values(values))
+            .returning(self.model)
+        )
+        db_obj = self.session.exec(statement).scalar_one()
+        # Una fila recién insertada no tiene hijos: las colecciones se marcan como
+        # cargadas y vacías para que serializarla no dispare consultas perezosas.
+        for relationship in inspect(self.model).relationships:
+            if relationship.uselist:
+                set_committed_value(db_obj, relationship.key, [])
+        return db_obj
 
     def create(self, *, obj_in: CreateSchemaType) -> ModelType:
         """Crea un nuevo registro en la base de datos.
@@ -35,9 +86,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         db_obj = self.model.model_validate(obj_in)
         try:
-            self.session.add(db_obj)
-            self._save(db_obj)
-            return db_obj
+            return self._insert(self._column_values(db_obj))
         except Exception:
             self.session.rollback()
             raise
@@ -49,9 +98,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         db_obj = self.model(**obj_dict)
         try:
-            self.session.add(db_obj)
-            self._save(db_obj)
-            return db_obj
+            return self._insert(self._column_values(db_obj))
         except Exception:
             self.session.rollback()
             raise
@@ -59,9 +106,20 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_by_id(self, id: Any) -> ModelType | None:
         """Obtiene un único registro por su ID. Retorna None si no se encuentra.
         Asume que el campo de la clave primaria se llama 'id'.
+        Pasa por el cargador de la petición: no consulta si ya se cargó.
+        """
+        return self.loader.load(self.model, id)
+
+    def get_many(self, ids: Iterable[Any]) -> list[ModelType]:
+        """Obtiene varios registros por ID con una sola consulta
+        (`WHERE id = ANY(:ids)`), en el orden de `ids` y sin repetidos. Los IDs
+        que no existen se omiten.
         """
-        statement = select(self.model).where(self.model.id == id)
-        return self.session.exec(statement).first()
+        ids = list(dict.fromkeys(ids))
+        found = self.loader.load_many(self.model, ids)
+        entities = [found[id] for id in ids if id in found]
+        self.loader.load_relations(entities, *self.eager_relations)
+        return entities
 
     def get_all(
         self,
@@ -77,8 +135,13 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Un diccionario donde la clave es el nombre del campo y el valor es el valor a filtrar (igualdad exacta).
         Ejemplo: `filters={"nombre": "Ejemplo", "activo": True}`
         """
-        statement = select(self.model)
+        statement = self._apply_filters(select(self.model), filters)
+        statement = statement.offset(skip).limit(limit)
+        entities = list(self.session.exec(statement).all())
+        self.loader.load_relations(entities, *self.eager_relations)
+        return entities
 
+    def _apply_filters(self, statement, filters: dict[str, Any] | None):
         if filters:
             for field, value in filters.items():
                 if hasattr(self.model, field):
@@ -87,25 +150,160 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                     raise ValueError(
                         f"Campo de filtro inválido: '{field}' no existe en el modelo {self.model.__name__}.",
                     )
+        return statement
 
-        statement = statement.offset(skip).limit(limit)
-        return self.session.exec(statement).all()
+    def count_total(self, *, filters: dict[str, Any] | None = None) -> TotalCount:
+        """Total de registros para la paginación de `get_all`. Sin filtros se
+        estima a partir de las estadísticas de la tabla; con filtros se cuenta
+        hasta un tope (ver `src/repository/counting.py`).
+        """
+        if not filters:
+            return total_counter.estimate(self.session, self.model)
+        return total_counter.count(
+            self.session,
+            self._apply_filters(select(self.model.id), filters),
+        )
 
     def update(self, *, db_obj: ModelType, obj_in: UpdateSchemaType) -> ModelType:
         """Actualiza un registro existente en la base de datos.
+        Emite un único `UPDATE ... RETURNING` que refresca `db_obj` en la sesión
+        con los valores finales (incluido `updated_at`).
         """
         obj_data = obj_in.model_dump(exclude_unset=True)
-        for field, value in obj_data.items():
-            setattr(db_obj, field, value)
+        if not obj_data:
+            return db_obj
 
+        statement = (
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(
+                **self._with_derived_values(obj_data),
+                version=self.model.version + 1,
+            )
+            .returning(self.model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
         try:
-            self.session.add(db_obj)
-            self._save(db_obj)
-            return db_obj
+            return self.session.exec(statement).scalar_one()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def update_by_id(
+        self,
+        *,
+        id: Any,
+        obj_in: UpdateSchemaType,
+        expected_version: int | None = None,
+    ) -> ModelType:
+        """Actualiza un registro por su ID con una sola sentencia
+        `UPDATE ... WHERE id = :id [AND version = :version] RETURNING`, sin
+        leerlo antes. Incrementa `version` en cada actualización.
+
+        Lanza `EntityNotFoundError` si no existe y `VersionConflictError` si
+        existe pero su versión no es `expected_version`. Solo en esos casos se
+        hace una segunda consulta para distinguir ambos.
+        """
+        statement = update(self.model).where(self.model.id == id)
+        if expected_version is not None:
+            statement = statement.where(self.model.version == expected_version)
+        statement = (
+            statement.values(
+                **self._with_derived_values(obj_in.model_dump(exclude_unset=True)),
+                version=self.model.version + 1,
+            )
+            .returning(self.model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        try:
+            db_obj = self.session.exec(statement).scalar_one_or_none()
         except Exception:
             self.session.rollback()
             raise
 
+        if db_obj is not None:
+            return db_obj
+        raise self._missing_error(id, expected_version)
+
+    def _missing_error(self, id: Any, expected_version: int | None) -> Exception:
+        """Error de una escritura por ID que no encontró la fila: la entidad no
+        existe o no está en `expected_version`.
+        """
+        if expected_version is not None:
+            exists = self.session.exec(
+                select(self.model.id).where(self.model.id == id),
+            ).first()
+            if exists is not None:
+                return VersionConflictError(
+                    f"{self.model.__name__} con id {id} no está en la versión "
+                    f"{expected_version}.",
+                )
+        return EntityNotFoundError(f"{self.model.__name__} con id {id} no encontrado.")
+
+    def patch_by_id(
+        self,
+        *,
+        id: Any,
+        patch: MergePatchSchema,
+        expected_version: int | None = None,
+    ) -> ModelType:
+        """Aplica un JSON Merge Patch con `update_by_id`: solo se escriben los
+        campos presentes en `patch`.
+
+        Un campo de texto puede traer un `TextDelta` en lugar del valor. El delta
+        se aplica sobre el texto de la versión `expected_version`, que en ese
+        caso es obligatoria (`VersionRequiredError`); si el resultado no cambia
+        el texto, el campo no se escribe. Si no queda ningún campo que escribir
+        se devuelve la entidad sin modificarla: conserva su versión (y su ETag).
+        """
+        values = {name: getattr(patch, name) for name in patch.model_fields_set}
+        deltas = {
+            name: value
+            for name, value in values.items()
+            if isinstance(value, TextDelta)
+        }
+        if deltas:
+            if expected_version is None:
+                raise VersionRequiredError(
+                    "Los deltas de texto requieren la versión sobre la que se "
+                    "calcularon.",
+                )
+            texts = self._texts_at_version(id, list(deltas), expected_version)
+            if texts is None:
+                raise self._missing_error(id, expected_version)
+            for name, delta in deltas.items():
+                text = apply_delta(texts[name], delta)
+                if text == texts[name]:
+                    del values[name]
+                else:
+                    values[name] = text
+        if not values:
+            current = self.get_by_id(id=id)
+            if current is None or expected_version not in (None, current.version):
+                raise self._missing_error(id, expected_version)
+            return current
+        return self.update_by_id(
+            id=id,
+            obj_in=patch.update_schema(**values),
+            expected_version=expected_version,
+        )
+
+    def _texts_at_version(
+        self,
+        id: Any,
+        names: list[str],
+        version: int,
+    ) -> dict[str, str] | None:
+        """Valores de los campos `names` de la entidad si está en `version`."""
+        # Con `id` en la consulta `exec` devuelve filas aunque se pida un solo campo.
+        columns = [getattr(self.model, name) for name in names]
+        row = self.session.exec(
+            select(self.model.id, *columns).where(
+                self.model.id == id, self.model.version == version
+            ),
+        ).first()
+        return None if row is None else dict(zip(names, row[1:], strict=True))
+
     def delete(self, *, entity: ModelType) -> None:
         """Elimina una entidad de la sesión.
         Si ocurre un error (ej. violación de FK durante el flush),
@@ -119,6 +317,38 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             self.session.rollback()
             raise
 
+    def delete_by_id(self, *, id: Any) -> None:
+        """Elimina un registro por su ID con una sola sentencia
+        `DELETE ... RETURNING id`, sin cargarlo. Las filas dependientes (secciones,
+        enlaces) las elimina la base de datos con `ON DELETE CASCADE`.
+
+        Lanza `EntityNotFoundError` si no existe y `EntityInUseError` si una clave
+        foránea sin cascada lo impide.
+        """
+        # "fetch" usa el RETURNING para sacar la entidad de la sesión sin tener
+        # que cargarla para evaluar el WHERE.
+        statement = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        try:
+            deleted_id = self.session.exec(statement).scalar_one_or_none()
+        except IntegrityError as e:
+            self.session.rollback()
+            raise EntityInUseError(
+                f"{self.model.__name__} con id {id} tiene registros relacionados.",
+            ) from e
+        except Exception:
+            self.session.rollback()
+            raise
+        if deleted_id is None:
+            raise EntityNotFoundError(
+                f"{self.model.__name__} con id {id} no encontrado.",
+            )
+        self.loader.forget(self.model, id)
+
     def commit(self) -> None:
         """Confirma la transacción actual."""
         self.session.commit()
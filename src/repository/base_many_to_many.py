@@ -44,7 +44,7 @@ class BaseManyToManyRepository(
         if not entity:
             raise ValueError(f"{self.model.__name__} con id {entity_id} no encontrado.")
 
-        related_entity = self.session.get(related_model, related_entity_id)
+        related_entity = self.loader.load(related_model, related_entity_id)
         if not related_entity:
             raise ValueError(
                 f"{related_model.__name__} con id {related_entity_id} no encontrado.",
@@ -84,7 +84,7 @@ class BaseManyToManyRepository(
         if not entity:
             raise ValueError(f"{self.model.__name__} con id {entity_id} no encontrado.")
 
-        related_entity = self.session.get(related_model, related_entity_id)
+        related_entity = self.loader.load(related_model, related_entity_id)
         if not related_entity:
             raise ValueError(
                 f"{related_model.__name__} con id {related_entity_id} no encontrado.",
@@ -99,7 +99,9 @@ class BaseManyToManyRepository(
         return entity
 
     def get_related_entities(
-        self, entity_id: uuid.UUID, relation_attr: str,
+        self,
+        entity_id: uuid.UUID,
+        relation_attr: str,
     ) -> list[RelatedModelType]:
         """Método genérico para obtener todas las entidades relacionadas.
 
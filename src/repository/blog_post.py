@@ -1,14 +1,27 @@
 import uuid
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any
 
 from fastapi import Depends
-from sqlmodel import Session, select
+from sqlalchemy import insert, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
 
-from src.core.database.config import get_session
-from src.domain.models.blog_post import BlogPost
+from src.core.database.config import CurrentSession
+from src.domain.models.blog_post import BlogPost, missing_body_error
+from src.domain.models.blog_post_body import BlogPostBody
 from src.domain.models.category import Category
 from src.domain.models.tag import Tag
 from src.domain.schemas.blog_post import BlogPostCreateSchema, BlogPostUpdateSchema
+from src.domain.schemas.blog_post_stats import BlogPostStatsReadSchema
+from src.domain.schemas.category import CategoryReadSchema
+from src.domain.schemas.tag import TagReadSchema
+from src.repository.feeds import record_feed_change
+from src.repository.loader import CurrentEntityLoader
+from src.repository.related_posts import RelatedPostsRepository, mark_tags_changed
+from src.repository.rendered_content import rendered_columns
+from src.repository.taxonomy import category_of, tags_of
+from src.repository.view_stats import ViewStatsRepository
 
 from .base_many_to_many import BaseManyToManyRepository
 
@@ -22,33 +35,173 @@ class BlogPostRepository(
     La sesión de base de datos (session) se inyecta a través del constructor de BaseRepository.
     """
 
-    def add_tag_to_blog_post(self, blog_post_id: uuid.UUID, tag_id: uuid.UUID):
-        """Agrega un tag a un blog post.
+    # La categoría y los tags se resuelven con el snapshot de taxonomía: de los
+    # tags solo se cargan los enlaces (ver src/repository/taxonomy.py).
+    # El contenido está en `BlogPostBody`: las lecturas de metadatos no lo cargan.
+    eager_relations = ("body", "tag_links", "sections")
+
+    # Los cambios de posts se anotan en la sesión para caducar, al confirmarse,
+    # el sitemap y los feeds afectados (ver src/repository/feeds.py).
+
+    def _with_derived_values(self, values: dict[str, Any]) -> dict[str, Any]:
+        # `content` no es una columna de `blogpost`: lo escribe `_write_body`.
+        values = super()._with_derived_values(values)
+        return {key: value for key, value in values.items() if key != "content"}
+
+    def _apply_filters(self, statement, filters: dict[str, Any] | None):
+        """Además de los filtros por igualdad admite `created_from` (incluido) y
+        `created_to` (excluido) sobre `created_at`. Con la tabla particionada,
+        la consulta solo recorre las particiones del rango.
+        """
+        filters = dict(filters or {})
+        created_from = _local_naive(filters.pop("created_from", None))
+        created_to = _local_naive(filters.pop("created_to", None))
+        statement = super()._apply_filters(statement, filters)
+        if created_from is not None:
+            statement = statement.where(BlogPost.created_at >= created_from)
+        if created_to is not None:
+            statement = statement.where(BlogPost.created_at < created_to)
+        return statement
+
+    def _texts_at_version(
+        self,
+        id: uuid.UUID,
+        names: list[str],
+        version: int,
+    ) -> dict[str, str] | None:
+        # Los deltas solo se admiten en `content`, que está en `BlogPostBody`.
+        row = self.session.exec(
+            select(BlogPostBody.content)
+            .join(BlogPost, BlogPost.id == BlogPostBody.blog_post_id)
+            .where(BlogPost.id == id, BlogPost.version == version),
+        ).first()
+        return None if row is None else {"content": row}
+
+    def _write_body(self, blog_post: BlogPost, content: str, *, new: bool) -> None:
+        """Inserta o actualiza el contenido de `blog_post` (con su HTML) en una
+        sentencia con RETURNING y lo fija como ya cargado en el post. Si un post
+        existente no tiene contenido, lanza `MissingBlogPostBodyError`.
+        """
+        values = {"content": content, **rendered_columns(content)}
+        if new:
+            statement = insert(BlogPostBody).values(
+                blog_post_id=blog_post.id,
+                **values,
+            )
+        else:
+            statement = (
+                update(BlogPostBody)
+                .where(BlogPostBody.blog_post_id == blog_post.id)
+                .values(**values)
+                .execution_options(
+                    populate_existing=True,
+                    synchronize_session=False,
+                )
+            )
+        body = self.session.exec(statement.returning(BlogPostBody)).scalar_one_or_none()
+        if body is None:
+            raise missing_body_error(blog_post.id)
+        set_committed_value(blog_post, "body", body)
+
+    def create(self, *, obj_in: BlogPostCreateSchema) -> BlogPost:
+        blog_post = super().create(obj_in=obj_in)
+        self._write_body(blog_post, obj_in.content, new=True)
+        record_feed_change(self.session, "post", blog_post.id, blog_post.category_id)
+        record_feed_change(self.session, "count")
+        return blog_post
+
+    def create_from_dict(self, *, obj_dict: dict[str, Any]) -> BlogPost:
+        blog_post = super().create_from_dict(obj_dict=obj_dict)
+        self._write_body(blog_post, obj_dict["content"], new=True)
+        record_feed_change(self.session, "post", blog_post.id, blog_post.category_id)
+        record_feed_change(self.session, "count")
+        return blog_post
+
+    def update(self, *, db_obj: BlogPost, obj_in: BlogPostUpdateSchema) -> BlogPost:
+        return self._record_update(super().update(db_obj=db_obj, obj_in=obj_in), obj_in)
+
+    def update_by_id(
+        self,
+        *,
+        id: uuid.UUID,
+        obj_in: BlogPostUpdateSchema,
+        expected_version: int | None = None,
+    ) -> BlogPost:
+        blog_post = super().update_by_id(
+            id=id,
+            obj_in=obj_in,
+            expected_version=expected_version,
+        )
+        return self._record_update(blog_post, obj_in)
+
+    def _record_update(
+        self,
+        blog_post: BlogPost,
+        obj_in: BlogPostUpdateSchema,
+    ) -> BlogPost:
+        # El UPDATE de `blogpost` ya incrementó `version` aunque solo cambie el
+        # contenido.
+        if obj_in.content is not None:
+            self._write_body(blog_post, obj_in.content, new=False)
+        # Si cambia la categoría no se conoce la anterior: caducan los feeds de
+        # todas las categorías.
+        moved = "category_id" in obj_in.model_fields_set
+        category_id = None if moved else blog_post.category_id
+        record_feed_change(self.session, "post", blog_post.id, category_id)
+        return blog_post
+
+    def delete_by_id(self, *, id: uuid.UUID) -> None:
+        """Elimina un blog post y marca los posts que lo tenían como relacionado
+        para completar su lista con otro vecino.
         """
-        return self.add_related_entity(
+        listing_ids = RelatedPostsRepository(self.session).get_listing_ids([id])
+        super().delete_by_id(id=id)
+        mark_tags_changed(self.session, listing_ids)
+        record_feed_change(self.session, "post", id, None)
+        record_feed_change(self.session, "count")
+
+    def add_tag_to_blog_post(self, blog_post_id: uuid.UUID, tag_id: uuid.UUID):
+        """Agrega un tag a un blog post."""
+        blog_post = self.add_related_entity(
             entity_id=blog_post_id,
             related_entity_id=tag_id,
             related_model=Tag,
             relation_attr="tags",
         )
+        mark_tags_changed(self.session, [blog_post_id])
+        return blog_post
 
     def remove_tag_from_blog_post(self, blog_post_id: uuid.UUID, tag_id: uuid.UUID):
-        """Elimina un tag de un blog post.
-        """
-        return self.remove_related_entity(
+        """Elimina un tag de un blog post."""
+        blog_post = self.remove_related_entity(
             entity_id=blog_post_id,
             related_entity_id=tag_id,
             related_model=Tag,
             relation_attr="tags",
         )
+        mark_tags_changed(self.session, [blog_post_id])
+        return blog_post
+
+    def get_tags_for_blog_post(
+        self,
+        blog_post_id: uuid.UUID,
+    ) -> list[TagReadSchema] | list[Tag]:
+        """Obtiene todos los tags asociados a un blog post, desde el snapshot de
+        taxonomía.
+
+        Raises:
+            ValueError: Si el blog post no existe
 
-    def get_tags_for_blog_post(self, blog_post_id: uuid.UUID) -> list[Tag]:
-        """Obtiene todos los tags asociados a un blog post.
         """
-        return self.get_related_entities(entity_id=blog_post_id, relation_attr="tags")
+        blog_post = self.get_by_id(id=blog_post_id)
+        if not blog_post:
+            raise ValueError(f"BlogPost con id {blog_post_id} no encontrado.")
+        return tags_of(blog_post)
 
     def assign_category_to_blog_post(
-        self, blog_post_id: uuid.UUID, category_id: uuid.UUID,
+        self,
+        blog_post_id: uuid.UUID,
+        category_id: uuid.UUID,
     ) -> BlogPost:
         """Asigna una categoría a un blog post.
 
@@ -67,19 +220,26 @@ class BlogPostRepository(
         if not blog_post:
             raise ValueError(f"BlogPost con id {blog_post_id} no encontrado.")
 
-        category = self.session.get(Category, category_id)
+        category = self.loader.load(Category, category_id)
         if not category:
             raise ValueError(f"Category con id {category_id} no encontrada.")
 
         blog_post.category_id = category_id
         blog_post.category = category
+        blog_post.version = BlogPost.version + 1
 
         self.session.add(blog_post)
+        self.session.flush()
+        record_feed_change(self.session, "post", blog_post_id, None)
 
         return blog_post
 
-    def get_category_for_blog_post(self, blog_post_id: uuid.UUID) -> Category | None:
-        """Obtiene la categoría asociada a un blog post.
+    def get_category_for_blog_post(
+        self,
+        blog_post_id: uuid.UUID,
+    ) -> CategoryReadSchema | Category | None:
+        """Obtiene la categoría asociada a un blog post, desde el snapshot de
+        taxonomía.
 
         Args:
             blog_post_id: ID del blog post
@@ -95,10 +255,66 @@ class BlogPostRepository(
         if not blog_post:
             raise ValueError(f"BlogPost con id {blog_post_id} no encontrado.")
 
-        return blog_post.category
+        return category_of(blog_post)
+
+    def get_related_blog_posts(
+        self,
+        blog_post_id: uuid.UUID,
+        limit: int = 10,
+    ) -> list[BlogPost]:
+        """Obtiene los blog posts más parecidos por sus tags, del más al menos
+        parecido, desde el índice precalculado.
+
+        Raises:
+            ValueError: Si el blog post no existe
+
+        """
+        related_ids = RelatedPostsRepository(self.session).get_related_ids(
+            blog_post_id,
+            limit,
+        )
+        # Sin vecinos solo hace falta comprobar si el post existe.
+        if not related_ids and self.get_by_id(id=blog_post_id) is None:
+            raise ValueError(f"BlogPost con id {blog_post_id} no encontrado.")
+        return self.get_many(related_ids)
+
+    def get_trending_blog_posts(self, limit: int = 10) -> list[BlogPost]:
+        """Obtiene los blog posts con más visitas recientes, de mayor a menor
+        puntuación de tendencia.
+        """
+        return self.get_many(ViewStatsRepository(self.session).get_trending_ids(limit))
+
+    def get_blog_post_stats(self, blog_post_id: uuid.UUID) -> BlogPostStatsReadSchema:
+        """Obtiene las visitas y la puntuación de tendencia actual de un blog post.
+
+        Raises:
+            ValueError: Si el blog post no existe
+
+        """
+        stats_repo = ViewStatsRepository(self.session)
+        stats = stats_repo.get_stats(blog_post_id)
+        if stats is None:
+            if self.get_by_id(id=blog_post_id) is None:
+                raise ValueError(f"BlogPost con id {blog_post_id} no encontrado.")
+            return BlogPostStatsReadSchema(
+                blog_post_id=blog_post_id,
+                views=0,
+                trending_score=0.0,
+            )
+        return BlogPostStatsReadSchema(
+            blog_post_id=blog_post_id,
+            views=stats.views,
+            trending_score=stats_repo.trending_score(stats),
+        )
 
     def get_blog_posts_by_category(
-        self, category_id: uuid.UUID, skip: int = 0, limit: int = 100,
+        self,
+        category_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        *,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
     ) -> list[BlogPost]:
         """Obtiene todos los blog posts pertenecientes a una categoría.
 
@@ -106,24 +322,49 @@ class BlogPostRepository(
             category_id: ID de la categoría
             skip: Número de registros a saltar (para paginación)
             limit: Límite de registros a devolver (para paginación)
+            created_from: Solo los creados desde esta fecha (incluida)
+            created_to: Solo los creados antes de esta fecha
 
         Returns:
             Lista de blog posts que pertenecen a la categoría
 
         """
-        statement = (
-            select(BlogPost)
-            .where(BlogPost.category_id == category_id)
-            .offset(skip)
-            .limit(limit)
+        statement = self._apply_filters(
+            select(BlogPost),
+            {
+                "category_id": category_id,
+                "created_from": created_from,
+                "created_to": created_to,
+            },
         )
-        return self.session.exec(statement).all()
+        blog_posts = list(self.session.exec(statement.offset(skip).limit(limit)).all())
+        self.loader.load_relations(blog_posts, *self.eager_relations)
+        return blog_posts
+
+
+def created_range(
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> dict[str, datetime]:
+    """Filtros de `_apply_filters` para un rango de fechas de alta; vacío si no
+    se indica ningún extremo (así `count_total` sigue usando la estimación).
+    """
+    bounds = {"created_from": created_from, "created_to": created_to}
+    return {key: value for key, value in bounds.items() if value is not None}
+
+
+def _local_naive(moment: datetime | None) -> datetime | None:
+    # `created_at` se guarda en hora local sin zona (ver Base).
+    if moment is not None and moment.tzinfo is not None:
+        return moment.astimezone().replace(tzinfo=None)
+    return moment
 
 
 def get_blog_post_repository(
-    session: Session = Depends(get_session),
+    session: CurrentSession,
+    loader: CurrentEntityLoader,
 ) -> BlogPostRepository:
-    return BlogPostRepository(model=BlogPost, db_session=session)
+    return BlogPostRepository(model=BlogPost, db_session=session, loader=loader)
 
 
 CurrentBlogPostRepo = Annotated[BlogPostRepository, Depends(get_blog_post_repository)]
@@ -0,0 +1,148 @@
+"""Contadores en memoria con escritura diferida (visitas, impresiones).
+
+Cada proceso acumula los incrementos por clave y cada
+`VIEW_FLUSH_INTERVAL_SECONDS` los escribe con un único upsert aditivo por
+contador (`valor = valor + excluded.valor`). Varios workers pueden vaciar a la
+vez sin coordinarse: ninguno lee y reescribe el valor de otro. Las filas se
+escriben ordenadas por clave para que dos upserts concurrentes bloqueen en el
+mismo orden y no se produzcan interbloqueos.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Sequence
+from threading import Lock
+
+import anyio.to_thread
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, SQLModel
+
+from src.core.database.config import get_engine
+from src.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_flushed = registry.counter(
+    "buffered_counter_flushed_total",
+    "Incrementos escritos en la base de datos por los vaciados de cada contador.",
+    ("counter",),
+)
+_dropped = registry.counter(
+    "buffered_counter_dropped_total",
+    "Incrementos descartados: buffer lleno o entidad inexistente al vaciar.",
+    ("counter",),
+)
+_flush_errors = registry.counter(
+    "buffered_counter_flush_errors_total",
+    "Vaciados que fallaron y se reintentarán.",
+    ("counter",),
+)
+
+# Escribe los incrementos `{clave: cantidad}` producidos hasta el instante `at`
+# y devuelve cuántos se escribieron (los de entidades inexistentes se descartan).
+ApplyFunction = Callable[[Session, dict[uuid.UUID, int], float], int]
+
+
+def dialect_insert(model: type[SQLModel], dialect_name: str):
+    """`INSERT` con soporte de `on_conflict_do_update` para el motor en uso."""
+    if dialect_name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+class BufferedCounter:
+    """Incrementos pendientes de escribir, acumulados por clave en memoria."""
+
+    def __init__(
+        self,
+        name: str,
+        apply: ApplyFunction,
+        *,
+        max_keys: int | None = None,
+    ):
+        self.name = name
+        self._apply = apply
+        # Tope de claves distintas en el buffer: acota la memoria si llegan
+        # incrementos para IDs arbitrarios; las claves presentes siguen sumando.
+        self.max_keys = max_keys
+        self._counts: Counter[uuid.UUID] = Counter()
+        self._lock = Lock()
+
+    def record(self, key: uuid.UUID, count: int = 1) -> bool:
+        """Anota `count` incrementos; devuelve False si el buffer está lleno."""
+        with self._lock:
+            if (
+                self.max_keys is not None
+                and key not in self._counts
+                and len(self._counts) >= self.max_keys
+            ):
+                _dropped.labels(self.name).inc(count)
+                return False
+            self._counts[key] += count
+        return True
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(self._counts.values())
+
+    def drain(self) -> dict[uuid.UUID, int]:
+        """Extrae y devuelve los incrementos pendientes, dejando el buffer vacío."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return dict(counts)
+
+    def restore(self, counts: dict[uuid.UUID, int]) -> None:
+        """Devuelve al buffer incrementos extraídos que no se pudieron escribir."""
+        with self._lock:
+            self._counts.update(counts)
+
+    def flush(self, session: Session | None = None) -> int:
+        """Escribe los incrementos pendientes. Sin `session` abre una propia y
+        confirma; con ella, la confirmación queda a cargo de quien llama. Si la
+        escritura falla los incrementos vuelven al buffer para el próximo intento.
+        """
+        counts = self.drain()
+        if not counts:
+            return 0
+        at = time.time()
+        try:
+            if session is not None:
+                written = self._apply(session, counts, at)
+            else:
+                with Session(get_engine()) as own_session:
+                    written = self._apply(own_session, counts, at)
+                    own_session.commit()
+        except Exception:
+            self.restore(counts)
+            _flush_errors.labels(self.name).inc()
+            raise
+        _flushed.labels(self.name).inc(written)
+        _dropped.labels(self.name).inc(sum(counts.values()) - written)
+        return written
+
+
+async def flush_periodically(
+    counters: Sequence[BufferedCounter],
+    interval: float,
+) -> None:
+    """Vacía `counters` cada `interval` segundos hasta que se cancela la tarea.
+    El vaciado corre en un hilo; si se cancela a mitad, termina antes de salir.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        await anyio.to_thread.run_sync(flush_all, counters)
+
+
+def flush_all(counters: Sequence[BufferedCounter]) -> None:
+    """Vacía cada contador; el fallo de uno no impide vaciar los demás."""
+    for counter in counters:
+        try:
+            counter.flush()
+        except Exception:
+            logger.exception(
+                "No se pudo vaciar el contador %s; se reintentará.",
+                counter.name,
+            )
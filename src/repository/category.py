@@ -1,25 +1,123 @@
+import uuid
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy import delete, select, update
 from sqlmodel import Session
 
-from src.core.database.config import get_session
+from src.core.database.config import CurrentSession
+from src.domain.models.blog_post import BlogPost
 from src.domain.models.category import Category
-from src.domain.schemas.category import CategoryCreateSchema, CategoryUpdateSchema
+from src.domain.schemas.category import (
+    CategoryCreateSchema,
+    CategoryDeletePolicy,
+    CategoryUpdateSchema,
+)
 from src.repository.base import BaseRepository
+from src.repository.feeds import record_feed_change
+from src.repository.loader import CurrentEntityLoader, EntityLoader
+from src.repository.related_posts import RelatedPostsRepository, mark_tags_changed
+from src.repository.taxonomy import TaxonomyRepositoryMixin
 
 
 class CategoryRepository(
+    TaxonomyRepositoryMixin,
     BaseRepository[Category, CategoryCreateSchema, CategoryUpdateSchema],
 ):
-    def __init__(self, model: type, db_session: Session):
-        super().__init__(model, db_session)
+    def __init__(
+        self,
+        model: type,
+        db_session: Session,
+        loader: EntityLoader | None = None,
+    ):
+        super().__init__(model, db_session, loader)
+
+    # El nombre de la categoría aparece en su feed (ver src/repository/feeds.py).
+
+    def update(
+        self,
+        *,
+        db_obj: Category,
+        obj_in: CategoryUpdateSchema,
+    ) -> Category:
+        category = super().update(db_obj=db_obj, obj_in=obj_in)
+        record_feed_change(self.session, "category", category.id)
+        return category
+
+    def update_by_id(
+        self,
+        *,
+        id: uuid.UUID,
+        obj_in: CategoryUpdateSchema,
+        expected_version: int | None = None,
+    ) -> Category:
+        category = super().update_by_id(
+            id=id,
+            obj_in=obj_in,
+            expected_version=expected_version,
+        )
+        record_feed_change(self.session, "category", id)
+        return category
+
+    def delete_with_policy(
+        self,
+        *,
+        id: uuid.UUID,
+        policy: CategoryDeletePolicy = CategoryDeletePolicy.RESTRICT,
+        reassign_to: uuid.UUID | None = None,
+    ) -> None:
+        """Elimina una categoría aplicando `policy` a sus blog posts:
+
+        * `RESTRICT`: falla con `EntityInUseError` si tiene blog posts.
+        * `REASSIGN`: los mueve a `reassign_to` con un único UPDATE.
+        * `CASCADE`: los elimina con un único DELETE; sus secciones y enlaces
+          los elimina la base de datos. Los posts que tenían alguno como
+          relacionado se marcan para completar su lista con otro vecino.
+
+        Raises:
+            ValueError: Si `REASSIGN` no indica una categoría destino existente
+            EntityNotFoundError: Si la categoría no existe
+            EntityInUseError: Si con `RESTRICT` la categoría tiene blog posts
+
+        """
+        if policy is CategoryDeletePolicy.REASSIGN:
+            if reassign_to is None or reassign_to == id:
+                raise ValueError(
+                    "La política 'reassign' requiere otra categoría en reassign_to.",
+                )
+            if self.loader.load(Category, reassign_to) is None:
+                raise ValueError(
+                    f"La categoría destino {reassign_to} no existe.",
+                )
+            self.session.exec(
+                update(BlogPost)
+                .where(BlogPost.category_id == id)
+                .values(category_id=reassign_to, version=BlogPost.version + 1),
+            )
+        elif policy is CategoryDeletePolicy.CASCADE:
+            post_ids = set(
+                self.session.exec(
+                    select(BlogPost.id).where(BlogPost.category_id == id),
+                ).scalars(),
+            )
+            listing_ids = RelatedPostsRepository(self.session).get_listing_ids(
+                list(post_ids),
+            )
+            self.session.exec(delete(BlogPost).where(BlogPost.category_id == id))
+            self.loader.forget(BlogPost)
+            mark_tags_changed(self.session, set(listing_ids) - post_ids)
+        self.delete_by_id(id=id)
+        if policy is not CategoryDeletePolicy.RESTRICT:
+            # Cambios masivos de posts: caducan el sitemap y todos los feeds.
+            record_feed_change(self.session, "all")
+        record_feed_change(self.session, "category", id)
 
 
 def get_category_repository(
-    session: Session = Depends(get_session),
+    session: CurrentSession,
+    loader: CurrentEntityLoader,
 ) -> CategoryRepository:
-    return CategoryRepository(model=Category, db_session=session)
+    return CategoryRepository(model=Category, db_session=session, loader=loader)
 
 
 CurrentCategoryRepo = Annotated[CategoryRepository, Depends(get_category_repository)]
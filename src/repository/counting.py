@@ -0,0 +1,116 @@
+"""Totales para la paginación de los listados.
+
+Un `COUNT(*)` exacto sobre `blogpost` en cada petición es demasiado caro, así
+que los totales se obtienen según el caso:
+
+* Listados sin filtros: la estimación del planificador de PostgreSQL
+  (`pg_class.reltuples`, la suma de sus particiones si la tabla está
+  particionada). Si la tabla es pequeña (estimación por debajo del tope) o no
+  hay estimación, se cuenta de forma exacta, que es barato.
+* Listados filtrados: conteo exacto limitado a `cap` filas. Si hay más, se
+  devuelve `cap` marcado como no exacto ("más de N").
+
+Los resultados se guardan `cache_seconds` segundos por consulta y parámetros.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy import Select, func, select, text
+from sqlmodel import Session, SQLModel
+
+from src.core.settings import app_settings
+
+# Una tabla particionada no tiene filas propias: se suman las de sus particiones
+# ya analizadas (ver src/core/database/partitioning.py).
+ESTIMATE_SQL = """
+SELECT CASE WHEN c.relkind = 'p' THEN (
+    SELECT sum(p.reltuples) FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid
+    WHERE i.inhparent = c.oid AND p.reltuples >= 0
+) ELSE c.reltuples END
+FROM pg_class c WHERE c.oid = to_regclass(:name)
+"""
+
+
+@dataclass(frozen=True)
+class TotalCount:
+    value: int
+    # False si es una estimación o si el conteo alcanzó el tope.
+    exact: bool
+
+
+class TotalCounter:
+    def __init__(self, *, cap: int, cache_seconds: float, max_entries: int = 1024):
+        self.cap = cap
+        self.cache_seconds = cache_seconds
+        self.max_entries = max_entries
+        self._cache: OrderedDict[tuple, tuple[float, TotalCount]] = OrderedDict()
+        self._lock = Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, key: tuple) -> TotalCount | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, total = entry
+            if expires < monotonic():
+                del self._cache[key]
+                return None
+            return total
+
+    def _store(self, key: tuple, total: TotalCount) -> TotalCount:
+        if self.cache_seconds <= 0:
+            return total
+        with self._lock:
+            self._cache[key] = (monotonic() + self.cache_seconds, total)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return total
+
+    def count(self, session: Session, statement: Select) -> TotalCount:
+        """Cuenta las filas de `statement` (sin paginar) hasta `cap`."""
+        compiled = statement.compile(session.get_bind())
+        key = ("count", str(compiled), repr(sorted(compiled.params.items())))
+        total = self._cached(key)
+        if total is not None:
+            return total
+
+        limited = statement.order_by(None).limit(self.cap + 1).subquery()
+        rows = session.exec(select(func.count()).select_from(limited)).one()[0]
+        if rows > self.cap:
+            total = TotalCount(value=self.cap, exact=False)
+        else:
+            total = TotalCount(value=rows, exact=True)
+        return self._store(key, total)
+
+    def estimate(self, session: Session, model: type[SQLModel]) -> TotalCount:
+        """Total de filas de la tabla de `model`, estimado si es grande."""
+        table = model.__table__
+        key = ("estimate", table.name)
+        total = self._cached(key)
+        if total is not None:
+            return total
+
+        if session.get_bind().dialect.name == "postgresql":
+            reltuples = session.exec(
+                text(ESTIMATE_SQL),
+                params={"name": table.name},
+            ).scalar()
+            # -1: la tabla nunca se ha analizado.
+            if reltuples is not None and reltuples >= self.cap:
+                return self._store(key, TotalCount(value=int(reltuples), exact=False))
+
+        return self._store(key, self.count(session, select(table.c.id)))
+
+
+total_counter = TotalCounter(
+    cap=app_settings.TOTAL_COUNT_CAP,
+    cache_seconds=app_settings.TOTAL_COUNT_CACHE_SECONDS,
+)
@@ -0,0 +1,22 @@
+class EntityNotFoundError(ValueError):
+    """La entidad solicitada no existe."""
+
+
+class EntityInUseError(Exception):
+    """La entidad no puede eliminarse porque otras filas la referencian."""
+
+
+class VersionConflictError(Exception):
+    """La entidad existe pero su versión no coincide con la esperada: otra
+    petición la modificó entre medias.
+    """
+
+
+class VersionRequiredError(Exception):
+    """La operación solo puede aplicarse sobre una versión concreta de la
+    entidad y no se indicó ninguna.
+    """
+
+
+class InvalidDeltaError(ValueError):
+    """El delta de texto no corresponde al texto sobre el que se aplica."""
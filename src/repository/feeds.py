@@ -0,0 +1,447 @@
+"""Sitemap y feeds RSS/Atom generados en el servidor y cacheados.
+
+Los documentos se generan recorriendo los posts con consultas en streaming
+(cursor de servidor, `yield_per`), sin paginar con offset, y se guardan en
+memoria ya comprimidos con gzip junto con su ETag y su `Last-Modified`.
+
+Solo se regeneran cuando cambian los posts de su ámbito. `BlogPostRepository` y
+`CategoryRepository` anotan los cambios en la sesión y, al confirmarse, se marcan
+como caducados los documentos afectados:
+
+* el feed global, con cualquier cambio de un post,
+* el feed de una categoría, con los cambios de sus posts o de la categoría,
+* el sitemap del rango de IDs del post cambiado y, si cambia el número de posts,
+  el índice de sitemaps.
+
+Cada proceso tiene su propia caché: los cambios hechos en otro proceso se ven
+como mucho `FEED_CACHE_TTL_SECONDS` después.
+"""
+
+import hashlib
+import math
+import uuid
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from threading import Lock
+from time import monotonic
+from typing import Any
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, select
+
+from src.core.markdown import render_markdown
+from src.core.settings import app_settings
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_body import BlogPostBody
+from src.domain.models.category import Category
+
+_CHANGES_KEY = "feed_changes"
+_STREAM_BATCH = 1_000
+_WRITE_BUFFER = 64 * 1024
+
+RSS_MEDIA_TYPE = "application/rss+xml; charset=utf-8"
+ATOM_MEDIA_TYPE = "application/atom+xml; charset=utf-8"
+XML_MEDIA_TYPE = "application/xml; charset=utf-8"
+
+# Cambios que caducan documentos tras el commit:
+#   ("post", blog_post_id, category_id)   category_id None: cualquier categoría
+#   ("count",)                            se crearon o borraron posts
+#   ("category", category_id)             cambió la categoría (p. ej. su nombre)
+#   ("all",)                              cambios masivos
+Change = tuple[Any, ...]
+# ("feed", category_id | None, "rss" | "atom"), ("sitemap_index",) o
+# ("sitemap", número de sitemaps, sitemap)
+DocumentKey = tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class CachedDocument:
+    body: bytes  # comprimido con gzip
+    etag: str
+    last_modified: datetime
+    media_type: str
+    # Instante (monotonic) en que se generó; -inf si está caducado.
+    built_at: float
+    # Número de sitemaps (solo en el índice).
+    sitemaps: int = 1
+
+
+class _GzipWriter:
+    """Comprime el documento a medida que se escribe."""
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+        self._parts: list[bytes] = []
+        self._buffer: list[str] = []
+        self._buffered = 0
+
+    def write(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= _WRITE_BUFFER:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._parts.append(self._compressor.compress("".join(self._buffer).encode()))
+        self._buffer.clear()
+        self._buffered = 0
+
+    def finish(self) -> bytes:
+        self._flush()
+        self._parts.append(self._compressor.flush())
+        return b"".join(self._parts)
+
+
+def _utc(value: datetime) -> datetime:
+    # Las fechas se guardan sin zona, en la hora local del servidor.
+    return value.astimezone(UTC).replace(microsecond=0)
+
+
+def post_url(blog_post_id: uuid.UUID) -> str:
+    path = app_settings.PUBLIC_BLOG_POST_PATH.format(blog_post_id=blog_post_id)
+    return f"{app_settings.PUBLIC_SITE_URL.rstrip('/')}{path}"
+
+
+def sitemap_url(sitemap: int) -> str:
+    return f"{app_settings.PUBLIC_API_URL.rstrip('/')}/sitemaps/{sitemap}.xml"
+
+
+def sitemap_count(post_count: int) -> int:
+    """Número de sitemaps: potencia de dos para que cada uno cubra un rango fijo
+    de IDs y un cambio solo afecte al sitemap de su rango.
+    """
+    needed = math.ceil(post_count / app_settings.SITEMAP_URLS_PER_FILE)
+    return 1 if needed <= 1 else 1 << (needed - 1).bit_length()
+
+
+def sitemap_of(blog_post_id: uuid.UUID, sitemaps: int) -> int:
+    """Sitemap al que pertenece un post: los primeros bits de su UUID."""
+    return blog_post_id.int >> (128 - (sitemaps.bit_length() - 1))
+
+
+def _sitemap_bounds(sitemap: int, sitemaps: int) -> tuple[uuid.UUID, uuid.UUID | None]:
+    shift = 128 - (sitemaps.bit_length() - 1)
+    upper = None if sitemap == sitemaps - 1 else uuid.UUID(int=(sitemap + 1) << shift)
+    return uuid.UUID(int=sitemap << shift), upper
+
+
+def _stream(session: Session, statement) -> Iterator[Any]:
+    return iter(session.exec(statement.execution_options(yield_per=_STREAM_BATCH)))
+
+
+def build_sitemap(
+    session: Session,
+    sitemap: int,
+    sitemaps: int,
+) -> tuple[bytes, datetime | None]:
+    """Sitemap con las URLs de los posts cuyo ID cae en el rango de `sitemap`."""
+    statement = select(BlogPost.id, BlogPost.updated_at).order_by(BlogPost.id)
+    if sitemaps > 1:
+        lower, upper = _sitemap_bounds(sitemap, sitemaps)
+        statement = statement.where(BlogPost.id >= lower)
+        if upper is not None:
+            statement = statement.where(BlogPost.id < upper)
+    writer = _GzipWriter()
+    writer.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+    )
+    last_modified = None
+    for id, updated_at in _stream(session, statement):
+        updated_at = _utc(updated_at)
+        last_modified = max(last_modified or updated_at, updated_at)
+        writer.write(
+            f"<url><loc>{escape(post_url(id))}</loc>"
+            f"<lastmod>{updated_at.isoformat()}</lastmod></url>\n",
+        )
+    writer.write("</urlset>\n")
+    return writer.finish(), last_modified
+
+
+def build_sitemap_index(session: Session) -> tuple[bytes, int]:
+    """Índice de sitemaps; devuelve también cuántos sitemaps lista."""
+    sitemaps = sitemap_count(session.exec(select(func.count(BlogPost.id))).one())
+    writer = _GzipWriter()
+    writer.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+    )
+    for sitemap in range(sitemaps):
+        writer.write(f"<sitemap><loc>{escape(sitemap_url(sitemap))}</loc></sitemap>\n")
+    writer.write("</sitemapindex>\n")
+    return writer.finish(), sitemaps
+
+
+def _feed_posts(session: Session, category_id: uuid.UUID | None):
+    statement = select(
+        BlogPost.id,
+        BlogPost.title,
+        BlogPostBody.content,
+        BlogPostBody.content_html,
+        BlogPost.created_at,
+        BlogPost.updated_at,
+    ).join(BlogPostBody, BlogPostBody.blog_post_id == BlogPost.id)
+    if category_id is not None:
+        statement = statement.where(BlogPost.category_id == category_id)
+    statement = statement.order_by(
+        BlogPost.created_at.desc(),
+        BlogPost.id.desc(),
+    ).limit(app_settings.FEED_ITEMS)
+    return _stream(session, statement)
+
+
+def build_feed(
+    session: Session,
+    category_id: uuid.UUID | None,
+    format: str,
+) -> tuple[bytes, datetime | None]:
+    """Feed RSS 2.0 o Atom con los últimos `FEED_ITEMS` posts, de todos o de
+    una categoría.
+
+    Raises:
+        ValueError: Si la categoría no existe
+
+    """
+    title = app_settings.FEED_TITLE
+    feed_id = app_settings.PUBLIC_SITE_URL
+    if category_id is not None:
+        name = session.exec(
+            select(Category.name).where(Category.id == category_id),
+        ).first()
+        if name is None:
+            raise ValueError(f"Category con id {category_id} no encontrada.")
+        title = f"{title} - {name}"
+        feed_id = category_id.urn
+
+    entries = []
+    last_modified = None
+    for post in _feed_posts(session, category_id):
+        updated_at = _utc(post.updated_at)
+        last_modified = max(last_modified or updated_at, updated_at)
+        html = post.content_html
+        if html is None:
+            html = render_markdown(post.content)
+        entries.append((post, html, _utc(post.created_at), updated_at))
+
+    writer = _GzipWriter()
+    site = escape(app_settings.PUBLIC_SITE_URL)
+    writer.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    if format == "atom":
+        updated = last_modified or datetime.now(UTC).replace(microsecond=0)
+        writer.write(
+            '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+            f"<id>{escape(feed_id)}</id><title>{escape(title)}</title>"
+            f"<updated>{updated.isoformat()}</updated>"
+            f"<link href={quoteattr(app_settings.PUBLIC_SITE_URL)}/>\n",
+        )
+        for post, html, created_at, updated_at in entries:
+            writer.write(
+                f"<entry><id>{post.id.urn}</id><title>{escape(post.title)}</title>"
+                f"<link href={quoteattr(post_url(post.id))}/>"
+                f"<published>{created_at.isoformat()}</published>"
+                f"<updated>{updated_at.isoformat()}</updated>"
+                f'<content type="html">{escape(html)}</content></entry>\n',
+            )
+        writer.write("</feed>\n")
+    else:
+        writer.write(
+            '<rss version="2.0"><channel>\n'
+            f"<title>{escape(title)}</title><link>{site}</link>"
+            f"<description>{escape(title)}</description>\n",
+        )
+        for post, html, created_at, _ in entries:
+            writer.write(
+                f"<item><title>{escape(post.title)}</title>"
+                f"<link>{escape(post_url(post.id))}</link>"
+                f'<guid isPermaLink="false">{post.id.urn}</guid>'
+                f"<pubDate>{format_datetime(created_at, usegmt=True)}</pubDate>"
+                f"<description>{escape(html)}</description></item>\n",
+            )
+        writer.write("</channel></rss>\n")
+    return writer.finish(), last_modified
+
+
+def _is_affected(key: DocumentKey, changes: Iterable[Change]) -> bool:
+    kind = key[0]
+    for change in changes:
+        if change[0] == "all":
+            return True
+        if kind == "feed":
+            category_id = key[1]
+            if change[0] == "post" and (
+                category_id is None or change[2] in (None, category_id)
+            ):
+                return True
+            if change[0] == "category" and change[1] == category_id:
+                return True
+        elif kind == "sitemap_index":
+            if change[0] == "count":
+                return True
+        elif kind == "sitemap":
+            if change[0] == "post" and sitemap_of(change[1], key[1]) == key[2]:
+                return True
+    return False
+
+
+class FeedCache:
+    """Documentos generados por clave. Un documento caducado se sigue guardando
+    para conservar su `Last-Modified` si al regenerarlo no cambia.
+    """
+
+    def __init__(self, *, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._documents: dict[DocumentKey, CachedDocument] = {}
+        # Invalidaciones aplicadas; permite detectar las que llegan mientras se
+        # genera un documento.
+        self._generation = 0
+        self._lock = Lock()
+        self._build_locks: dict[DocumentKey, Lock] = {}
+
+    def _is_fresh(self, document: CachedDocument | None) -> bool:
+        return (
+            document is not None and monotonic() - document.built_at < self.ttl_seconds
+        )
+
+    def get(
+        self,
+        key: DocumentKey,
+        build: Callable[[], tuple[bytes, datetime | None]],
+        *,
+        media_type: str,
+        sitemaps: Callable[[], int] | None = None,
+    ) -> CachedDocument:
+        """Documento de `key`; lo genera con `build` si no existe o caducó. Solo
+        un hilo por clave lo genera; los demás esperan su resultado. Si `build`
+        falla (p. ej. la categoría no existe) la excepción se propaga y no queda
+        nada guardado para esa clave.
+        """
+        document = self._documents.get(key)
+        if self._is_fresh(document):
+            return document
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, Lock())
+        with build_lock:
+            document = self._documents.get(key)
+            if self._is_fresh(document):
+                return document
+            generation = self._generation
+            try:
+                body, last_modified = build()
+            except Exception:
+                # Sin documento, el lock de la clave no se volvería a liberar:
+                # las claves vienen de la URL (p. ej. cualquier UUID de categoría).
+                with self._lock:
+                    if key not in self._documents:
+                        self._build_locks.pop(key, None)
+                raise
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            if document is not None and document.etag == etag:
+                last_modified = document.last_modified
+            built = CachedDocument(
+                body=body,
+                etag=etag,
+                last_modified=(
+                    last_modified or datetime.now(UTC).replace(microsecond=0)
+                ),
+                media_type=media_type,
+                built_at=monotonic(),
+                sitemaps=sitemaps() if sitemaps is not None else 1,
+            )
+            with self._lock:
+                if self._generation != generation:
+                    # Un cambio confirmado durante la generación podría no estar
+                    # incluido: el documento nace caducado.
+                    built = replace(built, built_at=float("-inf"))
+                self._documents[key] = built
+            return built
+
+    def invalidate(self, changes: Iterable[Change]) -> None:
+        changes = list(changes)
+        with self._lock:
+            self._generation += 1
+            for key, document in self._documents.items():
+                if document.built_at != float("-inf") and _is_affected(key, changes):
+                    self._documents[key] = replace(document, built_at=float("-inf"))
+
+    def discard(self, predicate: Callable[[DocumentKey], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._documents if predicate(key)]:
+                del self._documents[key]
+                self._build_locks.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._documents.clear()
+            self._build_locks.clear()
+
+
+feed_cache = FeedCache(ttl_seconds=app_settings.FEED_CACHE_TTL_SECONDS)
+
+
+def get_sitemap_index(session: Session) -> CachedDocument:
+    sitemaps = 0
+
+    def build() -> tuple[bytes, datetime | None]:
+        nonlocal sitemaps
+        body, sitemaps = build_sitemap_index(session)
+        # Los sitemaps de otra partición ya no se servirán.
+        feed_cache.discard(lambda key: key[0] == "sitemap" and key[1] != sitemaps)
+        return body, None
+
+    return feed_cache.get(
+        ("sitemap_index",),
+        build,
+        media_type=XML_MEDIA_TYPE,
+        sitemaps=lambda: sitemaps,
+    )
+
+
+def get_sitemap(session: Session, sitemap: int, sitemaps: int) -> CachedDocument:
+    return feed_cache.get(
+        ("sitemap", sitemaps, sitemap),
+        lambda: build_sitemap(session, sitemap, sitemaps),
+        media_type=XML_MEDIA_TYPE,
+    )
+
+
+def get_feed(
+    session: Session,
+    category_id: uuid.UUID | None,
+    format: str,
+) -> CachedDocument:
+    """Feed `format` ("rss" o "atom") de todos los posts o de `category_id`.
+
+    Raises:
+        ValueError: Si la categoría no existe
+
+    """
+    return feed_cache.get(
+        ("feed", category_id, format),
+        lambda: build_feed(session, category_id, format),
+        media_type=ATOM_MEDIA_TYPE if format == "atom" else RSS_MEDIA_TYPE,
+    )
+
+
+def record_feed_change(session: Session, *change: Any) -> None:
+    """Anota un cambio que caducará los documentos afectados cuando la sesión
+    confirme.
+    """
+    session.info.setdefault(_CHANGES_KEY, []).append(change)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_feeds(session: OrmSession) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        feed_cache.invalidate(changes)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_feed_changes(session: OrmSession) -> None:
+    session.info.pop(_CHANGES_KEY, None)
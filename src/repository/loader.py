@@ -0,0 +1,203 @@
+"""Cargador de entidades por petición (patrón DataLoader).
+
+Agrupa las búsquedas por ID de una misma petición en una sola consulta por
+modelo: las comprobaciones de existencia de los routers, las lecturas por lotes
+(`?ids=`) y la carga de relaciones de un listado comparten la misma caché, de
+modo que una entidad ya cargada no se vuelve a pedir.
+
+La instancia se crea una vez por petición con la dependencia
+`get_entity_loader` y los repositorios la reciben al construirse.
+"""
+
+from collections.abc import Iterable
+from typing import Annotated, Any
+
+from fastapi import Depends
+from sqlalchemy import any_, inspect, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import RelationshipDirection
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlmodel import Session, SQLModel
+
+from src.core.database.config import CurrentSession
+
+
+def id_in(column, ids: list[Any], dialect_name: str):
+    """Condición `column = ANY(:ids)` en PostgreSQL, con un único parámetro de
+    tipo array, para que la sentencia sea la misma sea cual sea el número de
+    IDs. En otros motores se usa `IN`.
+    """
+    if dialect_name == "postgresql":
+        return column == any_(literal(ids, ARRAY(column.type)))
+    return column.in_(ids)
+
+
+class EntityLoader:
+    def __init__(self, session: Session):
+        self.session = session
+        # Por modelo, entidad encontrada o None si se buscó y no existe.
+        self._cache: dict[type[SQLModel], dict[Any, SQLModel | None]] = {}
+        self._pending: dict[type[SQLModel], set[Any]] = {}
+
+    @property
+    def _dialect_name(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def prime(self, model: type[SQLModel], ids: Iterable[Any]) -> None:
+        """Encola IDs para que se carguen junto con la próxima búsqueda de `model`."""
+        cached = self._cache.get(model, {})
+        pending = self._pending.setdefault(model, set())
+        pending.update(id for id in ids if id is not None and id not in cached)
+
+    def load_many(
+        self,
+        model: type[SQLModel],
+        ids: Iterable[Any],
+    ) -> dict[Any, SQLModel]:
+        """Entidades de `model` con los IDs indicados (y los encolados), por ID.
+        Los IDs que no existen no aparecen en el resultado.
+        """
+        ids = list(ids)
+        self.prime(model, ids)
+        self._dispatch(model)
+        cached = self._cache.get(model, {})
+        return {id: cached[id] for id in ids if cached.get(id) is not None}
+
+    def load(self, model: type[SQLModel], id: Any) -> SQLModel | None:
+        return self.load_many(model, [id]).get(id)
+
+    def forget(self, model: type[SQLModel], id: Any | None = None) -> None:
+        """Descarta de la caché una entidad, o todas las de `model` si no se
+        indica `id` (p. ej. tras un borrado masivo).
+        """
+        if id is None:
+            self._cache.pop(model, None)
+        else:
+            self._cache.get(model, {}).pop(id, None)
+
+    def _dispatch(self, model: type[SQLModel]) -> None:
+        pending = self._pending.pop(model, set())
+        if not pending:
+            return
+        cached = self._cache.setdefault(model, {})
+        missing = []
+        for id in pending:
+            # Las entidades que ya están en la sesión no se vuelven a consultar.
+            entity = self.session.identity_map.get(identity_key(model, id))
+            if entity is not None:
+                cached[id] = entity
+            else:
+                missing.append(id)
+        if not missing:
+            return
+        statement = select(model).where(id_in(model.id, missing, self._dialect_name))
+        found = {entity.id: entity for entity in self.session.exec(statement).scalars()}
+        for id in missing:
+            cached[id] = found.get(id)
+
+    def _remember(self, model: type[SQLModel], entities: Iterable[SQLModel]) -> None:
+        cached = self._cache.setdefault(model, {})
+        for entity in entities:
+            cached[entity.id] = entity
+
+    def load_relations(self, entities: list[SQLModel], *relation_attrs: str) -> None:
+        """Carga las relaciones `relation_attrs` de todas las `entities` con una
+        consulta por relación y las fija como ya cargadas, evitando las cargas
+        perezosas una a una (N+1) al serializar. Las relaciones muchos a uno se
+        resuelven con la caché, sin consulta si ya se cargaron en la petición.
+        """
+        if not entities:
+            return
+        mapper = inspect(type(entities[0]))
+        for attr in relation_attrs:
+            relationship = mapper.relationships[attr]
+            target = relationship.mapper.class_
+            if relationship.direction is RelationshipDirection.MANYTOONE:
+                self._load_many_to_one(entities, relationship, target)
+            elif not relationship.uselist:
+                self._load_one_to_one(entities, relationship, target)
+            elif relationship.direction is RelationshipDirection.ONETOMANY:
+                self._load_one_to_many(entities, relationship, target)
+            else:
+                self._load_many_to_many(entities, relationship, target)
+
+    def _load_many_to_one(self, entities, relationship, target) -> None:
+        ((local_column, _),) = relationship.local_remote_pairs
+        fk_attr = relationship.parent.get_property_by_column(local_column).key
+        related = self.load_many(
+            target,
+            {getattr(entity, fk_attr) for entity in entities},
+        )
+        for entity in entities:
+            set_committed_value(
+                entity,
+                relationship.key,
+                related.get(getattr(entity, fk_attr)),
+            )
+
+    def _load_one_to_one(self, entities, relationship, target) -> None:
+        # Filas dependientes con la clave foránea como clave primaria (p. ej.
+        # `BlogPostBody`): no tienen `id` propio, así que no pasan por la caché.
+        ((_, remote_column),) = relationship.local_remote_pairs
+        fk_attr = relationship.mapper.get_property_by_column(remote_column).key
+        parent_ids = [entity.id for entity in entities]
+        statement = select(target).where(
+            id_in(remote_column, parent_ids, self._dialect_name),
+        )
+        found = {
+            getattr(child, fk_attr): child
+            for child in self.session.exec(statement).scalars()
+        }
+        for entity in entities:
+            set_committed_value(entity, relationship.key, found.get(entity.id))
+
+    def _load_one_to_many(self, entities, relationship, target) -> None:
+        ((_, remote_column),) = relationship.local_remote_pairs
+        fk_attr = relationship.mapper.get_property_by_column(remote_column).key
+        parent_ids = [entity.id for entity in entities]
+        statement = select(target).where(
+            id_in(remote_column, parent_ids, self._dialect_name),
+        )
+        if relationship.order_by:
+            statement = statement.order_by(*relationship.order_by)
+        children = list(self.session.exec(statement).scalars())
+        self._remember(target, children)
+        grouped: dict[Any, list[SQLModel]] = {entity.id: [] for entity in entities}
+        for child in children:
+            grouped[getattr(child, fk_attr)].append(child)
+        for entity in entities:
+            set_committed_value(entity, relationship.key, grouped[entity.id])
+
+    def _load_many_to_many(self, entities, relationship, target) -> None:
+        ((_, parent_column),) = relationship.synchronize_pairs
+        ((target_column, secondary_column),) = relationship.secondary_synchronize_pairs
+        statement = (
+            select(parent_column, target)
+            .select_from(target)
+            .join(relationship.secondary, target_column == secondary_column)
+            .where(
+                id_in(
+                    parent_column,
+                    [entity.id for entity in entities],
+                    self._dialect_name,
+                ),
+            )
+        )
+        grouped: dict[Any, list[SQLModel]] = {entity.id: [] for entity in entities}
+        related = []
+        for parent_id, child in self.session.exec(statement):
+            grouped[parent_id].append(child)
+            related.append(child)
+        self._remember(target, related)
+        for entity in entities:
+            set_committed_value(entity, relationship.key, grouped[entity.id])
+
+
+def get_entity_loader(session: CurrentSession) -> EntityLoader:
+    # FastAPI resuelve la dependencia una vez por petición: todos los
+    # repositorios de la misma petición comparten el cargador.
+    return EntityLoader(session)
+
+
+CurrentEntityLoader = Annotated[EntityLoader, Depends(get_entity_loader)]
@@ -0,0 +1,35 @@
+"""Deltas de texto para las rutas PATCH (ver `BaseRepository.patch_by_id`).
+
+Con el autoguardado del editor cada petición envía solo lo que cambió del
+contenido, con el formato de `TextDelta`:
+
+    {"delta": [{"retain": 1204}, {"delete": 3}, {"insert": "nuevo "}]}
+
+El delta se calcula sobre una versión concreta del texto, la que indica
+`If-Match`: si la entidad cambió desde entonces el parche no se aplica.
+"""
+
+from src.domain.schemas.patch import TextDelta
+from src.repository.exceptions import InvalidDeltaError
+
+
+def apply_delta(text: str, delta: TextDelta) -> str:
+    """Aplica `delta` sobre `text`. Lanza `InvalidDeltaError` si el delta recorre
+    más caracteres de los que tiene el texto.
+    """
+    parts: list[str] = []
+    position = 0
+    for op in delta.delta:
+        if op.insert is not None:
+            parts.append(op.insert)
+            continue
+        end = position + (op.retain or op.delete)
+        if end > len(text):
+            raise InvalidDeltaError(
+                f"El delta recorre {end} caracteres y el texto tiene {len(text)}.",
+            )
+        if op.retain is not None:
+            parts.append(text[position:end])
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
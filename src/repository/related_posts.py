@@ -0,0 +1,382 @@
+"""Posts relacionados por similitud de tags, con un índice precalculado.
+
+Calcular el solapamiento de tags en cada petición exigiría un self-join sobre
+`blogposttaglink`. En su lugar se construye la matriz dispersa post×tag, se
+calcula la similitud coseno entre posts y se guardan los `RELATED_POSTS_K`
+vecinos de cada uno en `relatedblogpost`. Servir `/blog_posts/{id}/related` es
+entonces leer una lista ya ordenada por su clave primaria.
+
+* `rebuild()`: recalcula el índice completo.
+* `refresh(post_ids)`: recalcula solo los posts afectados por un cambio de tags.
+  Los repositorios marcan los posts con `mark_tags_changed` y el recálculo se
+  hace después de confirmar la transacción, en una transacción propia, una vez
+  por transacción. Al borrar un post se marcan los que lo tenían en su lista
+  para que la completen con otro vecino.
+
+Las filas se escriben con un upsert sobre (post, posición): dos recálculos
+concurrentes que toquen la misma lista no chocan con la clave primaria; gana
+el último en confirmar.
+
+Con NumPy y SciPy instalados la similitud se calcula de forma vectorizada
+(producto de matrices dispersas); sin ellos se usa un índice invertido en
+Python puro, con el mismo resultado.
+"""
+
+import logging
+import math
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session
+
+from src.core.settings import app_settings
+from src.domain.models.blog_post_tag_link import BlogPostTagLink
+from src.domain.models.related_blog_post import RelatedBlogPost
+from src.repository.buffered_counter import dialect_insert
+from src.repository.loader import id_in
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - dependencias opcionales
+    np = None
+    sparse = None
+
+logger = logging.getLogger(__name__)
+
+Link = tuple[uuid.UUID, uuid.UUID]
+Neighbors = dict[uuid.UUID, list[tuple[uuid.UUID, float]]]
+
+# Decimales con los que se comparan las puntuaciones, para que los empates se
+# resuelvan igual con ambas implementaciones.
+SCORE_DECIMALS = 6
+_DIRTY_KEY = "related_posts_dirty"
+_INSERT_BATCH = 5_000
+
+
+def _ranked(candidates: Iterable[tuple[uuid.UUID, float]], k: int | None):
+    """Los `k` mejores por puntuación descendente; los empates, por ID."""
+    rounded = [(post_id, round(score, SCORE_DECIMALS)) for post_id, score in candidates]
+    return sorted(rounded, key=lambda item: (-item[1], str(item[0])))[:k]
+
+
+def _similar_posts_python(
+    links: list[Link],
+    targets: list[uuid.UUID],
+    k: int | None,
+) -> Neighbors:
+    tags_by_post: dict[uuid.UUID, set[uuid.UUID]] = defaultdict(set)
+    posts_by_tag: dict[uuid.UUID, set[uuid.UUID]] = defaultdict(set)
+    for post_id, tag_id in links:
+        tags_by_post[post_id].add(tag_id)
+        posts_by_tag[tag_id].add(post_id)
+
+    neighbors: Neighbors = {}
+    for target in targets:
+        target_tags = tags_by_post.get(target)
+        if not target_tags:
+            neighbors[target] = []
+            continue
+        overlap: Counter[uuid.UUID] = Counter()
+        for tag_id in target_tags:
+            overlap.update(posts_by_tag[tag_id])
+        del overlap[target]
+        size = len(target_tags)
+        neighbors[target] = _ranked(
+            (
+                (post_id, shared / math.sqrt(size * len(tags_by_post[post_id])))
+                for post_id, shared in overlap.items()
+            ),
+            k,
+        )
+    return neighbors
+
+
+def _similar_posts_sparse(
+    links: list[Link],
+    targets: list[uuid.UUID],
+    k: int | None,
+) -> Neighbors:
+    post_ids = list(dict.fromkeys(post_id for post_id, _ in links))
+    tag_ids = list(dict.fromkeys(tag_id for _, tag_id in links))
+    post_index = {post_id: i for i, post_id in enumerate(post_ids)}
+    tag_index = {tag_id: i for i, tag_id in enumerate(tag_ids)}
+
+    count = len(links)
+    rows = np.fromiter((post_index[p] for p, _ in links), dtype=np.int64, count=count)
+    cols = np.fromiter((tag_index[t] for _, t in links), dtype=np.int64, count=count)
+    matrix = sparse.csr_matrix(
+        (np.ones(count), (rows, cols)),
+        shape=(len(post_ids), len(tag_ids)),
+    )
+    # Un enlace repetido suma 2 al convertir a CSR: la matriz es binaria.
+    matrix.data[:] = 1.0
+    norms = np.sqrt(np.asarray(matrix.sum(axis=1)).ravel())
+    normalized = sparse.diags(1.0 / norms) @ matrix
+
+    neighbors: Neighbors = {target: [] for target in targets}
+    present = [target for target in targets if target in post_index]
+    if not present:
+        return neighbors
+    target_rows = np.array([post_index[target] for target in present])
+    similarity = (normalized[target_rows] @ normalized.T).tocsr()
+
+    for i, target in enumerate(present):
+        start, end = similarity.indptr[i], similarity.indptr[i + 1]
+        columns = similarity.indices[start:end]
+        scores = similarity.data[start:end]
+        keep = columns != post_index[target]
+        columns, scores = columns[keep], scores[keep]
+        if k is not None and len(scores) > k:
+            # Se descartan los que no pueden entrar en el top-K sin ordenar toda
+            # la fila; los empates con el K-ésimo se conservan para `_ranked`.
+            threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+            keep = scores >= threshold
+            columns, scores = columns[keep], scores[keep]
+        neighbors[target] = _ranked(
+            (
+                (post_ids[column], float(score))
+                for column, score in zip(columns, scores, strict=True)
+            ),
+            k,
+        )
+    return neighbors
+
+
+def similar_posts(
+    links: Iterable[Link],
+    targets: Iterable[uuid.UUID],
+    k: int | None,
+) -> Neighbors:
+    """Los `k` posts más parecidos a cada uno de `targets` (todos los que
+    comparten algún tag si `k` es None) según la similitud coseno de sus tags.
+    `links` debe contener todos los enlaces (post, tag) de los objetivos y de
+    cualquier post que comparta tags con ellos.
+    """
+    links = list(links)
+    targets = list(dict.fromkeys(targets))
+    if not links:
+        return {target: [] for target in targets}
+    if sparse is not None:
+        return _similar_posts_sparse(links, targets, k)
+    return _similar_posts_python(links, targets, k)
+
+
+class RelatedPostsRepository:
+    def __init__(self, db_session: Session, k: int | None = None):
+        self.session = db_session
+        self.k = k or app_settings.RELATED_POSTS_K
+
+    @property
+    def _dialect_name(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def get_related_ids(
+        self,
+        blog_post_id: uuid.UUID,
+        limit: int,
+    ) -> list[uuid.UUID]:
+        """IDs de los posts relacionados, del más al menos parecido."""
+        statement = (
+            select(RelatedBlogPost.related_id)
+            .where(RelatedBlogPost.blog_post_id == blog_post_id)
+            .order_by(RelatedBlogPost.rank)
+            .limit(limit)
+        )
+        return list(self.session.exec(statement).scalars())
+
+    def get_listing_ids(self, related_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+        """IDs de los posts que tienen alguno de `related_ids` en su lista."""
+        statement = select(RelatedBlogPost.blog_post_id).where(
+            id_in(RelatedBlogPost.related_id, related_ids, self._dialect_name),
+        )
+        return list(self.session.exec(statement.distinct()).scalars())
+
+    def _trim(self, neighbors: Neighbors) -> None:
+        """Borra las posiciones de las listas guardadas que quedan más allá de
+        la nueva longitud de cada lista de `neighbors`.
+        """
+        by_length: dict[int, list[uuid.UUID]] = defaultdict(list)
+        for post_id, related in neighbors.items():
+            by_length[len(related)].append(post_id)
+        for length, post_ids in sorted(by_length.items()):
+            self.session.exec(
+                delete(RelatedBlogPost)
+                .where(
+                    id_in(RelatedBlogPost.blog_post_id, post_ids, self._dialect_name),
+                    RelatedBlogPost.rank >= length,
+                )
+                .execution_options(synchronize_session=False),
+            )
+
+    def _store(self, neighbors: Neighbors) -> int:
+        rows = [
+            {
+                "blog_post_id": post_id,
+                "rank": rank,
+                "related_id": related_id,
+                "score": score,
+            }
+            for post_id, related in sorted(neighbors.items())
+            for rank, (related_id, score) in enumerate(related)
+        ]
+        statement = dialect_insert(RelatedBlogPost, self._dialect_name)
+        statement = statement.on_conflict_do_update(
+            index_elements=[RelatedBlogPost.blog_post_id, RelatedBlogPost.rank],
+            set_={
+                "related_id": statement.excluded.related_id,
+                "score": statement.excluded.score,
+            },
+        )
+        for start in range(0, len(rows), _INSERT_BATCH):
+            self.session.exec(statement, params=rows[start : start + _INSERT_BATCH])
+        return len(rows)
+
+    def rebuild(self) -> int:
+        """Recalcula el índice completo. Devuelve el número de filas guardadas."""
+        links = self.session.exec(
+            select(BlogPostTagLink.blog_post_id, BlogPostTagLink.tag_id),
+        ).all()
+        neighbors = similar_posts(links, (post_id for post_id, _ in links), self.k)
+        self.session.exec(
+            delete(RelatedBlogPost).execution_options(synchronize_session=False),
+        )
+        return self._store(neighbors)
+
+    def _candidate_links(self, post_ids: list[uuid.UUID]) -> list[Link]:
+        """Enlaces de los posts que comparten algún tag con `post_ids` (incluidos
+        ellos mismos): todos sus tags, necesarios para la norma de cada fila.
+        """
+        post_tags = select(BlogPostTagLink.tag_id).where(
+            id_in(BlogPostTagLink.blog_post_id, post_ids, self._dialect_name),
+        )
+        candidates = select(BlogPostTagLink.blog_post_id).where(
+            BlogPostTagLink.tag_id.in_(post_tags),
+        )
+        return self.session.exec(
+            select(BlogPostTagLink.blog_post_id, BlogPostTagLink.tag_id).where(
+                BlogPostTagLink.blog_post_id.in_(candidates),
+            ),
+        ).all()
+
+    def _current_lists(
+        self,
+        post_ids: list[uuid.UUID],
+        changed: list[uuid.UUID],
+    ) -> Neighbors:
+        """Listas guardadas de `post_ids` y de los posts que incluyen a `changed`."""
+        dialect = self._dialect_name
+        listers = select(RelatedBlogPost.blog_post_id).where(
+            id_in(RelatedBlogPost.related_id, changed, dialect),
+        )
+        statement = (
+            select(
+                RelatedBlogPost.blog_post_id,
+                RelatedBlogPost.related_id,
+                RelatedBlogPost.score,
+            )
+            .where(
+                id_in(RelatedBlogPost.blog_post_id, post_ids, dialect)
+                | RelatedBlogPost.blog_post_id.in_(listers),
+            )
+            .order_by(RelatedBlogPost.blog_post_id, RelatedBlogPost.rank)
+        )
+        lists: Neighbors = defaultdict(list)
+        for post_id, related_id, score in self.session.exec(statement):
+            lists[post_id].append((related_id, score))
+        return lists
+
+    def refresh(self, post_ids: Iterable[uuid.UUID]) -> int:
+        """Actualiza el índice tras cambiar los tags de `post_ids`.
+
+        Solo cambian las puntuaciones de los pares en los que participa un post
+        modificado, así que sus filas se recalculan y, en el resto, basta con
+        fusionar la nueva puntuación en la lista guardada. Únicamente hay que
+        recalcular la fila de un post si un modificado que estaba en su lista
+        baja de puntuación, porque su sustituto puede ser cualquier otro post.
+        """
+        changed = set(post_ids)
+        if not changed:
+            return 0
+        changed_list = list(changed)
+
+        # Todas las puntuaciones de los modificados, no solo las K mejores: la
+        # similitud es simétrica y son también las nuevas puntuaciones de los demás.
+        scores = similar_posts(self._candidate_links(changed_list), changed_list, None)
+        rows: Neighbors = {
+            post_id: related[: self.k] for post_id, related in scores.items()
+        }
+
+        updated: dict[uuid.UUID, dict[uuid.UUID, float]] = defaultdict(dict)
+        for changed_id, related in scores.items():
+            for post_id, score in related:
+                updated[post_id][changed_id] = score
+        sharers = [post_id for post_id in updated if post_id not in changed]
+        current = self._current_lists(sharers, changed_list)
+
+        recompute = []
+        for post_id in (updated.keys() | current.keys()) - changed:
+            listed = current.get(post_id, [])
+            new_scores = updated.get(post_id, {})
+            if any(
+                related_id in changed and new_scores.get(related_id, 0.0) < score
+                for related_id, score in listed
+            ):
+                recompute.append(post_id)
+                continue
+            merged = _ranked(
+                [item for item in listed if item[0] not in changed]
+                + list(new_scores.items()),
+                self.k,
+            )
+            if merged != listed:
+                rows[post_id] = merged
+        if recompute:
+            rows.update(
+                similar_posts(self._candidate_links(recompute), recompute, self.k),
+            )
+        self._trim(rows)
+        return self._store(rows)
+
+
+def mark_tags_changed(session: Session, post_ids: Iterable[uuid.UUID]) -> None:
+    """Anota que los tags de `post_ids` cambiaron; sus vecinos se recalculan
+    después de confirmar la transacción.
+    """
+    session.info.setdefault(_DIRTY_KEY, set()).update(post_ids)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _refresh_after_commit(session: OrmSession) -> None:
+    # Fuera de la transacción de la petición: sus locks ya están liberados y un
+    # fallo del recálculo no deshace el cambio, solo deja el índice desfasado
+    # hasta el siguiente cambio de esos posts o un `rebuild()`.
+    changed = session.info.pop(_DIRTY_KEY, None)
+    if not changed or not app_settings.RELATED_POSTS_INCREMENTAL:
+        return
+    try:
+        with Session(session.get_bind()) as refresh_session:
+            RelatedPostsRepository(refresh_session).refresh(changed)
+            refresh_session.commit()
+    except Exception:
+        logger.exception(
+            "No se pudo actualizar el índice de posts relacionados de %d posts.",
+            len(changed),
+        )
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_after_rollback(session: OrmSession) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+if __name__ == "__main__":
+    from src.core.database.config import get_engine
+
+    with Session(get_engine()) as session:
+        count = RelatedPostsRepository(session).rebuild()
+        session.commit()
+    print(f"Índice de posts relacionados recalculado: {count} filas.")
@@ -0,0 +1,176 @@
+"""HTML del contenido de posts y secciones, renderizado al escribirlo.
+
+`BlogPostRepository` (en `BlogPostBody`) y `SectionRepository` guardan junto a
+`content` su versión en HTML (`content_html`, ver `src/core/markdown.py`) y el
+hash del contenido con el que se generó (`content_hash`). Las lecturas con
+`?content_format=html` devuelven el HTML guardado sin renderizar nada.
+
+Renderizar es trabajo de CPU: los contenidos grandes se envían a un pool de
+procesos para no retener el GIL del proceso que atiende las peticiones. Las
+filas sin HTML o con un hash desfasado (p. ej. tras cambiar `RENDERER_VERSION`)
+se completan con el backfill:
+
+    python -m src.repository.rendered_content
+"""
+
+import multiprocessing
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, SQLModel, select
+
+from src.core.markdown import content_hash, render_markdown
+from src.core.settings import app_settings
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_body import BlogPostBody
+from src.domain.models.section import Section
+from src.repository.taxonomy import to_read_schema
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    if app_settings.CONTENT_RENDER_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # "spawn": un fork del proceso de la API heredaría sus hilos y
+            # conexiones abiertas.
+            _pool = ProcessPoolExecutor(
+                max_workers=app_settings.CONTENT_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def render_many(contents: Sequence[str]) -> list[str]:
+    """Renderiza `contents` en orden. Si en total superan
+    `CONTENT_RENDER_POOL_MIN_CHARS` se reparten entre los procesos del pool; por
+    debajo, el envío entre procesos cuesta más que renderizar aquí.
+    """
+    pool = None
+    if sum(map(len, contents)) >= app_settings.CONTENT_RENDER_POOL_MIN_CHARS:
+        pool = _get_pool()
+    if pool is None:
+        return [render_markdown(content) for content in contents]
+    chunksize = max(1, len(contents) // (4 * app_settings.CONTENT_RENDER_WORKERS))
+    return list(pool.map(render_markdown, contents, chunksize=chunksize))
+
+
+def rendered_columns(content: str) -> dict[str, str]:
+    return {
+        "content_html": render_many([content])[0],
+        "content_hash": content_hash(content),
+    }
+
+
+class RenderedContentMixin:
+    """Para repositorios de modelos con `content`, `content_html` y
+    `content_hash`: cada escritura que cambia `content` guarda también su HTML.
+    """
+
+    def _with_derived_values(self, values: dict[str, Any]) -> dict[str, Any]:
+        values = super()._with_derived_values(values)
+        if values.get("content") is not None:
+            values = {**values, **rendered_columns(values["content"])}
+        return values
+
+
+def content_as_html(entity: BlogPost | Section) -> str:
+    """HTML guardado de `entity`; si aún no lo tiene (filas anteriores al
+    backfill), lo renderiza al vuelo sin guardarlo.
+    """
+    if isinstance(entity, BlogPost):
+        entity = entity.stored_body
+    if entity.content_html is not None:
+        return entity.content_html
+    return render_markdown(entity.content)
+
+
+def as_html[S: SQLModel](schema: type[S], entity: BlogPost | Section) -> S:
+    """Esquema de lectura de `entity` con el contenido (y el de sus secciones,
+    si el esquema las incluye) en HTML.
+    """
+    read = to_read_schema(schema, entity)
+    changes: dict[str, Any] = {"content": content_as_html(entity)}
+    if "sections" in type(read).model_fields:
+        changes["sections"] = [
+            section.model_copy(update={"content": content_as_html(source)})
+            for section, source in zip(read.sections, entity.sections, strict=True)
+        ]
+    return read.model_copy(update=changes)
+
+
+def backfill_rendered_content(
+    session: Session,
+    model: type[BlogPostBody] | type[Section],
+    *,
+    batch_size: int = 500,
+) -> int:
+    """Renderiza y guarda el HTML de las filas de `model` sin HTML o cuyo hash no
+    corresponde a su contenido. Recorre la tabla por lotes ordenados por clave
+    primaria y confirma cada lote. Devuelve las filas actualizadas.
+    """
+    table = model.__table__
+    (key,) = table.primary_key.columns
+    statement = (
+        update(table)
+        .where(key == bindparam("row_id"))
+        .values(content_html=bindparam("html"), content_hash=bindparam("hash"))
+    )
+    updated = 0
+    last_id: uuid.UUID | None = None
+    while True:
+        query = select(
+            key.label("id"),
+            table.c.content,
+            table.c.content_hash,
+        ).order_by(key)
+        if last_id is not None:
+            query = query.where(key > last_id)
+        rows = session.exec(query.limit(batch_size)).all()
+        if not rows:
+            return updated
+        last_id = rows[-1].id
+        stale = [
+            (row.id, row.content, expected)
+            for row in rows
+            if row.content_hash != (expected := content_hash(row.content))
+        ]
+        if stale:
+            htmls = render_many([content for _, content, _ in stale])
+            session.connection().execute(
+                statement,
+                [
+                    {"row_id": id, "html": html, "hash": digest}
+                    for (id, _, digest), html in zip(stale, htmls, strict=True)
+                ],
+            )
+            session.commit()
+            updated += len(stale)
+
+
+if __name__ == "__main__":
+    from src.core.database.config import get_engine
+
+    try:
+        with Session(get_engine()) as session:
+            for model in (BlogPostBody, Section):
+                count = backfill_rendered_content(session, model)
+                print(f"{model.__name__}: {count} filas renderizadas.")
+    finally:
+        shutdown_render_pool()
@@ -4,23 +4,33 @@ from typing import Annotated
 from fastapi import Depends
 from sqlmodel import Session, select
 
-from src.core.database.config import get_session
+from src.core.database.config import CurrentSession
 from src.domain.models.section import Section
 from src.domain.schemas.section import SectionCreateSchema, SectionUpdateSchema
 from src.repository.base import BaseRepository
+from src.repository.loader import CurrentEntityLoader, EntityLoader
+from src.repository.rendered_content import RenderedContentMixin
 
 
 class SectionRepository(
+    RenderedContentMixin,
     BaseRepository[Section, SectionCreateSchema, SectionUpdateSchema],
 ):
-    def __init__(self, model: type, db_session: Session):
-        super().__init__(model, db_session)
+    def __init__(
+        self,
+        model: type,
+        db_session: Session,
+        loader: EntityLoader | None = None,
+    ):
+        super().__init__(model, db_session, loader)
 
     def get_sections_by_blog_post(
-        self, blog_post_id: uuid.UUID, skip: int = 0, limit: int = 100,
+        self,
+        blog_post_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
     ) -> list[Section]:
-        """Obtiene todas las secciones de un blog post específico ordenadas por position_order.
-        """
+        """Obtiene todas las secciones de un blog post específico ordenadas por position_order."""
         stmt = (
             select(Section)
             .where(Section.blog_post_id == blog_post_id)
@@ -33,9 +43,10 @@ class SectionRepository(
 
 
 def get_section_repository(
-    session: Session = Depends(get_session),
+    session: CurrentSession,
+    loader: CurrentEntityLoader,
 ) -> SectionRepository:
-    return SectionRepository(model=Section, db_session=session)
+    return SectionRepository(model=Section, db_session=session, loader=loader)
 
 
 CurrentSectionRepo = Annotated[SectionRepository, Depends(get_section_repository)]
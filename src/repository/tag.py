@@ -1,21 +1,46 @@
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends
-from sqlmodel import Session
+from sqlmodel import Session, select
 
-from src.core.database.config import get_session
+from src.core.database.config import CurrentSession
+from src.domain.models.blog_post_tag_link import BlogPostTagLink
 from src.domain.models.tag import Tag
 from src.domain.schemas.tag import TagCreateSchema, TagUpdateSchema
 from src.repository.base import BaseRepository
-
-
-class TagRepository(BaseRepository[Tag, TagCreateSchema, TagUpdateSchema]):
-    def __init__(self, model: type, db_session: Session):
-        super().__init__(model, db_session)
-
-
-def get_tag_repository(session: Session = Depends(get_session)) -> TagRepository:
-    return TagRepository(model=Tag, db_session=session)
+from src.repository.loader import CurrentEntityLoader, EntityLoader
+from src.repository.related_posts import mark_tags_changed
+from src.repository.taxonomy import TaxonomyRepositoryMixin
+
+
+class TagRepository(
+    TaxonomyRepositoryMixin,
+    BaseRepository[Tag, TagCreateSchema, TagUpdateSchema],
+):
+    def __init__(
+        self,
+        model: type,
+        db_session: Session,
+        loader: EntityLoader | None = None,
+    ):
+        super().__init__(model, db_session, loader)
+
+    def delete_by_id(self, *, id: Any) -> None:
+        """Elimina un tag y marca sus blog posts para recalcular sus relacionados
+        (la base de datos borra los enlaces en cascada).
+        """
+        blog_post_ids = self.session.exec(
+            select(BlogPostTagLink.blog_post_id).where(BlogPostTagLink.tag_id == id),
+        ).all()
+        super().delete_by_id(id=id)
+        mark_tags_changed(self.session, blog_post_ids)
+
+
+def get_tag_repository(
+    session: CurrentSession,
+    loader: CurrentEntityLoader,
+) -> TagRepository:
+    return TagRepository(model=Tag, db_session=session, loader=loader)
 
 
 CurrentTagRepo = Annotated[TagRepository, Depends(get_tag_repository)]
@@ -0,0 +1,421 @@
+"""Snapshot en memoria de las categorías y los tags.
+
+Casi todas las respuestas de blog posts incluyen su categoría y sus tags, dos
+tablas pequeñas que apenas cambian. En lugar de cargarlas en cada petición, las
+rutas construyen el esquema de lectura de los posts con `to_read_schema`, que las
+toma del snapshot del proceso: una copia inmutable y versionada de todas las
+categorías y tags, por ID y por nombre. De la base de datos solo se leen los enlaces post-tag
+(`BlogPost.tag_links`), sin unirlos con `tag`.
+
+Las escrituras de `CategoryRepository` y `TagRepository` (ver
+`TaxonomyRepositoryMixin`):
+
+* caducan el snapshot del proceso al confirmarse, y
+* en PostgreSQL emiten `NOTIFY` en el canal `TAXONOMY_NOTIFY_CHANNEL` dentro de
+  la misma transacción, de modo que la notificación solo se entrega si se
+  confirma.
+
+Cada proceso escucha el canal con `TaxonomyListener` (una conexión dedicada) y,
+al recibir una notificación, reconstruye el snapshot y lo sustituye de una vez.
+Si la escucha no está disponible (SQLite, conexión caída), los cambios de otros
+procesos se recogen al caducar el snapshot, como mucho
+`TAXONOMY_SNAPSHOT_TTL_SECONDS` después.
+"""
+
+import logging
+import select as select_module
+import uuid
+from dataclasses import dataclass, field, replace
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import object_session
+from sqlmodel import Session, SQLModel
+
+from src.core.database.config import ReadOnlySession
+from src.core.settings import app_settings
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.category import Category
+from src.domain.models.tag import Tag
+from src.domain.schemas.category import CategoryReadSchema
+from src.domain.schemas.tag import TagReadSchema
+
+logger = logging.getLogger(__name__)
+
+_CHANGED_KEY = "taxonomy_changed"
+_NOTIFIED_KEY = "taxonomy_notified"
+_REBUILT_KEY = "taxonomy_rebuilt"
+
+# Identifica las notificaciones de este proceso, que ya caducó su snapshot al
+# confirmar y no necesita reconstruirlo otra vez.
+PROCESS_TOKEN = uuid.uuid4().hex
+
+
+@dataclass(frozen=True)
+class TaxonomySnapshot:
+    version: int
+    # Instante (monotonic) de la última reconstrucción desde la base de datos.
+    built_at: float
+    categories: dict[uuid.UUID, CategoryReadSchema] = field(default_factory=dict)
+    tags: dict[uuid.UUID, TagReadSchema] = field(default_factory=dict)
+    # El nombre de una categoría no es único: se guardan todas, por antigüedad.
+    categories_by_name: dict[str, tuple[CategoryReadSchema, ...]] = field(
+        default_factory=dict,
+    )
+    tags_by_name: dict[str, TagReadSchema] = field(default_factory=dict)
+
+
+def load_snapshot(session: Session, version: int) -> TaxonomySnapshot:
+    """Construye el snapshot desde la base de datos con dos consultas."""
+    categories: dict[uuid.UUID, CategoryReadSchema] = {}
+    categories_by_name: dict[str, tuple[CategoryReadSchema, ...]] = {}
+    for category in session.exec(
+        select(Category).order_by(Category.created_at, Category.id),
+    ).scalars():
+        read = CategoryReadSchema.model_validate(category)
+        categories[read.id] = read
+        categories_by_name[read.name] = (*categories_by_name.get(read.name, ()), read)
+    tags = {
+        tag.id: TagReadSchema.model_validate(tag)
+        for tag in session.exec(select(Tag)).scalars()
+    }
+    return TaxonomySnapshot(
+        version=version,
+        built_at=monotonic(),
+        categories=categories,
+        tags=tags,
+        categories_by_name=categories_by_name,
+        tags_by_name={tag.name: tag for tag in tags.values()},
+    )
+
+
+class TaxonomySnapshotStore:
+    """Snapshot vigente del proceso. Las lecturas no toman ningún lock: solo
+    leen la referencia al snapshot, que se sustituye entera en cada cambio.
+    """
+
+    def __init__(self, *, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: TaxonomySnapshot | None = None
+        self._version = 0
+        # Invalidaciones recibidas; permite detectar las que llegan durante una
+        # reconstrucción.
+        self._generation = 0
+        self._lock = Lock()
+        self._rebuild_lock = Lock()
+
+    def _is_fresh(self, snapshot: TaxonomySnapshot | None) -> bool:
+        return (
+            snapshot is not None and monotonic() - snapshot.built_at < self.ttl_seconds
+        )
+
+    def current(self, session: Session) -> TaxonomySnapshot:
+        """Snapshot vigente; lo reconstruye con `session` si no existe o caducó.
+        Una sesión con cambios de taxonomía sin confirmar no lo reconstruye: recibe
+        un snapshot propio, que no se comparte con el resto del proceso.
+        """
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+        if session.info.get(_CHANGED_KEY):
+            return load_snapshot(session, self._version)
+        # Si otro hilo ya está reconstruyendo, se sirve el snapshot caducado en
+        # lugar de lanzar otra reconstrucción.
+        if not self._rebuild_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+            return self._load(session)
+        finally:
+            self._rebuild_lock.release()
+
+    def rebuild(self, session: Session) -> TaxonomySnapshot:
+        """Reconstruye el snapshot desde la base de datos."""
+        with self._rebuild_lock:
+            return self._load(session)
+
+    def _load(self, session: Session) -> TaxonomySnapshot:
+        generation = self._generation
+        snapshot = load_snapshot(session, self._version + 1)
+        with self._lock:
+            self._version = snapshot.version
+            if self._generation != generation:
+                # Un cambio confirmado durante la carga podría no estar en ella:
+                # el snapshot nace caducado y se recarga en la siguiente petición.
+                snapshot = replace(snapshot, built_at=float("-inf"))
+            self._snapshot = snapshot
+        if not isinstance(session, ReadOnlySession):
+            # La transacción puede tener escrituras sin confirmar que ahora están
+            # en el snapshot: si se revierte, el snapshot caduca con ella.
+            session.info[_REBUILT_KEY] = True
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Caduca el snapshot: se sigue sirviendo hasta que una petición (o el
+        listener) lo reconstruye.
+        """
+        with self._lock:
+            self._generation += 1
+            if self._snapshot is not None:
+                self._snapshot = replace(self._snapshot, built_at=float("-inf"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+
+def _taxonomy_session(blog_post: BlogPost) -> Session | None:
+    session = object_session(blog_post)
+    return session if isinstance(session, Session) else None
+
+
+def category_of(blog_post: BlogPost) -> CategoryReadSchema | Category | None:
+    """Categoría de `blog_post` desde el snapshot. Si la relación ya está cargada
+    (p. ej. tras reasignarla) se usa esa; si el snapshot no la tiene, está
+    desfasado: se caduca y la categoría se carga de la base de datos.
+    """
+    state = inspect(blog_post)
+    session = _taxonomy_session(blog_post)
+    if "category" in state.dict or session is None:
+        return blog_post.category
+    category = taxonomy_snapshot.current(session).categories.get(blog_post.category_id)
+    if category is None:
+        taxonomy_snapshot.invalidate()
+        return blog_post.category
+    return category
+
+
+def tags_of(blog_post: BlogPost) -> list[TagReadSchema] | list[Tag]:
+    """Tags de `blog_post` desde el snapshot, a partir de sus enlaces (cargados
+    con el post o, si no, con una consulta sobre la tabla de enlaces). Si los
+    tags ya están cargados (p. ej. tras añadir uno) se usan esos.
+    """
+    state = inspect(blog_post)
+    session = _taxonomy_session(blog_post)
+    if "tags" in state.dict or session is None:
+        return blog_post.tags
+    snapshot = taxonomy_snapshot.current(session)
+    tags = [snapshot.tags.get(link.tag_id) for link in blog_post.tag_links]
+    if None in tags:
+        taxonomy_snapshot.invalidate()
+        return blog_post.tags
+    return tags
+
+
+def blog_post_read_values(blog_post: BlogPost, fields: set[str]) -> dict[str, Any]:
+    """Valores de `fields` de `blog_post` para su esquema de lectura, con la
+    categoría y los tags resueltos con el snapshot.
+    """
+    values = {
+        name: getattr(blog_post, name)
+        for name in fields - {"category", "tags"}
+        if hasattr(blog_post, name)
+    }
+    if "category" in fields:
+        values["category"] = category_of(blog_post)
+    if "tags" in fields:
+        values["tags"] = tags_of(blog_post)
+    return values
+
+
+def to_read_schema[S: SQLModel](schema: type[S], entity: Any) -> S:
+    """`schema.model_validate(entity)`. Los blog posts toman la categoría y los
+    tags del snapshot en lugar de cargarlos de la base de datos.
+    """
+    if isinstance(entity, BlogPost):
+        entity = blog_post_read_values(entity, set(schema.model_fields))
+    return schema.model_validate(entity)
+
+
+class TaxonomyRepositoryMixin:
+    """Para `CategoryRepository` y `TagRepository`: cada escritura caduca el
+    snapshot al confirmarse y avisa a los demás procesos.
+    """
+
+    def create(self, *, obj_in):
+        created = super().create(obj_in=obj_in)
+        notify_taxonomy_change(self.session)
+        return created
+
+    def create_from_dict(self, *, obj_dict: dict[str, Any]):
+        created = super().create_from_dict(obj_dict=obj_dict)
+        notify_taxonomy_change(self.session)
+        return created
+
+    def update(self, *, db_obj, obj_in):
+        updated = super().update(db_obj=db_obj, obj_in=obj_in)
+        notify_taxonomy_change(self.session)
+        return updated
+
+    def update_by_id(self, *, id: Any, obj_in, expected_version: int | None = None):
+        updated = super().update_by_id(
+            id=id,
+            obj_in=obj_in,
+            expected_version=expected_version,
+        )
+        notify_taxonomy_change(self.session)
+        return updated
+
+    def delete_by_id(self, *, id: Any) -> None:
+        super().delete_by_id(id=id)
+        notify_taxonomy_change(self.session)
+
+    def get_read_by_id(self, id: uuid.UUID) -> CategoryReadSchema | TagReadSchema | Any:
+        """Entidad por ID desde el snapshot; si no está (no existe o el snapshot
+        aún no la tiene), se busca en la base de datos.
+        """
+        snapshot = taxonomy_snapshot.current(self.session)
+        found = (snapshot.categories if self.model is Category else snapshot.tags).get(
+            id,
+        )
+        return found if found is not None else self.get_by_id(id=id)
+
+    def get_by_name(self, name: str) -> list[CategoryReadSchema] | list[TagReadSchema]:
+        """Entidades con el nombre exacto `name`, desde el snapshot."""
+        snapshot = taxonomy_snapshot.current(self.session)
+        if self.model is Category:
+            return list(snapshot.categories_by_name.get(name, ()))
+        tag = snapshot.tags_by_name.get(name)
+        return [tag] if tag is not None else []
+
+
+def notify_taxonomy_change(session: Session) -> None:
+    """Anota que la transacción cambia categorías o tags. En PostgreSQL emite
+    además el `NOTIFY`, que la base de datos solo entrega si la transacción se
+    confirma (una vez por transacción).
+    """
+    session.info[_CHANGED_KEY] = True
+    if session.info.get(_NOTIFIED_KEY) or session.get_bind().dialect.name != (
+        "postgresql"
+    ):
+        return
+    session.exec(
+        text("SELECT pg_notify(:channel, :payload)"),
+        params={
+            "channel": app_settings.TAXONOMY_NOTIFY_CHANNEL,
+            "payload": PROCESS_TOKEN,
+        },
+    )
+    session.info[_NOTIFIED_KEY] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_taxonomy(session: OrmSession) -> None:
+    session.info.pop(_NOTIFIED_KEY, None)
+    session.info.pop(_REBUILT_KEY, None)
+    if session.info.pop(_CHANGED_KEY, None):
+        taxonomy_snapshot.invalidate()
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_taxonomy_change(session: OrmSession) -> None:
+    session.info.pop(_NOTIFIED_KEY, None)
+    session.info.pop(_CHANGED_KEY, None)
+    if session.info.pop(_REBUILT_KEY, None):
+        taxonomy_snapshot.invalidate()
+
+
+class TaxonomyListener:
+    """Escucha `TAXONOMY_NOTIFY_CHANNEL` en un hilo con una conexión propia
+    (fuera del pool) y reconstruye el snapshot con cada notificación de otro
+    proceso. Si la conexión se pierde, reintenta y reconstruye al volver a
+    escuchar, por si se perdió alguna notificación. Solo en PostgreSQL (psycopg2).
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        store: TaxonomySnapshotStore,
+        *,
+        channel: str,
+        poll_seconds: float = 5.0,
+        retry_seconds: float = 5.0,
+    ):
+        self.engine = engine
+        self.store = store
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = retry_seconds
+        self.listening = Event()
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> bool:
+        """Arranca la escucha. Devuelve False si el motor no admite LISTEN."""
+        if self.engine.dialect.name != "postgresql":
+            return False
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="taxonomy-listener", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.warning(
+                    "Escucha de %s interrumpida; se reintenta en %.0f s",
+                    self.channel,
+                    self.retry_seconds,
+                    exc_info=True,
+                )
+            finally:
+                self.listening.clear()
+            self._stop.wait(self.retry_seconds)
+
+    def _listen(self) -> None:
+        connection = self.engine.raw_connection()
+        dbapi_connection = connection.driver_connection
+        # La conexión queda en autocommit y escuchando: no vuelve al pool.
+        connection.detach()
+        try:
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self.listening.set()
+            # Lo confirmado mientras no se escuchaba se recoge reconstruyendo.
+            self._refresh()
+            while not self._stop.is_set():
+                ready, _, _ = select_module.select(
+                    [dbapi_connection],
+                    [],
+                    [],
+                    self.poll_seconds,
+                )
+                if not ready:
+                    continue
+                dbapi_connection.poll()
+                notifies = [
+                    notify
+                    for notify in dbapi_connection.notifies
+                    if notify.payload != PROCESS_TOKEN
+                ]
+                dbapi_connection.notifies.clear()
+                if notifies:
+                    self._refresh()
+        finally:
+            connection.close()
+
+    def _refresh(self) -> None:
+        self.store.invalidate()
+        with Session(self.engine) as session:
+            self.store.rebuild(session)
+
+
+taxonomy_snapshot = TaxonomySnapshotStore(
+    ttl_seconds=app_settings.TAXONOMY_SNAPSHOT_TTL_SECONDS,
+)
@@ -0,0 +1,130 @@
+"""Contadores de visitas con escritura diferida y ranking de tendencia.
+
+Un `UPDATE blogpost SET views = views + 1` por visita bloquearía las filas más
+leídas y generaría WAL en cada página vista. En su lugar, cada proceso acumula
+las visitas en memoria (`view_counter`, ver `src/repository/buffered_counter.py`)
+y las escribe periódicamente en `blogpoststats` con un único upsert aditivo por
+lotes. La fila de `BlogPost` no se toca nunca.
+
+La puntuación de tendencia suma 2^((t - ahora) / vida media) por cada visita en
+el instante `t`. Se guarda su logaritmo referido al instante 0 (`trending_log`),
+que no depende de "ahora": cada vaciado solo le suma las visitas nuevas y el
+ranking es un `ORDER BY trending_log DESC` servido por un índice.
+"""
+
+import math
+import time
+import uuid
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from src.core.settings import app_settings
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_stats import BlogPostStats
+from src.repository.buffered_counter import BufferedCounter, dialect_insert
+from src.repository.loader import id_in
+
+LN2 = math.log(2)
+# Por debajo de e^-50 el término menor no cambia la suma en coma flotante; el
+# límite evita además el error por underflow de `exp` en PostgreSQL.
+_MIN_LOG_RATIO = -50.0
+
+
+def _half_life_seconds() -> float:
+    return app_settings.TRENDING_HALF_LIFE_HOURS * 3600
+
+
+def trending_log(views: int, at: float, half_life_seconds: float) -> float:
+    """Logaritmo de la aportación de `views` visitas en el instante `at`."""
+    return math.log(views) + LN2 * at / half_life_seconds
+
+
+def trending_score(log_score: float, now: float, half_life_seconds: float) -> float:
+    """Puntuación de tendencia en el instante `now`: visitas ponderadas por su
+    antigüedad (una visita de hace una vida media cuenta 0,5).
+    """
+    return math.exp(log_score - LN2 * now / half_life_seconds)
+
+
+class ViewStatsRepository:
+    def __init__(self, db_session: Session, half_life_seconds: float | None = None):
+        self.session = db_session
+        self.half_life_seconds = half_life_seconds or _half_life_seconds()
+
+    @property
+    def _dialect_name(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def _upsert(self):
+        table = BlogPostStats.__table__
+        statement = dialect_insert(BlogPostStats, self._dialect_name)
+        if self._dialect_name == "postgresql":
+            greatest, least = func.greatest, func.least
+        else:
+            # En SQLite max() y min() con dos argumentos son funciones escalares.
+            greatest, least = func.max, func.min
+        excluded = statement.excluded
+        high = greatest(table.c.trending_log, excluded.trending_log)
+        low = least(table.c.trending_log, excluded.trending_log)
+        # log(e^a + e^b) sin desbordamiento: max + log(1 + e^(min - max)).
+        log_sum = high + func.ln(1 + func.exp(greatest(low - high, _MIN_LOG_RATIO)))
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.blog_post_id],
+            set_={"views": table.c.views + excluded.views, "trending_log": log_sum},
+        )
+
+    def apply_views(self, views: dict[uuid.UUID, int], at: float) -> int:
+        """Suma `views` (visitas por post) a los contadores con un único upsert,
+        como si todas se hubieran producido en el instante `at`. Las visitas de
+        posts que ya no existen se descartan. Devuelve las visitas escritas.
+        """
+        ids = sorted(views)
+        existing = set(
+            self.session.exec(
+                select(BlogPost.id).where(id_in(BlogPost.id, ids, self._dialect_name)),
+            ).scalars(),
+        )
+        rows = [
+            {
+                "blog_post_id": id,
+                "views": views[id],
+                "trending_log": trending_log(views[id], at, self.half_life_seconds),
+            }
+            for id in ids
+            if id in existing
+        ]
+        if rows:
+            self.session.exec(self._upsert(), params=rows)
+        return sum(row["views"] for row in rows)
+
+    def get_stats(self, blog_post_id: uuid.UUID) -> BlogPostStats | None:
+        return self.session.get(BlogPostStats, blog_post_id)
+
+    def trending_score(self, stats: BlogPostStats, now: float | None = None) -> float:
+        return trending_score(
+            stats.trending_log,
+            time.time() if now is None else now,
+            self.half_life_seconds,
+        )
+
+    def get_trending_ids(self, limit: int) -> list[uuid.UUID]:
+        """IDs de los posts con mayor puntuación de tendencia, de mayor a menor."""
+        return list(
+            self.session.exec(
+                select(BlogPostStats.blog_post_id)
+                .order_by(BlogPostStats.trending_log.desc(), BlogPostStats.blog_post_id)
+                .limit(limit),
+            ).scalars(),
+        )
+
+
+def write_views(session: Session, views: dict[uuid.UUID, int], at: float) -> int:
+    return ViewStatsRepository(session).apply_views(views, at)
+
+
+view_counter = BufferedCounter(
+    "blog_post_views",
+    write_views,
+    max_keys=app_settings.VIEW_BUFFER_MAX_POSTS,
+)
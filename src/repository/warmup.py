@@ -0,0 +1,49 @@
+import uuid
+
+from sqlmodel import Session
+
+from src.domain.models.announcement import Announcement
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.category import Category
+from src.domain.models.section import Section
+from src.domain.models.tag import Tag
+from src.repository.announcement import AnnouncementRepository
+from src.repository.blog_post import BlogPostRepository
+from src.repository.category import CategoryRepository
+from src.repository.section import SectionRepository
+from src.repository.tag import TagRepository
+
+
+def warm_repositories(session: Session) -> None:
+    """Ejecuta una vez las consultas de los endpoints más usados para que queden
+    compiladas en la caché de sentencias del engine. Usa un ID inexistente, así
+    que no devuelve datos; las cargas perezosas de las relaciones se calientan
+    sobre el primer blog post, si existe.
+    """
+    probe = uuid.uuid4()
+
+    blog_posts = BlogPostRepository(model=BlogPost, db_session=session)
+    blog_posts.get_by_id(id=probe)
+    blog_posts.get_blog_posts_by_category(category_id=probe, limit=1)
+    for blog_post in blog_posts.get_all(limit=1):
+        blog_post.tag_links  # noqa: B018
+        blog_post.sections  # noqa: B018
+        blog_post.announcements  # noqa: B018
+
+    for repository in (
+        CategoryRepository(model=Category, db_session=session),
+        TagRepository(model=Tag, db_session=session),
+        SectionRepository(model=Section, db_session=session),
+        AnnouncementRepository(model=Announcement, db_session=session),
+    ):
+        repository.get_by_id(id=probe)
+        repository.get_all(limit=1)
+
+    SectionRepository(model=Section, db_session=session).get_sections_by_blog_post(
+        probe,
+        limit=1,
+    )
+    AnnouncementRepository(
+        model=Announcement,
+        db_session=session,
+    ).get_announcements_by_blog_post(probe, limit=1)
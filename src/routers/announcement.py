@@ -1,8 +1,10 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from src.domain.models.blog_post import BlogPost
+from src.core.etag import IfMatchVersion, set_etag
+from src.core.pagination import BatchIds, set_total_count
+from src.domain.models.category import Category
 from src.domain.schemas.announcement import (
     AnnouncementCreateSchema,
     AnnouncementReadSchema,
@@ -11,18 +13,23 @@ from src.domain.schemas.announcement import (
 from src.domain.schemas.blog_post import BlogPostReadSchema
 from src.repository.announcement import CurrentAnnouncementRepo
 from src.repository.blog_post import BlogPostRepository, get_blog_post_repository
+from src.repository.counting import TotalCount
+from src.repository.exceptions import EntityNotFoundError, VersionConflictError
+from src.repository.taxonomy import to_read_schema
 
 router = APIRouter(prefix="/v1/api/announcements", tags=["Announcements"])
 
 
 @router.post(
-    "", response_model=AnnouncementReadSchema, status_code=status.HTTP_201_CREATED,
+    "",
+    response_model=AnnouncementReadSchema,
+    status_code=status.HTTP_201_CREATED,
 )
 def create_announcement(
-    announcement_in: AnnouncementCreateSchema, repo: CurrentAnnouncementRepo,
+    announcement_in: AnnouncementCreateSchema,
+    repo: CurrentAnnouncementRepo,
 ):
-    """Crea un nuevo anuncio.
-    """
+    """Crea un nuevo anuncio."""
     try:
         created_announcement = repo.create(obj_in=announcement_in)
         return created_announcement
@@ -33,23 +40,74 @@ def create_announcement(
         )
 
 
-@router.get("/{announcement_id}", response_model=AnnouncementReadSchema)
-def read_announcement(announcement_id: uuid.UUID, repo: CurrentAnnouncementRepo):
-    """Obtiene un único anuncio por su ID.
+@router.get(
+    "/serve",
+    response_model=AnnouncementReadSchema,
+    responses={status.HTTP_204_NO_CONTENT: {"description": "Sin anuncios"}},
+)
+def serve_announcement(
+    *,
+    blog_post_id: uuid.UUID,
+    category_id: uuid.UUID | None = None,
+    repo: CurrentAnnouncementRepo,
+    response: Response,
+):
+    """Elige el anuncio que se muestra en un blog post, rotando entre los suyos
+    según su peso o, si no tiene, entre los de `category_id`. Se sirve desde un
+    snapshot en memoria, sin consultar la base de datos, y anota la impresión.
+    Responde `204` si no hay ningún anuncio que mostrar.
     """
+    announcement, version = repo.serve_announcement(
+        blog_post_id=blog_post_id,
+        category_id=category_id,
+    )
+    headers = {"X-Announcements-Version": str(version)}
+    if announcement is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+    response.headers.update(headers)
+    return announcement
+
+
+@router.get("/{announcement_id}", response_model=AnnouncementReadSchema)
+def read_announcement(
+    announcement_id: uuid.UUID, repo: CurrentAnnouncementRepo, response: Response
+):
+    """Obtiene un único anuncio por su ID."""
     db_announcement = repo.get_by_id(id=announcement_id)
     if not db_announcement:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Anuncio no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anuncio no encontrado",
         )
+    set_etag(response, db_announcement)
     return db_announcement
 
 
 @router.get("", response_model=list[AnnouncementReadSchema])
-def read_announcements(repo: CurrentAnnouncementRepo, skip: int = 0, limit: int = 100):
+def read_announcements(
+    repo: CurrentAnnouncementRepo,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    include_total: bool = False,
+    ids: BatchIds = None,
+):
     """Obtiene múltiples anuncios con paginación.
+    Con `ids` devuelve solo los anuncios indicados, en ese orden y omitiendo
+    los que no existen.
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`
+    (con `ids`, el número de los anuncios devueltos).
     """
-    announcements = repo.get_all(skip=skip, limit=limit)
+    if ids is not None:
+        announcements = repo.get_many(ids)
+        total = TotalCount(len(announcements), exact=True)
+    else:
+        announcements = repo.get_all(skip=skip, limit=limit)
+        total = None
+    if include_total:
+        if total is None:
+            total = repo.count_total()
+        set_total_count(response, total)
     return announcements
 
 
@@ -58,38 +116,47 @@ def update_announcement(
     announcement_id: uuid.UUID,
     announcement_in: AnnouncementUpdateSchema,
     repo: CurrentAnnouncementRepo,
+    response: Response,
+    expected_version: IfMatchVersion,
 ):
-    """Actualiza un anuncio existente.
+    """Actualiza un anuncio existente con una sola sentencia.
+    Con `If-Match` el cambio solo se aplica si la versión coincide (412 si no).
     """
-    db_announcement_to_update = repo.get_by_id(id=announcement_id)
-    if not db_announcement_to_update:
+    try:
+        updated_announcement = repo.update_by_id(
+            id=announcement_id,
+            obj_in=announcement_in,
+            expected_version=expected_version,
+        )
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Anuncio no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anuncio no encontrado",
         )
-
-    try:
-        updated_announcement = repo.update(
-            db_obj=db_announcement_to_update, obj_in=announcement_in,
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="El anuncio fue modificado por otra petición; vuelva a leerlo.",
         )
-        return updated_announcement
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ocurrió un error al actualizar el anuncio: {e!s}",
         )
+    set_etag(response, updated_announcement)
+    return updated_announcement
 
 
 @router.delete("/{announcement_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_announcement(announcement_id: uuid.UUID, repo: CurrentAnnouncementRepo):
-    """Elimina un anuncio por su ID.
-    """
-    db_announcement = repo.get_by_id(id=announcement_id)
-    if not db_announcement:
+    """Elimina un anuncio por su ID."""
+    try:
+        repo.delete_by_id(id=announcement_id)
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Anuncio no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anuncio no encontrado",
         )
-    try:
-        repo.delete(entity=db_announcement)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -110,25 +177,27 @@ def add_announcement_to_blog_post(
     repo: CurrentAnnouncementRepo,
     blog_post_repo: BlogPostRepository = Depends(get_blog_post_repository),
 ):
-    """Agrega un anuncio a un blog post.
-    """
+    """Agrega un anuncio a un blog post."""
     # Verificar que el blog post existe
     blog_post = blog_post_repo.get_by_id(id=blog_post_id)
     if not blog_post:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Blog post no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Blog post no encontrado",
         )
 
     # Verificar que el anuncio existe
     announcement = repo.get_by_id(id=announcement_id)
     if not announcement:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Anuncio no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anuncio no encontrado",
         )
 
     try:
         updated_announcement = repo.add_announcement_to_blog_post(
-            blog_post_id=blog_post_id, announcement_id=announcement_id,
+            blog_post_id=blog_post_id,
+            announcement_id=announcement_id,
         )
         repo.commit()
         return updated_announcement
@@ -150,25 +219,27 @@ def remove_announcement_from_blog_post(
     repo: CurrentAnnouncementRepo,
     blog_post_repo: BlogPostRepository = Depends(get_blog_post_repository),
 ):
-    """Elimina un anuncio de un blog post.
-    """
+    """Elimina un anuncio de un blog post."""
     # Verificar que el blog post existe
     blog_post = blog_post_repo.get_by_id(id=blog_post_id)
     if not blog_post:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Blog post no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Blog post no encontrado",
         )
 
     # Verificar que el anuncio existe
     announcement = repo.get_by_id(id=announcement_id)
     if not announcement:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Anuncio no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anuncio no encontrado",
         )
 
     try:
         updated_announcement = repo.remove_announcement_from_blog_post(
-            blog_post_id=blog_post_id, announcement_id=announcement_id,
+            blog_post_id=blog_post_id,
+            announcement_id=announcement_id,
         )
         repo.commit()
         return updated_announcement
@@ -180,24 +251,93 @@ def remove_announcement_from_blog_post(
         )
 
 
+# Anuncios por defecto de una categoría
+
+
+@router.post(
+    "/category/{category_id}/announcements/{announcement_id}",
+    response_model=AnnouncementReadSchema,
+)
+def add_announcement_to_category(
+    category_id: uuid.UUID,
+    announcement_id: uuid.UUID,
+    repo: CurrentAnnouncementRepo,
+):
+    """Agrega un anuncio por defecto a una categoría: se muestra en los blog
+    posts de la categoría que no tienen anuncios propios.
+    """
+    try:
+        return repo.add_announcement_to_category(
+            category_id=category_id,
+            announcement_id=announcement_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ocurrió un error al agregar el anuncio a la categoría: {e!s}",
+        ) from e
+
+
+@router.delete(
+    "/category/{category_id}/announcements/{announcement_id}",
+    response_model=AnnouncementReadSchema,
+)
+def remove_announcement_from_category(
+    category_id: uuid.UUID,
+    announcement_id: uuid.UUID,
+    repo: CurrentAnnouncementRepo,
+):
+    """Elimina un anuncio por defecto de una categoría."""
+    try:
+        return repo.remove_announcement_from_category(
+            category_id=category_id,
+            announcement_id=announcement_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ocurrió un error al eliminar el anuncio de la categoría: {e!s}",
+        ) from e
+
+
+@router.get("/category/{category_id}", response_model=list[AnnouncementReadSchema])
+def get_announcements_by_category(
+    category_id: uuid.UUID,
+    repo: CurrentAnnouncementRepo,
+):
+    """Obtiene los anuncios por defecto de una categoría."""
+    if repo.loader.load(Category, category_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Categoría con id {category_id} no encontrada",
+        )
+    return repo.get_announcements_by_category(category_id=category_id)
+
+
 @router.get("/{announcement_id}/blog_posts", response_model=list[BlogPostReadSchema])
 def get_blog_posts_for_announcement(
     announcement_id: uuid.UUID,
     repo: CurrentAnnouncementRepo,
 ):
-    """Obtiene todos los blog posts asociados a un anuncio.
-    """
+    """Obtiene todos los blog posts asociados a un anuncio."""
     announcement = repo.get_by_id(id=announcement_id)
     if not announcement:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Anuncio no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Anuncio no encontrado",
         )
 
     try:
         blog_posts = repo.get_blog_posts_for_announcement(
             announcement_id=announcement_id,
         )
-        return blog_posts
+        return [
+            to_read_schema(BlogPostReadSchema, blog_post) for blog_post in blog_posts
+        ]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -211,12 +351,15 @@ def get_announcements_by_blog_post(
     blog_post_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
+    include_total: bool = False,
     repo: CurrentAnnouncementRepo,
+    response: Response,
     blog_post_repo: BlogPostRepository = Depends(get_blog_post_repository),
 ):
     """Obtiene todos los anuncios asociados a un blog post específico.
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`.
     """
-    blog_post = blog_post_repo.session.get(BlogPost, blog_post_id)
+    blog_post = blog_post_repo.get_by_id(id=blog_post_id)
     if not blog_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -225,8 +368,15 @@ def get_announcements_by_blog_post(
 
     try:
         announcements = repo.get_announcements_by_blog_post(
-            blog_post_id=blog_post_id, skip=skip, limit=limit,
+            blog_post_id=blog_post_id,
+            skip=skip,
+            limit=limit,
         )
+        if include_total:
+            set_total_count(
+                response,
+                repo.count_announcements_by_blog_post(blog_post_id),
+            )
         return announcements
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,345 @@
+"""Ejecución de varias operaciones de la API en una sola petición.
+
+El editor guarda un post con una docena de llamadas (post, secciones, tags,
+anuncios). `/v1/api/batch` las recibe en orden y las ejecuta con los mismos
+métodos de repositorio que las rutas individuales, en una sola sesión y
+transacción: o se aplican todas o ninguna.
+"""
+
+import logging
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel
+
+from src.core.database.config import CurrentSession
+from src.domain.models.announcement import Announcement
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.category import Category
+from src.domain.models.section import Section
+from src.domain.models.tag import Tag
+from src.domain.schemas.announcement import (
+    AnnouncementCreateSchema,
+    AnnouncementReadSchema,
+    AnnouncementUpdateSchema,
+)
+from src.domain.schemas.batch import (
+    BatchOperation,
+    BatchOperationResult,
+    BatchOperationType,
+    BatchRequestSchema,
+    BatchResponseSchema,
+)
+from src.domain.schemas.blog_post import (
+    BlogPostCreateSchema,
+    BlogPostReadSchema,
+    BlogPostUpdateSchema,
+)
+from src.domain.schemas.category import (
+    CategoryCreateSchema,
+    CategoryReadSchema,
+    CategoryUpdateSchema,
+)
+from src.domain.schemas.section import (
+    SectionCreateSchema,
+    SectionReadSchema,
+    SectionUpdateSchema,
+)
+from src.domain.schemas.tag import TagCreateSchema, TagReadSchema, TagUpdateSchema
+from src.repository.announcement import AnnouncementRepository
+from src.repository.base import BaseRepository
+from src.repository.blog_post import BlogPostRepository
+from src.repository.category import CategoryRepository
+from src.repository.exceptions import (
+    EntityInUseError,
+    EntityNotFoundError,
+    VersionConflictError,
+)
+from src.repository.loader import CurrentEntityLoader, EntityLoader
+from src.repository.section import SectionRepository
+from src.repository.tag import TagRepository
+from src.repository.taxonomy import to_read_schema
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v1/api/batch", tags=["Batch"])
+
+
+class BatchReferenceError(ValueError):
+    """Una referencia `{"$ref": ...}` o un ID del lote no es válido."""
+
+
+@dataclass(frozen=True)
+class _Entity:
+    model: type[SQLModel]
+    repository: type[BaseRepository]
+    create_schema: type[SQLModel]
+    update_schema: type[SQLModel]
+    read_schema: type[SQLModel]
+
+
+_ENTITIES = {
+    "tag": _Entity(Tag, TagRepository, TagCreateSchema, TagUpdateSchema, TagReadSchema),
+    "category": _Entity(
+        Category,
+        CategoryRepository,
+        CategoryCreateSchema,
+        CategoryUpdateSchema,
+        CategoryReadSchema,
+    ),
+    "section": _Entity(
+        Section,
+        SectionRepository,
+        SectionCreateSchema,
+        SectionUpdateSchema,
+        SectionReadSchema,
+    ),
+    "announcement": _Entity(
+        Announcement,
+        AnnouncementRepository,
+        AnnouncementCreateSchema,
+        AnnouncementUpdateSchema,
+        AnnouncementReadSchema,
+    ),
+    "blog_post": _Entity(
+        BlogPost,
+        BlogPostRepository,
+        BlogPostCreateSchema,
+        BlogPostUpdateSchema,
+        BlogPostReadSchema,
+    ),
+}
+
+
+class _BatchContext:
+    """Repositorios del lote: todos comparten la sesión y el cargador."""
+
+    def __init__(self, session: Session, loader: EntityLoader):
+        self.session = session
+        self.loader = loader
+        self._repositories: dict[str, BaseRepository] = {}
+
+    def repo(self, name: str) -> Any:
+        if name not in self._repositories:
+            entity = _ENTITIES[name]
+            self._repositories[name] = entity.repository(
+                entity.model,
+                self.session,
+                self.loader,
+            )
+        return self._repositories[name]
+
+
+def _as_uuid(value: Any, field: str) -> uuid.UUID:
+    try:
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except ValueError:
+        raise BatchReferenceError(f"'{field}' no es un UUID válido: {value!r}.")
+
+
+# Cada manejador recibe el contexto y la operación (con referencias ya resueltas)
+# y devuelve el código de estado, la entidad resultante y su esquema de lectura.
+Handler = Callable[
+    [_BatchContext, BatchOperation],
+    tuple[int, SQLModel | None, type[SQLModel] | None],
+]
+
+
+def _create(name: str) -> Handler:
+    entity = _ENTITIES[name]
+
+    def handler(ctx: _BatchContext, operation: BatchOperation):
+        obj_in = entity.create_schema.model_validate(operation.body or {})
+        created = ctx.repo(name).create(obj_in=obj_in)
+        return status.HTTP_201_CREATED, created, entity.read_schema
+
+    return handler
+
+
+def _update(name: str) -> Handler:
+    entity = _ENTITIES[name]
+
+    def handler(ctx: _BatchContext, operation: BatchOperation):
+        obj_in = entity.update_schema.model_validate(operation.body or {})
+        updated = ctx.repo(name).update_by_id(
+            id=_as_uuid(operation.id, "id"),
+            obj_in=obj_in,
+            expected_version=operation.version,
+        )
+        return status.HTTP_200_OK, updated, entity.read_schema
+
+    return handler
+
+
+def _delete(name: str) -> Handler:
+    def handler(ctx: _BatchContext, operation: BatchOperation):
+        ctx.repo(name).delete_by_id(id=_as_uuid(operation.id, "id"))
+        return status.HTTP_204_NO_CONTENT, None, None
+
+    return handler
+
+
+def _blog_post_tag(add: bool) -> Handler:
+    def handler(ctx: _BatchContext, operation: BatchOperation):
+        repo = ctx.repo("blog_post")
+        method = repo.add_tag_to_blog_post if add else repo.remove_tag_from_blog_post
+        blog_post = method(
+            blog_post_id=_as_uuid(operation.id, "id"),
+            tag_id=_as_uuid(operation.related_id, "related_id"),
+        )
+        return status.HTTP_200_OK, blog_post, BlogPostReadSchema
+
+    return handler
+
+
+def _assign_category(ctx: _BatchContext, operation: BatchOperation):
+    blog_post = ctx.repo("blog_post").assign_category_to_blog_post(
+        blog_post_id=_as_uuid(operation.id, "id"),
+        category_id=_as_uuid(operation.related_id, "related_id"),
+    )
+    return status.HTTP_200_OK, blog_post, BlogPostReadSchema
+
+
+def _blog_post_announcement(add: bool) -> Handler:
+    def handler(ctx: _BatchContext, operation: BatchOperation):
+        repo = ctx.repo("announcement")
+        method = (
+            repo.add_announcement_to_blog_post
+            if add
+            else repo.remove_announcement_from_blog_post
+        )
+        announcement = method(
+            blog_post_id=_as_uuid(operation.id, "id"),
+            announcement_id=_as_uuid(operation.related_id, "related_id"),
+        )
+        return status.HTTP_200_OK, announcement, AnnouncementReadSchema
+
+    return handler
+
+
+_HANDLERS: dict[BatchOperationType, Handler] = {
+    **{
+        BatchOperationType(f"{name}.{action}"): factory(name)
+        for name in _ENTITIES
+        for action, factory in (
+            ("create", _create),
+            ("update", _update),
+            ("delete", _delete),
+        )
+    },
+    BatchOperationType.BLOG_POST_ADD_TAG: _blog_post_tag(add=True),
+    BatchOperationType.BLOG_POST_REMOVE_TAG: _blog_post_tag(add=False),
+    BatchOperationType.BLOG_POST_ASSIGN_CATEGORY: _assign_category,
+    BatchOperationType.BLOG_POST_ADD_ANNOUNCEMENT: _blog_post_announcement(add=True),
+    BatchOperationType.BLOG_POST_REMOVE_ANNOUNCEMENT: _blog_post_announcement(
+        add=False,
+    ),
+}
+
+
+def _resolve(value: Any, refs: dict[str, uuid.UUID]) -> Any:
+    """Sustituye las referencias `{"$ref": "<ref>"}` por el ID correspondiente."""
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            ref = value["$ref"]
+            if ref not in refs:
+                raise BatchReferenceError(
+                    f"La referencia '{ref}' no corresponde a ninguna operación "
+                    "anterior con resultado.",
+                )
+            return refs[ref]
+        return {key: _resolve(item, refs) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, refs) for item in value]
+    return value
+
+
+def _error_status(error: Exception) -> int:
+    # EntityNotFoundError hereda de ValueError: va antes que BatchReferenceError.
+    if isinstance(error, EntityNotFoundError):
+        return status.HTTP_404_NOT_FOUND
+    if isinstance(error, (BatchReferenceError, ValidationError)):
+        return status.HTTP_422_UNPROCESSABLE_ENTITY
+    if isinstance(error, VersionConflictError):
+        return status.HTTP_412_PRECONDITION_FAILED
+    if isinstance(error, (EntityInUseError, IntegrityError)):
+        return status.HTTP_409_CONFLICT
+    if isinstance(error, ValueError):
+        # Los métodos de relación indican así que una entidad no existe.
+        return status.HTTP_404_NOT_FOUND
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in item['loc'])}: {item['msg']}"
+            for item in error.errors()
+        )
+    if isinstance(error, IntegrityError):
+        return f"Violación de integridad: {error.orig}"
+    return str(error)
+
+
+@router.post("", response_model=BatchResponseSchema)
+def run_batch(
+    *,
+    batch_in: BatchRequestSchema,
+    session: CurrentSession,
+    loader: CurrentEntityLoader,
+):
+    """Ejecuta en orden una lista de operaciones en una sola transacción.
+    Si una falla se revierten todas y se responde con su código de estado
+    (`404`, `409`, `412`, `422` o `500`), su posición y su `ref`.
+    """
+    ctx = _BatchContext(session, loader)
+    refs: dict[str, uuid.UUID] = {}
+    results: list[BatchOperationResult] = []
+
+    for index, operation in enumerate(batch_in.operations):
+        try:
+            operation = operation.model_copy(
+                update={
+                    "id": _resolve(operation.id, refs),
+                    "related_id": _resolve(operation.related_id, refs),
+                    "body": _resolve(operation.body, refs),
+                },
+            )
+            status_code, entity, read_schema = _HANDLERS[operation.op](ctx, operation)
+            # Los cambios de relaciones quedan pendientes en la sesión: se envían
+            # ya para que un error de la base de datos se atribuya a esta operación.
+            session.flush()
+            data = None
+            if entity is not None:
+                data = to_read_schema(read_schema, entity).model_dump(mode="json")
+                if operation.ref is not None:
+                    refs[operation.ref] = entity.id
+        except Exception as e:
+            session.rollback()
+            error_status = _error_status(e)
+            if error_status >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                # Los errores esperados (404, 409...) ya van en la respuesta; de
+                # los inesperados se registra la traza.
+                logger.exception(
+                    "Falló la operación %d (%s) del lote",
+                    index,
+                    operation.op,
+                )
+            raise HTTPException(
+                status_code=error_status,
+                detail={
+                    "message": _error_message(e),
+                    "operation": index,
+                    "ref": operation.ref,
+                },
+            ) from e
+        results.append(
+            BatchOperationResult(ref=operation.ref, status=status_code, data=data),
+        )
+
+    return BatchResponseSchema(results=results)
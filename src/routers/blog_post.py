@@ -1,26 +1,42 @@
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
+from src.core.content_format import ContentFormat, ContentFormatQuery
+from src.core.etag import IfMatchVersion, set_etag
+from src.core.pagination import BatchIds, set_total_count
+from src.core.prefer import ReturnMinimal, minimal_response
 from src.domain.schemas.blog_post import (
     BlogPostCreateSchema,
+    BlogPostPatchSchema,
     BlogPostReadSchema,
     BlogPostUpdateSchema,
 )
+from src.domain.schemas.blog_post_stats import BlogPostStatsReadSchema
 from src.domain.schemas.category import CategoryReadSchema
 from src.domain.schemas.tag import TagReadSchema
-from src.repository.blog_post import CurrentBlogPostRepo
+from src.repository.blog_post import CurrentBlogPostRepo, created_range
+from src.repository.counting import TotalCount
+from src.repository.exceptions import (
+    EntityNotFoundError,
+    InvalidDeltaError,
+    VersionConflictError,
+    VersionRequiredError,
+)
+from src.repository.rendered_content import as_html
+from src.repository.taxonomy import to_read_schema
+from src.repository.view_stats import view_counter
 
 router = APIRouter(prefix="/v1/api/blog_posts", tags=["BlogPosts"])
 
 
 @router.post("", response_model=BlogPostReadSchema, status_code=status.HTTP_201_CREATED)
 def create_blog_post(*, blog_post_in: BlogPostCreateSchema, repo: CurrentBlogPostRepo):
-    """Crea un nuevo blog post.
-    """
+    """Crea un nuevo blog post."""
     try:
         created_blog_post = repo.create(obj_in=blog_post_in)
-        return created_blog_post
+        return to_read_schema(BlogPostReadSchema, created_blog_post)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -29,23 +45,80 @@ def create_blog_post(*, blog_post_in: BlogPostCreateSchema, repo: CurrentBlogPos
 
 
 @router.get("", response_model=list[BlogPostReadSchema])
-def read_blog_posts(*, skip: int = 0, limit: int = 100, repo: CurrentBlogPostRepo):
+def read_blog_posts(
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    include_total: bool = False,
+    ids: BatchIds = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    content_format: ContentFormatQuery = ContentFormat.RAW,
+    repo: CurrentBlogPostRepo,
+    response: Response,
+):
     """Obtiene múltiples blog posts con paginación.
+    Con `ids` devuelve solo los blog posts indicados, en ese orden y omitiendo
+    los que no existen.
+    Con `created_from` (incluida) y `created_to` (excluida) devuelve solo los
+    creados en ese rango; no se combinan con `ids` (422).
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`
+    (con `ids`, el número de blog posts devueltos).
+    Con `content_format=html` el contenido del post y de sus secciones se
+    devuelve en HTML.
     """
-    blog_posts = repo.get_all(skip=skip, limit=limit)
-    return blog_posts
+    filters = created_range(created_from, created_to)
+    if ids is not None and filters:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="created_from y created_to no se pueden combinar con ids.",
+        )
+    if ids is not None:
+        blog_posts = repo.get_many(ids)
+        total = TotalCount(len(blog_posts), exact=True)
+    else:
+        blog_posts = repo.get_all(skip=skip, limit=limit, filters=filters)
+        total = None
+    if include_total:
+        if total is None:
+            total = repo.count_total(filters=filters)
+        set_total_count(response, total)
+    if content_format is ContentFormat.HTML:
+        return [as_html(BlogPostReadSchema, blog_post) for blog_post in blog_posts]
+    return [to_read_schema(BlogPostReadSchema, blog_post) for blog_post in blog_posts]
+
+
+@router.get("/trending", response_model=list[BlogPostReadSchema])
+def read_trending_blog_posts(*, limit: int = 10, repo: CurrentBlogPostRepo):
+    """Obtiene los blog posts en tendencia: los más visitados, pesando más las
+    visitas recientes (ver `src/repository/view_stats.py`).
+    """
+    blog_posts = repo.get_trending_blog_posts(limit=limit)
+    return [to_read_schema(BlogPostReadSchema, blog_post) for blog_post in blog_posts]
 
 
 @router.get("/{blog_post_id}", response_model=BlogPostReadSchema)
-def read_blog_post(*, blog_post_id: uuid.UUID, repo: CurrentBlogPostRepo):
+def read_blog_post(
+    *,
+    blog_post_id: uuid.UUID,
+    content_format: ContentFormatQuery = ContentFormat.RAW,
+    repo: CurrentBlogPostRepo,
+    response: Response,
+):
     """Obtiene un único blog post por su ID.
+    Con `content_format=html` el contenido del post y de sus secciones se
+    devuelve en HTML.
     """
     db_blog_post = repo.get_by_id(id=blog_post_id)
     if not db_blog_post:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="BlogPost no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="BlogPost no encontrado",
         )
-    return db_blog_post
+    set_etag(response, db_blog_post)
+    if content_format is ContentFormat.HTML:
+        return as_html(BlogPostReadSchema, db_blog_post)
+    return to_read_schema(BlogPostReadSchema, db_blog_post)
 
 
 @router.put("/{blog_post_id}", response_model=BlogPostReadSchema)
@@ -54,38 +127,103 @@ def update_blog_post(
     blog_post_id: uuid.UUID,
     blog_post_in: BlogPostUpdateSchema,
     repo: CurrentBlogPostRepo,
+    response: Response,
+    expected_version: IfMatchVersion,
 ):
-    """Actualiza un blog post existente.
+    """Actualiza un blog post existente con una sola sentencia.
+    Con `If-Match` el cambio solo se aplica si la versión coincide (412 si no).
     """
-    db_blog_post_to_update = repo.get_by_id(id=blog_post_id)
-    if not db_blog_post_to_update:
+    try:
+        updated_blog_post = repo.update_by_id(
+            id=blog_post_id,
+            obj_in=blog_post_in,
+            expected_version=expected_version,
+        )
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="BlogPost no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="BlogPost no encontrado",
         )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="El blog post fue modificado por otra petición; vuelva a leerlo.",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ocurrió un error al actualizar el blog post: {e}",
+        )
+    set_etag(response, updated_blog_post)
+    return to_read_schema(BlogPostReadSchema, updated_blog_post)
+
 
+@router.patch(
+    "/{blog_post_id}",
+    response_model=BlogPostReadSchema,
+    responses={204: {"description": "Aplicado, con `Prefer: return=minimal`"}},
+)
+def patch_blog_post(
+    *,
+    blog_post_id: uuid.UUID,
+    blog_post_patch: BlogPostPatchSchema,
+    repo: CurrentBlogPostRepo,
+    response: Response,
+    expected_version: IfMatchVersion,
+    return_minimal: ReturnMinimal,
+):
+    """Modifica solo los campos enviados (JSON Merge Patch,
+    `application/merge-patch+json`). `content` admite un delta de texto sobre
+    la versión de `If-Match`, obligatorio en ese caso (428 si falta).
+    Con `Prefer: return=minimal` responde 204 con la nueva ETag.
+    """
     try:
-        updated_blog_post = repo.update(
-            db_obj=db_blog_post_to_update, obj_in=blog_post_in,
+        patched_blog_post = repo.patch_by_id(
+            id=blog_post_id,
+            patch=blog_post_patch,
+            expected_version=expected_version,
+        )
+    except EntityNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="BlogPost no encontrado",
+        )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="El blog post fue modificado por otra petición; vuelva a leerlo.",
+        )
+    except VersionRequiredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail=str(e),
+        )
+    except InvalidDeltaError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
         )
-        return updated_blog_post
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ocurrió un error al actualizar el blog post: {e}",
-        )
+        ) from e
+    if return_minimal:
+        return minimal_response(patched_blog_post.version)
+    set_etag(response, patched_blog_post)
+    return to_read_schema(BlogPostReadSchema, patched_blog_post)
 
 
 @router.delete("/{blog_post_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_blog_post(*, blog_post_id: uuid.UUID, repo: CurrentBlogPostRepo):
-    """Elimina un blog post por su ID.
-    """
-    db_blog_post = repo.get_by_id(id=blog_post_id)
-    if not db_blog_post:
+    """Elimina un blog post por su ID."""
+    try:
+        repo.delete_by_id(id=blog_post_id)
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="BlogPost no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="BlogPost no encontrado",
         )
-    try:
-        repo.delete(entity=db_blog_post)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -99,15 +237,18 @@ def delete_blog_post(*, blog_post_id: uuid.UUID, repo: CurrentBlogPostRepo):
     status_code=status.HTTP_200_OK,
 )
 def add_tag_to_blog_post(
-    *, blog_post_id: uuid.UUID, tag_id: uuid.UUID, repo: CurrentBlogPostRepo,
+    *,
+    blog_post_id: uuid.UUID,
+    tag_id: uuid.UUID,
+    repo: CurrentBlogPostRepo,
 ):
-    """Agrega un tag a un blog post.
-    """
+    """Agrega un tag a un blog post."""
     try:
         updated_blog_post = repo.add_tag_to_blog_post(
-            blog_post_id=blog_post_id, tag_id=tag_id,
+            blog_post_id=blog_post_id,
+            tag_id=tag_id,
         )
-        return updated_blog_post
+        return to_read_schema(BlogPostReadSchema, updated_blog_post)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -123,15 +264,18 @@ def add_tag_to_blog_post(
     status_code=status.HTTP_200_OK,
 )
 def remove_tag_from_blog_post(
-    *, blog_post_id: uuid.UUID, tag_id: uuid.UUID, repo: CurrentBlogPostRepo,
+    *,
+    blog_post_id: uuid.UUID,
+    tag_id: uuid.UUID,
+    repo: CurrentBlogPostRepo,
 ):
-    """Elimina un tag de un blog post.
-    """
+    """Elimina un tag de un blog post."""
     try:
         updated_blog_post = repo.remove_tag_from_blog_post(
-            blog_post_id=blog_post_id, tag_id=tag_id,
+            blog_post_id=blog_post_id,
+            tag_id=tag_id,
         )
-        return updated_blog_post
+        return to_read_schema(BlogPostReadSchema, updated_blog_post)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -143,8 +287,7 @@ def remove_tag_from_blog_post(
 
 @router.get("/{blog_post_id}/tags", response_model=list[TagReadSchema])
 def get_blog_post_tags(*, blog_post_id: uuid.UUID, repo: CurrentBlogPostRepo):
-    """Obtiene todos los tags asociados a un blog post.
-    """
+    """Obtiene todos los tags asociados a un blog post."""
     try:
         tags = repo.get_tags_for_blog_post(blog_post_id=blog_post_id)
         return tags
@@ -157,17 +300,66 @@ def get_blog_post_tags(*, blog_post_id: uuid.UUID, repo: CurrentBlogPostRepo):
         )
 
 
+@router.get("/{blog_post_id}/related", response_model=list[BlogPostReadSchema])
+def get_related_blog_posts(
+    *,
+    blog_post_id: uuid.UUID,
+    limit: int = 10,
+    repo: CurrentBlogPostRepo,
+):
+    """Obtiene los blog posts más parecidos por sus tags, del más al menos
+    parecido. Se sirven desde un índice precalculado que se actualiza al cambiar
+    los tags (ver `src/repository/related_posts.py`).
+    """
+    try:
+        blog_posts = repo.get_related_blog_posts(
+            blog_post_id=blog_post_id,
+            limit=limit,
+        )
+        return [
+            to_read_schema(BlogPostReadSchema, blog_post) for blog_post in blog_posts
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ocurrió un error al obtener los blog posts relacionados: {e}",
+        ) from e
+
+
+@router.post("/{blog_post_id}/views", status_code=status.HTTP_202_ACCEPTED)
+async def record_blog_post_view(*, blog_post_id: uuid.UUID):
+    """Registra una visita a un blog post. No consulta la base de datos: la
+    visita se acumula en memoria y se escribe en el siguiente vaciado.
+    """
+    view_counter.record(blog_post_id)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/{blog_post_id}/stats", response_model=BlogPostStatsReadSchema)
+def get_blog_post_stats(*, blog_post_id: uuid.UUID, repo: CurrentBlogPostRepo):
+    """Obtiene las visitas y la puntuación de tendencia de un blog post."""
+    try:
+        return repo.get_blog_post_stats(blog_post_id=blog_post_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
 @router.put("/{blog_post_id}/category/{category_id}", response_model=BlogPostReadSchema)
 def assign_category_to_blog_post(
-    *, blog_post_id: uuid.UUID, category_id: uuid.UUID, repo: CurrentBlogPostRepo,
+    *,
+    blog_post_id: uuid.UUID,
+    category_id: uuid.UUID,
+    repo: CurrentBlogPostRepo,
 ):
-    """Asigna una categoría a un blog post.
-    """
+    """Asigna una categoría a un blog post."""
     try:
         updated_blog_post = repo.assign_category_to_blog_post(
-            blog_post_id=blog_post_id, category_id=category_id,
+            blog_post_id=blog_post_id,
+            category_id=category_id,
         )
-        return updated_blog_post
+        return to_read_schema(BlogPostReadSchema, updated_blog_post)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -179,8 +371,7 @@ def assign_category_to_blog_post(
 
 @router.get("/{blog_post_id}/category", response_model=CategoryReadSchema)
 def get_blog_post_category(*, blog_post_id: uuid.UUID, repo: CurrentBlogPostRepo):
-    """Obtiene la categoría de un blog post.
-    """
+    """Obtiene la categoría de un blog post."""
     try:
         category = repo.get_category_for_blog_post(blog_post_id=blog_post_id)
         if not category:
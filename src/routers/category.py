@@ -1,24 +1,38 @@
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
+from src.core.etag import IfMatchVersion, set_etag
+from src.core.pagination import BatchIds, set_total_count
 from src.domain.models.category import Category
 from src.domain.schemas.blog_post import BlogPostReadSchema
 from src.domain.schemas.category import (
     CategoryCreateSchema,
+    CategoryDeletePolicy,
     CategoryReadSchema,
     CategoryUpdateSchema,
 )
-from src.repository.blog_post import BlogPostRepository, get_blog_post_repository
+from src.repository.blog_post import (
+    BlogPostRepository,
+    created_range,
+    get_blog_post_repository,
+)
 from src.repository.category import CurrentCategoryRepo
+from src.repository.counting import TotalCount
+from src.repository.exceptions import (
+    EntityInUseError,
+    EntityNotFoundError,
+    VersionConflictError,
+)
+from src.repository.taxonomy import to_read_schema
 
 router = APIRouter(prefix="/v1/api/categories", tags=["Categories"])
 
 
 @router.post("", response_model=CategoryReadSchema, status_code=status.HTTP_201_CREATED)
 def create_category(category_in: CategoryCreateSchema, repo: CurrentCategoryRepo):
-    """Crea una nueva categoría.
-    """
+    """Crea una nueva categoría."""
     try:
         created_category = repo.create(obj_in=category_in)
         return created_category
@@ -30,22 +44,51 @@ def create_category(category_in: CategoryCreateSchema, repo: CurrentCategoryRepo
 
 
 @router.get("/{category_id}", response_model=CategoryReadSchema)
-def read_category(category_id: uuid.UUID, repo: CurrentCategoryRepo):
-    """Obtiene una única categoría por su ID.
-    """
-    db_category = repo.get_by_id(id=category_id)
+def read_category(
+    category_id: uuid.UUID, repo: CurrentCategoryRepo, response: Response
+):
+    """Obtiene una única categoría por su ID, desde el snapshot de taxonomía."""
+    db_category = repo.get_read_by_id(category_id)
     if not db_category:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Categoría no encontrada",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Categoría no encontrada",
         )
+    set_etag(response, db_category)
     return db_category
 
 
 @router.get("", response_model=list[CategoryReadSchema])
-def read_categories(repo: CurrentCategoryRepo, skip: int = 0, limit: int = 100):
+def read_categories(
+    repo: CurrentCategoryRepo,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    include_total: bool = False,
+    ids: BatchIds = None,
+    name: str | None = None,
+):
     """Obtiene múltiples categorías con paginación.
+    Con `ids` devuelve solo las categorías indicadas, en ese orden y omitiendo
+    las que no existen.
+    Con `name` devuelve las categorías con ese nombre exacto, desde el snapshot
+    de taxonomía.
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`
+    (con `ids` o `name`, el número de las categorías devueltas).
     """
-    categories = repo.get_all(skip=skip, limit=limit)
+    total = None
+    if name is not None:
+        categories = repo.get_by_name(name)
+        total = TotalCount(len(categories), exact=True)
+    elif ids is not None:
+        categories = repo.get_many(ids)
+        total = TotalCount(len(categories), exact=True)
+    else:
+        categories = repo.get_all(skip=skip, limit=limit)
+    if include_total:
+        if total is None:
+            total = repo.count_total()
+        set_total_count(response, total)
     return categories
 
 
@@ -54,36 +97,70 @@ def update_category(
     category_id: uuid.UUID,
     category_in: CategoryUpdateSchema,
     repo: CurrentCategoryRepo,
+    response: Response,
+    expected_version: IfMatchVersion,
 ):
-    """Actualiza una categoría existente.
+    """Actualiza una categoría existente con una sola sentencia.
+    Con `If-Match` el cambio solo se aplica si la versión coincide (412 si no).
     """
-    db_category_to_update = repo.get_by_id(id=category_id)
-    if not db_category_to_update:
+    try:
+        updated_category = repo.update_by_id(
+            id=category_id,
+            obj_in=category_in,
+            expected_version=expected_version,
+        )
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Categoría no encontrada",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Categoría no encontrada",
+        )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="La categoría fue modificada por otra petición; vuelva a leerla.",
         )
-
-    try:
-        updated_category = repo.update(db_obj=db_category_to_update, obj_in=category_in)
-        return updated_category
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ocurrió un error al actualizar la categoría: {e!s}",
         )
+    set_etag(response, updated_category)
+    return updated_category
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(category_id: uuid.UUID, repo: CurrentCategoryRepo):
-    """Elimina una categoría por su ID.
+def delete_category(
+    category_id: uuid.UUID,
+    repo: CurrentCategoryRepo,
+    policy: CategoryDeletePolicy = CategoryDeletePolicy.RESTRICT,
+    reassign_to: uuid.UUID | None = None,
+):
+    """Elimina una categoría por su ID. Si tiene blog posts, `policy` decide:
+    `restrict` (por defecto) responde 409, `reassign` los mueve a `reassign_to`
+    y `cascade` los elimina junto con sus secciones.
     """
-    db_category = repo.get_by_id(id=category_id)
-    if not db_category:
+    try:
+        repo.delete_with_policy(
+            id=category_id,
+            policy=policy,
+            reassign_to=reassign_to,
+        )
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Categoría no encontrada",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Categoría no encontrada",
+        )
+    except EntityInUseError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="La categoría tiene blog posts. Use policy=reassign con "
+            "reassign_to o policy=cascade.",
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
         )
-    try:
-        repo.delete(entity=db_category)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -97,11 +174,18 @@ def get_blog_posts_by_category(
     category_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
+    include_total: bool = False,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    response: Response,
     blog_post_repo: BlogPostRepository = Depends(get_blog_post_repository),
 ):
     """Obtiene todos los blog posts que pertenecen a una categoría específica.
+    Con `created_from` (incluida) y `created_to` (excluida) devuelve solo los
+    creados en ese rango.
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`.
     """
-    category = blog_post_repo.session.get(Category, category_id)
+    category = blog_post_repo.loader.load(Category, category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,9 +194,21 @@ def get_blog_posts_by_category(
 
     try:
         blog_posts = blog_post_repo.get_blog_posts_by_category(
-            category_id=category_id, skip=skip, limit=limit,
+            category_id=category_id,
+            skip=skip,
+            limit=limit,
+            created_from=created_from,
+            created_to=created_to,
         )
-        return blog_posts
+        if include_total:
+            filters = {
+                "category_id": category_id,
+                **created_range(created_from, created_to),
+            }
+            set_total_count(response, blog_post_repo.count_total(filters=filters))
+        return [
+            to_read_schema(BlogPostReadSchema, blog_post) for blog_post in blog_posts
+        ]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
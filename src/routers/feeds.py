@@ -0,0 +1,93 @@
+import gzip
+import uuid
+from email.utils import format_datetime
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from src.core.database.config import CurrentSession
+from src.core.etag import is_not_modified
+from src.core.middleware.compression import negotiate_encoding
+from src.repository.feeds import (
+    CachedDocument,
+    get_feed,
+    get_sitemap,
+    get_sitemap_index,
+)
+
+router = APIRouter(tags=["Feeds"])
+
+FeedFormat = Literal["rss", "atom"]
+
+
+def _serve(request: Request, document: CachedDocument) -> Response:
+    """Respuesta con el documento cacheado: `304` si el cliente ya lo tiene y,
+    si no, el cuerpo comprimido tal cual o descomprimido si no acepta gzip.
+    """
+    headers = {
+        "ETag": document.etag,
+        "Last-Modified": format_datetime(document.last_modified, usegmt=True),
+        "Cache-Control": "public, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if is_not_modified(request, document.etag, document.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if negotiate_encoding(accept_encoding, ("gzip",)) == "gzip":
+        headers["Content-Encoding"] = "gzip"
+        body = document.body
+    else:
+        body = gzip.decompress(document.body)
+    return Response(body, media_type=document.media_type, headers=headers)
+
+
+@router.get("/sitemap.xml")
+def read_sitemap(request: Request, session: CurrentSession):
+    """Sitemap de los blog posts. Si no caben en un solo fichero
+    (`SITEMAP_URLS_PER_FILE`) devuelve un índice que enlaza a `/sitemaps/{n}.xml`.
+    """
+    index = get_sitemap_index(session)
+    if index.sitemaps == 1:
+        return _serve(request, get_sitemap(session, 0, 1))
+    return _serve(request, index)
+
+
+@router.get("/sitemaps/{sitemap}.xml")
+def read_sitemap_part(
+    sitemap: int,
+    request: Request,
+    session: CurrentSession,
+):
+    """Uno de los sitemaps listados en el índice de `/sitemap.xml`."""
+    sitemaps = get_sitemap_index(session).sitemaps
+    if not 0 <= sitemap < sitemaps:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sitemap no encontrado",
+        )
+    return _serve(request, get_sitemap(session, sitemap, sitemaps))
+
+
+@router.get("/feeds/{format}.xml")
+def read_feed(
+    format: FeedFormat,
+    request: Request,
+    session: CurrentSession,
+):
+    """Feed RSS (`rss.xml`) o Atom (`atom.xml`) con los últimos blog posts."""
+    return _serve(request, get_feed(session, None, format))
+
+
+@router.get("/feeds/categories/{category_id}/{format}.xml")
+def read_category_feed(
+    category_id: uuid.UUID,
+    format: FeedFormat,
+    request: Request,
+    session: CurrentSession,
+):
+    """Feed RSS o Atom con los últimos blog posts de una categoría."""
+    try:
+        document = get_feed(session, category_id, format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return _serve(request, document)
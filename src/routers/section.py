@@ -1,14 +1,26 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
-from src.domain.models.blog_post import BlogPost
+from src.core.content_format import ContentFormat, ContentFormatQuery
+from src.core.etag import IfMatchVersion, set_etag
+from src.core.pagination import BatchIds, set_total_count
+from src.core.prefer import ReturnMinimal, minimal_response
 from src.domain.schemas.section import (
     SectionCreateSchema,
+    SectionPatchSchema,
     SectionReadSchema,
     SectionUpdateSchema,
 )
 from src.repository.blog_post import BlogPostRepository, get_blog_post_repository
+from src.repository.counting import TotalCount
+from src.repository.exceptions import (
+    EntityNotFoundError,
+    InvalidDeltaError,
+    VersionConflictError,
+    VersionRequiredError,
+)
+from src.repository.rendered_content import as_html
 from src.repository.section import CurrentSectionRepo
 
 router = APIRouter(prefix="/v1/api/sections", tags=["Sections"])
@@ -16,8 +28,7 @@ router = APIRouter(prefix="/v1/api/sections", tags=["Sections"])
 
 @router.post("", response_model=SectionReadSchema, status_code=status.HTTP_201_CREATED)
 def create_section(section_in: SectionCreateSchema, repo: CurrentSectionRepo):
-    """Crea una nueva sección.
-    """
+    """Crea una nueva sección."""
     try:
         created_section = repo.create(obj_in=section_in)
         return created_section
@@ -29,22 +40,56 @@ def create_section(section_in: SectionCreateSchema, repo: CurrentSectionRepo):
 
 
 @router.get("/{section_id}", response_model=SectionReadSchema)
-def read_section(section_id: uuid.UUID, repo: CurrentSectionRepo):
+def read_section(
+    section_id: uuid.UUID,
+    repo: CurrentSectionRepo,
+    response: Response,
+    content_format: ContentFormatQuery = ContentFormat.RAW,
+):
     """Obtiene una única sección por su ID.
+    Con `content_format=html` el contenido se devuelve en HTML.
     """
     db_section = repo.get_by_id(id=section_id)
     if not db_section:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Sección no encontrada",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sección no encontrada",
         )
+    set_etag(response, db_section)
+    if content_format is ContentFormat.HTML:
+        return as_html(SectionReadSchema, db_section)
     return db_section
 
 
 @router.get("", response_model=list[SectionReadSchema])
-def read_sections(repo: CurrentSectionRepo, skip: int = 0, limit: int = 100):
+def read_sections(
+    repo: CurrentSectionRepo,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    include_total: bool = False,
+    ids: BatchIds = None,
+    content_format: ContentFormatQuery = ContentFormat.RAW,
+):
     """Obtiene múltiples secciones con paginación.
+    Con `ids` devuelve solo las secciones indicadas, en ese orden y omitiendo
+    las que no existen.
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`
+    (con `ids`, el número de las secciones devueltas).
+    Con `content_format=html` el contenido se devuelve en HTML.
     """
-    sections = repo.get_all(skip=skip, limit=limit)
+    if ids is not None:
+        sections = repo.get_many(ids)
+        total = TotalCount(len(sections), exact=True)
+    else:
+        sections = repo.get_all(skip=skip, limit=limit)
+        total = None
+    if include_total:
+        if total is None:
+            total = repo.count_total()
+        set_total_count(response, total)
+    if content_format is ContentFormat.HTML:
+        return [as_html(SectionReadSchema, section) for section in sections]
     return sections
 
 
@@ -53,36 +98,102 @@ def update_section(
     section_id: uuid.UUID,
     section_in: SectionUpdateSchema,
     repo: CurrentSectionRepo,
+    response: Response,
+    expected_version: IfMatchVersion,
 ):
-    """Actualiza una sección existente.
+    """Actualiza una sección existente con una sola sentencia.
+    Con `If-Match` el cambio solo se aplica si la versión coincide (412 si no).
     """
-    db_section_to_update = repo.get_by_id(id=section_id)
-    if not db_section_to_update:
+    try:
+        updated_section = repo.update_by_id(
+            id=section_id,
+            obj_in=section_in,
+            expected_version=expected_version,
+        )
+    except EntityNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sección no encontrada",
+        )
+    except VersionConflictError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Sección no encontrada",
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="La sección fue modificada por otra petición; vuelva a leerla.",
         )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Ocurrió un error al actualizar la sección: {e!s}",
+        )
+    set_etag(response, updated_section)
+    return updated_section
 
+
+@router.patch(
+    "/{section_id}",
+    response_model=SectionReadSchema,
+    responses={204: {"description": "Aplicado, con `Prefer: return=minimal`"}},
+)
+def patch_section(
+    section_id: uuid.UUID,
+    section_patch: SectionPatchSchema,
+    repo: CurrentSectionRepo,
+    response: Response,
+    expected_version: IfMatchVersion,
+    return_minimal: ReturnMinimal,
+):
+    """Modifica solo los campos enviados (JSON Merge Patch,
+    `application/merge-patch+json`). `content` admite un delta de texto sobre
+    la versión de `If-Match`, obligatorio en ese caso (428 si falta).
+    Con `Prefer: return=minimal` responde 204 con la nueva ETag.
+    """
     try:
-        updated_section = repo.update(db_obj=db_section_to_update, obj_in=section_in)
-        return updated_section
+        patched_section = repo.patch_by_id(
+            id=section_id,
+            patch=section_patch,
+            expected_version=expected_version,
+        )
+    except EntityNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sección no encontrada",
+        )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="La sección fue modificada por otra petición; vuelva a leerla.",
+        )
+    except VersionRequiredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail=str(e),
+        )
+    except InvalidDeltaError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ocurrió un error al actualizar la sección: {e!s}",
-        )
+        ) from e
+    if return_minimal:
+        return minimal_response(patched_section.version)
+    set_etag(response, patched_section)
+    return patched_section
 
 
 @router.delete("/{section_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_section(section_id: uuid.UUID, repo: CurrentSectionRepo):
-    """Elimina una sección por su ID.
-    """
-    db_section = repo.get_by_id(id=section_id)
-    if not db_section:
+    """Elimina una sección por su ID."""
+    try:
+        repo.delete_by_id(id=section_id)
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Sección no encontrada",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sección no encontrada",
         )
-    try:
-        repo.delete(entity=db_section)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -96,12 +207,17 @@ def get_sections_by_blog_post(
     blog_post_id: uuid.UUID,
     skip: int = 0,
     limit: int = 100,
+    include_total: bool = False,
+    content_format: ContentFormatQuery = ContentFormat.RAW,
     repo: CurrentSectionRepo,
+    response: Response,
     blog_post_repo: BlogPostRepository = Depends(get_blog_post_repository),
 ):
     """Obtiene todas las secciones que pertenecen a un blog post específico ordenadas por position_order.
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`.
+    Con `content_format=html` el contenido se devuelve en HTML.
     """
-    blog_post = blog_post_repo.session.get(BlogPost, blog_post_id)
+    blog_post = blog_post_repo.get_by_id(id=blog_post_id)
     if not blog_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,8 +226,17 @@ def get_sections_by_blog_post(
 
     try:
         sections = repo.get_sections_by_blog_post(
-            blog_post_id=blog_post_id, skip=skip, limit=limit,
+            blog_post_id=blog_post_id,
+            skip=skip,
+            limit=limit,
         )
+        if include_total:
+            set_total_count(
+                response,
+                repo.count_total(filters={"blog_post_id": blog_post_id}),
+            )
+        if content_format is ContentFormat.HTML:
+            return [as_html(SectionReadSchema, section) for section in sections]
         return sections
     except Exception as e:
         raise HTTPException(
@@ -1,8 +1,12 @@
 import uuid
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
+from src.core.etag import IfMatchVersion, set_etag
+from src.core.pagination import BatchIds, set_total_count
 from src.domain.schemas.tag import TagCreateSchema, TagReadSchema, TagUpdateSchema
+from src.repository.counting import TotalCount
+from src.repository.exceptions import EntityNotFoundError, VersionConflictError
 from src.repository.tag import CurrentTagRepo
 
 router = APIRouter(prefix="/v1/api/tags", tags=["Tags"])
@@ -10,8 +14,7 @@ router = APIRouter(prefix="/v1/api/tags", tags=["Tags"])
 
 @router.post("", response_model=TagReadSchema, status_code=status.HTTP_201_CREATED)
 def create_tag(tag_in: TagCreateSchema, repo: CurrentTagRepo):
-    """Crea un nuevo tag.
-    """
+    """Crea un nuevo tag."""
     try:
         created_tag = repo.create(obj_in=tag_in)
         return created_tag
@@ -23,22 +26,49 @@ def create_tag(tag_in: TagCreateSchema, repo: CurrentTagRepo):
 
 
 @router.get("/{tag_id}", response_model=TagReadSchema)
-def read_tag(tag_id: uuid.UUID, repo: CurrentTagRepo):
-    """Obtiene un único tag por su ID.
-    """
-    db_tag = repo.get_by_id(id=tag_id)
+def read_tag(tag_id: uuid.UUID, repo: CurrentTagRepo, response: Response):
+    """Obtiene un único tag por su ID, desde el snapshot de taxonomía."""
+    db_tag = repo.get_read_by_id(tag_id)
     if not db_tag:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Tag no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tag no encontrado",
         )
+    set_etag(response, db_tag)
     return db_tag
 
 
 @router.get("", response_model=list[TagReadSchema])
-def read_tags(repo: CurrentTagRepo, skip: int = 0, limit: int = 100):
+def read_tags(
+    repo: CurrentTagRepo,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    include_total: bool = False,
+    ids: BatchIds = None,
+    name: str | None = None,
+):
     """Obtiene múltiples tags con paginación.
+    Con `ids` devuelve solo los tags indicados, en ese orden y omitiendo
+    los que no existen.
+    Con `name` devuelve el tag con ese nombre, si existe, desde el snapshot de
+    taxonomía.
+    Con `include_total=true` devuelve el total en la cabecera `X-Total-Count`
+    (con `ids` o `name`, el número de los tags devueltos).
     """
-    tags = repo.get_all(skip=skip, limit=limit)
+    total = None
+    if name is not None:
+        tags = repo.get_by_name(name)
+        total = TotalCount(len(tags), exact=True)
+    elif ids is not None:
+        tags = repo.get_many(ids)
+        total = TotalCount(len(tags), exact=True)
+    else:
+        tags = repo.get_all(skip=skip, limit=limit)
+    if include_total:
+        if total is None:
+            total = repo.count_total()
+        set_total_count(response, total)
     return tags
 
 
@@ -47,36 +77,47 @@ def update_tag(
     tag_id: uuid.UUID,
     tag_in: TagUpdateSchema,
     repo: CurrentTagRepo,
+    response: Response,
+    expected_version: IfMatchVersion,
 ):
-    """Actualiza un tag existente.
+    """Actualiza un tag existente con una sola sentencia.
+    Con `If-Match` el cambio solo se aplica si la versión coincide (412 si no).
     """
-    db_tag_to_update = repo.get_by_id(id=tag_id)
-    if not db_tag_to_update:
+    try:
+        updated_tag = repo.update_by_id(
+            id=tag_id,
+            obj_in=tag_in,
+            expected_version=expected_version,
+        )
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Tag no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tag no encontrado",
+        )
+    except VersionConflictError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="El tag fue modificado por otra petición; vuelva a leerlo.",
         )
-
-    try:
-        updated_tag = repo.update(db_obj=db_tag_to_update, obj_in=tag_in)
-        return updated_tag
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ocurrió un error al actualizar el tag: {e!s}",
         )
+    set_etag(response, updated_tag)
+    return updated_tag
 
 
 @router.delete("/{tag_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_tag(tag_id: uuid.UUID, repo: CurrentTagRepo):
-    """Elimina un tag por su ID.
-    """
-    db_tag = repo.get_by_id(id=tag_id)
-    if not db_tag:
+    """Elimina un tag por su ID."""
+    try:
+        repo.delete_by_id(id=tag_id)
+    except EntityNotFoundError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Tag no encontrado",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tag no encontrado",
         )
-    try:
-        repo.delete(entity=db_tag)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,29 +1,58 @@
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine
+from sqlmodel import Session
 
 from src.core.database.config import get_session as original_get_session
+from src.core.database.config import set_engine
+from src.core.database.engine import create_db_engine
+from src.core.database.instrumentation import QueryStats, count_queries
+from src.core.database.partitioning import (
+    partition_blog_posts,
+    unpartition_blog_posts,
+)
+from src.core.settings import app_settings
 from src.domain.models.announcement import Announcement  # noqa: F401
+from src.domain.models.announcement_stats import AnnouncementStats  # noqa: F401
 from src.domain.models.base import Base
 from src.domain.models.blog_post import BlogPost  # noqa: F401
 from src.domain.models.blog_post_announcement_link import (
     BlogPostAnnouncementLink,  # noqa: F401
 )
+from src.domain.models.blog_post_stats import BlogPostStats  # noqa: F401
 from src.domain.models.blog_post_tag_link import BlogPostTagLink  # noqa: F401
 from src.domain.models.category import Category  # noqa: F401
+from src.domain.models.category_announcement_link import (
+    CategoryAnnouncementLink,  # noqa: F401
+)
+from src.domain.models.related_blog_post import RelatedBlogPost  # noqa: F401
 from src.domain.models.section import Section  # noqa: F401
 from src.domain.models.tag import Tag  # noqa: F401
-from src.main import app
+from src.main import app, rate_limiter
+from src.repository.counting import total_counter
+from src.repository.taxonomy import taxonomy_snapshot
 from tests.settings import test_db_settings
 
-TEST_DATABASE_URL = (
-    f"postgresql+psycopg2://{test_db_settings.TEST_DB_USERNAME}:{test_db_settings.TEST_DB_PASSWORD}@"
-    f"{test_db_settings.TEST_DB_HOST}:{test_db_settings.TEST_DB_PORT}/{test_db_settings.TEST_DB_NAME}"
-)
-
-engine_test = create_engine(TEST_DATABASE_URL, echo=False)
+TEST_DATABASE_URL = test_db_settings.database_url
+
+engine_test = create_db_engine(TEST_DATABASE_URL)
+set_engine(engine_test)
+# El calentamiento abriría su propia transacción sobre la base de datos de prueba;
+# se prueba por separado en tests/test_startup.py.
+app_settings.STARTUP_WARMUP = False
+# Las pruebas comparten cliente; el rate limiting se prueba en tests/test_rate_limit.py.
+rate_limiter.enabled = False
+# El vaciado periódico escribiría fuera de la transacción de cada test; las
+# visitas se prueban en tests/test_view_stats.py vaciando sobre la sesión de prueba.
+app_settings.VIEW_FLUSH_ENABLED = False
+# Los totales en caché sobrevivirían entre tests; la caché se prueba en
+# tests/test_counting.py.
+total_counter.cache_seconds = 0
+# La escucha de NOTIFY reconstruiría el snapshot de taxonomía fuera de la
+# transacción de cada test; se prueba en tests/test_taxonomy.py.
+app_settings.TAXONOMY_LISTEN_ENABLED = False
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -32,18 +61,36 @@ def create_test_database_tables():
     y las elimina después de que todas las pruebas de la sesión hayan finalizado.
     """
     Base.metadata.create_all(bind=engine_test)
+    if test_db_settings.TEST_DB_PARTITIONED:
+        with engine_test.begin() as connection:
+            partition_blog_posts(connection)
     yield
+    if test_db_settings.TEST_DB_PARTITIONED:
+        with engine_test.begin() as connection:
+            unpartition_blog_posts(connection)
     Base.metadata.drop_all(bind=engine_test)
 
 
+@pytest.fixture(autouse=True)
+def empty_taxonomy_snapshot():
+    """Descarta el snapshot de taxonomía entre tests: se construye con los datos
+    (sin confirmar) de la transacción de cada uno.
+    """
+    taxonomy_snapshot.clear()
+    yield
+    taxonomy_snapshot.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session_test() -> Generator[Session]:
     """Proporciona una sesión de base de datos de prueba para cada función de prueba.
     Las transacciones se revierten después de cada prueba para asegurar el aislamiento.
+    La sesión trabaja dentro de un SAVEPOINT, de modo que sus commit y rollback no
+    cierran la transacción externa.
     """
     connection = engine_test.connect()
     transaction = connection.begin()
-    session = Session(bind=connection)
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
 
     yield session
 
@@ -67,3 +114,24 @@ def client(db_session_test: Session) -> Generator[TestClient]:
         yield c
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """Devuelve un context manager que falla si el bloque ejecuta más de
+    `max_queries` sentencias SQL. Uso:
+
+        with assert_max_queries(3):
+            client.get(url)
+    """
+
+    @contextmanager
+    def _assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+        with count_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Se esperaban como máximo {max_queries} consultas y se ejecutaron "
+            f"{stats.count}:\n{stats.summary()}"
+        )
+
+    return _assert_max_queries
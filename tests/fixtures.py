@@ -5,6 +5,7 @@ from sqlmodel import Session
 
 from src.domain.models.announcement import Announcement
 from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_body import BlogPostBody
 from src.domain.models.category import Category
 from src.domain.models.section import Section
 from src.domain.models.tag import Tag
@@ -21,6 +22,10 @@ TAG_URL = "/v1/api/blog_posts/{blog_post_id}/tags/{tag_id}"
 TAGS_URL = "/v1/api/blog_posts/{blog_post_id}/tags"
 CATEGORY_URL = "/v1/api/blog_posts/{blog_post_id}/category/{category_id}"
 GET_CATEGORY_URL = "/v1/api/blog_posts/{blog_post_id}/category"
+RELATED_URL = "/v1/api/blog_posts/{blog_post_id}/related"
+VIEWS_URL = "/v1/api/blog_posts/{blog_post_id}/views"
+STATS_URL = "/v1/api/blog_posts/{blog_post_id}/stats"
+TRENDING_URL = "/v1/api/blog_posts/trending"
 
 # URLs para tests de tags
 TAG_BASE_URL = "/v1/api/tags"
@@ -39,6 +44,14 @@ ANNOUNCEMENT_TO_BLOG_POST_URL = (
 )
 ANNOUNCEMENT_BLOG_POSTS_URL = "/v1/api/announcements/{announcement_id}/blog_posts"
 ANNOUNCEMENTS_BY_BLOG_POST_URL = "/v1/api/announcements/blog_post/{blog_post_id}"
+ANNOUNCEMENT_TO_CATEGORY_URL = (
+    "/v1/api/announcements/category/{category_id}/announcements/{announcement_id}"
+)
+ANNOUNCEMENTS_BY_CATEGORY_URL = "/v1/api/announcements/category/{category_id}"
+ANNOUNCEMENT_SERVE_URL = "/v1/api/announcements/serve"
+
+# Batch
+BATCH_URL = "/v1/api/batch"
 
 
 def create_test_category(
@@ -46,8 +59,7 @@ def create_test_category(
     name: str = "Categoría de Prueba",
     description: str = "Descripción de prueba",
 ) -> Category:
-    """Crea una categoría de prueba en la base de datos.
-    """
+    """Crea una categoría de prueba en la base de datos."""
     category = Category(name=name, description=description)
     db_session.add(category)
     db_session.commit()
@@ -56,8 +68,7 @@ def create_test_category(
 
 
 def create_test_tag(db_session: Session, name: str = "Tag de Prueba") -> Tag:
-    """Crea un tag de prueba en la base de datos.
-    """
+    """Crea un tag de prueba en la base de datos."""
     tag = Tag(name=name)
     db_session.add(tag)
     db_session.commit()
@@ -78,9 +89,9 @@ def create_test_blog_post(
 
     blog_post = BlogPost(
         title=title,
-        content=content,
         category_id=category_id,
         date=date.today(),
+        body=BlogPostBody(content=content),
     )
     db_session.add(blog_post)
     db_session.commit()
@@ -119,13 +130,14 @@ def create_test_announcement(
     name: str = "Anuncio de Prueba",
     url: str = "https://example.com",
     image_url: str = "https://example.com/image.jpg",
+    weight: int = 1,
 ) -> Announcement:
-    """Crea un anuncio de prueba en la base de datos.
-    """
+    """Crea un anuncio de prueba en la base de datos."""
     announcement = Announcement(
         name=name,
         url=url,
         image_url=image_url,
+        weight=weight,
     )
     db_session.add(announcement)
     db_session.commit()
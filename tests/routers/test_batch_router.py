@@ -0,0 +1,149 @@
+import logging
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.section import Section
+from src.domain.models.tag import Tag
+from src.routers import batch
+from tests.fixtures import (
+    BATCH_URL,
+    create_test_announcement,
+    create_test_blog_post,
+    create_test_category,
+)
+
+
+def test_batch_saves_blog_post_with_references(
+    client: TestClient,
+    db_session_test: Session,
+):
+    """Prueba un guardado completo del editor en un solo lote, con referencias a
+    entidades creadas por operaciones anteriores.
+    """
+    category = create_test_category(db_session_test, name="Lote Categoria")
+    announcement = create_test_announcement(db_session_test, name="Lote Anuncio")
+    blog_post = create_test_blog_post(db_session_test, category_id=category.id)
+    version = blog_post.version
+
+    operations = [
+        {
+            "op": "blog_post.update",
+            "ref": "post",
+            "id": str(blog_post.id),
+            "version": version,
+            "body": {"title": "Título desde el lote"},
+        },
+        {
+            "op": "section.create",
+            "body": {
+                "title": "Sección",
+                "content": "Contenido",
+                "blog_post_id": {"$ref": "post"},
+            },
+        },
+        {"op": "tag.create", "ref": "tag", "body": {"name": "Tag del lote"}},
+        {
+            "op": "blog_post.add_tag",
+            "id": {"$ref": "post"},
+            "related_id": {"$ref": "tag"},
+        },
+        {
+            "op": "blog_post.add_announcement",
+            "id": {"$ref": "post"},
+            "related_id": str(announcement.id),
+        },
+    ]
+    response = client.post(BATCH_URL, json={"operations": operations})
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 201, 201, 200, 200]
+    assert results[0]["data"]["title"] == "Título desde el lote"
+    assert results[1]["data"]["blog_post_id"] == str(blog_post.id)
+    assert [tag["name"] for tag in results[3]["data"]["tags"]] == ["Tag del lote"]
+
+    db_session_test.expire_all()
+    db_blog_post = db_session_test.get(BlogPost, blog_post.id)
+    assert db_blog_post.version == version + 1
+    assert [section.title for section in db_blog_post.sections] == ["Sección"]
+    assert [tag.name for tag in db_blog_post.tags] == ["Tag del lote"]
+    assert [item.id for item in db_blog_post.announcements] == [announcement.id]
+
+
+def test_batch_failure_rolls_back_everything(
+    client: TestClient,
+    db_session_test: Session,
+):
+    """Prueba que si una operación falla no se aplica ninguna del lote."""
+    blog_post = create_test_blog_post(db_session_test)
+    operations = [
+        {"op": "tag.create", "body": {"name": "Tag revertido"}},
+        {
+            "op": "section.create",
+            "body": {"title": "S", "content": "C", "blog_post_id": str(blog_post.id)},
+        },
+        {"op": "blog_post.update", "id": str(uuid.uuid4()), "body": {"title": "X"}},
+    ]
+    response = client.post(BATCH_URL, json={"operations": operations})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"]["operation"] == 2
+
+    assert not db_session_test.exec(
+        select(Tag).where(Tag.name == "Tag revertido"),
+    ).all()
+    assert not db_session_test.exec(
+        select(Section).where(Section.blog_post_id == blog_post.id),
+    ).all()
+
+
+def test_batch_unexpected_error_is_logged(client: TestClient, monkeypatch, caplog):
+    """Prueba que un error inesperado responde 500 y deja su traza en el log."""
+
+    def failing_handler(ctx, operation):
+        raise RuntimeError("fallo inesperado")
+
+    monkeypatch.setitem(batch._HANDLERS, "tag.create", failing_handler)
+    with caplog.at_level(logging.ERROR, logger=batch.__name__):
+        response = client.post(
+            BATCH_URL,
+            json={"operations": [{"op": "tag.create", "body": {}}]},
+        )
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    [record] = caplog.records
+    assert record.exc_info[0] is RuntimeError
+
+
+def test_batch_invalid_operations(client: TestClient, db_session_test: Session):
+    """Prueba los errores de validación: referencia desconocida, cuerpo inválido
+    y versión obsoleta.
+    """
+    response = client.post(
+        BATCH_URL,
+        json={"operations": [{"op": "tag.delete", "id": {"$ref": "inexistente"}}]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "inexistente" in response.json()["detail"]["message"]
+
+    response = client.post(
+        BATCH_URL,
+        json={"operations": [{"op": "tag.create", "body": {}}]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    blog_post = create_test_blog_post(db_session_test)
+    operations = [
+        {
+            "op": "blog_post.update",
+            "id": str(blog_post.id),
+            "version": blog_post.version + 1,
+            "body": {"title": "Obsoleto"},
+        },
+    ]
+    response = client.post(BATCH_URL, json={"operations": operations})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    response = client.post(BATCH_URL, json={"operations": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
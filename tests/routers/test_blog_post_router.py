@@ -56,7 +56,10 @@ def test_read_blog_post_success(client: TestClient, db_session_test: Session):
     post_title = "Post para Leer"
     post_content = "Contenido detallado."
     new_post = create_test_blog_post(
-        db_session_test, title=post_title, content=post_content, category_id=category.id,
+        db_session_test,
+        title=post_title,
+        content=post_content,
+        category_id=category.id,
     )
     created_post_id = new_post.id
 
@@ -78,6 +81,36 @@ def test_read_blog_post_not_found(client: TestClient):
     assert response.json()["detail"] == "BlogPost no encontrado"
 
 
+def test_read_blog_posts_by_ids(client: TestClient, db_session_test: Session):
+    """Prueba la lectura por lotes: orden de `ids`, sin repetidos ni inexistentes."""
+    category = create_test_category(db_session_test, name="Lotes Categoria")
+    posts = [
+        create_test_blog_post(
+            db_session_test,
+            title=f"Lote {i}",
+            category_id=category.id,
+        )
+        for i in range(3)
+    ]
+    tag = create_test_tag(db_session_test, name="Tag Lote")
+    db_session_test.add(BlogPostTagLink(blog_post_id=posts[2].id, tag_id=tag.id))
+    db_session_test.commit()
+    ids = [posts[2].id, posts[0].id, uuid.uuid4(), posts[2].id]
+
+    params = {"ids": [str(id) for id in ids]}
+    response = client.get(BLOG_POST_BASE_URL, params=params)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [post["id"] for post in data] == [str(posts[2].id), str(posts[0].id)]
+    assert [tag["name"] for tag in data[0]["tags"]] == ["Tag Lote"]
+    assert data[1]["tags"] == []
+    assert data[1]["category"]["id"] == str(category.id)
+
+    too_many = [str(uuid.uuid4()) for _ in range(101)]
+    response = client.get(BLOG_POST_BASE_URL, params={"ids": too_many})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_read_blog_posts_empty(client: TestClient, db_session_test: Session):
     """Prueba la lectura de blog posts cuando no hay ninguno."""
     all_posts = db_session_test.exec(select(BlogPost)).all()
@@ -106,7 +139,8 @@ def test_update_blog_post_success(client: TestClient, db_session_test: Session):
         "content": "Contenido Actualizado.",
     }
     response = client.put(
-        BLOG_POST_ID_URL.format(blog_post_id=post_id_to_update), json=update_payload,
+        BLOG_POST_ID_URL.format(blog_post_id=post_id_to_update),
+        json=update_payload,
     )
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
@@ -119,11 +153,133 @@ def test_update_blog_post_success(client: TestClient, db_session_test: Session):
     assert original_post.content == update_payload["content"]
 
 
+def test_update_blog_post_if_match(client: TestClient, db_session_test: Session):
+    """Prueba que If-Match con la versión actual aplica el cambio y una versión
+    obsoleta responde 412 sin modificar el blog post.
+    """
+    category = create_test_category(db_session_test, name="Version Categoria")
+    post = create_test_blog_post(db_session_test, category_id=category.id)
+    url = BLOG_POST_ID_URL.format(blog_post_id=post.id)
+
+    etag = client.get(url).headers["etag"]
+    assert etag == '"1"'
+
+    response = client.put(url, json={"title": "Primera"}, headers={"If-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["version"] == 2
+    assert response.headers["etag"] == '"2"'
+
+    response = client.put(url, json={"title": "Segunda"}, headers={"If-Match": etag})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    db_session_test.refresh(post)
+    assert post.title == "Primera"
+    assert post.version == 2
+
+
+def test_update_blog_post_not_found(client: TestClient):
+    """Prueba la actualización de un blog post que no existe, con y sin If-Match."""
+    url = BLOG_POST_ID_URL.format(blog_post_id=uuid.uuid4())
+    assert client.put(url, json={"title": "X"}).status_code == status.HTTP_404_NOT_FOUND
+    response = client.put(url, json={"title": "X"}, headers={"If-Match": '"1"'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+MERGE_PATCH = {"Content-Type": "application/merge-patch+json"}
+
+
+def test_patch_blog_post_with_content_delta(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Prueba que PATCH aplica un delta sobre el contenido de la versión de
+    If-Match, escribe solo los campos enviados, acepta `null` en `date` y no
+    escribe nada si el delta no cambia el texto.
+    """
+    post = create_test_blog_post(db_session_test, content="Hola mundo cruel")
+    url = BLOG_POST_ID_URL.format(blog_post_id=post.id)
+    delta = [{"retain": 5}, {"insert": "*gran* "}, {"retain": 5}, {"delete": 6}]
+
+    with assert_max_queries(3) as stats:
+        response = client.patch(
+            url,
+            json={"content": {"delta": delta}, "date": None},
+            headers={**MERGE_PATCH, "If-Match": '"1"', "Prefer": "return=minimal"},
+        )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert response.headers["etag"] == '"2"'
+    assert response.headers["preference-applied"] == "return=minimal"
+    # El UPDATE de `blogpost` solo escribe los campos enviados.
+    [post_update] = [
+        sql for sql in stats.statements if sql.startswith("UPDATE blogpost ")
+    ]
+    assert "date=" in post_update
+    assert "title=" not in post_update
+
+    data = client.get(url, params={"content_format": "html"}).json()
+    assert data["content"] == "<p>Hola <em>gran</em> mundo</p>"
+    assert data["date"] is None
+    assert data["title"] == "Blog Post de Prueba"
+
+    response = client.patch(url, json={"title": "Nuevo"}, headers=MERGE_PATCH)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["content"] == "Hola *gran* mundo"
+    assert response.json()["version"] == 3
+
+    # Un delta que no cambia el texto no escribe nada: la versión se conserva.
+    idle = {"content": {"delta": [{"retain": 4}]}}
+    with assert_max_queries(3) as stats:
+        response = client.patch(
+            url,
+            json=idle,
+            headers={**MERGE_PATCH, "If-Match": '"3"', "Prefer": "return=minimal"},
+        )
+    assert response.headers["etag"] == '"3"'
+    assert not [sql for sql in stats.statements if sql.startswith("UPDATE")]
+    response = client.patch(url, json=idle, headers={"If-Match": '"2"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+
+def test_patch_blog_post_errors(client: TestClient, db_session_test: Session):
+    """Prueba que un delta sin If-Match responde 428, sobre una versión obsoleta
+    412, y que un delta más largo que el texto o `null` en un campo obligatorio
+    responden 422 sin modificar el blog post.
+    """
+    post = create_test_blog_post(db_session_test, content="corto")
+    url = BLOG_POST_ID_URL.format(blog_post_id=post.id)
+    patch = {"content": {"delta": [{"retain": 5}, {"insert": "!"}]}}
+
+    response = client.patch(url, json=patch, headers=MERGE_PATCH)
+    assert response.status_code == status.HTTP_428_PRECONDITION_REQUIRED
+    response = client.patch(url, json=patch, headers={"If-Match": '"7"'})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    response = client.patch(
+        url,
+        json={"content": {"delta": [{"retain": 6}, {"insert": "!"}]}},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert client.patch(url, json={"title": None}).status_code == 422
+    response = client.patch(
+        BLOG_POST_ID_URL.format(blog_post_id=uuid.uuid4()),
+        json=patch,
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    db_session_test.refresh(post)
+    assert post.version == 1
+    assert post.content == "corto"
+
+
 def test_delete_blog_post_success(client: TestClient, db_session_test: Session):
     """Prueba la eliminación exitosa de un blog post."""
     category = create_test_category(db_session_test, name="Delete Categoria")
     post_to_delete = create_test_blog_post(
-        db_session_test, title="Post a Eliminar", content="Bye", category_id=category.id,
+        db_session_test,
+        title="Post a Eliminar",
+        content="Bye",
+        category_id=category.id,
     )
     post_id = post_to_delete.id
 
@@ -153,7 +309,8 @@ def test_add_tag_to_blog_post_success(client: TestClient, db_session_test: Sessi
     assert data["tags"][0]["name"] == tag.name
 
     stmt = select(BlogPostTagLink).where(
-        BlogPostTagLink.blog_post_id == blog_post.id, BlogPostTagLink.tag_id == tag.id,
+        BlogPostTagLink.blog_post_id == blog_post.id,
+        BlogPostTagLink.tag_id == tag.id,
     )
     link = db_session_test.exec(stmt).first()
     assert link is not None
@@ -170,7 +327,8 @@ def test_add_tag_to_blog_post_not_found(client: TestClient, db_session_test: Ses
 
 
 def test_add_tag_to_blog_post_tag_not_found(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
     """Prueba agregar un tag que no existe a un blog post."""
     blog_post = create_test_blog_post(db_session_test)
@@ -184,7 +342,8 @@ def test_add_tag_to_blog_post_tag_not_found(
 
 
 def test_remove_tag_from_blog_post_success(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
     """Prueba eliminar un tag de un blog post exitosamente."""
     blog_post = create_test_blog_post(db_session_test)
@@ -208,7 +367,8 @@ def test_remove_tag_from_blog_post_success(
     assert len(blog_post.tags) == 0
 
     stmt = select(BlogPostTagLink).where(
-        BlogPostTagLink.blog_post_id == blog_post.id, BlogPostTagLink.tag_id == tag.id,
+        BlogPostTagLink.blog_post_id == blog_post.id,
+        BlogPostTagLink.tag_id == tag.id,
     )
     link = db_session_test.exec(stmt).first()
     assert link is None
@@ -246,7 +406,8 @@ def test_get_blog_post_tags_empty(client: TestClient, db_session_test: Session):
 
 
 def test_assign_category_to_blog_post_success(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
     """Prueba asignar una categoría a un blog post exitosamente."""
     initial_category = create_test_category(db_session_test, name="Categoría Inicial")
@@ -271,7 +432,8 @@ def test_assign_category_to_blog_post_success(
 
 
 def test_assign_category_to_blog_post_not_found(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
     """Prueba asignar una categoría a un blog post que no existe."""
     category = create_test_category(db_session_test, name="Categoría Sin Post")
@@ -285,7 +447,8 @@ def test_assign_category_to_blog_post_not_found(
 
 
 def test_assign_category_to_blog_post_category_not_found(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
     """Prueba asignar una categoría que no existe a un blog post."""
     blog_post = create_test_blog_post(db_session_test)
@@ -293,7 +456,8 @@ def test_assign_category_to_blog_post_category_not_found(
 
     response = client.put(
         CATEGORY_URL.format(
-            blog_post_id=blog_post.id, category_id=non_existent_category_id,
+            blog_post_id=blog_post.id,
+            category_id=non_existent_category_id,
         ),
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -314,7 +478,8 @@ def test_get_blog_post_category_success(client: TestClient, db_session_test: Ses
 
 
 def test_get_blog_post_category_blog_post_not_found(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
     """Prueba obtener la categoría de un blog post que no existe."""
     non_existent_id = str(uuid.uuid4())
@@ -4,6 +4,7 @@ from fastapi import status
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
+from src.domain.models.blog_post import BlogPost
 from src.domain.models.category import Category
 from tests.fixtures import (
     BLOG_POSTS_BY_CATEGORY_URL,
@@ -99,7 +100,8 @@ def test_read_categories_with_items(client: TestClient, db_session_test: Session
 def test_update_category_success(client: TestClient, db_session_test: Session):
     """Prueba la actualización exitosa de una categoría."""
     original_category = Category(
-        name="Nombre Original", description="Descripción Original",
+        name="Nombre Original",
+        description="Descripción Original",
     )
     db_session_test.add(original_category)
     db_session_test.commit()
@@ -111,7 +113,8 @@ def test_update_category_success(client: TestClient, db_session_test: Session):
         "description": "Descripción Actualizada",
     }
     response = client.put(
-        CATEGORY_ID_URL.format(category_id=category_id_to_update), json=update_data,
+        CATEGORY_ID_URL.format(category_id=category_id_to_update),
+        json=update_data,
     )
     assert response.status_code == status.HTTP_200_OK
 
@@ -130,7 +133,8 @@ def test_update_category_not_found(client: TestClient):
     non_existent_id = str(uuid.uuid4())
     update_data = {"name": "No Importa"}
     response = client.put(
-        CATEGORY_ID_URL.format(category_id=non_existent_id), json=update_data,
+        CATEGORY_ID_URL.format(category_id=non_existent_id),
+        json=update_data,
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
@@ -138,7 +142,8 @@ def test_update_category_not_found(client: TestClient):
 def test_delete_category_success(client: TestClient, db_session_test: Session):
     """Prueba la eliminación exitosa de una categoría."""
     category_to_delete = Category(
-        name="Para Borrar Definitivamente", description="Adiós",
+        name="Para Borrar Definitivamente",
+        description="Adiós",
     )
     db_session_test.add(category_to_delete)
     db_session_test.commit()
@@ -163,22 +168,60 @@ def test_delete_category_not_found(client: TestClient):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+def test_delete_category_with_blog_posts_policies(
+    client: TestClient,
+    db_session_test: Session,
+):
+    """Prueba las políticas de borrado de una categoría con blog posts: por
+    defecto responde 409; `reassign` mueve los posts y `cascade` los elimina.
+    """
+    category = create_test_category(db_session_test, name="Con Posts")
+    target = create_test_category(db_session_test, name="Destino")
+    post = create_test_blog_post(db_session_test, category_id=category.id)
+    url = CATEGORY_ID_URL.format(category_id=category.id)
+
+    assert client.delete(url).status_code == status.HTTP_409_CONFLICT
+    response = client.delete(url, params={"policy": "reassign"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = client.delete(
+        url,
+        params={"policy": "reassign", "reassign_to": str(target.id)},
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    db_session_test.refresh(post)
+    assert post.category_id == target.id
+
+    target_url = CATEGORY_ID_URL.format(category_id=target.id)
+    response = client.delete(target_url, params={"policy": "cascade"})
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    db_session_test.expire_all()
+    assert db_session_test.get(BlogPost, post.id) is None
+
+
 def test_get_blog_posts_by_category_success(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
     """Prueba obtener todos los blog posts de una categoría."""
     category = create_test_category(db_session_test, name="Categoría con Posts")
 
     post1 = create_test_blog_post(
-        db_session_test, title="Post 1 en Categoría", category_id=category.id,
+        db_session_test,
+        title="Post 1 en Categoría",
+        category_id=category.id,
     )
     post2 = create_test_blog_post(
-        db_session_test, title="Post 2 en Categoría", category_id=category.id,
+        db_session_test,
+        title="Post 2 en Categoría",
+        category_id=category.id,
     )
 
     other_category = create_test_category(db_session_test, name="Otra Categoría")
     create_test_blog_post(
-        db_session_test, title="Post en Otra Categoría", category_id=other_category.id,
+        db_session_test,
+        title="Post en Otra Categoría",
+        category_id=other_category.id,
     )
 
     response = client.get(BLOG_POSTS_BY_CATEGORY_URL.format(category_id=category.id))
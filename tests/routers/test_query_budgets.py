@@ -0,0 +1,195 @@
+"""Presupuestos de consultas SQL por endpoint.
+Si un cambio añade consultas (por ejemplo, una relación perezosa nueva que
+provoca un N+1), estos tests fallan mostrando las sentencias ejecutadas.
+"""
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.domain.models.blog_post_tag_link import BlogPostTagLink
+from src.domain.models.section import Section
+from src.repository.taxonomy import taxonomy_snapshot
+from tests.fixtures import (
+    BLOG_POST_BASE_URL,
+    BLOG_POST_ID_URL,
+    BLOG_POSTS_BY_CATEGORY_URL,
+    SECTIONS_BY_BLOG_POST_URL,
+    TAG_BASE_URL,
+    TAG_ID_URL,
+    TAG_URL,
+    create_test_blog_post,
+    create_test_category,
+    create_test_section,
+    create_test_tag,
+)
+
+
+def _create_posts(db_session: Session, count: int):
+    category = create_test_category(db_session, name="Presupuesto")
+    posts = [
+        create_test_blog_post(db_session, title=f"Post {i}", category_id=category.id)
+        for i in range(count)
+    ]
+    for post in posts:
+        create_test_section(db_session, blog_post_id=post.id)
+    db_session.expire_all()
+    # Como tras el calentamiento del arranque: categorías y tags en memoria.
+    taxonomy_snapshot.rebuild(db_session)
+    return category, posts
+
+
+def test_read_blog_post_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """El detalle de un blog post no debe superar su presupuesto de consultas."""
+    _, posts = _create_posts(db_session_test, 1)
+    url = BLOG_POST_ID_URL.format(blog_post_id=posts[0].id)
+
+    # Post, contenido, enlaces a tags y secciones.
+    with assert_max_queries(4):
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_read_blog_posts_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """El listado de blog posts no debe superar su presupuesto de consultas."""
+    _create_posts(db_session_test, 5)
+
+    # Posts, contenidos, enlaces a tags y secciones: una consulta por modelo, sin
+    # N+1. La categoría y los tags salen del snapshot de taxonomía.
+    with assert_max_queries(4):
+        response = client.get(BLOG_POST_BASE_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 5
+
+
+def test_batch_read_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """La lectura por lotes (`?ids=`) resuelve todos los IDs con una consulta."""
+    _, posts = _create_posts(db_session_test, 5)
+    ids = [str(post.id) for post in posts]
+
+    with assert_max_queries(4):
+        response = client.get(BLOG_POST_BASE_URL, params={"ids": ids})
+    assert response.status_code == status.HTTP_200_OK
+    assert [post["id"] for post in response.json()] == ids
+
+    with assert_max_queries(1):
+        response = client.get(TAG_BASE_URL, params={"ids": ids})
+    assert response.json() == []
+
+
+def test_blog_posts_by_category_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """El listado por categoría no debe superar su presupuesto de consultas."""
+    category, _ = _create_posts(db_session_test, 5)
+    url = BLOG_POSTS_BY_CATEGORY_URL.format(category_id=category.id)
+
+    # La categoría de la comprobación de existencia se reutiliza para los posts.
+    with assert_max_queries(5):
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_add_tag_to_blog_post_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Agregar un tag no debe superar su presupuesto de consultas."""
+    _, posts = _create_posts(db_session_test, 1)
+    tag = create_test_tag(db_session_test, name="Tag Presupuesto")
+    url = TAG_URL.format(blog_post_id=posts[0].id, tag_id=tag.id)
+    db_session_test.expire_all()
+
+    with assert_max_queries(6):
+        response = client.post(url)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_simple_lists_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Los listados sin relaciones deben resolverse con una sola consulta."""
+    _, posts = _create_posts(db_session_test, 1)
+    url = SECTIONS_BY_BLOG_POST_URL.format(blog_post_id=posts[0].id)
+
+    with assert_max_queries(1):
+        assert client.get(TAG_BASE_URL).status_code == status.HTTP_200_OK
+
+    with assert_max_queries(2):
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_write_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Crear y actualizar usan una sola sentencia con RETURNING, sin lectura previa
+    ni refresh (más el NOTIFY de la taxonomía en PostgreSQL).
+    """
+    notify = int(db_session_test.get_bind().dialect.name == "postgresql")
+    with assert_max_queries(1 + notify):
+        response = client.post(TAG_BASE_URL, json={"name": "Tag Escritura"})
+    assert response.status_code == status.HTTP_201_CREATED
+    url = TAG_ID_URL.format(tag_id=response.json()["id"])
+    db_session_test.expire_all()
+
+    with assert_max_queries(1 + notify):
+        response = client.put(url, json={"name": "Tag Actualizado"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "Tag Actualizado"
+
+
+def test_delete_blog_post_query_budget(
+    client: TestClient,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Eliminar un blog post con secciones y tags es una sola sentencia: la base
+    de datos borra las filas dependientes en cascada. La otra consulta busca los
+    posts que lo tienen como relacionado, para completar sus listas.
+    """
+    _, posts = _create_posts(db_session_test, 1)
+    post = posts[0]
+    for i in range(20):
+        create_test_section(db_session_test, blog_post_id=post.id, position_order=i)
+    tag = create_test_tag(db_session_test, name="Tag Cascada")
+    db_session_test.add(BlogPostTagLink(blog_post_id=post.id, tag_id=tag.id))
+    db_session_test.commit()
+    post_id = post.id
+    db_session_test.expire_all()
+
+    with assert_max_queries(2):
+        response = client.delete(BLOG_POST_ID_URL.format(blog_post_id=post_id))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not db_session_test.exec(
+        select(Section).where(Section.blog_post_id == post_id),
+    ).all()
+    assert not db_session_test.exec(
+        select(BlogPostTagLink).where(BlogPostTagLink.blog_post_id == post_id),
+    ).all()
+
+
+def test_query_count_headers(client: TestClient, db_session_test: Session):
+    """Prueba que la respuesta expone el número de consultas y el tiempo de BD."""
+    response = client.get(TAG_BASE_URL)
+    assert response.headers["x-db-query-count"] == "1"
+    assert float(response.headers["x-db-time-ms"]) >= 0
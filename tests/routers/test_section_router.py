@@ -13,8 +13,7 @@ from tests.fixtures import (
 
 
 def test_create_section_success(client: TestClient, db_session_test: Session):
-    """Test para crear una sección exitosamente.
-    """
+    """Test para crear una sección exitosamente."""
     blog_post = create_test_blog_post(db_session_test)
 
     section_data = {
@@ -38,8 +37,7 @@ def test_create_section_success(client: TestClient, db_session_test: Session):
 
 
 def test_create_section_missing_required_fields(client: TestClient):
-    """Test para verificar que fallan los datos requeridos al crear una sección.
-    """
+    """Test para verificar que fallan los datos requeridos al crear una sección."""
     section_data = {"title": "Sección sin blog_post_id", "content": "Contenido"}
 
     response = client.post(SECTION_BASE_URL, json=section_data)
@@ -48,8 +46,7 @@ def test_create_section_missing_required_fields(client: TestClient):
 
 
 def test_read_section_success(client: TestClient, db_session_test: Session):
-    """Test para obtener una sección por ID exitosamente.
-    """
+    """Test para obtener una sección por ID exitosamente."""
     section = create_test_section(db_session_test)
 
     response = client.get(SECTION_ID_URL.format(section_id=section.id))
@@ -63,8 +60,7 @@ def test_read_section_success(client: TestClient, db_session_test: Session):
 
 
 def test_read_section_not_found(client: TestClient):
-    """Test para verificar el comportamiento cuando una sección no existe.
-    """
+    """Test para verificar el comportamiento cuando una sección no existe."""
     fake_section_id = uuid.uuid4()
 
     response = client.get(SECTION_ID_URL.format(section_id=fake_section_id))
@@ -74,8 +70,7 @@ def test_read_section_not_found(client: TestClient):
 
 
 def test_read_sections_empty(client: TestClient, db_session_test: Session):
-    """Test para obtener todas las secciones cuando la base de datos está vacía.
-    """
+    """Test para obtener todas las secciones cuando la base de datos está vacía."""
     response = client.get(SECTION_BASE_URL)
 
     assert response.status_code == 200
@@ -84,14 +79,17 @@ def test_read_sections_empty(client: TestClient, db_session_test: Session):
 
 
 def test_read_sections_with_items(client: TestClient, db_session_test: Session):
-    """Test para obtener todas las secciones cuando hay elementos en la base de datos.
-    """
+    """Test para obtener todas las secciones cuando hay elementos en la base de datos."""
     blog_post = create_test_blog_post(db_session_test)
     _ = create_test_section(
-        db_session_test, title="Sección 1", blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 1",
+        blog_post_id=blog_post.id,
     )
     _ = create_test_section(
-        db_session_test, title="Sección 2", blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 2",
+        blog_post_id=blog_post.id,
     )
 
     response = client.get(SECTION_BASE_URL)
@@ -105,8 +103,7 @@ def test_read_sections_with_items(client: TestClient, db_session_test: Session):
 
 
 def test_update_section_success(client: TestClient, db_session_test: Session):
-    """Test para actualizar una sección exitosamente.
-    """
+    """Test para actualizar una sección exitosamente."""
     section = create_test_section(db_session_test)
 
     update_data = {
@@ -116,7 +113,8 @@ def test_update_section_success(client: TestClient, db_session_test: Session):
     }
 
     response = client.put(
-        SECTION_ID_URL.format(section_id=section.id), json=update_data,
+        SECTION_ID_URL.format(section_id=section.id),
+        json=update_data,
     )
 
     assert response.status_code == 200
@@ -128,23 +126,45 @@ def test_update_section_success(client: TestClient, db_session_test: Session):
 
 
 def test_update_section_not_found(client: TestClient):
-    """Test para verificar el comportamiento al actualizar una sección que no existe.
-    """
+    """Test para verificar el comportamiento al actualizar una sección que no existe."""
     fake_section_id = uuid.uuid4()
     update_data = {"title": "Título Actualizado"}
 
     response = client.put(
-        SECTION_ID_URL.format(section_id=fake_section_id), json=update_data,
+        SECTION_ID_URL.format(section_id=fake_section_id),
+        json=update_data,
     )
 
     assert response.status_code == 404
     assert response.json()["detail"] == "Sección no encontrada"
 
 
-def test_delete_section_success(client: TestClient, db_session_test: Session):
-    """Test para eliminar una sección exitosamente.
+def test_patch_section_with_content_delta(client: TestClient, db_session_test: Session):
+    """Prueba que PATCH aplica un delta sobre el contenido de una sección, con
+    su HTML, y que `null` solo se admite en los campos opcionales.
     """
     section = create_test_section(db_session_test)
+    url = SECTION_ID_URL.format(section_id=section.id)
+    content = section.content
+
+    response = client.patch(
+        url,
+        json={"content": {"delta": [{"insert": "**Nuevo** "}]}, "image_url": None},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == 200
+    assert response.json()["content"] == f"**Nuevo** {content}"
+    assert response.json()["image_url"] is None
+    assert response.headers["etag"] == '"2"'
+    db_session_test.refresh(section)
+    assert section.content_html.startswith("<p><strong>Nuevo</strong> ")
+
+    assert client.patch(url, json={"position_order": None}).status_code == 422
+
+
+def test_delete_section_success(client: TestClient, db_session_test: Session):
+    """Test para eliminar una sección exitosamente."""
+    section = create_test_section(db_session_test)
 
     response = client.delete(SECTION_ID_URL.format(section_id=section.id))
 
@@ -156,8 +176,7 @@ def test_delete_section_success(client: TestClient, db_session_test: Session):
 
 
 def test_delete_section_not_found(client: TestClient):
-    """Test para verificar el comportamiento al eliminar una sección que no existe.
-    """
+    """Test para verificar el comportamiento al eliminar una sección que no existe."""
     fake_section_id = uuid.uuid4()
 
     response = client.delete(SECTION_ID_URL.format(section_id=fake_section_id))
@@ -167,21 +186,30 @@ def test_delete_section_not_found(client: TestClient):
 
 
 def test_get_sections_by_blog_post_success(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
-    """Test para obtener secciones de un blog post específico ordenadas por position_order.
-    """
+    """Test para obtener secciones de un blog post específico ordenadas por position_order."""
     blog_post = create_test_blog_post(db_session_test)
 
     # Crear secciones con diferentes position_order
     _ = create_test_section(
-        db_session_test, title="Sección 3", position_order=3, blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 3",
+        position_order=3,
+        blog_post_id=blog_post.id,
     )
     _ = create_test_section(
-        db_session_test, title="Sección 1", position_order=1, blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 1",
+        position_order=1,
+        blog_post_id=blog_post.id,
     )
     _ = create_test_section(
-        db_session_test, title="Sección 2", position_order=2, blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 2",
+        position_order=2,
+        blog_post_id=blog_post.id,
     )
 
     response = client.get(SECTIONS_BY_BLOG_POST_URL.format(blog_post_id=blog_post.id))
@@ -200,8 +228,7 @@ def test_get_sections_by_blog_post_success(
 
 
 def test_get_sections_by_blog_post_not_found(client: TestClient):
-    """Test para verificar el comportamiento cuando el blog post no existe.
-    """
+    """Test para verificar el comportamiento cuando el blog post no existe."""
     fake_blog_post_id = uuid.uuid4()
 
     response = client.get(
@@ -213,8 +240,7 @@ def test_get_sections_by_blog_post_not_found(client: TestClient):
 
 
 def test_get_sections_by_blog_post_empty(client: TestClient, db_session_test: Session):
-    """Test para obtener secciones de un blog post que no tiene secciones.
-    """
+    """Test para obtener secciones de un blog post que no tiene secciones."""
     blog_post = create_test_blog_post(db_session_test)
 
     response = client.get(SECTIONS_BY_BLOG_POST_URL.format(blog_post_id=blog_post.id))
@@ -225,10 +251,10 @@ def test_get_sections_by_blog_post_empty(client: TestClient, db_session_test: Se
 
 
 def test_get_sections_by_blog_post_with_pagination(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
-    """Test para verificar la paginación en la obtención de secciones por blog post.
-    """
+    """Test para verificar la paginación en la obtención de secciones por blog post."""
     blog_post = create_test_blog_post(db_session_test)
 
     # Crear 5 secciones
@@ -264,21 +290,30 @@ def test_get_sections_by_blog_post_with_pagination(
 
 
 def test_get_sections_by_blog_post_ordered_by_position(
-    client: TestClient, db_session_test: Session,
+    client: TestClient,
+    db_session_test: Session,
 ):
-    """Test para verificar que las secciones se devuelven ordenadas por position_order.
-    """
+    """Test para verificar que las secciones se devuelven ordenadas por position_order."""
     blog_post = create_test_blog_post(db_session_test)
 
     # Crear secciones con diferentes position_order
     _ = create_test_section(
-        db_session_test, title="Sección 3", position_order=3, blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 3",
+        position_order=3,
+        blog_post_id=blog_post.id,
     )
     _ = create_test_section(
-        db_session_test, title="Sección 1", position_order=1, blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 1",
+        position_order=1,
+        blog_post_id=blog_post.id,
     )
     _ = create_test_section(
-        db_session_test, title="Sección 2", position_order=2, blog_post_id=blog_post.id,
+        db_session_test,
+        title="Sección 2",
+        position_order=2,
+        blog_post_id=blog_post.id,
     )
 
     response = client.get(SECTIONS_BY_BLOG_POST_URL.format(blog_post_id=blog_post.id))
@@ -2,13 +2,30 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class TestSettings(BaseSettings):
-    TEST_DB_USERNAME: str
-    TEST_DB_PASSWORD: str
-    TEST_DB_HOST: str
-    TEST_DB_PORT: str
-    TEST_DB_NAME: str
+    # Si no se configura nada, las pruebas usan SQLite en memoria.
+    TEST_DATABASE_URL: str | None = None
+
+    TEST_DB_USERNAME: str | None = None
+    TEST_DB_PASSWORD: str | None = None
+    TEST_DB_HOST: str | None = None
+    TEST_DB_PORT: str | None = None
+    TEST_DB_NAME: str | None = None
+    # Crea blogpost particionada por created_at (solo PostgreSQL), para pasar
+    # las pruebas también con esa disposición.
+    TEST_DB_PARTITIONED: bool = False
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @property
+    def database_url(self) -> str:
+        if self.TEST_DATABASE_URL:
+            return self.TEST_DATABASE_URL
+        if self.TEST_DB_NAME:
+            return (
+                f"postgresql+psycopg2://{self.TEST_DB_USERNAME}:{self.TEST_DB_PASSWORD}"
+                f"@{self.TEST_DB_HOST}:{self.TEST_DB_PORT}/{self.TEST_DB_NAME}"
+            )
+        return "sqlite://"
+
 
 test_db_settings = TestSettings()
@@ -0,0 +1,160 @@
+import random
+import uuid
+from time import monotonic
+
+import pytest
+from fastapi import status
+from sqlmodel import Session
+
+from src.domain.models.announcement import Announcement
+from src.domain.models.announcement_stats import AnnouncementStats
+from src.repository.announcement import AnnouncementRepository
+from src.repository.announcement_snapshot import (
+    AnnouncementSnapshot,
+    ServedAnnouncement,
+    announcement_snapshot,
+    impression_counter,
+)
+from tests.fixtures import (
+    ANNOUNCEMENT_ID_URL,
+    ANNOUNCEMENT_SERVE_URL,
+    ANNOUNCEMENT_TO_BLOG_POST_URL,
+    ANNOUNCEMENT_TO_CATEGORY_URL,
+    ANNOUNCEMENTS_BY_CATEGORY_URL,
+    create_test_announcement,
+    create_test_blog_post,
+    create_test_category,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_snapshot():
+    announcement_snapshot.clear()
+    impression_counter.drain()
+    yield
+    announcement_snapshot.clear()
+    impression_counter.drain()
+
+
+def _served(name: str, weight: int) -> ServedAnnouncement:
+    return ServedAnnouncement(
+        id=uuid.uuid4(),
+        name=name,
+        url=None,
+        image_url=None,
+        weight=weight,
+        version=1,
+    )
+
+
+def test_pick_is_weighted_and_falls_back_to_category():
+    """Prueba la rotación ponderada y los anuncios por defecto de la categoría."""
+    heavy, light, default = _served("a", 3), _served("b", 1), _served("c", 1)
+    post_id, other_post_id, category_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    snapshot = AnnouncementSnapshot(
+        version=1,
+        built_at=monotonic(),
+        announcements={a.id: a for a in (heavy, light, default)},
+        by_blog_post={post_id: (heavy.id, light.id)},
+        by_category={category_id: (default.id,)},
+    )
+
+    rng = random.Random(7)
+    picks = [snapshot.pick(post_id, category_id, rng=rng) for _ in range(4000)]
+    assert picks.count(heavy) / len(picks) == pytest.approx(0.75, abs=0.03)
+    assert set(picks) == {heavy, light}
+
+    assert snapshot.pick(other_post_id, category_id) == default
+    assert snapshot.pick(other_post_id) is None
+
+    patched = snapshot.patched(
+        [("blog_post", post_id, heavy.id, False), ("deleted", light.id)],
+    )
+    assert patched.version == 2
+    assert patched.pick(post_id, category_id) == default
+    # El snapshot original no cambia.
+    assert snapshot.candidates(post_id) == [heavy, light]
+
+
+def test_serve_uses_snapshot_and_applies_committed_changes(
+    client,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Prueba que servir anuncios no consulta la base de datos una vez cargado
+    el snapshot y que los cambios confirmados se aplican sin reconstruirlo.
+    """
+    category = create_test_category(db_session_test, name="Snapshot")
+    blog_post = create_test_blog_post(db_session_test, category_id=category.id)
+    first = create_test_announcement(db_session_test, name="Primero")
+    default = create_test_announcement(db_session_test, name="Por defecto")
+    blog_post_id, category_id = blog_post.id, category.id
+    first_id, default_id = first.id, default.id
+    params = {"blog_post_id": str(blog_post_id), "category_id": str(category_id)}
+
+    response = client.get(ANNOUNCEMENT_SERVE_URL, params=params)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    version = int(response.headers["X-Announcements-Version"])
+
+    client.post(
+        ANNOUNCEMENT_TO_CATEGORY_URL.format(
+            category_id=category_id,
+            announcement_id=default_id,
+        ),
+    )
+    db_session_test.commit()
+    with assert_max_queries(0):
+        response = client.get(ANNOUNCEMENT_SERVE_URL, params=params)
+    assert response.json()["id"] == str(default_id)
+    assert int(response.headers["X-Announcements-Version"]) == version + 1
+
+    client.post(
+        ANNOUNCEMENT_TO_BLOG_POST_URL.format(
+            blog_post_id=blog_post_id,
+            announcement_id=first_id,
+        ),
+    )
+    client.put(
+        ANNOUNCEMENT_ID_URL.format(announcement_id=first_id),
+        json={"name": "Nuevo"},
+    )
+    db_session_test.commit()
+    with assert_max_queries(0):
+        response = client.get(ANNOUNCEMENT_SERVE_URL, params=params)
+    assert response.json()["id"] == str(first_id)
+    assert response.json()["name"] == "Nuevo"
+
+    response = client.get(ANNOUNCEMENTS_BY_CATEGORY_URL.format(category_id=category_id))
+    assert [a["id"] for a in response.json()] == [str(default_id)]
+
+    # Impresiones: Por defecto una vez, Primero dos veces.
+    assert impression_counter.pending() == 2
+    impression_counter.flush(db_session_test)
+    assert db_session_test.get(AnnouncementStats, first_id).impressions == 1
+    assert db_session_test.get(AnnouncementStats, default_id).impressions == 1
+
+
+def test_rolled_back_changes_are_not_applied(db_session_test: Session):
+    """Prueba que un cambio revertido no llega al snapshot."""
+    blog_post = create_test_blog_post(db_session_test)
+    announcement = create_test_announcement(db_session_test)
+    blog_post_id, announcement_id = blog_post.id, announcement.id
+    announcement_snapshot.rebuild(db_session_test)
+
+    repo = AnnouncementRepository(model=Announcement, db_session=db_session_test)
+    repo.add_announcement_to_blog_post(
+        blog_post_id=blog_post_id,
+        announcement_id=announcement_id,
+    )
+    db_session_test.rollback()
+    snapshot = announcement_snapshot.current(db_session_test)
+    assert snapshot.pick(blog_post_id) is None
+
+    repo.add_announcement_to_blog_post(
+        blog_post_id=blog_post_id,
+        announcement_id=announcement_id,
+    )
+    db_session_test.commit()
+    assert announcement_snapshot.current(db_session_test).pick(blog_post_id).id == (
+        announcement_id
+    )
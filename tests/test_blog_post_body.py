@@ -0,0 +1,101 @@
+import uuid
+
+import pytest
+from fastapi import status
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from src.domain.models.blog_post import BlogPost, MissingBlogPostBodyError
+from src.domain.models.blog_post_body import BlogPostBody
+from src.repository.taxonomy import taxonomy_snapshot
+from tests.fixtures import (
+    BLOG_POST_BASE_URL,
+    BLOG_POST_ID_URL,
+    GET_CATEGORY_URL,
+    STATS_URL,
+    TAGS_URL,
+    create_test_blog_post,
+    create_test_category,
+)
+
+
+def test_metadata_reads_do_not_load_content(
+    client,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Prueba que las lecturas que no devuelven el contenido (comprobaciones de
+    existencia, conteos) no leen `blogpostbody` y que el detalle sí lo devuelve.
+    """
+    blog_post = create_test_blog_post(db_session_test, content="Texto largo")
+    blog_post_id = blog_post.id
+    db_session_test.expire_all()
+    taxonomy_snapshot.rebuild(db_session_test)
+
+    for url in (TAGS_URL, GET_CATEGORY_URL, STATS_URL):
+        with assert_max_queries(2) as stats:
+            response = client.get(url.format(blog_post_id=blog_post_id))
+        assert response.status_code == status.HTTP_200_OK
+        assert "blogpostbody" not in stats.summary()
+    with assert_max_queries(3) as stats:
+        client.get(BLOG_POST_BASE_URL, params={"include_total": True, "limit": 0})
+    assert "blogpostbody" not in stats.summary()
+
+    response = client.get(BLOG_POST_ID_URL.format(blog_post_id=blog_post_id))
+    assert response.json()["content"] == "Texto largo"
+
+
+def test_writes_keep_content_in_body(client, db_session_test: Session):
+    """Prueba que crear y actualizar un post escriben el contenido y su HTML en
+    `blogpostbody`, que cambiar solo el contenido incrementa la versión del post
+    y que borrar el post borra su contenido.
+    """
+    category = create_test_category(db_session_test)
+    response = client.post(
+        BLOG_POST_BASE_URL,
+        json={"title": "T", "content": "*uno*", "category_id": str(category.id)},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["content"] == "*uno*"
+    blog_post_id = uuid.UUID(response.json()["id"])
+    url = BLOG_POST_ID_URL.format(blog_post_id=blog_post_id)
+
+    response = client.put(url, json={"content": "**dos**"})
+    assert response.json()["content"] == "**dos**"
+    assert response.json()["version"] == 2
+    db_session_test.commit()
+    db_session_test.expire_all()
+    body = db_session_test.get(BlogPostBody, blog_post_id)
+    assert body.content_html == "<p><strong>dos</strong></p>"
+    assert db_session_test.get(BlogPost, blog_post_id).title == "T"
+
+    assert client.delete(url).status_code == status.HTTP_204_NO_CONTENT
+    db_session_test.expire_all()
+    assert not db_session_test.exec(
+        select(BlogPostBody).where(BlogPostBody.blog_post_id == blog_post_id),
+    ).all()
+
+
+def test_post_without_body_fails_loudly(
+    client,
+    db_session_test: Session,
+    caplog,
+):
+    """Prueba que un post sin fila en `blogpostbody` (datos dañados) no se sirve
+    con otro contenido: leerlo o actualizar su contenido falla y se registra.
+    """
+    blog_post = create_test_blog_post(db_session_test, content="Perdido")
+    blog_post_id = blog_post.id
+    db_session_test.exec(
+        delete(BlogPostBody).where(BlogPostBody.blog_post_id == blog_post_id),
+    )
+    db_session_test.commit()
+    db_session_test.expire_all()
+    url = BLOG_POST_ID_URL.format(blog_post_id=blog_post_id)
+
+    for params in ({}, {"content_format": "html"}):
+        with pytest.raises(MissingBlogPostBodyError):
+            client.get(url, params=params)
+    response = client.put(url, json={"content": "Recuperado"})
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert f"{blog_post_id} no tiene fila en blogpostbody" in caplog.text
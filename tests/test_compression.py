@@ -0,0 +1,117 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.core.middleware.compression import CompressionMiddleware, negotiate_encoding
+from src.core.settings import app_settings
+from tests.fixtures import BLOG_POST_ID_URL, create_test_blog_post
+
+LARGE_TEXT = "Contenido de un blog post bastante repetitivo. " * 200
+
+
+def build_client(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/large", response_class=PlainTextResponse)
+    def large():
+        return LARGE_TEXT
+
+    @app.get("/small", response_class=PlainTextResponse)
+    def small():
+        return "ok"
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for _ in range(20):
+                yield LARGE_TEXT[:500]
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_negotiate_encoding_respects_quality_values():
+    """Prueba la negociación de Accept-Encoding con valores q y comodines."""
+    supported = ("zstd", "br", "gzip")
+    assert negotiate_encoding("gzip, zstd", supported) == "zstd"
+    assert negotiate_encoding("gzip;q=1.0, zstd;q=0.5", supported) == "gzip"
+    assert negotiate_encoding("zstd;q=0, gzip", supported) == "gzip"
+    assert negotiate_encoding("*", supported) == "zstd"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding("br;q=0, *;q=0", supported) is None
+
+
+def test_gzip_response_above_threshold():
+    """Prueba que una respuesta grande se comprime con gzip."""
+    client = build_client(minimum_size=500)
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(LARGE_TEXT)
+    assert response.text == LARGE_TEXT
+
+
+def test_small_response_is_not_compressed():
+    """Prueba que las respuestas por debajo del umbral no se comprimen."""
+    client = build_client(minimum_size=500)
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+def test_zstd_preferred_when_accepted():
+    """Prueba que zstd tiene preferencia cuando el cliente lo acepta."""
+    pytest.importorskip("zstandard")
+    client = build_client(minimum_size=500)
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br, zstd"})
+    assert response.headers["content-encoding"] == "zstd"
+    assert response.text == LARGE_TEXT
+
+
+def test_streaming_response_is_compressed():
+    """Prueba la compresión trozo a trozo de una respuesta en streaming."""
+    client = build_client(minimum_size=500)
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == LARGE_TEXT[:500] * 20
+
+
+def test_route_levels_and_thread_offload():
+    """Prueba los niveles por ruta y la compresión en un hilo de trabajo."""
+    client = build_client(
+        minimum_size=500,
+        route_levels={"/large": {"gzip": 1}},
+        compress_in_thread=True,
+        thread_min_size=0,
+    )
+    with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as r:
+        raw = b"".join(r.iter_raw())
+    assert raw == gzip.compress(LARGE_TEXT.encode(), compresslevel=1, mtime=0)
+    assert zlib.decompress(raw, 31).decode() == LARGE_TEXT
+
+
+def test_weak_etag_of_compressed_response_matches_if_match(client, db_session_test):
+    """Prueba que la ETag débil de una respuesta comprimida sirve como If-Match
+    en las escrituras (la versión es la misma).
+    """
+    content = LARGE_TEXT[: app_settings.COMPRESSION_MINIMUM_SIZE * 2]
+    post = create_test_blog_post(db_session_test, content=content)
+    url = BLOG_POST_ID_URL.format(blog_post_id=post.id)
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag == 'W/"1"'
+
+    response = client.patch(url, json={"title": "Nuevo"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    response = client.put(url, json={"title": "Otro"}, headers={"If-Match": etag})
+    assert response.status_code == 412
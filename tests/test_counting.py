@@ -0,0 +1,88 @@
+import uuid
+
+from fastapi import status
+from sqlalchemy import select, text
+from sqlmodel import Session
+
+from src.domain.models.blog_post import BlogPost
+from src.repository.counting import TotalCount, TotalCounter
+from tests.fixtures import (
+    BLOG_POST_BASE_URL,
+    BLOG_POSTS_BY_CATEGORY_URL,
+    TAG_BASE_URL,
+    create_test_blog_post,
+    create_test_category,
+)
+
+
+def test_list_include_total_header(client, db_session_test: Session):
+    """Prueba que `include_total` añade `X-Total-Count` a los listados y que con
+    `ids` cuenta solo las filas devueltas.
+    """
+    category = create_test_category(db_session_test, name="Totales")
+    posts = [
+        create_test_blog_post(db_session_test, title=f"T{i}", category_id=category.id)
+        for i in range(3)
+    ]
+
+    response = client.get(BLOG_POST_BASE_URL, params={"limit": 1})
+    assert "x-total-count" not in response.headers
+
+    response = client.get(
+        BLOG_POST_BASE_URL,
+        params={"limit": 1, "include_total": True},
+    )
+    assert len(response.json()) == 1
+    assert response.headers["x-total-count"] == "3"
+    assert "x-total-count-estimated" not in response.headers
+
+    url = BLOG_POSTS_BY_CATEGORY_URL.format(category_id=category.id)
+    response = client.get(url, params={"limit": 2, "include_total": True})
+    assert response.headers["x-total-count"] == "3"
+
+    # Con `ids` el total es el número de filas devueltas, no el de la tabla.
+    ids = [str(post.id) for post in posts[:2]] + [str(uuid.uuid4())]
+    response = client.get(
+        BLOG_POST_BASE_URL,
+        params={"ids": ids, "include_total": True},
+    )
+    assert len(response.json()) == 2
+    assert response.headers["x-total-count"] == "2"
+    assert "x-total-count-estimated" not in response.headers
+    response = client.get(
+        TAG_BASE_URL,
+        params={"ids": [str(uuid.uuid4())], "include_total": True},
+    )
+    assert response.headers["x-total-count"] == "0"
+
+    response = client.get(
+        BLOG_POST_BASE_URL,
+        params={"ids": ids, "created_from": "2025-01-01T00:00:00"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_counter_caps_estimates_and_caches(db_session_test: Session):
+    """Por encima del tope el total deja de ser exacto; los resultados se
+    reutilizan mientras dura la caché.
+    """
+    category = create_test_category(db_session_test, name="Tope")
+    for i in range(5):
+        create_test_blog_post(db_session_test, title=f"C{i}", category_id=category.id)
+    counter = TotalCounter(cap=3, cache_seconds=60)
+    filtered = select(BlogPost.id).where(BlogPost.category_id == category.id)
+
+    assert counter.count(db_session_test, filtered) == TotalCount(3, exact=False)
+
+    if db_session_test.get_bind().dialect.name == "postgresql":
+        db_session_test.exec(text("ANALYZE blogpost"))
+        assert counter.estimate(db_session_test, BlogPost) == TotalCount(5, exact=False)
+    else:
+        assert counter.estimate(db_session_test, BlogPost) == TotalCount(3, exact=False)
+
+    counter = TotalCounter(cap=10, cache_seconds=60)
+    assert counter.count(db_session_test, filtered) == TotalCount(5, exact=True)
+    create_test_blog_post(db_session_test, title="Extra", category_id=category.id)
+    assert counter.count(db_session_test, filtered) == TotalCount(5, exact=True)
+    counter.clear()
+    assert counter.count(db_session_test, filtered) == TotalCount(6, exact=True)
@@ -0,0 +1,151 @@
+import re
+import uuid
+
+import pytest
+from fastapi import status
+from sqlmodel import Session
+
+from src.core.settings import app_settings
+from src.repository.feeds import feed_cache, post_url, sitemap_of
+from tests.fixtures import (
+    BLOG_POST_BASE_URL,
+    BLOG_POST_ID_URL,
+    create_test_category,
+)
+
+FEED_URL = "/feeds/{format}.xml"
+CATEGORY_FEED_URL = "/feeds/categories/{category_id}/{format}.xml"
+SITEMAP_URL = "/sitemap.xml"
+SITEMAP_PART_URL = "/sitemaps/{sitemap}.xml"
+
+
+@pytest.fixture(autouse=True)
+def empty_feed_cache():
+    feed_cache.clear()
+    yield
+    feed_cache.clear()
+
+
+def _create_post(client, category_id: uuid.UUID, title: str) -> uuid.UUID:
+    response = client.post(
+        BLOG_POST_BASE_URL,
+        json={"title": title, "content": "Texto", "category_id": str(category_id)},
+    )
+    return uuid.UUID(response.json()["id"])
+
+
+def _locs(body: str) -> list[str]:
+    return re.findall(r"<loc>([^<]+)</loc>", body)
+
+
+def test_feeds_are_cached_and_invalidated_by_scope(
+    client,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Prueba que los feeds se sirven desde la caché y que un post nuevo solo
+    regenera el feed global y el de su categoría.
+    """
+    running = create_test_category(db_session_test, name="Running")
+    yoga = create_test_category(db_session_test, name="Yoga")
+    running_url = CATEGORY_FEED_URL.format(category_id=running.id, format="rss")
+    yoga_url = CATEGORY_FEED_URL.format(category_id=yoga.id, format="atom")
+    _create_post(client, running.id, "Primer rodaje")
+    db_session_test.commit()
+
+    assert "Primer rodaje" in client.get(FEED_URL.format(format="rss")).text
+    assert "Primer rodaje" in client.get(running_url).text
+    response = client.get(yoga_url)
+    assert response.headers["content-type"].startswith("application/atom+xml")
+    assert "<entry>" not in response.text
+    with assert_max_queries(0):
+        client.get(FEED_URL.format(format="rss"))
+        client.get(running_url)
+
+    _create_post(client, yoga.id, "Saludo al sol")
+    db_session_test.commit()
+    with assert_max_queries(0):
+        assert "Saludo al sol" not in client.get(running_url).text
+    assert "Saludo al sol" in client.get(yoga_url).text
+    assert "Saludo al sol" in client.get(FEED_URL.format(format="rss")).text
+
+    missing = CATEGORY_FEED_URL.format(category_id=uuid.uuid4(), format="rss")
+    assert client.get(missing).status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_missing_category_feed_leaves_nothing_cached(client):
+    """Prueba que los feeds de categorías inexistentes no dejan documentos ni
+    locks en la caché.
+    """
+    for _ in range(3):
+        missing = CATEGORY_FEED_URL.format(category_id=uuid.uuid4(), format="rss")
+        assert client.get(missing).status_code == status.HTTP_404_NOT_FOUND
+    assert feed_cache._documents == {}
+    assert feed_cache._build_locks == {}
+
+
+def test_feeds_support_conditional_get_and_gzip(client, db_session_test: Session):
+    """Prueba las respuestas `304` con `If-None-Match` e `If-Modified-Since` y
+    que el documento se sirve comprimido o no según `Accept-Encoding`.
+    """
+    category = create_test_category(db_session_test)
+    _create_post(client, category.id, "Post")
+    db_session_test.commit()
+    url = FEED_URL.format(format="atom")
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    identity = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.text == response.text
+
+    for headers in ({"If-None-Match": etag}, {"If-Modified-Since": last_modified}):
+        response = client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+    response = client.get(url, headers={"If-None-Match": '"otra"'})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_sitemap_is_sharded_by_id_range(
+    client,
+    db_session_test: Session,
+    assert_max_queries,
+    monkeypatch,
+):
+    """Prueba que con muchos posts `/sitemap.xml` es un índice, que los sitemaps
+    reparten los posts por rango de ID y que editar un post solo regenera el suyo.
+    """
+    monkeypatch.setattr(app_settings, "SITEMAP_URLS_PER_FILE", 2)
+    category = create_test_category(db_session_test)
+    post_ids = [_create_post(client, category.id, f"Post {i}") for i in range(5)]
+    db_session_test.commit()
+
+    index = client.get(SITEMAP_URL).text
+    assert "<sitemapindex" in index
+    sitemaps = len(_locs(index))
+    assert sitemaps == 4
+
+    locs_by_sitemap = [
+        _locs(client.get(SITEMAP_PART_URL.format(sitemap=n)).text)
+        for n in range(sitemaps)
+    ]
+    assert sorted(loc for locs in locs_by_sitemap for loc in locs) == sorted(
+        post_url(post_id) for post_id in post_ids
+    )
+    edited = post_ids[0]
+    assert post_url(edited) in locs_by_sitemap[sitemap_of(edited, sitemaps)]
+    response = client.get(SITEMAP_PART_URL.format(sitemap=sitemaps))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    client.put(BLOG_POST_ID_URL.format(blog_post_id=edited), json={"title": "Nuevo"})
+    db_session_test.commit()
+    with assert_max_queries(0):
+        for n in range(sitemaps):
+            if n != sitemap_of(edited, sitemaps):
+                client.get(SITEMAP_PART_URL.format(sitemap=n))
+    with assert_max_queries(1):
+        client.get(SITEMAP_PART_URL.format(sitemap=sitemap_of(edited, sitemaps)))
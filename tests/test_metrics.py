@@ -0,0 +1,65 @@
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.core.metrics import Histogram, MetricsRegistry
+from tests.fixtures import TAG_ID_URL
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Prueba el formato de texto Prometheus de un histograma."""
+    registry = MetricsRegistry()
+    family = registry.histogram("latency_seconds", "Latencia.", ("route",), (0.1, 1.0))
+    series = family.labels("/x")
+    assert isinstance(series, Histogram)
+    series.observe(0.05)
+    series.observe(0.5)
+    series.observe(3.0)
+
+    output = registry.render()
+    assert "# TYPE latency_seconds histogram" in output
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/x",le="1"} 2' in output
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 3' in output
+    assert 'latency_seconds_count{route="/x"} 3' in output
+
+
+def test_metrics_endpoint_uses_route_templates(client: TestClient):
+    """Prueba que /metrics agrupa las peticiones por plantilla de ruta."""
+    for _ in range(2):
+        response = client.get(TAG_ID_URL.format(tag_id=uuid.uuid4()))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert "# TYPE http_requests_total counter" in body
+    assert (
+        'http_requests_total{method="GET",route="/v1/api/tags/{tag_id}",status="404"}'
+        in body
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/v1/api/tags/{tag_id}"}'
+        in body
+    )
+    assert "http_requests_in_progress" in body
+    assert "http_threadpool_queue_seconds_count" in body
+    assert "threadpool_capacity" in body
+
+
+def test_unknown_methods_share_one_series(client: TestClient):
+    """Prueba que los métodos HTTP desconocidos se agrupan en `OTHER` en lugar
+    de crear una serie por cada uno.
+    """
+    for method in ("FOO1", "FOO2"):
+        client.request(method, TAG_ID_URL.format(tag_id=uuid.uuid4()))
+
+    body = client.get("/metrics").text
+    assert "FOO" not in body
+    assert (
+        'http_request_duration_seconds_count{method="OTHER",route="<unmatched>"} 2'
+        in body
+    )
@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from sqlalchemy import delete, insert, inspect, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from src.core.database.partitioning import (
+    ensure_partitions,
+    is_partitioned,
+    partition_blog_posts,
+    unpartition_blog_posts,
+)
+from src.domain.models.blog_post import BlogPost
+from src.domain.models.blog_post_body import BlogPostBody
+from src.repository.blog_post import created_range, get_blog_post_repository
+from src.repository.loader import EntityLoader
+from tests.conftest import engine_test
+from tests.fixtures import (
+    BLOG_POST_BASE_URL,
+    BLOG_POSTS_BY_CATEGORY_URL,
+    create_test_blog_post,
+    create_test_category,
+)
+
+
+def _set_created_at(session: Session, blog_post_id: uuid.UUID, moment: datetime):
+    session.exec(
+        update(BlogPost).where(BlogPost.id == blog_post_id).values(created_at=moment),
+    )
+    session.commit()
+
+
+def test_blog_posts_filtered_by_created_range(client, db_session_test: Session):
+    """Prueba que los listados filtran por fecha de alta (`created_from`
+    incluida, `created_to` excluida) y que el total respeta el filtro.
+    """
+    category = create_test_category(db_session_test)
+    posts = {}
+    for moment in (datetime(2025, 1, 10), datetime(2025, 5, 10), datetime(2025, 9, 1)):
+        blog_post = create_test_blog_post(db_session_test, category_id=category.id)
+        _set_created_at(db_session_test, blog_post.id, moment)
+        posts[moment.month] = str(blog_post.id)
+
+    response = client.get(
+        BLOG_POST_BASE_URL,
+        params={
+            "created_from": "2025-05-10T00:00:00",
+            "created_to": "2025-09-01T00:00:00",
+            "include_total": True,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.json()] == [posts[5]]
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = client.get(
+        BLOG_POSTS_BY_CATEGORY_URL.format(category_id=category.id),
+        params={"created_from": "2025-02-01T00:00:00", "include_total": True},
+    )
+    assert {item["id"] for item in response.json()} == {posts[5], posts[9]}
+    assert response.headers["X-Total-Count"] == "2"
+
+
+@pytest.mark.skipif(
+    engine_test.dialect.name != "postgresql",
+    reason="particionado solo en PostgreSQL",
+)
+def test_partitioned_table_prunes_and_keeps_references(db_session_test: Session):
+    """Prueba, con `blogpost` particionada (dentro de la transacción del test),
+    que las consultas con rango de fechas solo recorren sus particiones, que los
+    triggers sustituyen a las claves foráneas y a la unicidad del id y que se
+    puede volver a la tabla sin particionar.
+    """
+    connection = db_session_test.connection()
+    if not is_partitioned(connection):
+        partition_blog_posts(connection)
+
+    # Sin partición para 2025, el post va a la de por defecto; el cambio de
+    # partición no borra su contenido.
+    blog_post = create_test_blog_post(db_session_test, content="Archivado")
+    blog_post_id = blog_post.id
+    _set_created_at(db_session_test, blog_post_id, datetime(2025, 2, 1))
+    assert ensure_partitions(
+        connection,
+        months=3,
+        ahead=0,
+        now=datetime(2025, 1, 15),
+    ) == ["blogpost_p2025_01"]
+    location = connection.exec_driver_sql(
+        "SELECT tableoid::regclass::text FROM blogpost WHERE id = %(id)s",
+        {"id": blog_post_id},
+    ).scalar()
+    assert location == "blogpost_p2025_01"
+    assert db_session_test.get(BlogPostBody, blog_post_id).content == "Archivado"
+
+    repo = get_blog_post_repository(db_session_test, EntityLoader(db_session_test))
+    statement = repo._apply_filters(
+        select(BlogPost),
+        created_range(datetime(2025, 1, 1), datetime(2025, 4, 1)),
+    )
+    sql = statement.compile(
+        dialect=connection.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    plan = "\n".join(connection.exec_driver_sql(f"EXPLAIN {sql}").scalars())
+    assert "blogpost_p2025_01" in plan
+    assert "blogpost_default" not in plan
+
+    with pytest.raises(IntegrityError), connection.begin_nested():
+        connection.execute(
+            insert(BlogPostBody).values(blog_post_id=uuid.uuid4(), content="x"),
+        )
+    # El id sigue siendo único entre particiones, también al mover la fila.
+    with pytest.raises(IntegrityError), connection.begin_nested():
+        connection.exec_driver_sql(
+            "CREATE TEMP TABLE duplicate AS SELECT * FROM blogpost WHERE id = %(id)s",
+            {"id": blog_post_id},
+        )
+        connection.exec_driver_sql("UPDATE duplicate SET created_at = '2025-06-01'")
+        connection.exec_driver_sql("INSERT INTO blogpost SELECT * FROM duplicate")
+    _set_created_at(db_session_test, blog_post_id, datetime(2025, 6, 1))
+    assert db_session_test.get(BlogPostBody, blog_post_id).content == "Archivado"
+    connection.execute(delete(BlogPost).where(BlogPost.id == blog_post_id))
+    assert (
+        connection.execute(
+            select(BlogPostBody).where(BlogPostBody.blog_post_id == blog_post_id),
+        ).first()
+        is None
+    )
+
+    unpartition_blog_posts(connection)
+    assert not is_partitioned(connection)
+    foreign_keys = inspect(connection).get_foreign_keys("blogpostbody")
+    assert [fk["referred_table"] for fk in foreign_keys] == ["blogpost"]
@@ -0,0 +1,85 @@
+from collections.abc import Generator
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.core.rate_limit import InMemoryBackend, RateLimitRule
+from src.main import rate_limiter
+from tests.fixtures import BLOG_POST_BASE_URL, TAG_BASE_URL
+
+
+@pytest.fixture
+def limited_client(client: TestClient) -> Generator[TestClient]:
+    """Activa el limitador con cubos pequeños y vacíos durante la prueba."""
+    original = rate_limiter.rules, rate_limiter.backend
+    rate_limiter.rules = {
+        "write": RateLimitRule(rate=1, burst=2),
+        "list": RateLimitRule(rate=1, burst=10),
+        "read": RateLimitRule(rate=100, burst=100),
+    }
+    rate_limiter.backend = InMemoryBackend()
+    rate_limiter.enabled = True
+    yield client
+    rate_limiter.enabled = False
+    rate_limiter.rules, rate_limiter.backend = original
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_over_time(monkeypatch):
+    """Prueba que el cubo admite ráfagas hasta `burst` y se rellena a `rate`."""
+    now = 100.0
+    monkeypatch.setattr("src.core.rate_limit.monotonic", lambda: now)
+    backend = InMemoryBackend()
+    rule = RateLimitRule(rate=2, burst=3)
+
+    assert [(await backend.consume("k", 1, rule)).allowed for _ in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    decision = await backend.consume("k", 1, rule)
+    assert decision.retry_after == pytest.approx(0.5)
+
+    now += 0.5
+    assert (await backend.consume("k", 1, rule)).allowed
+
+
+def test_write_routes_return_429_with_retry_after(limited_client: TestClient):
+    """Prueba que superar el límite de escritura devuelve 429 con Retry-After."""
+    for i in range(2):
+        response = limited_client.post(TAG_BASE_URL, json={"name": f"tag-{i}"})
+        assert response.status_code == status.HTTP_201_CREATED
+
+    response = limited_client.post(TAG_BASE_URL, json={"name": "tag-extra"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response.headers["retry-after"] == "1"
+    assert response.headers["x-ratelimit-group"] == "write"
+
+    # Las lecturas tienen su propio cubo.
+    assert limited_client.get(TAG_BASE_URL).status_code == status.HTTP_200_OK
+
+    metrics = limited_client.get("/metrics").text
+    assert 'rate_limit_decisions_total{group="write",decision="limited"}' in metrics
+
+
+def test_list_cost_grows_with_limit(limited_client: TestClient):
+    """Prueba que un `limit` enorme agota el cubo de listados de ese cliente."""
+    response = limited_client.get(BLOG_POST_BASE_URL, params={"limit": 100000})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = limited_client.get(BLOG_POST_BASE_URL, params={"limit": 10})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["retry-after"]) >= 1
+
+    # Cambiar de cabeceras no da un cubo nuevo; otra dirección sí.
+    response = limited_client.get(
+        BLOG_POST_BASE_URL,
+        params={"limit": 10},
+        headers={"X-API-Key": "otro"},
+    )
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    other_client = TestClient(limited_client.app, client=("10.0.0.2", 50000))
+    response = other_client.get(BLOG_POST_BASE_URL, params={"limit": 10})
+    assert response.status_code == status.HTTP_200_OK
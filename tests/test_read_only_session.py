@@ -0,0 +1,74 @@
+from typing import Annotated
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from src.core.database.config import (
+    ReadOnlySession,
+    ReadOnlySessionError,
+    get_session,
+    writes_on_read,
+)
+from src.domain.models.tag import Tag
+from tests.conftest import engine_test
+
+
+def _request(method: str) -> Request:
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+def test_get_uses_read_only_session_without_commit():
+    """Las peticiones GET reciben una sesión de solo lectura que no confirma."""
+    dependency = get_session(_request("GET"))
+    session = next(dependency)
+    assert isinstance(session, ReadOnlySession)
+    if engine_test.dialect.name == "postgresql":
+        assert session.exec(text("SHOW transaction_read_only")).scalar() == "on"
+    else:
+        session.exec(text("SELECT 1"))
+
+    commits = []
+    session.commit = lambda: commits.append(True)
+    with pytest.raises(StopIteration):
+        next(dependency)
+    assert commits == []
+
+    write_dependency = get_session(_request("POST"))
+    write_session = next(write_dependency)
+    assert not isinstance(write_session, ReadOnlySession)
+    write_dependency.close()
+
+
+def test_read_only_session_rejects_flush():
+    """Un flush con cambios pendientes falla en una sesión de solo lectura."""
+    with ReadOnlySession(engine_test) as session:
+        session.add(Tag(name="solo-lectura"))
+        with pytest.raises(ReadOnlySessionError):
+            session.flush()
+
+
+def test_read_only_session_is_chosen_per_route():
+    """Prueba, a través de la dependencia real `get_session`, que una ruta GET no
+    puede escribir y que una marcada con `writes_on_read` recibe una sesión
+    normal.
+    """
+    app = FastAPI()
+    SessionDep = Annotated[Session, Depends(get_session)]
+
+    @app.get("/write")
+    def write_on_get(session: SessionDep):
+        session.add(Tag(name="solo-lectura"))
+        session.flush()
+
+    @app.get("/marked")
+    @writes_on_read
+    def marked_route(session: SessionDep):
+        return {"read_only": isinstance(session, ReadOnlySession)}
+
+    with TestClient(app) as client:
+        with pytest.raises(ReadOnlySessionError):
+            client.get("/write")
+        assert client.get("/marked").json() == {"read_only": False}
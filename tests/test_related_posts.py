@@ -0,0 +1,197 @@
+import uuid
+
+import pytest
+from fastapi import status
+from sqlmodel import Session, select
+
+from src.domain.models.related_blog_post import RelatedBlogPost
+from src.repository import related_posts
+from src.repository.related_posts import RelatedPostsRepository, similar_posts
+from tests.fixtures import (
+    BLOG_POST_ID_URL,
+    CATEGORY_ID_URL,
+    RELATED_URL,
+    TAG_URL,
+    create_test_blog_post,
+    create_test_category,
+    create_test_tag,
+)
+
+
+def _links(tags_by_post: dict[str, set[str]]):
+    ids = {}
+    links = []
+    for post, tags in tags_by_post.items():
+        for tag in tags:
+            post_id = ids.setdefault(post, uuid.uuid5(uuid.NAMESPACE_DNS, post))
+            tag_id = ids.setdefault(tag, uuid.uuid5(uuid.NAMESPACE_DNS, f"tag-{tag}"))
+            links.append((post_id, tag_id))
+    return ids, links
+
+
+def test_similar_posts_cosine_top_k():
+    """Prueba el orden por similitud coseno de tags, sin el propio post."""
+    ids, links = _links(
+        {
+            "a": {"x", "y", "z"},
+            "b": {"x", "y", "z"},
+            "c": {"x", "y"},
+            "d": {"z", "w", "v", "u"},
+            "e": {"q"},
+        },
+    )
+    neighbors = similar_posts(links, [ids["a"], ids["e"]], k=2)
+
+    assert [post for post, _ in neighbors[ids["a"]]] == [ids["b"], ids["c"]]
+    assert neighbors[ids["a"]][0][1] == pytest.approx(1.0)
+    assert neighbors[ids["a"]][1][1] == pytest.approx(2 / (3 * 2) ** 0.5)
+    assert neighbors[ids["e"]] == []
+
+
+@pytest.mark.skipif(related_posts.sparse is None, reason="requiere numpy y scipy")
+def test_sparse_and_python_implementations_agree():
+    """Prueba que la versión vectorizada y la de Python dan el mismo resultado."""
+    tags_by_post = {
+        f"p{i}": {f"t{(i * j) % 17}" for j in range(1, 5)} for i in range(60)
+    }
+    ids, links = _links(tags_by_post)
+    targets = [ids[f"p{i}"] for i in range(60)]
+
+    assert related_posts._similar_posts_sparse(
+        links,
+        targets,
+        5,
+    ) == related_posts._similar_posts_python(links, targets, 5)
+
+
+def test_related_endpoint_updates_when_tags_change(client, db_session_test: Session):
+    """Prueba que el índice se recalcula al confirmar cambios de tags y que el
+    endpoint sirve los vecinos en orden.
+    """
+    category = create_test_category(db_session_test, name="Relacionados")
+    posts = [
+        create_test_blog_post(db_session_test, title=f"R{i}", category_id=category.id)
+        for i in range(3)
+    ]
+    tags = [create_test_tag(db_session_test, name=f"rel-{i}") for i in range(2)]
+    post_ids = [post.id for post in posts]
+
+    for post_index, tag_index in [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0)]:
+        url = TAG_URL.format(
+            blog_post_id=post_ids[post_index],
+            tag_id=tags[tag_index].id,
+        )
+        assert client.post(url).status_code == status.HTTP_200_OK
+    db_session_test.commit()
+
+    response = client.get(RELATED_URL.format(blog_post_id=post_ids[0]))
+    assert response.status_code == status.HTTP_200_OK
+    assert [post["id"] for post in response.json()] == [
+        str(post_ids[1]),
+        str(post_ids[2]),
+    ]
+
+    # Al quitar el tag compartido, el post 2 deja de estar relacionado con el 0.
+    url = TAG_URL.format(blog_post_id=post_ids[2], tag_id=tags[0].id)
+    assert client.delete(url).status_code == status.HTTP_200_OK
+    db_session_test.commit()
+    response = client.get(RELATED_URL.format(blog_post_id=post_ids[0]))
+    assert [post["id"] for post in response.json()] == [str(post_ids[1])]
+    response = client.get(RELATED_URL.format(blog_post_id=post_ids[2]))
+    assert response.json() == []
+
+    response = client.get(RELATED_URL.format(blog_post_id=uuid.uuid4()))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_rebuild_matches_incremental_refresh(db_session_test: Session):
+    """Prueba que recalcular todo el índice da el mismo resultado que las
+    actualizaciones incrementales.
+    """
+    category = create_test_category(db_session_test, name="Reconstruir")
+    posts = [
+        create_test_blog_post(db_session_test, title=f"B{i}", category_id=category.id)
+        for i in range(4)
+    ]
+    tags = [create_test_tag(db_session_test, name=f"reb-{i}") for i in range(3)]
+    for i, post in enumerate(posts):
+        post.tags = tags[: i % 3 + 1]
+        related_posts.mark_tags_changed(db_session_test, [post.id])
+    db_session_test.commit()
+
+    statement = select(
+        RelatedBlogPost.blog_post_id,
+        RelatedBlogPost.rank,
+        RelatedBlogPost.related_id,
+    ).order_by(RelatedBlogPost.blog_post_id, RelatedBlogPost.rank)
+    incremental = db_session_test.exec(statement).all()
+    assert incremental
+
+    RelatedPostsRepository(db_session_test).rebuild()
+    assert db_session_test.exec(statement).all() == incremental
+
+
+def test_deleted_post_is_replaced_in_related_lists(
+    client,
+    db_session_test: Session,
+    monkeypatch,
+):
+    """Prueba que al borrar un post los que lo tenían como relacionado lo
+    sustituyen por el siguiente vecino en vez de quedarse con la lista corta.
+    """
+    monkeypatch.setattr(related_posts.app_settings, "RELATED_POSTS_K", 1)
+    category = create_test_category(db_session_test, name="Borrados")
+    posts = [
+        create_test_blog_post(db_session_test, title=f"D{i}", category_id=category.id)
+        for i in range(3)
+    ]
+    tags = [create_test_tag(db_session_test, name=f"del-{i}") for i in range(2)]
+    posts[0].tags = tags
+    posts[1].tags = tags
+    posts[2].tags = tags[:1]
+    related_posts.mark_tags_changed(db_session_test, [post.id for post in posts])
+    db_session_test.commit()
+    post_ids = [post.id for post in posts]
+
+    response = client.get(RELATED_URL.format(blog_post_id=post_ids[0]))
+    assert [post["id"] for post in response.json()] == [str(post_ids[1])]
+
+    response = client.delete(BLOG_POST_ID_URL.format(blog_post_id=post_ids[1]))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    db_session_test.commit()
+    response = client.get(RELATED_URL.format(blog_post_id=post_ids[0]))
+    assert [post["id"] for post in response.json()] == [str(post_ids[2])]
+
+
+def test_category_cascade_replaces_deleted_posts_in_related_lists(
+    client,
+    db_session_test: Session,
+    monkeypatch,
+):
+    """Prueba que al borrar una categoría con `cascade` los posts de otras
+    categorías que tenían alguno de los suyos como relacionado lo sustituyen por
+    el siguiente vecino.
+    """
+    monkeypatch.setattr(related_posts.app_settings, "RELATED_POSTS_K", 1)
+    kept = create_test_category(db_session_test, name="Se queda")
+    removed = create_test_category(db_session_test, name="Se borra")
+    posts = [
+        create_test_blog_post(db_session_test, title=f"C{i}", category_id=category.id)
+        for i, category in enumerate((kept, removed, kept))
+    ]
+    tags = [create_test_tag(db_session_test, name=f"cas-{i}") for i in range(2)]
+    posts[0].tags = tags
+    posts[1].tags = tags
+    posts[2].tags = tags[:1]
+    related_posts.mark_tags_changed(db_session_test, [post.id for post in posts])
+    db_session_test.commit()
+    url = RELATED_URL.format(blog_post_id=posts[0].id)
+    assert [post["id"] for post in client.get(url).json()] == [str(posts[1].id)]
+
+    response = client.delete(
+        CATEGORY_ID_URL.format(category_id=removed.id),
+        params={"policy": "cascade"},
+    )
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    db_session_test.commit()
+    assert [post["id"] for post in client.get(url).json()] == [str(posts[2].id)]
@@ -0,0 +1,127 @@
+import uuid
+
+from fastapi import status
+from sqlmodel import Session
+
+from src.core.markdown import content_hash, render_markdown
+from src.core.settings import app_settings
+from src.domain.models.blog_post_body import BlogPostBody
+from src.domain.models.section import Section
+from src.repository.rendered_content import (
+    backfill_rendered_content,
+    render_many,
+    shutdown_render_pool,
+)
+from tests.fixtures import (
+    BLOG_POST_ID_URL,
+    SECTION_BASE_URL,
+    SECTION_ID_URL,
+    create_test_blog_post,
+    create_test_section,
+)
+
+
+def test_render_markdown_escapes_html_and_unsafe_urls():
+    """Prueba que el HTML del contenido se escapa y que solo se enlazan URLs
+    con esquemas permitidos.
+    """
+    html = render_markdown(
+        "# Título *1*\n\n"
+        "<script>alert(1)</script> **negrita** y `a<b>`\n\n"
+        "- [web](https://example.com/?a=1&b=2)\n"
+        "- [malo](javascript:alert)\n"
+        '- ![img"x](JavaScript:x)',
+    )
+    assert html == (
+        "<h1>Título <em>1</em></h1>\n"
+        "<p>&lt;script&gt;alert(1)&lt;/script&gt; <strong>negrita</strong> y "
+        "<code>a&lt;b&gt;</code></p>\n"
+        '<ul><li><a href="https://example.com/?a=1&amp;b=2" rel="nofollow noopener">'
+        "web</a></li><li>malo</li><li>img&quot;x</li></ul>"
+    )
+
+
+def test_writes_store_html_and_reads_return_it(client, db_session_test: Session):
+    """Prueba que crear y actualizar una sección guarda su HTML y que las
+    lecturas con `content_format=html` lo devuelven, también dentro del post.
+    """
+    blog_post = create_test_blog_post(db_session_test, content="Post *raw*")
+    blog_post_id = blog_post.id
+
+    response = client.post(
+        SECTION_BASE_URL,
+        json={
+            "title": "S",
+            "content": "Hola **mundo**",
+            "blog_post_id": str(blog_post_id),
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    section_id = uuid.UUID(response.json()["id"])
+    assert response.json()["content"] == "Hola **mundo**"
+
+    section = db_session_test.get(Section, section_id)
+    assert section.content_html == "<p>Hola <strong>mundo</strong></p>"
+    assert section.content_hash == content_hash("Hola **mundo**")
+
+    url = SECTION_ID_URL.format(section_id=section_id)
+    client.put(url, json={"content": "Adiós _mundo_"})
+    db_session_test.refresh(section)
+    assert section.content_html == "<p>Adiós <em>mundo</em></p>"
+    # Cambiar otros campos no vuelve a renderizar.
+    client.put(url, json={"title": "Otro"})
+    db_session_test.refresh(section)
+    assert section.content_hash == content_hash("Adiós _mundo_")
+
+    response = client.get(url, params={"content_format": "html"})
+    assert response.json()["content"] == "<p>Adiós <em>mundo</em></p>"
+    assert client.get(url).json()["content"] == "Adiós _mundo_"
+
+    # El post se creó sin pasar por el repositorio: su HTML se genera al vuelo.
+    response = client.get(
+        BLOG_POST_ID_URL.format(blog_post_id=blog_post_id),
+        params={"content_format": "html"},
+    )
+    assert response.json()["content"] == "<p>Post <em>raw</em></p>"
+    assert response.json()["sections"][0]["content"] == "<p>Adiós <em>mundo</em></p>"
+
+
+def test_backfill_renders_missing_and_stale_rows(db_session_test: Session):
+    """Prueba que el backfill completa las filas sin HTML o con un hash
+    desfasado y que una segunda pasada no actualiza nada.
+    """
+    blog_post = create_test_blog_post(db_session_test)
+    sections = [
+        create_test_section(
+            db_session_test,
+            content=f"*{i}*",
+            blog_post_id=blog_post.id,
+        )
+        for i in range(3)
+    ]
+    section_ids = [section.id for section in sections]
+    stale = sections[0]
+    stale.content_html, stale.content_hash = "<p>viejo</p>", "desfasado"
+    db_session_test.add(stale)
+    db_session_test.commit()
+
+    assert backfill_rendered_content(db_session_test, Section, batch_size=2) == 3
+    assert backfill_rendered_content(db_session_test, Section, batch_size=2) == 0
+    assert backfill_rendered_content(db_session_test, BlogPostBody) == 1
+
+    db_session_test.expire_all()
+    for i, section_id in enumerate(section_ids):
+        section = db_session_test.get(Section, section_id)
+        assert section.content_html == f"<p><em>{i}</em></p>"
+        assert section.content_hash == content_hash(f"*{i}*")
+
+
+def test_render_many_in_process_pool(monkeypatch):
+    """Prueba que renderizar en el pool de procesos da el mismo resultado."""
+    monkeypatch.setattr(app_settings, "CONTENT_RENDER_WORKERS", 1)
+    monkeypatch.setattr(app_settings, "CONTENT_RENDER_POOL_MIN_CHARS", 0)
+    contents = [f"# Sección {i}\n\nTexto **{i}**" for i in range(5)]
+    try:
+        assert render_many(contents) == [render_markdown(c) for c in contents]
+    finally:
+        shutdown_render_pool()
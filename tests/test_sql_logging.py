@@ -0,0 +1,67 @@
+import logging
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.database.sql_logging import SQLLogger
+from src.core.database.sql_logging import logger as sql_logger
+from tests.conftest import engine_test
+from tests.fixtures import SECTION_ID_URL
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def _capture(sql_log: SQLLogger) -> _ListHandler:
+    handler = _ListHandler()
+    sql_logger.addHandler(handler)
+    sql_log.install()
+    return handler
+
+
+def test_slow_query_log_includes_route_and_parameters(client: TestClient):
+    """Prueba que las consultas lentas se registran con la ruta y los parámetros."""
+    sql_log = SQLLogger(engine_test, slow_query_ms=0)
+    handler = _capture(sql_log)
+    section_id = uuid.uuid4()
+    try:
+        client.get(SECTION_ID_URL.format(section_id=section_id))
+    finally:
+        sql_log.remove()
+        sql_logger.removeHandler(handler)
+
+    slow = [
+        message
+        for message in handler.messages
+        if message.startswith("Consulta lenta") and "FROM section" in message
+    ]
+    assert slow
+    assert "GET /v1/api/sections/{section_id}" in slow[0]
+    assert section_id.hex in slow[0].replace("-", "")
+
+
+@pytest.mark.skipif(
+    engine_test.dialect.name != "postgresql",
+    reason="EXPLAIN solo en PostgreSQL",
+)
+def test_slow_query_explain_runs_once_per_statement(client: TestClient):
+    """Prueba que el plan de una consulta lenta se captura una sola vez por forma."""
+    sql_log = SQLLogger(engine_test, slow_query_ms=0, explain_slow=True)
+    handler = _capture(sql_log)
+    try:
+        for _ in range(3):
+            client.get(SECTION_ID_URL.format(section_id=uuid.uuid4()))
+    finally:
+        sql_log.remove()
+        sql_logger.removeHandler(handler)
+
+    plans = [m for m in handler.messages if m.startswith("Plan de la consulta lenta")]
+    assert len(plans) == 1
+    assert "Scan" in plans[0]
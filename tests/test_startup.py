@@ -0,0 +1,46 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.core.database.instrumentation import count_queries
+from src.core.database.settings import Settings
+from src.core.startup import warmup
+from tests.conftest import engine_test
+
+
+def test_warmup_runs_registered_steps():
+    """Prueba que el calentamiento abre conexiones y ejecuta las consultas calientes."""
+    with count_queries() as stats:
+        timings = warmup.run(engine_test, connections=2)
+
+    assert {"mappers", "connections", "repositories"} <= timings.keys()
+    assert stats.count >= 10
+
+
+def test_lifespan_publishes_startup_metrics(client: TestClient):
+    """Prueba que el lifespan publica la duración de las fases del arranque."""
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert 'app_startup_seconds{phase="engine"}' in response.text
+    assert 'app_startup_seconds{phase="total"}' in response.text
+
+
+def _database_url() -> str:
+    return Settings(_env_file=None).database_url
+
+
+def test_database_url_requires_configuration(monkeypatch):
+    """Prueba que sin DATABASE_URL ni DB_* no se usa ninguna base de datos por
+    defecto y que SQLite solo se usa si se configura.
+    """
+    for name in ("DATABASE_URL", "DB_NAME", "DB_PASSWORD", "DB_USERNAME", "DB_HOST"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("DB_PORT", "5432")
+    with pytest.raises(ValueError, match="DB_NAME"):
+        _database_url()
+    monkeypatch.delenv("DB_PORT")
+    with pytest.raises(ValueError, match="DATABASE_URL"):
+        _database_url()
+
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///./fitvana.db")
+    assert _database_url() == "sqlite:///./fitvana.db"
@@ -0,0 +1,169 @@
+import time
+
+import pytest
+from fastapi import status
+from sqlalchemy import text
+from sqlmodel import Session
+
+from src.core.settings import app_settings
+from src.domain.models.blog_post_tag_link import BlogPostTagLink
+from src.repository.taxonomy import (
+    PROCESS_TOKEN,
+    TaxonomyListener,
+    TaxonomySnapshotStore,
+    taxonomy_snapshot,
+)
+from tests.conftest import engine_test
+from tests.fixtures import (
+    BATCH_URL,
+    BLOG_POST_ID_URL,
+    CATEGORY_BASE_URL,
+    CATEGORY_ID_URL,
+    TAG_BASE_URL,
+    create_test_blog_post,
+    create_test_category,
+    create_test_tag,
+)
+
+
+def test_blog_posts_read_taxonomy_from_snapshot(
+    client,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Prueba que la categoría y los tags de un post salen del snapshot, que se
+    buscan por nombre y que un cambio confirmado caduca el snapshot.
+    """
+    category = create_test_category(db_session_test, name="Fuerza")
+    blog_post = create_test_blog_post(db_session_test, category_id=category.id)
+    tags = [create_test_tag(db_session_test, name=name) for name in ("b", "a")]
+    for tag in tags:
+        db_session_test.add(BlogPostTagLink(blog_post_id=blog_post.id, tag_id=tag.id))
+    db_session_test.commit()
+    url = BLOG_POST_ID_URL.format(blog_post_id=blog_post.id)
+    taxonomy_snapshot.rebuild(db_session_test)
+
+    # Post, enlaces a tags y secciones; ninguna consulta a `category` ni a `tag`.
+    with assert_max_queries(3) as stats:
+        body = client.get(url).json()
+    assert "FROM category" not in stats.summary()
+    assert body["category"]["name"] == "Fuerza"
+    assert [tag["name"] for tag in body["tags"]] == ["b", "a"]
+
+    with assert_max_queries(0):
+        response = client.get(TAG_BASE_URL, params={"name": "a"})
+        assert [tag["id"] for tag in response.json()] == [str(tags[1].id)]
+        response = client.get(CATEGORY_ID_URL.format(category_id=category.id))
+        assert response.headers["etag"] == '"1"'
+
+    client.put(CATEGORY_ID_URL.format(category_id=category.id), json={"name": "Poder"})
+    db_session_test.commit()
+    assert client.get(url).json()["category"]["name"] == "Poder"
+    response = client.get(CATEGORY_BASE_URL, params={"name": "Poder"})
+    assert [category["version"] for category in response.json()] == [2]
+
+
+def test_missing_taxonomy_falls_back_to_database(
+    client,
+    db_session_test: Session,
+):
+    """Prueba que si el snapshot no tiene la categoría o un tag de un post (aún
+    no recibió el cambio) se cargan de la base de datos y el snapshot caduca.
+    """
+    taxonomy_snapshot.rebuild(db_session_test)
+    version = taxonomy_snapshot.current(db_session_test).version
+    category = create_test_category(db_session_test, name="Nueva")
+    blog_post = create_test_blog_post(db_session_test, category_id=category.id)
+    tag = create_test_tag(db_session_test, name="nuevo")
+    db_session_test.add(BlogPostTagLink(blog_post_id=blog_post.id, tag_id=tag.id))
+    db_session_test.commit()
+    db_session_test.expire_all()
+
+    body = client.get(BLOG_POST_ID_URL.format(blog_post_id=blog_post.id)).json()
+    assert body["category"]["name"] == "Nueva"
+    assert [tag["name"] for tag in body["tags"]] == ["nuevo"]
+
+    snapshot = taxonomy_snapshot.current(db_session_test)
+    assert snapshot.version > version
+    assert snapshot.categories[category.id].name == "Nueva"
+    assert snapshot.tags_by_name["nuevo"].id == tag.id
+
+
+def test_rolled_back_taxonomy_change_does_not_reach_snapshot(
+    client,
+    db_session_test: Session,
+):
+    """Prueba que un lote que crea un tag, lo usa en un post y después falla no
+    deja el tag en el snapshot: el snapshot no se construye con cambios sin
+    confirmar y, si se construyó en la transacción, caduca al revertirla.
+    """
+    blog_post = create_test_blog_post(db_session_test)
+    operations = [
+        {"op": "tag.create", "ref": "tag", "body": {"name": "fantasma"}},
+        {
+            "op": "blog_post.add_tag",
+            "id": str(blog_post.id),
+            "related_id": {"$ref": "tag"},
+        },
+        {
+            "op": "blog_post.update",
+            "id": str(blog_post.id),
+            "version": blog_post.version + 5,
+            "body": {"title": "Nunca"},
+        },
+    ]
+    response = client.post(BATCH_URL, json={"operations": operations})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    assert client.get(TAG_BASE_URL, params={"name": "fantasma"}).json() == []
+    assert (
+        client.get(BLOG_POST_ID_URL.format(blog_post_id=blog_post.id)).json()["tags"]
+        == []
+    )
+
+
+@pytest.mark.skipif(
+    engine_test.dialect.name != "postgresql",
+    reason="LISTEN solo en PostgreSQL",
+)
+def test_listener_rebuilds_snapshot_on_notify():
+    """Prueba que una notificación de otro proceso reconstruye el snapshot y que
+    las del propio proceso se ignoran.
+    """
+    store = TaxonomySnapshotStore(ttl_seconds=300)
+    listener = TaxonomyListener(
+        engine_test,
+        store,
+        channel=app_settings.TAXONOMY_NOTIFY_CHANNEL,
+        poll_seconds=0.1,
+    )
+
+    def notify(payload: str) -> None:
+        with engine_test.connect() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": app_settings.TAXONOMY_NOTIFY_CHANNEL, "payload": payload},
+            )
+            connection.commit()
+
+    def wait_for_version(version: int) -> bool:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            snapshot = store._snapshot
+            if snapshot is not None and snapshot.version >= version:
+                return True
+            time.sleep(0.02)
+        return False
+
+    assert listener.start()
+    try:
+        assert listener.listening.wait(5)
+        # Al empezar a escuchar reconstruye, por si se perdió algún cambio.
+        assert wait_for_version(1)
+        notify(PROCESS_TOKEN)
+        notify("otro-proceso")
+        assert wait_for_version(2)
+        time.sleep(0.3)
+        assert store._snapshot.version == 2
+    finally:
+        listener.stop()
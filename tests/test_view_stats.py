@@ -0,0 +1,119 @@
+import math
+import uuid
+
+import pytest
+from fastapi import status
+from sqlmodel import Session
+
+from src.repository.buffered_counter import BufferedCounter
+from src.repository.view_stats import (
+    ViewStatsRepository,
+    trending_score,
+    view_counter,
+    write_views,
+)
+from tests.fixtures import (
+    STATS_URL,
+    TRENDING_URL,
+    VIEWS_URL,
+    create_test_blog_post,
+    create_test_category,
+)
+
+HOUR = 3600.0
+
+
+@pytest.fixture(autouse=True)
+def empty_view_counter():
+    view_counter.drain()
+    yield
+    view_counter.drain()
+
+
+def _posts(db_session: Session, count: int):
+    category = create_test_category(db_session, name="Visitas")
+    return [
+        create_test_blog_post(db_session, title=f"V{i}", category_id=category.id)
+        for i in range(count)
+    ]
+
+
+def test_views_are_buffered_and_flushed_in_one_upsert(
+    client,
+    db_session_test: Session,
+    assert_max_queries,
+):
+    """Prueba que las visitas no tocan la base de datos hasta el vaciado y que
+    este las suma con un único upsert.
+    """
+    post_ids = [post.id for post in _posts(db_session_test, 2)]
+
+    with assert_max_queries(0):
+        for post_id in [post_ids[0]] * 3 + [post_ids[1]]:
+            response = client.post(VIEWS_URL.format(blog_post_id=post_id))
+            assert response.status_code == status.HTTP_202_ACCEPTED
+    assert view_counter.pending() == 4
+
+    # Comprobación de existencia y upsert.
+    with assert_max_queries(2):
+        assert view_counter.flush(db_session_test) == 4
+    assert view_counter.pending() == 0
+
+    client.post(VIEWS_URL.format(blog_post_id=post_ids[0]))
+    view_counter.flush(db_session_test)
+
+    response = client.get(STATS_URL.format(blog_post_id=post_ids[0]))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["views"] == 4
+    assert response.json()["trending_score"] == pytest.approx(4, rel=1e-3)
+
+    response = client.get(TRENDING_URL)
+    assert [post["id"] for post in response.json()] == [
+        str(post_ids[0]),
+        str(post_ids[1]),
+    ]
+
+
+def test_flush_drops_unknown_posts_and_restores_on_error(db_session_test: Session):
+    """Prueba que se descartan las visitas de posts inexistentes y que, si la
+    escritura falla, las visitas vuelven al buffer.
+    """
+    post = _posts(db_session_test, 1)[0]
+    counter = BufferedCounter("test_views", write_views, max_keys=2)
+    counter.record(post.id, 2)
+    counter.record(uuid.uuid4())
+    # Buffer lleno: los posts nuevos se descartan, los presentes siguen sumando.
+    assert counter.record(uuid.uuid4()) is False
+    assert counter.record(post.id) is True
+
+    assert counter.flush(db_session_test) == 3
+    assert ViewStatsRepository(db_session_test).get_stats(post.id).views == 3
+
+    counter.record(post.id)
+    # Una sesión inválida hace fallar la escritura.
+    with pytest.raises(AttributeError):
+        counter.flush(object())
+    assert counter.pending() == 1
+
+
+def test_trending_score_decays_with_half_life(db_session_test: Session):
+    """Prueba que las visitas antiguas pesan menos y que el ranking por
+    `trending_log` coincide con el de la puntuación con decaimiento.
+    """
+    old, recent = _posts(db_session_test, 2)
+    repo = ViewStatsRepository(db_session_test, half_life_seconds=HOUR)
+    now = 1_000 * HOUR
+    repo.apply_views({old.id: 8}, at=now - 3 * HOUR)
+    repo.apply_views({old.id: 1}, at=now)
+    repo.apply_views({recent.id: 2}, at=now)
+
+    old_stats = repo.get_stats(old.id)
+    db_session_test.refresh(old_stats)
+    assert old_stats.views == 9
+    # 8 visitas hace tres vidas medias valen 1.
+    assert repo.trending_score(old_stats, now=now) == pytest.approx(2)
+    assert trending_score(old_stats.trending_log, now + HOUR, HOUR) == pytest.approx(1)
+    assert math.isfinite(old_stats.trending_log)
+
+    repo.apply_views({recent.id: 1}, at=now)
+    assert repo.get_trending_ids(limit=2) == [recent.id, old.id]